@@ -0,0 +1,63 @@
+"""transcript cache table
+
+Revision ID: 20261017_0008
+Revises: 20260224_0007
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0008"
+down_revision = "20260224_0007"
+branch_labels = None
+depends_on = None
+
+
+def _inspector() -> sa.Inspector:
+    return sa.inspect(op.get_bind())
+
+
+def _table_names() -> set[str]:
+    return set(_inspector().get_table_names())
+
+
+def _index_names(table_name: str) -> set[str]:
+    return {idx["name"] for idx in _inspector().get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    if "transcript_cache" not in _table_names():
+        op.create_table(
+            "transcript_cache",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("video_id", sa.String(), nullable=False),
+            sa.Column("language", sa.String(), nullable=False),
+            sa.Column("text", sa.String(), nullable=False),
+            sa.Column("segments", sa.JSON(), nullable=True),
+            sa.Column("fetched_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("video_id", "language", name="uq_transcript_cache_video_language"),
+        )
+
+    if "transcript_cache" in _table_names():
+        if "ix_transcript_cache_video_id" not in _index_names("transcript_cache"):
+            op.create_index(
+                "ix_transcript_cache_video_id",
+                "transcript_cache",
+                ["video_id"],
+                unique=False,
+            )
+
+
+def downgrade() -> None:
+    if "transcript_cache" not in _table_names():
+        return
+
+    if "ix_transcript_cache_video_id" in _index_names("transcript_cache"):
+        op.drop_index("ix_transcript_cache_video_id", table_name="transcript_cache")
+    op.drop_table("transcript_cache")
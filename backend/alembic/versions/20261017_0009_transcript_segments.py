@@ -0,0 +1,147 @@
+"""transcript segment table, backfilled from artifact meta
+
+Revision ID: 20261017_0009
+Revises: 20261017_0008
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0009"
+down_revision = "20261017_0008"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 200
+
+artifact_table = sa.table(
+    "artifact",
+    sa.column("id", sa.Integer()),
+    sa.column("kind", sa.String()),
+    sa.column("meta", sa.JSON()),
+)
+segment_table = sa.table(
+    "transcript_segment",
+    sa.column("artifact_id", sa.Integer()),
+    sa.column("position", sa.Integer()),
+    sa.column("start_seconds", sa.Float()),
+    sa.column("end_seconds", sa.Float()),
+    sa.column("text", sa.String()),
+)
+
+
+def _inspector() -> sa.Inspector:
+    return sa.inspect(op.get_bind())
+
+
+def _table_names() -> set[str]:
+    return set(_inspector().get_table_names())
+
+
+def _index_names(table_name: str) -> set[str]:
+    return {idx["name"] for idx in _inspector().get_indexes(table_name)}
+
+
+def _transcript_batches(bind):
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(artifact_table.c.id, artifact_table.c.meta)
+            .where(artifact_table.c.kind == "transcript", artifact_table.c.id > last_id)
+            .order_by(artifact_table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _backfill_segments() -> None:
+    bind = op.get_bind()
+    for rows in _transcript_batches(bind):
+        segment_rows = []
+        for artifact_id, meta in rows:
+            if not isinstance(meta, dict) or "segments" not in meta:
+                continue
+            segments = meta.get("segments") or []
+            segment_rows.extend(
+                {
+                    "artifact_id": artifact_id,
+                    "position": position,
+                    "start_seconds": float(segment.get("start", 0.0)),
+                    "end_seconds": float(segment.get("end", 0.0)),
+                    "text": str(segment.get("text", "")),
+                }
+                for position, segment in enumerate(segments)
+                if isinstance(segment, dict)
+            )
+            new_meta = {key: value for key, value in meta.items() if key != "segments"}
+            new_meta["segment_count"] = len(segments)
+            bind.execute(
+                artifact_table.update()
+                .where(artifact_table.c.id == artifact_id)
+                .values(meta=new_meta)
+            )
+        if segment_rows:
+            bind.execute(segment_table.insert(), segment_rows)
+
+
+def upgrade() -> None:
+    if "transcript_segment" not in _table_names():
+        op.create_table(
+            "transcript_segment",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("artifact_id", sa.Integer(), nullable=False),
+            sa.Column("position", sa.Integer(), nullable=False),
+            sa.Column("start_seconds", sa.Float(), nullable=False),
+            sa.Column("end_seconds", sa.Float(), nullable=False),
+            sa.Column("text", sa.String(), nullable=False),
+            sa.ForeignKeyConstraint(["artifact_id"], ["artifact.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        if "ix_transcript_segment_artifact_start" not in _index_names("transcript_segment"):
+            op.create_index(
+                "ix_transcript_segment_artifact_start",
+                "transcript_segment",
+                ["artifact_id", "start_seconds"],
+                unique=False,
+            )
+        _backfill_segments()
+
+
+def downgrade() -> None:
+    if "transcript_segment" not in _table_names():
+        return
+
+    bind = op.get_bind()
+    for rows in _transcript_batches(bind):
+        for artifact_id, meta in rows:
+            segments = [
+                {"start": start, "end": end, "text": text}
+                for start, end, text in bind.execute(
+                    sa.select(
+                        segment_table.c.start_seconds,
+                        segment_table.c.end_seconds,
+                        segment_table.c.text,
+                    )
+                    .where(segment_table.c.artifact_id == artifact_id)
+                    .order_by(segment_table.c.position)
+                ).all()
+            ]
+            new_meta = {key: value for key, value in (meta or {}).items() if key != "segment_count"}
+            new_meta["segments"] = segments
+            bind.execute(
+                artifact_table.update()
+                .where(artifact_table.c.id == artifact_id)
+                .values(meta=new_meta)
+            )
+
+    if "ix_transcript_segment_artifact_start" in _index_names("transcript_segment"):
+        op.drop_index("ix_transcript_segment_artifact_start", table_name="transcript_segment")
+    op.drop_table("transcript_segment")
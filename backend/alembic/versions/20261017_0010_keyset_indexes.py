@@ -0,0 +1,58 @@
+"""composite indexes for keyset pagination
+
+Revision ID: 20261017_0010
+Revises: 20261017_0009
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0010"
+down_revision = "20261017_0009"
+branch_labels = None
+depends_on = None
+
+# List endpoints filter by workspace and page by `id < cursor ORDER BY id DESC`;
+# ascending composites serve that as a backward index scan on SQLite and Postgres.
+INDEXES = (
+    ("project", "ix_project_workspace_recent", ["workspace_id", "id"]),
+    ("artifact", "ix_artifact_workspace_project_recent", ["workspace_id", "project_id", "id"]),
+    ("artifact", "ix_artifact_workspace_project_kind_recent", ["workspace_id", "project_id", "kind", "id"]),
+    ("job", "ix_job_workspace_recent", ["workspace_id", "id"]),
+    ("job", "ix_job_workspace_project_recent", ["workspace_id", "project_id", "id"]),
+    ("job", "ix_job_workspace_status_updated", ["workspace_id", "status", "updated_at"]),
+    ("template", "ix_template_workspace_recent", ["workspace_id", "id"]),
+    ("template", "ix_template_workspace_kind_recent", ["workspace_id", "kind", "id"]),
+    ("workflow", "ix_workflow_workspace_recent", ["workspace_id", "id"]),
+)
+
+
+def _inspector() -> sa.Inspector:
+    return sa.inspect(op.get_bind())
+
+
+def _table_names() -> set[str]:
+    return set(_inspector().get_table_names())
+
+
+def _index_names(table_name: str) -> set[str]:
+    return {idx["name"] for idx in _inspector().get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    tables = _table_names()
+    for table_name, index_name, columns in INDEXES:
+        if table_name in tables and index_name not in _index_names(table_name):
+            op.create_index(index_name, table_name, columns, unique=False)
+
+
+def downgrade() -> None:
+    tables = _table_names()
+    for table_name, index_name, _columns in reversed(INDEXES):
+        if table_name in tables and index_name in _index_names(table_name):
+            op.drop_index(index_name, table_name=table_name)
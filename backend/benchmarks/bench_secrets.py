@@ -0,0 +1,72 @@
+"""Per-call cost of secret encryption/decryption, legacy vs current implementation.
+
+Run from `backend/` with the usual settings in the environment:
+
+    python -m benchmarks.bench_secrets --number 20000
+
+`decrypt_secret` runs on every uncached provider credential lookup, so the
+single-token numbers are the ones that matter on the request path.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import hmac
+import timeit
+
+from trendr_api.config import settings
+from trendr_api.security import decrypt_many, decrypt_secret, encrypt_secret
+from trendr_api.security.secrets import _key_bytes
+
+
+def _legacy_keystream(key: bytes, nonce: bytes, length: int) -> bytes:
+    output = bytearray()
+    counter = 0
+    while len(output) < length:
+        block = hmac.new(key, nonce + counter.to_bytes(8, "big"), hashlib.sha256).digest()
+        output.extend(block)
+        counter += 1
+    return bytes(output[:length])
+
+
+def _legacy_decrypt(token: str) -> str:
+    raw = base64.urlsafe_b64decode(token.encode("utf-8"))
+    nonce, tag, ciphertext = raw[:16], raw[16:48], raw[48:]
+    key = _key_bytes()
+    expected_tag = hmac.new(key, nonce + ciphertext, hashlib.sha256).digest()
+    if not hmac.compare_digest(tag, expected_tag):
+        raise ValueError("invalid tag")
+    stream = _legacy_keystream(key, nonce, len(ciphertext))
+    return bytes(b ^ s for b, s in zip(ciphertext, stream)).decode("utf-8")
+
+
+def _report(label: str, seconds: float, number: int) -> None:
+    print(f"{label:<34} {seconds / number * 1e6:9.2f} us/call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    settings.secrets_encryption_key = settings.secrets_encryption_key or "bench-key"
+    for size in (51, 164, 1024):
+        secret = "s" * size
+        token = encrypt_secret(secret)
+        assert _legacy_decrypt(token) == decrypt_secret(token) == secret
+        print(f"secret length {size}")
+        _report("  legacy decrypt", timeit.timeit(lambda: _legacy_decrypt(token), number=args.number), args.number)
+        _report("  decrypt_secret", timeit.timeit(lambda: decrypt_secret(token), number=args.number), args.number)
+        tokens = [token] * 100
+        batch_runs = max(1, args.number // 100)
+        _report(
+            "  decrypt_many (per token, x100)",
+            timeit.timeit(lambda: decrypt_many(tokens), number=batch_runs),
+            batch_runs * 100,
+        )
+        _report("  encrypt_secret", timeit.timeit(lambda: encrypt_secret(secret), number=args.number), args.number)
+
+
+if __name__ == "__main__":
+    main()
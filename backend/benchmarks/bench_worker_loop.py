@@ -0,0 +1,125 @@
+"""Throughput of stub-provider generate jobs: loop-per-call vs worker-lifetime loop.
+
+Run from `backend/` with the usual settings in the environment:
+
+    python -m benchmarks.bench_worker_loop --jobs 300
+
+The legacy runner reproduces the old `_run_async`, which built and closed a new
+event loop (and its pooled HTTP clients) for every coroutine.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Callable
+
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from trendr_api.auth import resolve_auth_context
+from trendr_api.config import settings
+from trendr_api.models import Artifact, Job, Project
+from trendr_api.plugins.providers.openai_text_stub import OpenAITextStub
+from trendr_api.plugins.registry import registry
+from trendr_api.services.http_clients import aclose_http_clients
+from trendr_api.services.transcript_segments import insert_segment_rows, segment_rows
+from trendr_api.worker import tasks
+
+
+def _legacy_run_async(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.run_until_complete(aclose_http_clients())
+        loop.close()
+
+
+def _seed(engine, jobs: int) -> list[int]:
+    with Session(engine) as session:
+        actor = resolve_auth_context(
+            session=session,
+            user_external_id="bench-user",
+            workspace_slug="bench-space",
+        )
+        project = Project(
+            workspace_id=actor.workspace_id,
+            name="Bench",
+            source_type="youtube",
+            source_ref="https://youtu.be/dQw4w9WgXcQ",
+        )
+        session.add(project)
+        session.commit()
+        session.refresh(project)
+        transcript = Artifact(
+            workspace_id=actor.workspace_id,
+            project_id=project.id,
+            kind="transcript",
+            title="Transcript",
+            content="Benchmark transcript sentence that is long enough to be a fact. " * 20,
+            meta={"segment_count": 1},
+        )
+        session.add(transcript)
+        session.flush()
+        insert_segment_rows(
+            session,
+            segment_rows(transcript.id, [{"start": 0.0, "end": 1.0, "text": "hello world"}]),
+        )
+        batch = [
+            Job(
+                kind="generate",
+                status="queued",
+                workspace_id=actor.workspace_id,
+                project_id=project.id,
+                input={
+                    "project_id": project.id,
+                    "outputs": ["tweet", "linkedin", "blog"],
+                    "tone": "professional",
+                },
+                output={},
+            )
+            for _ in range(jobs)
+        ]
+        session.add_all(batch)
+        session.commit()
+        return [job.id for job in batch]
+
+
+def _measure(label: str, runner: Callable, jobs: int) -> float:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    job_ids = _seed(engine, jobs)
+
+    tasks.engine = engine
+    tasks._run_async = runner
+    started = time.perf_counter()
+    for job_id in job_ids:
+        tasks.generate_posts.run(job_id)
+    elapsed = time.perf_counter() - started
+    rate = jobs / elapsed
+    print(f"{label:<22} {jobs:>6} jobs  {elapsed:8.3f}s  {rate:10.1f} tasks/sec")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    args = parser.parse_args()
+
+    registry.text_providers.clear()
+    registry.register_text(OpenAITextStub())
+    settings.text_provider_fallbacks = "openai_stub"
+
+    persistent_runner = tasks._run_async
+    before = _measure("loop per call", _legacy_run_async, args.jobs)
+    after = _measure("worker-lifetime loop", persistent_runner, args.jobs)
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Requests/sec of the hot read endpoints at high concurrency, sync vs async handlers.
+
+Run from `backend/` with the usual settings in the environment:
+
+    python -m benchmarks.load_api_reads --requests 4000 --concurrency 200
+
+By default both modes are served in-process (httpx ASGI transport) from a seeded
+sqlite file, so the numbers show handler and threadpool overhead rather than
+network or Postgres latency. Point `--url` at running servers (one started with
+`DB_ASYNC_ENABLED=false`, one with `true`) to load-test a real deployment; pass
+`--user`/`--workspace` headers that exist there.
+
+Both in-process engines get `--pool-size` connections (default: one per
+concurrent request). Sync handlers keep their session open while the response
+model is validated on another threadpool hop, so a pool smaller than the request
+concurrency can park every threadpool worker waiting for a connection; the sync
+path then stalls until the pool timeout. The async path does not have this mode.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from trendr_api.api.analytics import router as analytics_router
+from trendr_api.api.artifacts import router as artifacts_router
+from trendr_api.api.async_reads import router as async_reads_router
+from trendr_api.api.jobs import router as jobs_router
+from trendr_api.api.projects import router as projects_router
+from trendr_api.api.schedule import router as schedule_router
+from trendr_api.auth import require_auth, require_auth_async, resolve_auth_context
+from trendr_api.db import get_async_session, get_session
+from trendr_api.models import Artifact, Job, Project
+from trendr_api.services.analytics import record_event
+
+
+def _seed(engine):
+    with Session(engine) as session:
+        actor = resolve_auth_context(
+            session=session,
+            user_external_id="bench-user",
+            workspace_slug="bench-space",
+        )
+        project = Project(
+            workspace_id=actor.workspace_id,
+            name="Bench",
+            source_type="youtube",
+            source_ref="https://youtu.be/dQw4w9WgXcQ",
+        )
+        session.add(project)
+        session.commit()
+        session.refresh(project)
+        for index in range(50):
+            session.add(
+                Job(
+                    kind="generate",
+                    status="succeeded",
+                    workspace_id=actor.workspace_id,
+                    project_id=project.id,
+                    input={"index": index},
+                    output={},
+                )
+            )
+            session.add(
+                Artifact(
+                    workspace_id=actor.workspace_id,
+                    project_id=project.id,
+                    kind="tweet",
+                    content=f"Benchmark artifact {index}",
+                    meta={},
+                )
+            )
+        session.commit()
+        for _ in range(20):
+            record_event(session, workspace_id=actor.workspace_id, kind="job_completed")
+        return actor, project.id
+
+
+def _build_app(mode: str, db_path: Path, actor, pool_size: int) -> FastAPI:
+    app = FastAPI()
+    pool_args = {"pool_size": pool_size, "max_overflow": 0}
+    if mode == "async":
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", **pool_args)
+
+        async def bench_async_session():
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                yield session
+
+        async def bench_auth_async():
+            return actor
+
+        app.include_router(async_reads_router)
+        app.dependency_overrides[get_async_session] = bench_async_session
+        app.dependency_overrides[require_auth_async] = bench_auth_async
+        return app
+
+    sync_engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+        **pool_args,
+    )
+
+    def bench_session():
+        with Session(sync_engine) as session:
+            yield session
+
+    def bench_auth():
+        return actor
+
+    for router in (jobs_router, artifacts_router, projects_router, schedule_router, analytics_router):
+        app.include_router(router)
+    app.dependency_overrides[get_session] = bench_session
+    app.dependency_overrides[require_auth] = bench_auth
+    return app
+
+
+async def _drive(client: httpx.AsyncClient, paths: list[str], requests: int, concurrency: int) -> tuple[float, int]:
+    cycle = itertools.cycle(paths)
+    remaining = requests
+    failures = 0
+    lock = asyncio.Lock()
+
+    async def worker() -> None:
+        nonlocal remaining, failures
+        while True:
+            async with lock:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+                path = next(cycle)
+            response = await client.get(path)
+            if response.status_code != 200:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, failures
+
+
+async def _run_mode(label: str, client: httpx.AsyncClient, paths: list[str], args) -> float:
+    await _drive(client, paths, min(args.requests, 200), args.concurrency)  # warm up
+    elapsed, failures = await _drive(client, paths, args.requests, args.concurrency)
+    rate = args.requests / elapsed
+    print(
+        f"{label:<8} {args.requests:>6} req  c={args.concurrency:<4} "
+        f"{elapsed:8.3f}s  {rate:10.1f} req/sec  failures={failures}"
+    )
+    return rate
+
+
+def _paths(prefix: str, project_id: int) -> list[str]:
+    return [
+        f"{prefix}/jobs?limit=20",
+        f"{prefix}/artifacts?project_id={project_id}",
+        f"{prefix}/projects",
+        f"{prefix}/projects/{project_id}",
+        f"{prefix}/schedule",
+        f"{prefix}/analytics/summary",
+    ]
+
+
+async def _main(args) -> None:
+    if args.url:
+        headers = {"X-User-Id": args.user, "X-Workspace-Slug": args.workspace}
+        for label, url in zip(("target-1", "target-2"), args.url):
+            limits = httpx.Limits(max_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=30) as client:
+                await _run_mode(label, client, _paths("/v1", args.project_id), args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        SQLModel.metadata.create_all(engine)
+        actor, project_id = _seed(engine)
+        engine.dispose()
+
+        rates = {}
+        for mode in ("sync", "async"):
+            transport = httpx.ASGITransport(app=_build_app(mode, db_path, actor, args.pool_size or args.concurrency))
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                rates[mode] = await _run_mode(mode, client, _paths("", project_id), args)
+        print(f"async/sync: {rates['async'] / rates['sync']:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=0, help="0 = one per concurrent request")
+    parser.add_argument("--url", action="append", help="base URL of a running API (repeatable)")
+    parser.add_argument("--user", default="bench-user")
+    parser.add_argument("--workspace", default="bench-space")
+    parser.add_argument("--project-id", type=int, default=1)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
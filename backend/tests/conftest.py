@@ -7,6 +7,19 @@ from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine
 
 from trendr_api.auth import AuthContext, resolve_auth_context
+from trendr_api.resilience import circuit_breaker, hedge_budget, latency_tracker, rate_limiter, retry_budget
+
+
+@pytest.fixture(autouse=True)
+def _reset_resilience_state():
+    # Resilience state is process-wide; keep one test's calls out of the next.
+    states = (circuit_breaker, hedge_budget, latency_tracker, rate_limiter, retry_budget)
+    for state in states:
+        state.reset()
+    yield
+    for state in states:
+        state.reset()
+
 
 @pytest.fixture
 def sqlite_engine():
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException, Request, Response
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from trendr_api.api.artifacts import get_artifact_content, list_artifacts
+from trendr_api.auth import AuthContext
+from trendr_api.main import app
+from trendr_api.models import Artifact, Project
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "headers": headers})
+
+
+def _seed(session: Session, actor: AuthContext, count: int = 5) -> int:
+    project = Project(workspace_id=actor.workspace_id, name="P", source_type="youtube", source_ref="u")
+    session.add(project)
+    session.flush()
+    for index in range(count):
+        session.add(
+            Artifact(
+                workspace_id=actor.workspace_id,
+                project_id=project.id,
+                kind="transcript" if index == 0 else "tweet",
+                title=f"a{index}",
+                content="x" * (1000 * (index + 1)),
+            )
+        )
+    session.commit()
+    return project.id
+
+
+def _list(session: Session, actor: AuthContext, project_id: int, **kwargs):
+    response = Response()
+    request = _request(kwargs.pop("if_none_match", None))
+    result = list_artifacts(
+        request=request, response=response, project_id=project_id, session=session, actor=actor, **kwargs
+    )
+    return result, response
+
+
+def test_cursor_pages_walk_every_artifact_newest_first(db_session: Session, actor: AuthContext):
+    project_id = _seed(db_session, actor)
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page, response = _list(db_session, actor, project_id, fields="title", cursor=cursor, limit=2)
+        assert all(set(item) == {"id", "title"} for item in page)
+        seen += [item["id"] for item in page]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        cursor = int(cursor)
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == 5
+
+
+def test_summary_mode_returns_sizes_and_previews(db_session: Session, actor: AuthContext):
+    project_id = _seed(db_session, actor, count=2)
+
+    page, _ = _list(db_session, actor, project_id, summary=True)
+
+    assert [item["content_length"] for item in page] == [2000, 1000]
+    assert all(len(item["preview"]) == 200 and "content" not in item for item in page)
+
+
+def test_unknown_fields_are_rejected(db_session: Session, actor: AuthContext):
+    project_id = _seed(db_session, actor, count=1)
+    with pytest.raises(HTTPException) as exc_info:
+        _list(db_session, actor, project_id, fields="title,secret")
+    assert exc_info.value.status_code == 400
+
+
+def test_etag_round_trip_returns_not_modified(db_session: Session, actor: AuthContext):
+    project_id = _seed(db_session, actor, count=2)
+
+    _, response = _list(db_session, actor, project_id)
+    etag = response.headers["ETag"]
+    cached, _ = _list(db_session, actor, project_id, if_none_match=etag)
+    assert cached.status_code == 304
+
+    db_session.add(Artifact(workspace_id=actor.workspace_id, project_id=project_id, kind="tweet", content="new"))
+    db_session.commit()
+    fresh, response = _list(db_session, actor, project_id, if_none_match=etag)
+    assert len(fresh) == 3
+    assert response.headers["ETag"] != etag
+
+
+def test_content_endpoint_is_workspace_scoped(
+    db_session: Session, actor: AuthContext, other_actor: AuthContext
+):
+    project_id = _seed(db_session, actor, count=1)
+    page, _ = _list(db_session, actor, project_id, fields="kind")
+    artifact_id = page[0]["id"]
+
+    body = get_artifact_content(
+        request=_request(), response=Response(), artifact_id=artifact_id, session=db_session, actor=actor
+    )
+    assert (body.kind, len(body.content)) == ("transcript", 1000)
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_artifact_content(
+            request=_request(), response=Response(), artifact_id=artifact_id, session=db_session, actor=other_actor
+        )
+    assert exc_info.value.status_code == 404
+
+
+def test_cors_exposes_pagination_and_etag_headers():
+    response = TestClient(app).get("/metrics", headers={"Origin": "http://localhost:3000"})
+    exposed = {h.strip() for h in response.headers["access-control-expose-headers"].split(",")}
+    assert {"X-Next-Cursor", "ETag"} <= exposed
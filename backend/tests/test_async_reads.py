@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import trendr_api.auth as auth_module
+from trendr_api.api import async_reads
+from trendr_api.auth import auth_cache, require_auth_async, resolve_auth_context
+from trendr_api.config import settings
+from trendr_api.models import Artifact, Job, Project, ScheduledPost
+from trendr_api.services.analytics import record_event
+
+
+@pytest.fixture
+def shared_db(tmp_path):
+    # A file database so the sync seeding engine and the aiosqlite engine see the same rows.
+    path = tmp_path / "reads.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(sync_engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield sync_engine, async_engine
+    sync_engine.dispose()
+
+
+def _seed(sync_engine):
+    with Session(sync_engine) as session:
+        actor = resolve_auth_context(session=session, user_external_id="u1", workspace_slug="ws-one")
+        other = resolve_auth_context(session=session, user_external_id="u2", workspace_slug="ws-two")
+        project = Project(workspace_id=actor.workspace_id, name="P1", source_type="youtube", source_ref="a")
+        foreign = Project(workspace_id=other.workspace_id, name="P2", source_type="youtube", source_ref="b")
+        session.add(project)
+        session.add(foreign)
+        session.commit()
+        session.refresh(project)
+        session.refresh(foreign)
+        session.add(Job(kind="ingest", status="succeeded", workspace_id=actor.workspace_id, project_id=project.id, input={}, output={}))
+        session.add(Job(kind="ingest", status="queued", workspace_id=other.workspace_id, project_id=foreign.id, input={}, output={}))
+        session.add(Artifact(workspace_id=actor.workspace_id, project_id=project.id, kind="tweet", content="hi", meta={}))
+        session.add(
+            ScheduledPost(
+                workspace_id=actor.workspace_id,
+                project_id=project.id,
+                platform="x",
+                content="post",
+                scheduled_at=datetime.utcnow() + timedelta(hours=1),
+                status="scheduled",
+                meta={},
+            )
+        )
+        session.commit()
+        record_event(session, workspace_id=actor.workspace_id, kind="job_completed")
+        return actor, other, project.id, foreign.id
+
+
+async def test_async_reads_match_sync_shape_and_scope(shared_db):
+    sync_engine, async_engine = shared_db
+    actor, other, project_id, foreign_id = _seed(sync_engine)
+
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        jobs = await async_reads.list_jobs(
+            response=Response(), project_id=None, limit=50, session=session, actor=actor
+        )
+        assert [job.workspace_id for job in jobs] == [actor.workspace_id]
+
+        job = await async_reads.get_job(job_id=jobs[0].id, session=session, actor=actor)
+        assert job.kind == "ingest"
+
+        artifacts = await async_reads.list_artifacts(
+            request=Request({"type": "http", "headers": []}),
+            response=Response(),
+            project_id=project_id,
+            session=session,
+            actor=actor,
+        )
+        assert artifacts[0]["content"] == "hi"
+
+        projects = await async_reads.list_projects(response=Response(), session=session, actor=actor)
+        assert [p.id for p in projects] == [project_id]
+
+        posts = await async_reads.list_scheduled_posts(
+            session=session, actor=actor, project_id=None, status=None, platform=None, limit=50
+        )
+        assert len(posts) == 1
+
+        summary = await async_reads.analytics_summary(session=session, actor=actor, days=30)
+        assert [(row.kind, row.count) for row in summary] == [("job_completed", 1)]
+        timeline = await async_reads.analytics_timeline(session=session, actor=actor, days=30)
+        assert timeline[0].count == 1
+
+        with pytest.raises(HTTPException) as exc_info:
+            await async_reads.get_project(project_id=foreign_id, session=session, actor=actor)
+        assert exc_info.value.status_code == 404
+
+    await async_engine.dispose()
+
+
+async def test_require_auth_async_resolves_then_serves_from_cache(shared_db, monkeypatch):
+    sync_engine, async_engine = shared_db
+    monkeypatch.setattr(auth_module, "engine", sync_engine)
+    auth_cache.clear()
+
+    first = await require_auth_async(x_user_id="async-user", x_workspace_slug="async-ws")
+    monkeypatch.setattr(auth_module, "engine", None)  # any further DB access would fail
+    second = await require_auth_async(x_user_id="async-user", x_workspace_slug="async-ws")
+
+    assert first == second
+    assert first.workspace_slug == "async-ws"
+    auth_cache.clear()
+    await async_engine.dispose()
+
+
+def test_resolved_async_database_url(monkeypatch):
+    monkeypatch.setattr(settings, "async_database_url", None)
+    monkeypatch.setattr(settings, "database_url", "postgresql+psycopg://u:p@db:5432/trendr")
+    assert settings.resolved_async_database_url == "postgresql+psycopg://u:p@db:5432/trendr"
+
+    monkeypatch.setattr(settings, "database_url", "sqlite:///./ci.db")
+    assert settings.resolved_async_database_url == "sqlite+aiosqlite:///./ci.db"
+
+    monkeypatch.setattr(settings, "async_database_url", "postgresql+psycopg://override/db")
+    assert settings.resolved_async_database_url == "postgresql+psycopg://override/db"
@@ -4,6 +4,7 @@ import pytest
 from fastapi import HTTPException
 from sqlmodel import Session, select
 
+from trendr_api import auth as auth_module
 from trendr_api.auth import require_auth, resolve_auth_context
 from trendr_api.models import WorkspaceMember
 
@@ -36,3 +37,130 @@ def test_require_auth_rejects_missing_user_header(db_session: Session):
     with pytest.raises(HTTPException) as exc:
         require_auth(session=db_session, x_user_id=None, x_workspace_slug="default")
     assert exc.value.status_code == 401
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.sets: dict[str, set[str]] = {}
+
+    def get(self, key: str):
+        return self.values.get(key)
+
+    def set(self, key: str, value: str, ex: int | None = None):
+        self.values[key] = value
+
+    def sadd(self, key: str, *members: str):
+        self.sets.setdefault(key, set()).update(members)
+
+    def expire(self, key: str, ttl: int):
+        return True
+
+    def smembers(self, key: str):
+        return set(self.sets.get(key, set()))
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sets.pop(key, None)
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+    def publish(self, channel: str, message: str):
+        return 0
+
+
+class _FakePipeline:
+    def __init__(self, client: _FakeRedis) -> None:
+        self.client = client
+        self.ops: list = []
+
+    def __getattr__(self, name: str):
+        def _queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        for name, args, kwargs in self.ops:
+            getattr(self.client, name)(*args, **kwargs)
+
+
+@pytest.fixture
+def auth_cache_state(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(auth_module, "get_redis", lambda: fake)
+    monkeypatch.setattr("trendr_api.cache.invalidation.get_redis", lambda: fake)
+    auth_module.auth_cache.clear()
+    yield fake
+    auth_module.auth_cache.clear()
+
+
+def _counting_resolver(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    original = auth_module.resolve_auth_context
+
+    def _resolve(**kwargs):
+        calls.append(kwargs["user_external_id"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(auth_module, "resolve_auth_context", _resolve)
+    return calls
+
+
+def test_require_auth_serves_repeat_principals_from_cache(
+    db_session: Session,
+    monkeypatch,
+    auth_cache_state,
+):
+    calls = _counting_resolver(monkeypatch)
+
+    first = require_auth(session=db_session, x_user_id="cached-user", x_workspace_slug="Cached Space")
+    second = require_auth(session=db_session, x_user_id="cached-user ", x_workspace_slug="cached-space")
+
+    assert first == second
+    assert calls == ["cached-user"]
+
+
+def test_membership_change_invalidates_cached_principal(
+    db_session: Session,
+    monkeypatch,
+    auth_cache_state,
+):
+    calls = _counting_resolver(monkeypatch)
+    first = require_auth(session=db_session, x_user_id="role-user", x_workspace_slug="role-space")
+    assert first.workspace_role == "owner"
+
+    membership = db_session.exec(
+        select(WorkspaceMember).where(
+            WorkspaceMember.user_id == first.user_id,
+            WorkspaceMember.workspace_id == first.workspace_id,
+        )
+    ).one()
+    membership.role = "viewer"
+    db_session.add(membership)
+    db_session.commit()
+
+    second = require_auth(session=db_session, x_user_id="role-user", x_workspace_slug="role-space")
+
+    assert second.workspace_role == "viewer"
+    assert calls == ["role-user", "role-user"]
+
+
+def test_require_auth_reads_redis_tier_when_local_cache_is_cold(
+    db_session: Session,
+    monkeypatch,
+    auth_cache_state,
+):
+    monkeypatch.setattr(auth_module.settings, "auth_cache_redis_enabled", True)
+    calls = _counting_resolver(monkeypatch)
+
+    first = require_auth(session=db_session, x_user_id="redis-user", x_workspace_slug="redis-space")
+    auth_module.auth_cache.clear()
+    second = require_auth(session=db_session, x_user_id="redis-user", x_workspace_slug="redis-space")
+
+    assert second == first
+    assert calls == ["redis-user"]
+    assert auth_cache_state.values
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from trendr_api.api.providers import list_text_providers
+from trendr_api.config import settings
+from trendr_api.plugins.registry import registry
+from trendr_api.plugins.router import generate_text
+from trendr_api.plugins.types import ProviderCapabilities
+from trendr_api.resilience import CLOSED, HALF_OPEN, OPEN, circuit_breaker
+
+# The package re-exports the shared breaker under the module's own name.
+breaker_module = importlib.import_module("trendr_api.resilience.circuit_breaker")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@dataclass
+class _FlakyProvider:
+    name: str
+    failing: bool = False
+    calls: int = 0
+    latency: float = 0.0
+    clock: _Clock | None = None
+    capabilities: ProviderCapabilities = ProviderCapabilities()
+
+    def is_available(self, *, meta: dict | None = None) -> bool:
+        return True
+
+    async def generate(self, *, prompt: str, system: str | None = None, meta: dict | None = None) -> str:
+        self.calls += 1
+        if self.clock is not None:
+            self.clock.now += self.latency
+        if self.failing:
+            raise RuntimeError("upstream 503")
+        return f"{self.name}-ok"
+
+
+class _FakeRedis:
+    """Just enough of redis-py for RedisCircuitStore."""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, float]] = {}
+        self.strings: dict[str, str] = {}
+
+    def pipeline(self) -> "_FakeRedis":
+        self._results: list = []
+        return self
+
+    def execute(self) -> list:
+        return self._results
+
+    def hincrby(self, key: str, field: str, amount: int) -> None:
+        row = self.hashes.setdefault(key, {})
+        row[field] = row.get(field, 0) + amount
+
+    def expire(self, key: str, seconds: int) -> None:
+        pass
+
+    def hgetall(self, key: str) -> dict:
+        row = {k.encode(): str(v).encode() for k, v in self.hashes.get(key, {}).items()}
+        if hasattr(self, "_results"):
+            self._results.append(row)
+        return row
+
+    def hset(self, key: str, mapping: dict) -> None:
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.strings.pop(key, None)
+
+    def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.strings:
+            return False
+        self.strings[key] = value
+        return True
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(breaker_module, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker_settings(monkeypatch):
+    monkeypatch.setattr(settings, "provider_circuit_store", "memory")
+    monkeypatch.setattr(settings, "provider_circuit_min_calls", 4)
+    monkeypatch.setattr(settings, "provider_circuit_failure_rate", 0.5)
+    monkeypatch.setattr(settings, "provider_circuit_open_seconds", 30.0)
+    monkeypatch.setattr(settings, "provider_circuit_slow_call_seconds", 10.0)
+
+
+@pytest.fixture
+def providers(monkeypatch, clock):
+    primary = _FlakyProvider(name="openai", clock=clock)
+    fallback = _FlakyProvider(name="openai_stub", clock=clock)
+    monkeypatch.setattr(registry, "text_providers", {"openai": primary, "openai_stub": fallback})
+    monkeypatch.setattr(settings, "text_provider_default", "openai")
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "openai_stub")
+    return primary, fallback
+
+
+async def _call() -> str:
+    return await generate_text(prompt="p", system=None, meta={})
+
+
+async def test_open_circuit_is_skipped_without_calling_provider(breaker_settings, providers, clock):
+    primary, fallback = providers
+    primary.failing = True
+
+    for _ in range(4):
+        assert await _call() == "openai_stub-ok"
+    assert primary.calls == 4
+    assert circuit_breaker.snapshot("openai")["state"] == OPEN
+
+    assert await _call() == "openai_stub-ok"
+    assert primary.calls == 4
+
+
+async def test_half_open_probe_closes_circuit_on_success(breaker_settings, providers, clock):
+    primary, _ = providers
+    primary.failing = True
+    for _ in range(4):
+        await _call()
+
+    clock.now += 31
+    assert circuit_breaker.snapshot("openai")["state"] == HALF_OPEN
+    primary.failing = False
+
+    assert await _call() == "openai-ok"
+    snapshot = circuit_breaker.snapshot("openai")
+    assert snapshot["state"] == CLOSED
+    assert snapshot["calls"] == 0
+
+
+async def test_failed_probe_reopens_circuit(breaker_settings, providers, clock):
+    primary, _ = providers
+    primary.failing = True
+    for _ in range(4):
+        await _call()
+
+    clock.now += 31
+    assert await _call() == "openai_stub-ok"
+    assert primary.calls == 5
+    assert circuit_breaker.snapshot("openai")["state"] == OPEN
+
+    clock.now += 10
+    await _call()
+    assert primary.calls == 5
+
+
+async def test_only_one_half_open_probe_at_a_time(breaker_settings, clock):
+    for _ in range(4):
+        circuit_breaker.record(circuit_breaker.acquire("openai"), ok=False)
+    clock.now += 31
+
+    probe = circuit_breaker.acquire("openai")
+    assert probe is not None and probe.probe
+    assert circuit_breaker.acquire("openai") is None
+
+    circuit_breaker.release(probe)
+    assert circuit_breaker.acquire("openai") is not None
+
+
+async def test_slow_calls_open_the_circuit(breaker_settings, providers, clock):
+    primary, _ = providers
+    primary.latency = 12.0
+
+    for _ in range(4):
+        assert await _call() == "openai-ok"
+
+    assert circuit_breaker.snapshot("openai")["slow_rate"] == 1.0
+    assert circuit_breaker.snapshot("openai")["state"] == OPEN
+
+
+async def test_failures_below_threshold_keep_circuit_closed(breaker_settings, providers, clock):
+    primary, _ = providers
+    for failing in (True, False, False, False, True, False):
+        primary.failing = failing
+        await _call()
+
+    snapshot = circuit_breaker.snapshot("openai")
+    assert snapshot["state"] == CLOSED
+    assert snapshot["failure_rate"] == pytest.approx(2 / 6, abs=1e-3)
+
+
+async def test_failures_age_out_of_the_window(breaker_settings, providers, clock):
+    primary, _ = providers
+    primary.failing = True
+    for _ in range(3):
+        await _call()
+
+    clock.now += settings.provider_circuit_window_seconds + 1
+    await _call()
+
+    assert circuit_breaker.snapshot("openai")["state"] == CLOSED
+
+
+async def test_redis_store_shares_state_between_breakers(breaker_settings, clock, monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(breaker_module, "get_redis", lambda: redis)
+    monkeypatch.setattr(settings, "provider_circuit_store", "redis")
+    other_process = breaker_module.CircuitBreaker()
+
+    for _ in range(4):
+        circuit_breaker.record(circuit_breaker.acquire("openai"), ok=False)
+
+    assert other_process.acquire("openai") is None
+    assert other_process.snapshot("openai")["state"] == OPEN
+
+
+async def test_redis_outage_falls_back_to_local_state(breaker_settings, clock, monkeypatch):
+    def _down():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(breaker_module, "get_redis", _down)
+    monkeypatch.setattr(settings, "provider_circuit_store", "redis")
+
+    for _ in range(4):
+        circuit_breaker.record(circuit_breaker.acquire("openai"), ok=False)
+
+    assert circuit_breaker.acquire("openai") is None
+
+
+def test_provider_listing_includes_circuit_state(actor, breaker_settings, clock, monkeypatch):
+    monkeypatch.setattr(registry, "text_providers", {"openai": _FlakyProvider(name="openai")})
+    for _ in range(4):
+        circuit_breaker.record(circuit_breaker.acquire("openai"), ok=False)
+
+    (row,) = list_text_providers(actor=actor)
+
+    assert row.circuit.state == OPEN
+    assert row.circuit.calls == 4
+    assert row.circuit.failure_rate == 1.0
+    assert row.circuit.open_until == clock.now + 30.0
+
+
+async def test_slow_redis_does_not_block_the_event_loop(monkeypatch):
+    def _slow_redis():
+        time.sleep(0.2)
+        raise TimeoutError("redis timed out")
+
+    monkeypatch.setattr(breaker_module, "get_redis", _slow_redis)
+    monkeypatch.setattr(settings, "provider_circuit_store", "redis")
+    monkeypatch.setattr(registry, "text_providers", {"openai": _FlakyProvider(name="openai")})
+    monkeypatch.setattr(settings, "text_provider_default", "openai")
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "")
+    ticks = 0
+
+    async def _ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.ensure_future(_ticker())
+    try:
+        assert await _call() == "openai-ok"
+    finally:
+        ticker.cancel()
+    assert ticks >= 5
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlmodel import Session
+
+from trendr_api.auth import AuthContext
+from trendr_api.cache import TTLCache
+from trendr_api.cache import invalidation
+from trendr_api.services import credential_cache as credential_cache_module
+from trendr_api.services.credential_cache import credential_cache, get_cached_workspace_api_key
+from trendr_api.services.provider_settings import (
+    delete_workspace_provider_api_key,
+    upsert_workspace_provider_api_key,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.published: list[tuple[str, dict]] = []
+
+    def publish(self, channel: str, message: str) -> int:
+        self.published.append((channel, json.loads(message)))
+        return 1
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = _FakeRedis()
+    monkeypatch.setattr(invalidation, "get_redis", lambda: client)
+    return client
+
+
+@pytest.fixture
+def _clean_credential_cache():
+    credential_cache.clear()
+    yield
+    credential_cache.clear()
+
+
+def test_ttl_cache_expires_entries_and_counts_lookups():
+    clock = _FakeClock()
+    cache: TTLCache[str, str | None] = TTLCache(name="test", maxsize=10, ttl_seconds=5, clock=clock)
+    loads: list[str] = []
+
+    def _loader() -> None:
+        loads.append("x")
+        return None
+
+    assert cache.get_or_load("a", _loader) is None
+    assert cache.get_or_load("a", _loader) is None
+    clock.now = 6
+    assert cache.get_or_load("a", _loader) is None
+
+    assert len(loads) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(name="test", maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.parametrize(
+    "invalidate",
+    [
+        lambda cache: cache.invalidate("a"),
+        lambda cache: cache.invalidate_where(lambda key, value: key == "a"),
+        lambda cache: cache.clear(),
+    ],
+)
+def test_ttl_cache_skips_loads_that_overlap_an_invalidation(invalidate):
+    cache: TTLCache[str, str] = TTLCache(name="test", maxsize=10, ttl_seconds=60)
+
+    def _stale_loader() -> str:
+        # The row changes (and is invalidated) while this load is in flight.
+        invalidate(cache)
+        return "stale"
+
+    assert cache.get_or_load("a", _stale_loader) == "stale"
+    assert cache.get("a") is None
+    assert cache.get_or_load("a", lambda: "fresh") == "fresh"
+    assert cache.get("a") == "fresh"
+
+
+def test_ttl_cache_disabled_with_zero_ttl():
+    cache: TTLCache[str, int] = TTLCache(name="test", maxsize=2, ttl_seconds=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_cached_workspace_api_key_skips_db_after_first_lookup(
+    sqlite_engine,
+    db_session: Session,
+    actor: AuthContext,
+    monkeypatch,
+    fake_redis,
+    _clean_credential_cache,
+):
+    monkeypatch.setattr(credential_cache_module, "engine", sqlite_engine)
+    upsert_workspace_provider_api_key(
+        session=db_session,
+        workspace_id=actor.workspace_id,
+        provider="openai",
+        api_key="sk-cached-123456789",
+    )
+
+    calls = 0
+    original_loader = credential_cache_module.get_workspace_provider_api_key
+
+    def _counting_loader(**kwargs):
+        nonlocal calls
+        calls += 1
+        return original_loader(**kwargs)
+
+    monkeypatch.setattr(credential_cache_module, "get_workspace_provider_api_key", _counting_loader)
+
+    first = get_cached_workspace_api_key(workspace_id=actor.workspace_id, provider="openai")
+    second = get_cached_workspace_api_key(workspace_id=actor.workspace_id, provider="openai")
+
+    assert first == second == "sk-cached-123456789"
+    assert calls == 1
+
+
+def test_credential_changes_invalidate_and_publish(
+    sqlite_engine,
+    db_session: Session,
+    actor: AuthContext,
+    monkeypatch,
+    fake_redis,
+    _clean_credential_cache,
+):
+    monkeypatch.setattr(credential_cache_module, "engine", sqlite_engine)
+    assert get_cached_workspace_api_key(workspace_id=actor.workspace_id, provider="openai") is None
+
+    upsert_workspace_provider_api_key(
+        session=db_session,
+        workspace_id=actor.workspace_id,
+        provider="openai",
+        api_key="sk-new-key-123456789",
+    )
+    assert (
+        get_cached_workspace_api_key(workspace_id=actor.workspace_id, provider="openai")
+        == "sk-new-key-123456789"
+    )
+
+    delete_workspace_provider_api_key(
+        session=db_session,
+        workspace_id=actor.workspace_id,
+        provider="openai",
+    )
+    assert get_cached_workspace_api_key(workspace_id=actor.workspace_id, provider="openai") is None
+
+    assert [message["payload"] for _, message in fake_redis.published] == [
+        {"workspace_id": actor.workspace_id, "provider": "openai"},
+        {"workspace_id": actor.workspace_id, "provider": "openai"},
+    ]
+
+
+def test_remote_invalidation_message_drops_cached_key(_clean_credential_cache):
+    credential_cache.set((7, "openai"), "stale-key")
+    credential_cache.set((8, "openai"), "other-key")
+
+    invalidation._handle_message(
+        json.dumps(
+            {
+                "origin": "another-process",
+                "namespace": "provider_credentials",
+                "payload": {"workspace_id": 7, "provider": "openai"},
+            }
+        )
+    )
+
+    assert credential_cache.get((7, "openai")) is None
+    assert credential_cache.get((8, "openai")) == "other-key"
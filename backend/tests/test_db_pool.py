@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+from sqlmodel import create_engine
+
+from trendr_api.config import settings
+from trendr_api.db import (
+    InstrumentedQueuePool,
+    engine_options,
+    pool_options,
+    reset_engine_after_fork,
+)
+from trendr_api.observability import metrics
+
+PG_URL = "postgresql+psycopg://u:p@db:5432/trendr"
+
+
+def test_pool_options_apply_role_overrides(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 8)
+    monkeypatch.setattr(settings, "db_pool_roles", {"worker": {"pool_size": 2}})
+
+    assert pool_options("api")["pool_size"] == 8
+    worker = pool_options("worker")
+    assert worker["pool_size"] == 2
+    assert worker["max_overflow"] == settings.db_max_overflow
+
+    monkeypatch.setattr(settings, "process_role", "worker")
+    assert pool_options()["pool_size"] == 2
+
+
+def test_engine_options_for_postgres_and_pgbouncer(monkeypatch):
+    monkeypatch.setattr(settings, "db_pgbouncer_mode", False)
+    monkeypatch.setattr(settings, "db_pool_roles", {"beat": {"pool_size": 1, "max_overflow": 0}})
+    options = engine_options(PG_URL, role="beat")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (1, 0)
+    assert options["pool_recycle"] == settings.db_pool_recycle_seconds
+
+    monkeypatch.setattr(settings, "db_pgbouncer_mode", True)
+    options = engine_options(PG_URL, role="api")
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"] == {"prepare_threshold": None}
+    assert "pool_size" not in options
+
+
+def test_engine_options_leave_sqlite_pooling_alone():
+    assert engine_options("sqlite:///./ci.db") == {"pool_pre_ping": True}
+
+
+def test_instrumented_pool_exports_wait_overflow_and_timeouts(monkeypatch):
+    monkeypatch.setattr(settings, "process_role", "test-pool")
+    labels = {"role": "test-pool", "engine": "sync"}
+    pool = InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:"),
+        pool_size=1,
+        max_overflow=1,
+        timeout=0.05,
+    )
+
+    first = pool.connect()
+    second = pool.connect()  # beyond pool_size: an overflow connection
+    assert metrics.counter_value("db_pool_overflow_total", **labels) == 1
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    assert metrics.counter_value("db_pool_checkout_timeouts_total", **labels) == 1
+
+    summaries = {
+        s["name"]: s for s in metrics.snapshot()["summaries"] if s["labels"] == labels
+    }
+    assert summaries["db_pool_checkout_wait_seconds"]["count"] == 3
+    assert summaries["db_pool_checkout_wait_seconds"]["max"] >= 0.05
+
+    first.close()
+    second.close()
+    pool.dispose()
+
+
+def test_reset_engine_after_fork_replaces_pool(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fork.db'}")
+    with engine.connect():
+        pass
+    inherited = engine.pool
+
+    reset_engine_after_fork(engine)
+
+    assert engine.pool is not inherited
+    assert engine.pool.checkedin() == 0
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import httpx
+import pytest
+from sqlmodel import Session, select
+
+from trendr_api.auth import resolve_auth_context
+from trendr_api.config import settings
+from trendr_api.models import Artifact, Job, Project
+from trendr_api.plugins.providers import openai_text
+from trendr_api.plugins.providers.openai_text import OpenAITextProvider
+from trendr_api.plugins.providers.openai_text_stub import OpenAITextStub
+from trendr_api.plugins.registry import registry
+from trendr_api.plugins.types import BatchRequest
+from trendr_api.worker import tasks
+
+
+class _FakeBatchServer:
+    """In-memory stand-in for the OpenAI Files and Batch endpoints."""
+
+    def __init__(self, *, polls_until_done: int = 1, failing: tuple[str, ...] = ()) -> None:
+        self.polls_until_done = polls_until_done
+        self.failing = failing
+        self.files: dict[str, str] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+
+    def _add_file(self, content: str) -> str:
+        file_id = f"file-{len(self.files) + 1}"
+        self.files[file_id] = content
+        return file_id
+
+    def _complete(self, batch: dict[str, Any]) -> None:
+        output_lines, error_lines = [], []
+        for line in self.files[batch["input_file_id"]].splitlines():
+            request = json.loads(line)
+            custom_id = request["custom_id"]
+            output_kind = custom_id.rsplit("-", 1)[-1]
+            if output_kind in self.failing:
+                error_lines.append(
+                    {"custom_id": custom_id, "response": {"status_code": 400, "body": {"error": "bad"}}, "error": None}
+                )
+                continue
+            body = {"choices": [{"message": {"role": "assistant", "content": f"batch {output_kind} draft"}}]}
+            output_lines.append({"custom_id": custom_id, "response": {"status_code": 200, "body": body}, "error": None})
+        batch["status"] = "completed"
+        batch["output_file_id"] = self._add_file("\n".join(json.dumps(row) for row in output_lines))
+        if error_lines:
+            batch["error_file_id"] = self._add_file("\n".join(json.dumps(row) for row in error_lines))
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        path = request.url.path.removeprefix("/v1")
+        if request.method == "POST" and path == "/files":
+            lines = [line for line in request.content.decode().splitlines() if line.startswith('{"custom_id"')]
+            return httpx.Response(200, json={"id": self._add_file("\n".join(lines)), "purpose": "batch"})
+        if request.method == "POST" and path == "/batches":
+            body = json.loads(request.content)
+            batch = {"id": f"batch-{len(self.batches) + 1}", "status": "validating", "polls": 0, **body}
+            self.batches[batch["id"]] = batch
+            return httpx.Response(200, json=batch)
+        if request.method == "GET" and path.startswith("/batches/"):
+            batch = self.batches[path.split("/")[-1]]
+            batch["polls"] += 1
+            if batch["status"] != "completed":
+                batch["status"] = "in_progress"
+                if batch["polls"] > self.polls_until_done:
+                    self._complete(batch)
+            return httpx.Response(200, json=batch)
+        if request.method == "GET" and path.startswith("/files/") and path.endswith("/content"):
+            return httpx.Response(200, text=self.files[path.split("/")[2]])
+        return httpx.Response(404, json={"error": {"message": f"no route {request.method} {path}"}})
+
+
+@pytest.fixture
+def batch_server(monkeypatch):
+    server = _FakeBatchServer()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+    monkeypatch.setattr(openai_text, "get_http_client", lambda url: client)
+    monkeypatch.setattr(openai_text, "get_cached_workspace_api_key", lambda **_: None)
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(registry, "text_providers", {"openai": OpenAITextProvider(), "openai_stub": OpenAITextStub()})
+    return server
+
+
+def _seed_batch_job(session: Session, *, outputs: list[str]) -> Job:
+    actor = resolve_auth_context(session=session, user_external_id="batch-user", workspace_slug="batch-space")
+    project = Project(workspace_id=actor.workspace_id, name="P", source_type="youtube", source_ref="x")
+    session.add(project)
+    session.flush()
+    session.add(
+        Artifact(
+            workspace_id=actor.workspace_id,
+            project_id=project.id,
+            kind="transcript",
+            title="Transcript",
+            content="we shipped the new editor today",
+        )
+    )
+    job = Job(
+        kind="generate",
+        status="queued",
+        workspace_id=actor.workspace_id,
+        project_id=project.id,
+        input={"project_id": project.id, "outputs": outputs, "tone": "casual", "execution": "batch"},
+        output={},
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+async def test_openai_batch_round_trip(batch_server):
+    provider = OpenAITextProvider()
+    requests = [
+        BatchRequest(custom_id="generate-1-tweet", prompt="Write a tweet", meta={"max_output_tokens": 200}),
+        BatchRequest(custom_id="generate-1-blog", prompt="Write a blog"),
+    ]
+
+    batch_id = await provider.submit_batch(requests)
+    (submitted,) = batch_server.batches.values()
+    lines = [json.loads(line) for line in batch_server.files[submitted["input_file_id"]].splitlines()]
+    assert submitted["endpoint"] == "/v1/chat/completions"
+    assert submitted["completion_window"] == "24h"
+    assert [line["custom_id"] for line in lines] == ["generate-1-tweet", "generate-1-blog"]
+    assert lines[0]["body"]["messages"] == [{"role": "user", "content": "Write a tweet"}]
+    assert lines[0]["body"]["max_tokens"] == 200
+
+    assert not (await provider.get_batch(batch_id)).done
+    status = await provider.get_batch(batch_id)
+    assert status.status == "completed"
+
+    results = await provider.batch_results(status)
+    assert results["generate-1-tweet"].text == "batch tweet draft"
+    assert results["generate-1-blog"].text == "batch blog draft"
+
+
+def test_batch_generate_job_fans_results_into_artifacts(sqlite_engine, batch_server, monkeypatch):
+    async def _no_interactive_calls(**_: object):
+        raise AssertionError("batch jobs must not call providers interactively")
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "generate_text_output", _no_interactive_calls)
+
+    with Session(sqlite_engine) as session:
+        job = _seed_batch_job(session, outputs=["tweet", "blog"])
+
+    assert tasks.generate_posts.run(job_id=job.id) == {"ok": True, "batch_id": "batch-1"}
+
+    with Session(sqlite_engine) as session:
+        submitted = session.get(Job, job.id)
+        assert submitted.status == "running"
+        assert submitted.output["batch"]["requests"] == {
+            f"generate-{job.id}-tweet": "tweet",
+            f"generate-{job.id}-blog": "blog",
+        }
+
+    assert tasks.poll_generate_batches.run()["finished"] == 0
+    with Session(sqlite_engine) as session:
+        assert session.get(Job, job.id).output["batch"]["status"] == "in_progress"
+
+    assert tasks.poll_generate_batches.run()["finished"] == 1
+    with Session(sqlite_engine) as session:
+        done = session.get(Job, job.id)
+        assert done.status == "succeeded"
+        assert done.output["batch"]["status"] == "completed"
+        artifacts = session.exec(
+            select(Artifact).where(Artifact.id.in_(done.output["artifact_ids"])).order_by(Artifact.id)
+        ).all()
+        assert [(a.kind, a.content, a.meta["tone"]) for a in artifacts] == [
+            ("tweet", "batch tweet draft", "casual"),
+            ("blog", "batch blog draft", "casual"),
+        ]
+
+    # Finished jobs are not collected twice.
+    assert tasks.poll_generate_batches.run()["finished"] == 0
+
+
+def test_batch_with_failed_request_fails_job_without_partial_drafts(sqlite_engine, batch_server, monkeypatch):
+    batch_server.polls_until_done = 0
+    batch_server.failing = ("blog",)
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+
+    with Session(sqlite_engine) as session:
+        job = _seed_batch_job(session, outputs=["tweet", "blog"])
+    tasks.generate_posts.run(job_id=job.id)
+
+    assert tasks.poll_generate_batches.run()["finished"] == 1
+    with Session(sqlite_engine) as session:
+        failed = session.get(Job, job.id)
+        assert failed.status == "failed"
+        assert "blog: OpenAI API 400" in failed.error
+        assert session.exec(select(Artifact).where(Artifact.kind.in_(["tweet", "blog"]))).all() == []
+
+
+def test_batch_execution_requires_a_batch_capable_provider(sqlite_engine, batch_server, monkeypatch):
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(settings, "generate_batch_provider", "openai_stub")
+
+    with Session(sqlite_engine) as session:
+        job = _seed_batch_job(session, outputs=["tweet"])
+
+    assert tasks.generate_posts.run(job_id=job.id)["ok"] is False
+    with Session(sqlite_engine) as session:
+        failed = session.get(Job, job.id)
+        assert failed.status == "failed"
+        assert "does not support batch execution" in failed.error
+    assert batch_server.batches == {}
+
+
+def test_poll_only_checks_batch_jobs_and_respects_concurrent_changes(sqlite_engine, batch_server, monkeypatch):
+    batch_server.polls_until_done = 0
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+
+    with Session(sqlite_engine) as session:
+        job = _seed_batch_job(session, outputs=["tweet"])
+        job_id = job.id
+        session.add(
+            Job(
+                kind="generate",
+                status="running",
+                workspace_id=job.workspace_id,
+                project_id=job.project_id,
+                input={"project_id": job.project_id, "outputs": ["tweet"]},
+                output={},
+            )
+        )
+        session.commit()
+    tasks.generate_posts.run(job_id=job_id)
+
+    # The job is cancelled while the provider is being asked about its batch.
+    original_handler = batch_server.handler
+
+    def _cancel_during_poll(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET" and request.url.path.startswith("/v1/batches/"):
+            with Session(sqlite_engine) as session:
+                cancelled = session.get(Job, job_id)
+                cancelled.status = "failed"
+                cancelled.error = "cancelled"
+                session.add(cancelled)
+                session.commit()
+        return original_handler(request)
+
+    batch_server.handler = _cancel_during_poll
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: batch_server.handler(request)))
+    monkeypatch.setattr(openai_text, "get_http_client", lambda url: client)
+
+    assert tasks.poll_generate_batches.run() == {"ok": True, "checked": 1, "finished": 0}
+    with Session(sqlite_engine) as session:
+        assert session.get(Job, job_id).error == "cancelled"
+        assert session.exec(select(Artifact).where(Artifact.kind == "tweet")).all() == []
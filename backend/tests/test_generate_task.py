@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlmodel import Session, select
+
+from trendr_api.auth import resolve_auth_context
+from trendr_api.config import settings
+from trendr_api.models import Artifact, Job, Project, TranscriptSegment
+from trendr_api.worker import tasks
+
+
+def _seed_generate_job(session: Session, *, outputs: list[str]) -> Job:
+    actor = resolve_auth_context(
+        session=session,
+        user_external_id="generate-user",
+        workspace_slug="generate-space",
+    )
+    project = Project(
+        workspace_id=actor.workspace_id,
+        name="P1",
+        source_type="youtube",
+        source_ref="https://youtu.be/dQw4w9WgXcQ",
+    )
+    session.add(project)
+    session.commit()
+    session.refresh(project)
+
+    transcript = Artifact(
+        workspace_id=actor.workspace_id,
+        project_id=project.id,
+        kind="transcript",
+        title="Transcript",
+        content="hello world transcript",
+        meta={"segment_count": 1},
+    )
+    session.add(transcript)
+    session.flush()
+    session.add(
+        TranscriptSegment(
+            artifact_id=transcript.id,
+            position=0,
+            start_seconds=0.0,
+            end_seconds=1.0,
+            text="hello world",
+        )
+    )
+    job = Job(
+        kind="generate",
+        status="queued",
+        workspace_id=actor.workspace_id,
+        project_id=project.id,
+        input={"project_id": project.id, "outputs": outputs, "tone": "professional"},
+        output={},
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def test_generate_posts_fans_out_outputs_with_bounded_concurrency(sqlite_engine, monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def _fake_generate_text_output(*, output_kind: str, **_: object):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return f"generated {output_kind}"
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "generate_text_output", _fake_generate_text_output)
+    monkeypatch.setattr(settings, "generate_concurrency_per_workspace", 2)
+
+    with Session(sqlite_engine) as session:
+        job = _seed_generate_job(session, outputs=["tweet", "linkedin", "blog"])
+
+        result = tasks.generate_posts.run(job.id)
+
+        assert result == {"ok": True}
+        assert peak == 2
+
+        session.expire_all()
+        refreshed = session.exec(select(Job).where(Job.id == job.id)).first()
+        assert refreshed is not None
+        assert refreshed.status == "succeeded"
+
+        artifacts = session.exec(
+            select(Artifact)
+            .where(Artifact.id.in_(refreshed.output["artifact_ids"]))
+            .order_by(Artifact.id)
+        ).all()
+        assert [a.kind for a in artifacts] == ["tweet", "linkedin", "blog"]
+        assert [a.content for a in artifacts] == [
+            "generated tweet",
+            "generated linkedin",
+            "generated blog",
+        ]
+
+
+def test_generate_posts_fails_job_without_partial_artifacts(sqlite_engine, monkeypatch):
+    async def _fake_generate_text_output(*, output_kind: str, **_: object):
+        if output_kind == "linkedin":
+            raise RuntimeError("provider down")
+        await asyncio.sleep(0.01)
+        return f"generated {output_kind}"
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "generate_text_output", _fake_generate_text_output)
+
+    with Session(sqlite_engine) as session:
+        job = _seed_generate_job(session, outputs=["tweet", "linkedin"])
+
+        result = tasks.generate_posts.run(job.id)
+
+        assert result["ok"] is False
+        session.expire_all()
+        refreshed = session.exec(select(Job).where(Job.id == job.id)).first()
+        assert refreshed is not None
+        assert refreshed.status == "failed"
+        assert "provider down" in (refreshed.error or "")
+
+        drafts = session.exec(
+            select(Artifact).where(Artifact.kind.in_(["tweet", "linkedin"]))
+        ).all()
+        assert drafts == []
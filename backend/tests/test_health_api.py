@@ -39,3 +39,13 @@ def test_health_returns_503_when_redis_check_fails(sqlite_engine, monkeypatch):
     assert payload["status"] == "degraded"
     assert payload["checks"]["db"]["status"] == "ok"
     assert payload["checks"]["redis"]["status"] == "error"
+
+
+def test_metrics_snapshot_exports_recorded_counters():
+    health_api.metrics.inc("test_metric_total", provider="openai")
+
+    payload = health_api.metrics_snapshot()
+
+    row = next(item for item in payload["counters"] if item["name"] == "test_metric_total")
+    assert row["labels"] == {"provider": "openai"}
+    assert row["value"] >= 1
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+from dataclasses import dataclass
+
+import pytest
+
+from trendr_api.config import settings
+from trendr_api.observability import metrics
+from trendr_api.plugins.providers.openai_text_stub import OpenAITextStub
+from trendr_api.plugins.registry import registry
+from trendr_api.plugins.router import generate_text
+from trendr_api.plugins.types import ProviderCapabilities
+from trendr_api.resilience import hedge_delay, latency_tracker
+
+hedging_module = importlib.import_module("trendr_api.resilience.hedging")
+
+
+@dataclass
+class _TimedProvider:
+    name: str
+    delay: float = 0.0
+    fail: bool = False
+    available: bool = True
+    calls: int = 0
+    cancelled: int = 0
+    capabilities: ProviderCapabilities = ProviderCapabilities()
+
+    def is_available(self, *, meta: dict | None = None) -> bool:
+        return self.available
+
+    async def generate(self, *, prompt: str, system: str | None = None, meta: dict | None = None) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return f"{self.name}-ok"
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    def _no_redis():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(hedging_module, "get_redis", _no_redis)
+    monkeypatch.setattr(settings, "provider_circuit_store", "memory")
+    monkeypatch.setattr(settings, "text_hedge_default_delay_seconds", 0.05)
+    monkeypatch.setattr(settings, "text_hedge_budget_per_hour", 10)
+
+    primary = _TimedProvider(name="openai")
+    fallback = _TimedProvider(name="secondary")
+    monkeypatch.setattr(registry, "text_providers", {"openai": primary, "secondary": fallback})
+    monkeypatch.setattr(settings, "text_provider_default", "openai")
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "secondary")
+    return primary, fallback
+
+
+async def _call(**meta) -> str:
+    return await generate_text(prompt="p", system=None, meta={"workspace_id": 1, "hedge": True, **meta})
+
+
+async def test_slow_primary_is_hedged_and_cancelled(providers):
+    primary, fallback = providers
+    primary.delay = 5.0
+    hedges_before = metrics.counter_value("provider_hedges_total", provider="secondary")
+
+    assert await asyncio.wait_for(_call(), timeout=1.0) == "secondary-ok"
+
+    assert primary.calls == fallback.calls == 1
+    assert primary.cancelled == 1
+    assert metrics.counter_value("provider_hedges_total", provider="secondary") == hedges_before + 1
+
+
+async def test_primary_answering_in_time_is_not_hedged(providers):
+    primary, fallback = providers
+
+    assert await _call() == "openai-ok"
+    assert fallback.calls == 0
+
+
+async def test_primary_can_still_win_after_hedge(providers):
+    primary, fallback = providers
+    primary.delay = 0.1
+    fallback.delay = 5.0
+
+    assert await asyncio.wait_for(_call(), timeout=1.0) == "openai-ok"
+    assert fallback.calls == 1
+    assert fallback.cancelled == 1
+
+
+async def test_hedge_answers_when_primary_fails_after_hedging(providers):
+    primary, fallback = providers
+    primary.delay = 0.1
+    primary.fail = True
+    fallback.delay = 0.2
+
+    assert await _call() == "secondary-ok"
+    assert primary.calls == fallback.calls == 1
+
+
+async def test_hedging_is_opt_in(providers):
+    primary, fallback = providers
+    primary.delay = 0.2
+
+    assert await generate_text(prompt="p", system=None, meta={"workspace_id": 1}) == "openai-ok"
+    assert fallback.calls == 0
+
+
+async def test_exhausted_budget_waits_for_primary(providers, monkeypatch):
+    primary, fallback = providers
+    primary.delay = 0.1
+    monkeypatch.setattr(settings, "text_hedge_budget_per_hour", 2)
+
+    for _ in range(2):
+        await _call()
+    assert fallback.calls == 2
+
+    fallback.delay = 0.5
+    assert await _call() == "openai-ok"
+    assert fallback.calls == 2
+
+    # Budgets are per workspace.
+    await _call(workspace_id=2)
+    assert fallback.calls == 3
+
+
+async def test_default_chain_never_hedges_against_the_stub(providers, monkeypatch):
+    primary, _ = providers
+    primary.delay = 0.2
+    stub = OpenAITextStub()
+    monkeypatch.setattr(registry, "text_providers", {"openai": primary, "openai_stub": stub})
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "openai_stub")
+    hedges_before = metrics.counter_value("provider_hedges_total", provider="openai_stub")
+
+    assert await _call() == "openai-ok"
+    assert metrics.counter_value("provider_hedges_total", provider="openai_stub") == hedges_before
+
+    # The stub is still the fallback when the real provider fails.
+    primary.fail = True
+    assert await _call() != "openai-ok"
+
+
+async def test_hedges_without_a_target_are_refunded(providers, monkeypatch):
+    primary, fallback = providers
+    primary.delay = 0.1
+    fallback.available = False
+    monkeypatch.setattr(registry, "text_providers", {**registry.text_providers, "openai_stub": OpenAITextStub()})
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "secondary,openai_stub")
+    monkeypatch.setattr(settings, "text_hedge_budget_per_hour", 1)
+
+    for _ in range(3):
+        assert await _call() == "openai-ok"
+    assert fallback.calls == 0
+
+    # The budget is still unspent once the target is back.
+    fallback.available = True
+    fallback.delay = 0.5
+    await _call()
+    assert fallback.calls == 1
+
+
+async def test_hedge_budget_backs_off_from_redis(monkeypatch):
+    calls = 0
+
+    def _down():
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(hedging_module, "get_redis", _down)
+    monkeypatch.setattr(settings, "text_hedge_budget_per_hour", 10)
+
+    assert hedging_module.hedge_budget.try_spend(1)
+    assert hedging_module.hedge_budget.try_spend(1)
+    assert calls == 1
+
+
+def test_hedge_delay_follows_observed_percentile(monkeypatch):
+    monkeypatch.setattr(settings, "text_hedge_percentile", 0.9)
+    monkeypatch.setattr(settings, "text_hedge_default_delay_seconds", 7.0)
+
+    for seconds in range(1, 11):
+        latency_tracker.observe("openai", float(seconds))
+    assert hedge_delay("openai") == 7.0
+
+    for seconds in range(11, 21):
+        latency_tracker.observe("openai", float(seconds))
+    assert hedge_delay("openai") == 18.0
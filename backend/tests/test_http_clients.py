@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from trendr_api.services.http_clients import HttpClientManager
+
+
+@pytest.mark.asyncio
+async def test_http_client_manager_reuses_client_per_host():
+    manager = HttpClientManager()
+    try:
+        first = manager.get("https://api.openai.com/v1/chat/completions")
+        second = manager.get("https://api.openai.com/v1/images/generations")
+        other = manager.get("https://www.youtube.com/oembed")
+
+        assert first is second
+        assert first is not other
+    finally:
+        await manager.aclose()
+
+    assert first.is_closed
+    assert other.is_closed
+
+
+@pytest.mark.asyncio
+async def test_http_client_manager_replaces_closed_client():
+    manager = HttpClientManager()
+    try:
+        first = manager.get("https://api.openai.com/v1/chat/completions")
+        await first.aclose()
+        replacement = manager.get("https://api.openai.com/v1/chat/completions")
+        assert replacement is not first
+        assert not replacement.is_closed
+    finally:
+        await manager.aclose()
+
+
+def test_http_client_manager_keeps_clients_per_event_loop():
+    manager = HttpClientManager()
+
+    async def _get():
+        return manager.get("https://api.openai.com/v1/chat/completions")
+
+    loop_a = asyncio.new_event_loop()
+    loop_b = asyncio.new_event_loop()
+    try:
+        client_a = loop_a.run_until_complete(_get())
+        client_b = loop_b.run_until_complete(_get())
+        assert client_a is not client_b
+
+        manager.close_all()
+        assert client_a.is_closed
+        assert client_b.is_closed
+    finally:
+        loop_a.close()
+        loop_b.close()
+
+
+def test_http_client_manager_rejects_relative_urls():
+    manager = HttpClientManager()
+
+    async def _get():
+        return manager.get("/v1/chat/completions")
+
+    with pytest.raises(ValueError, match="absolute URL"):
+        asyncio.run(_get())
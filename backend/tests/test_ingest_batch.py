@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, select
+
+from trendr_api.api.ingest import ingest_youtube_batch
+from trendr_api.auth import AuthContext
+from trendr_api.config import settings
+from trendr_api.models import Artifact, Event, Job, Project
+from trendr_api.schemas import IngestYouTubeBatchRequest
+from trendr_api.worker import tasks
+
+URLS = [
+    "https://youtu.be/aaaaaaaaaaa",
+    "https://youtu.be/bbbbbbbbbbb",
+    "https://youtu.be/ccccccccccc",
+]
+
+
+def _dispatch_recorder(calls: list):
+    def _dispatch(parent_job_id: int, child_job_ids: list[int]) -> str:
+        calls.append((parent_job_id, child_job_ids))
+        return "group-1"
+
+    return _dispatch
+
+
+def test_batch_ingest_bulk_creates_projects_and_jobs(
+    db_session: Session,
+    actor: AuthContext,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    calls: list = []
+    monkeypatch.setattr("trendr_api.api.ingest.tasks.dispatch_ingest_batch", _dispatch_recorder(calls))
+
+    parent = ingest_youtube_batch(
+        payload=IngestYouTubeBatchRequest(urls=URLS + [URLS[0]], project_name="Channel"),
+        session=db_session,
+        actor=actor,
+    )
+
+    assert parent.kind == "ingest_batch"
+    assert parent.task_id == "group-1"
+    assert parent.output["total"] == 3
+    assert parent.output["progress"] == 0.0
+    children = db_session.exec(select(Job).where(Job.kind == "ingest")).all()
+    assert [c.id for c in children] == parent.output["child_job_ids"]
+    assert {c.input["url"] for c in children} == set(URLS)
+    assert all(c.input["parent_job_id"] == parent.id for c in children)
+    projects = db_session.exec(select(Project)).all()
+    assert {p.name for p in projects} == {"Channel"}
+    assert calls == [(parent.id, parent.output["child_job_ids"])]
+
+
+def test_batch_ingest_rejects_oversized_batches(
+    db_session: Session,
+    actor: AuthContext,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "ingest_batch_max_urls", 2)
+    with pytest.raises(HTTPException) as exc_info:
+        ingest_youtube_batch(
+            payload=IngestYouTubeBatchRequest(urls=URLS),
+            session=db_session,
+            actor=actor,
+        )
+    assert exc_info.value.status_code == 400
+
+
+def test_ingest_chunks_fetch_concurrently_and_aggregate_progress(
+    sqlite_engine,
+    db_session: Session,
+    actor: AuthContext,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    calls: list = []
+    monkeypatch.setattr("trendr_api.api.ingest.tasks.dispatch_ingest_batch", _dispatch_recorder(calls))
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(settings, "ingest_batch_concurrency", 2)
+    in_flight = 0
+    peak = 0
+
+    async def _fake_metadata(url: str):
+        return {"url": url, "title": url[-3:]}
+
+    async def _fake_transcript(url: str):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if url.endswith("bbbbbbbbbbb"):
+            raise RuntimeError("captions disabled")
+        return {"text": "hello world", "segments": [{"start": 0.0, "end": 1.0, "text": "hello world"}]}
+
+    monkeypatch.setattr(tasks, "fetch_youtube_metadata", _fake_metadata)
+    monkeypatch.setattr(tasks, "fetch_youtube_transcript", _fake_transcript)
+
+    parent = ingest_youtube_batch(
+        payload=IngestYouTubeBatchRequest(urls=URLS),
+        session=db_session,
+        actor=actor,
+    )
+    child_ids = parent.output["child_job_ids"]
+
+    assert tasks.ingest_youtube_chunk.run(parent.id, child_ids)["succeeded"] == 2
+    assert peak == 2
+
+    db_session.expire_all()
+    refreshed = db_session.get(Job, parent.id)
+    assert refreshed.status == "succeeded"
+    assert (refreshed.output["succeeded"], refreshed.output["failed"]) == (2, 1)
+    assert refreshed.output["progress"] == 1.0
+
+    statuses = {job.input["url"]: job.status for job in db_session.exec(select(Job).where(Job.kind == "ingest"))}
+    assert statuses[URLS[1]] == "failed"
+    assert statuses[URLS[0]] == statuses[URLS[2]] == "succeeded"
+    assert len(db_session.exec(select(Artifact).where(Artifact.kind == "transcript")).all()) == 2
+    assert len(db_session.exec(select(Event).where(Event.kind == "job_completed")).all()) == 2
+
+
+def test_batch_progress_stays_running_until_all_chunks_report(
+    sqlite_engine,
+    db_session: Session,
+    actor: AuthContext,
+):
+    parent = Job(
+        kind="ingest_batch",
+        status="running",
+        workspace_id=actor.workspace_id,
+        input={},
+        output={"total": 4, "succeeded": 0, "failed": 0},
+    )
+    db_session.add(parent)
+    db_session.commit()
+
+    first = tasks._record_batch_progress(db_session, parent.id, succeeded=0, failed=2)
+    assert (first.status, first.output["progress"]) == ("running", 0.5)
+    second = tasks._record_batch_progress(db_session, parent.id, failed=2)
+    assert second.status == "failed"
+    assert second.error
+
+
+def test_dispatch_ingest_batch_splits_into_chunk_tasks(monkeypatch: pytest.MonkeyPatch):
+    captured: list = []
+
+    class _FakeGroup:
+        def __init__(self, signatures):
+            captured.extend(signatures)
+
+        def apply_async(self):
+            return type("GroupResult", (), {"id": "group-9"})()
+
+    monkeypatch.setattr(tasks, "group", _FakeGroup)
+    monkeypatch.setattr(settings, "ingest_batch_chunk_size", 2)
+
+    assert tasks.dispatch_ingest_batch(7, [1, 2, 3, 4, 5]) == "group-9"
+    assert [sig.args for sig in captured] == [(7, [1, 2]), (7, [3, 4]), (7, [5])]
+
+
+def test_chunk_failure_fails_children_and_reports_to_parent(
+    sqlite_engine,
+    db_session: Session,
+    actor: AuthContext,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    calls: list = []
+    monkeypatch.setattr("trendr_api.api.ingest.tasks.dispatch_ingest_batch", _dispatch_recorder(calls))
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+
+    def _lookup_down(session, video_ids):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(tasks, "lookup_transcripts", _lookup_down)
+
+    parent = ingest_youtube_batch(
+        payload=IngestYouTubeBatchRequest(urls=URLS),
+        session=db_session,
+        actor=actor,
+    )
+    child_ids = parent.output["child_job_ids"]
+
+    result = tasks.ingest_youtube_chunk.run(parent.id, child_ids)
+
+    assert result["ok"] is False
+    db_session.expire_all()
+    children = db_session.exec(select(Job).where(Job.kind == "ingest")).all()
+    assert {c.status for c in children} == {"failed"}
+    assert all("database went away" in (c.error or "") for c in children)
+    refreshed = db_session.get(Job, parent.id)
+    assert refreshed.status == "failed"
+    assert (refreshed.output["succeeded"], refreshed.output["failed"]) == (0, 3)
+
+
+def test_chunk_with_missing_jobs_still_reports_to_parent(
+    sqlite_engine,
+    db_session: Session,
+    actor: AuthContext,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    parent = Job(
+        kind="ingest_batch",
+        status="running",
+        workspace_id=actor.workspace_id,
+        input={},
+        output={"total": 2, "succeeded": 0, "failed": 0},
+    )
+    db_session.add(parent)
+    db_session.commit()
+    db_session.refresh(parent)
+
+    assert tasks.ingest_youtube_chunk.run(parent.id, [9001, 9002]) == {"error": "jobs not found"}
+
+    db_session.expire_all()
+    refreshed = db_session.get(Job, parent.id)
+    assert refreshed.status == "failed"
+    assert refreshed.output["failed"] == 2
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from trendr_api.api import job_events as job_events_api
+from trendr_api.auth import AuthContext
+from trendr_api.models import Job
+from trendr_api.services import job_events
+from trendr_api.services.job_events import JobEventBroker, job_event_payload, sse_stream
+from trendr_api.worker import tasks
+
+
+class _FakePubSub:
+    def __init__(self, messages: asyncio.Queue):
+        self.messages = messages
+        self.patterns: list[str] = []
+
+    async def psubscribe(self, pattern: str) -> None:
+        self.patterns.append(pattern)
+
+    async def get_message(self, ignore_subscribe_messages: bool = True, timeout: float = 1.0):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self) -> None:
+        return None
+
+
+class _FakeAsyncRedis:
+    def __init__(self):
+        self.messages: asyncio.Queue = asyncio.Queue()
+
+    def pubsub(self, ignore_subscribe_messages: bool = True) -> _FakePubSub:
+        return _FakePubSub(self.messages)
+
+    def publish(self, channel: str, data: str) -> None:
+        self.messages.put_nowait({"type": "pmessage", "channel": channel.encode(), "data": data})
+
+
+class _RecordingRedis:
+    def __init__(self):
+        self.published: list[tuple[str, dict]] = []
+
+    def publish(self, channel: str, data: str) -> None:
+        self.published.append((channel, json.loads(data)))
+
+
+def _job(session: Session, actor: AuthContext, status: str = "queued") -> Job:
+    job = Job(kind="generate", status=status, workspace_id=actor.workspace_id, input={}, output={})
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def _frames(chunks: list[str]) -> list[dict]:
+    return [json.loads(chunk.split("data: ", 1)[1]) for chunk in chunks if chunk.startswith("event:")]
+
+
+def test_update_job_publishes_status_to_workspace_channel(db_session: Session, actor: AuthContext, monkeypatch):
+    redis = _RecordingRedis()
+    monkeypatch.setattr(job_events, "get_redis", lambda: redis)
+    job = _job(db_session, actor)
+
+    tasks._update_job(db_session, job, status="running")
+
+    channel, event = redis.published[-1]
+    assert channel == f"trendr:job-events:ws:{actor.workspace_id}"
+    assert event["type"] == "job"
+    assert (event["job_id"], event["status"]) == (job.id, "running")
+
+
+async def test_job_stream_sends_snapshot_filters_and_ends_on_terminal_status(
+    db_session: Session, actor: AuthContext
+):
+    job = _job(db_session, actor, status="running")
+    other = _job(db_session, actor, status="running")
+    fake = _FakeAsyncRedis()
+    broker = JobEventBroker(redis_factory=lambda: fake)
+
+    async def snapshot():
+        return job_event_payload(job)
+
+    stream = sse_stream(workspace_id=actor.workspace_id, job_id=job.id, snapshot=snapshot, broker=broker)
+    chunks = [await stream.__anext__()]
+
+    channel = f"trendr:job-events:ws:{actor.workspace_id}"
+    fake.publish(channel, json.dumps({"type": "job", "job_id": other.id, "status": "succeeded"}))
+    fake.publish(channel, json.dumps({"type": "node", "job_id": job.id, "node_id": "n1", "status": "running"}))
+    fake.publish(channel, json.dumps({"type": "job", "job_id": job.id, "status": "succeeded"}))
+    chunks += [chunk async for chunk in stream]
+
+    events = _frames(chunks)
+    assert [e["type"] for e in events] == ["job", "node", "job"]
+    assert events[0]["status"] == "running"
+    assert events[-1]["status"] == "succeeded"
+    assert all(e["job_id"] == job.id for e in events)
+    assert broker.stream_count == 0
+    await broker.aclose()
+
+
+async def test_job_stream_closes_immediately_for_finished_job(db_session: Session, actor: AuthContext):
+    job = _job(db_session, actor, status="failed")
+    broker = JobEventBroker(redis_factory=_FakeAsyncRedis)
+
+    async def snapshot():
+        return job_event_payload(job)
+
+    chunks = [
+        chunk
+        async for chunk in sse_stream(
+            workspace_id=actor.workspace_id, job_id=job.id, snapshot=snapshot, broker=broker
+        )
+    ]
+    assert [e["status"] for e in _frames(chunks)] == ["failed"]
+    await broker.aclose()
+
+
+async def test_workspace_stream_sends_heartbeats_and_resync(actor: AuthContext):
+    broker = JobEventBroker(redis_factory=_FakeAsyncRedis)
+    stream = sse_stream(workspace_id=actor.workspace_id, broker=broker, heartbeat_seconds=0.05)
+
+    assert await stream.__anext__() == ": keep-alive\n\n"
+    broker._resync_all()
+    assert _frames([await stream.__anext__()]) == [{"type": "resync", "workspace_id": actor.workspace_id}]
+
+    await stream.aclose()
+    assert broker.stream_count == 0
+    await broker.aclose()
+
+
+async def test_job_events_endpoint_hides_other_workspace_jobs(
+    sqlite_engine, db_session: Session, actor: AuthContext, other_actor: AuthContext, monkeypatch
+):
+    monkeypatch.setattr(job_events_api, "engine", sqlite_engine)
+    job = _job(db_session, other_actor)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await job_events_api.stream_job_events(job_id=job.id, actor=actor)
+    assert exc_info.value.status_code == 404
+
+    response = await job_events_api.stream_job_events(job_id=job.id, actor=other_actor)
+    assert response.media_type == "text/event-stream"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from fastapi import Response
 from sqlmodel import Session
 
 from trendr_api.auth import AuthContext
@@ -29,22 +30,22 @@ def _seed_jobs(session: Session, actor: AuthContext, other_actor: AuthContext):
 
 def test_list_jobs_filters_by_project_id(db_session: Session, actor: AuthContext, other_actor: AuthContext):
     p1_id, _ = _seed_jobs(db_session, actor, other_actor)
-    items = list_jobs(project_id=p1_id, limit=20, session=db_session, actor=actor)
+    items = list_jobs(response=Response(), project_id=p1_id, limit=20, session=db_session, actor=actor)
     assert len(items) == 2
     assert all(item.project_id == p1_id for item in items)
 
 
 def test_list_jobs_applies_limit_bounds(db_session: Session, actor: AuthContext, other_actor: AuthContext):
     _seed_jobs(db_session, actor, other_actor)
-    assert len(list_jobs(limit=1, session=db_session, actor=actor)) == 1
+    assert len(list_jobs(response=Response(), limit=1, session=db_session, actor=actor)) == 1
     # Router clamps lower bound to 1.
-    assert len(list_jobs(limit=0, session=db_session, actor=actor)) == 1
+    assert len(list_jobs(response=Response(), limit=0, session=db_session, actor=actor)) == 1
 
 
 def test_list_jobs_scoped_to_workspace(db_session: Session, actor: AuthContext, other_actor: AuthContext):
     _seed_jobs(db_session, actor, other_actor)
-    actor_items = list_jobs(limit=20, session=db_session, actor=actor)
-    other_items = list_jobs(limit=20, session=db_session, actor=other_actor)
+    actor_items = list_jobs(response=Response(), limit=20, session=db_session, actor=actor)
+    other_items = list_jobs(response=Response(), limit=20, session=db_session, actor=other_actor)
     assert len(actor_items) == 2
     assert len(other_items) == 1
     assert all(item.workspace_id == actor.workspace_id for item in actor_items)
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlmodel import Session, select
+
+from trendr_api.auth import resolve_auth_context
+from trendr_api.config import settings
+from trendr_api.models import Artifact, Job, Project, TranscriptSegment
+from trendr_api.observability import metrics
+from trendr_api.plugins.providers.openai_text import OpenAITextProvider
+from trendr_api.plugins.registry import registry
+from trendr_api.services import generate, map_reduce
+from trendr_api.services.map_reduce import needs_map_reduce, split_chunks, summarize_chunks
+from trendr_api.worker import tasks
+
+
+class _FakePipeline:
+    def __init__(self, store: dict[str, str]) -> None:
+        self._store = store
+        self._pending: list[tuple[str, str]] = []
+
+    def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self._pending.append((key, value))
+
+    def execute(self) -> None:
+        self._store.update(self._pending)
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.store[key].encode("utf-8") if key in self.store else None for key in keys]
+
+    def pipeline(self) -> _FakePipeline:
+        return _FakePipeline(self.store)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(map_reduce, "get_redis", lambda: redis)
+    return redis
+
+
+@pytest.fixture
+def map_calls(monkeypatch):
+    calls: list[str] = []
+
+    async def _fake_generate_text(*, prompt: str, meta: dict, preferred_provider: str, on_served, **_: object) -> str:
+        assert meta["output_kind"] == "chunk_summary"
+        calls.append(prompt)
+        on_served(preferred_provider)
+        await asyncio.sleep(0.01)
+        return f"summary {len(calls)}"
+
+    monkeypatch.setattr(map_reduce.provider_router, "generate_text", _fake_generate_text)
+    return calls
+
+
+def _segments(count: int) -> list[dict]:
+    return [
+        {"start": float(i * 10), "end": float(i * 10 + 10), "text": f"Segment number {i} talks about topic {i}."}
+        for i in range(count)
+    ]
+
+
+def test_split_chunks_keeps_segment_boundaries():
+    segments = _segments(6)
+    chunks = split_chunks("", segments, chunk_tokens=25)
+
+    assert len(chunks) == 3
+    assert [(c["start"], c["end"]) for c in chunks] == [(0.0, 20.0), (20.0, 40.0), (40.0, 60.0)]
+    assert chunks[0]["text"] == f"{segments[0]['text']} {segments[1]['text']}"
+
+
+def test_split_chunks_falls_back_to_sentences():
+    transcript = " ".join(f"This is sentence number {i} of the plain transcript." for i in range(8))
+    chunks = split_chunks(transcript, None, chunk_tokens=30)
+
+    assert len(chunks) > 1
+    assert all(c["start"] is None for c in chunks)
+    assert "sentence number 0" in chunks[0]["text"]
+    assert "sentence number 7" in chunks[-1]["text"]
+
+
+def test_needs_map_reduce_modes(monkeypatch):
+    long_text = "word " * 400
+    monkeypatch.setattr(settings, "map_reduce_auto_min_tokens", 0)
+
+    assert needs_map_reduce(long_text, mode="auto", budget_tokens=100)
+    assert not needs_map_reduce(long_text, mode="auto", budget_tokens=1000)
+    assert not needs_map_reduce(long_text, mode="auto", budget_tokens=None)
+    assert not needs_map_reduce(long_text, mode="single", budget_tokens=100)
+    assert needs_map_reduce("short", mode="map_reduce", budget_tokens=1000)
+
+    monkeypatch.setattr(settings, "map_reduce_auto_min_tokens", 1000)
+    assert not needs_map_reduce(long_text, mode="auto", budget_tokens=100)
+    assert needs_map_reduce(long_text * 5, mode="auto", budget_tokens=100)
+
+
+async def test_summarize_chunks_bounds_concurrency_and_reuses_cache(fake_redis, monkeypatch):
+    in_flight = 0
+    peak = 0
+    calls = 0
+
+    async def _fake_generate_text(*, prompt: str, preferred_provider: str, on_served, **_: object) -> str:
+        nonlocal in_flight, peak, calls
+        calls += 1
+        on_served(preferred_provider)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"  summary of {prompt.split('[')[1].split(']')[0]}  "
+
+    monkeypatch.setattr(map_reduce.provider_router, "generate_text", _fake_generate_text)
+    chunks = split_chunks("", _segments(8), chunk_tokens=12)
+
+    first = await summarize_chunks(chunks, provider_name="openai", meta={}, semaphore=asyncio.Semaphore(2))
+
+    assert calls == len(chunks) == 8
+    assert peak == 2
+    assert first.cached == 0
+    assert first.segments[0] == {"start": 0.0, "end": 10.0, "text": "summary of 0.0-10.0"}
+    assert first.transcript.startswith("[0.0-10.0]\nsummary of 0.0-10.0\n\n[10.0-20.0]")
+
+    second = await summarize_chunks(chunks, provider_name="openai", meta={}, semaphore=asyncio.Semaphore(2))
+
+    assert calls == 8
+    assert second.cached == 8
+    assert second.segments == first.segments
+
+    await summarize_chunks(chunks, provider_name="other", meta={}, semaphore=asyncio.Semaphore(2))
+    assert calls == 16
+
+
+async def test_summaries_from_a_fallback_provider_are_not_cached(fake_redis, monkeypatch):
+    calls = 0
+
+    async def _stub_answers(*, on_served, **_: object) -> str:
+        nonlocal calls
+        calls += 1
+        on_served("openai_stub")
+        return "placeholder"
+
+    monkeypatch.setattr(map_reduce.provider_router, "generate_text", _stub_answers)
+    chunks = split_chunks("", _segments(4), chunk_tokens=12)
+
+    result = await summarize_chunks(chunks, provider_name="openai", meta={}, semaphore=asyncio.Semaphore(4))
+
+    assert [segment["text"] for segment in result.segments] == ["placeholder"] * 4
+    assert fake_redis.store == {}
+    await summarize_chunks(chunks, provider_name="openai", meta={}, semaphore=asyncio.Semaphore(4))
+    assert calls == 8
+
+
+def test_summary_cache_key_covers_provider_model(monkeypatch):
+    monkeypatch.setattr(settings, "openai_model", "model-a")
+    monkeypatch.setitem(registry.text_providers, "openai", OpenAITextProvider())
+
+    assert map_reduce._provider_model("openai") == "model-a"
+    assert map_reduce._cache_key("openai", "model-a", "text") != map_reduce._cache_key("openai", "model-b", "text")
+
+
+async def test_summarize_chunks_works_without_redis(map_calls, monkeypatch):
+    def _down():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(map_reduce, "get_redis", _down)
+    chunks = split_chunks("", _segments(4), chunk_tokens=12)
+
+    result = await summarize_chunks(chunks, provider_name="openai", meta={}, semaphore=asyncio.Semaphore(4))
+
+    assert len(map_calls) == 4
+    assert result.cached == 0
+    assert len(result.segments) == 4
+
+
+def _seed_long_generate_job(session: Session, *, mode: str) -> Job:
+    actor = resolve_auth_context(
+        session=session,
+        user_external_id="map-reduce-user",
+        workspace_slug="map-reduce-space",
+    )
+    project = session.exec(select(Project).where(Project.workspace_id == actor.workspace_id)).first()
+    if project is None:
+        project = Project(
+            workspace_id=actor.workspace_id,
+            name="Long video",
+            source_type="youtube",
+            source_ref="https://youtu.be/dQw4w9WgXcQ",
+        )
+        session.add(project)
+        session.flush()
+        segments = _segments(6)
+        transcript = Artifact(
+            workspace_id=actor.workspace_id,
+            project_id=project.id,
+            kind="transcript",
+            title="Transcript",
+            content=" ".join(seg["text"] for seg in segments),
+            meta={"segment_count": len(segments)},
+        )
+        session.add(transcript)
+        session.flush()
+        session.add_all(
+            TranscriptSegment(
+                artifact_id=transcript.id,
+                position=i,
+                start_seconds=seg["start"],
+                end_seconds=seg["end"],
+                text=seg["text"],
+            )
+            for i, seg in enumerate(segments)
+        )
+    job = Job(
+        kind="generate",
+        status="queued",
+        workspace_id=actor.workspace_id,
+        project_id=project.id,
+        input={"project_id": project.id, "outputs": ["tweet", "linkedin", "blog"], "mode": mode},
+        output={},
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def test_generate_posts_map_reduce_summarises_once_for_all_outputs(
+    sqlite_engine, monkeypatch, fake_redis, map_calls
+):
+    seen: dict[str, tuple[str, list]] = {}
+
+    async def _fake_generate_text_output(*, output_kind: str, transcript: str, segments: list, **_: object):
+        seen[output_kind] = (transcript, segments)
+        return f"generated {output_kind}"
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "generate_text_output", _fake_generate_text_output)
+    monkeypatch.setattr(settings, "map_reduce_chunk_tokens", 25)
+
+    with Session(sqlite_engine) as session:
+        job = _seed_long_generate_job(session, mode="map_reduce")
+    assert tasks.generate_posts.run(job_id=job.id) == {"ok": True}
+
+    assert len(map_calls) == 3
+    assert set(seen) == {"tweet", "linkedin", "blog"}
+    transcript, segments = seen["blog"]
+    assert [(s["start"], s["end"]) for s in segments] == [(0.0, 20.0), (20.0, 40.0), (40.0, 60.0)]
+    assert "Segment number" not in transcript
+    assert transcript.startswith("[0.0-20.0]\nsummary")
+
+    with Session(sqlite_engine) as session:
+        refreshed = session.get(Job, job.id)
+        assert refreshed.output["map_reduce"] == {"chunks": 3, "cached": 0}
+
+        # A re-generation of the same transcript reuses every chunk summary.
+        again = _seed_long_generate_job(session, mode="map_reduce")
+    assert tasks.generate_posts.run(job_id=again.id) == {"ok": True}
+
+    assert len(map_calls) == 3
+    with Session(sqlite_engine) as session:
+        assert session.get(Job, again.id).output["map_reduce"] == {"chunks": 3, "cached": 3}
+
+
+def test_generate_posts_single_mode_skips_map_step(sqlite_engine, monkeypatch, fake_redis, map_calls):
+    async def _fake_generate_text_output(*, output_kind: str, **_: object):
+        return f"generated {output_kind}"
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "generate_text_output", _fake_generate_text_output)
+    monkeypatch.setattr(settings, "prompt_max_tokens", 10)
+
+    with Session(sqlite_engine) as session:
+        job = _seed_long_generate_job(session, mode="single")
+    assert tasks.generate_posts.run(job_id=job.id) == {"ok": True}
+
+    assert map_calls == []
+    with Session(sqlite_engine) as session:
+        assert session.get(Job, job.id).output["map_reduce"] is None
+
+
+def test_generate_posts_auto_mode_compacts_a_just_over_budget_transcript(
+    sqlite_engine, monkeypatch, fake_redis, map_calls
+):
+    async def _fake_generate_text_output(*, output_kind: str, on_delta=None, **kwargs: object):
+        generate.prepare_output_request(output_kind=output_kind, **kwargs)
+        return f"generated {output_kind}"
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "generate_text_output", _fake_generate_text_output)
+    # The transcript is about 60 tokens: just over this budget, far under the auto threshold.
+    monkeypatch.setattr(settings, "prompt_max_tokens", 50)
+    before = metrics.counter_value("generate_prompt_compactions_total", output_kind="blog")
+
+    with Session(sqlite_engine) as session:
+        job = _seed_long_generate_job(session, mode="auto")
+    assert tasks.generate_posts.run(job_id=job.id) == {"ok": True}
+
+    assert map_calls == []
+    assert metrics.counter_value("generate_prompt_compactions_total", output_kind="blog") == before + 1
+    with Session(sqlite_engine) as session:
+        assert session.get(Job, job.id).output["map_reduce"] is None
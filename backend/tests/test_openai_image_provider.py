@@ -24,14 +24,8 @@ class _FakeAsyncClient:
         self.response = response
         self.calls: list[dict[str, Any]] = []
 
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-    async def post(self, url: str, *, json: dict[str, Any], headers: dict[str, str]):
-        self.calls.append({"url": url, "json": json, "headers": headers})
+    async def post(self, url: str, *, json: dict[str, Any], headers: dict[str, str], timeout: float):
+        self.calls.append({"url": url, "json": json, "headers": headers, "timeout": timeout})
         return self.response
 
 
@@ -54,8 +48,8 @@ async def test_openai_image_provider_returns_b64(monkeypatch):
     )
     fake_client = _FakeAsyncClient(response=fake_response)
     monkeypatch.setattr(
-        "trendr_api.plugins.providers.openai_image.httpx.AsyncClient",
-        lambda *, timeout: fake_client,
+        "trendr_api.plugins.providers.openai_image.get_http_client",
+        lambda url: fake_client,
     )
 
     try:
@@ -76,6 +70,7 @@ async def test_openai_image_provider_returns_b64(monkeypatch):
     assert call["json"]["quality"] == "hd"
     assert call["json"]["style"] == "natural"
     assert call["json"]["response_format"] == "b64_json"
+    assert call["timeout"] == 90
 
 
 @pytest.mark.asyncio
@@ -90,8 +85,8 @@ async def test_openai_image_provider_raises_on_api_error(monkeypatch):
     )
     fake_client = _FakeAsyncClient(response=fake_response)
     monkeypatch.setattr(
-        "trendr_api.plugins.providers.openai_image.httpx.AsyncClient",
-        lambda *, timeout: fake_client,
+        "trendr_api.plugins.providers.openai_image.get_http_client",
+        lambda url: fake_client,
     )
 
     try:
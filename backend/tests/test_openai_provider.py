@@ -23,14 +23,8 @@ class _FakeAsyncClient:
         self.response = response
         self.calls: list[dict[str, Any]] = []
 
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-    async def post(self, url: str, *, json: dict[str, Any], headers: dict[str, str]):
-        self.calls.append({"url": url, "json": json, "headers": headers})
+    async def post(self, url: str, *, json: dict[str, Any], headers: dict[str, str], timeout: float):
+        self.calls.append({"url": url, "json": json, "headers": headers, "timeout": timeout})
         return self.response
 
 
@@ -58,11 +52,10 @@ async def test_openai_provider_generate_parses_chat_completion(monkeypatch):
     )
     fake_client = _FakeAsyncClient(response=fake_response)
 
-    def _client_factory(*, timeout: int):
-        assert timeout == 45
-        return fake_client
-
-    monkeypatch.setattr("trendr_api.plugins.providers.openai_text.httpx.AsyncClient", _client_factory)
+    monkeypatch.setattr(
+        "trendr_api.plugins.providers.openai_text.get_http_client",
+        lambda url: fake_client,
+    )
 
     try:
         provider = OpenAITextProvider()
@@ -84,6 +77,7 @@ async def test_openai_provider_generate_parses_chat_completion(monkeypatch):
     assert call["json"]["temperature"] == 0.3
     assert call["json"]["max_tokens"] == 120
     assert call["headers"]["Authorization"] == "Bearer test-key"
+    assert call["timeout"] == 45
 
 
 @pytest.mark.asyncio
@@ -110,11 +104,10 @@ async def test_openai_provider_generate_uses_workspace_key(monkeypatch):
     )
     fake_client = _FakeAsyncClient(response=fake_response)
 
-    def _client_factory(*, timeout: int):
-        assert timeout == 45
-        return fake_client
-
-    monkeypatch.setattr("trendr_api.plugins.providers.openai_text.httpx.AsyncClient", _client_factory)
+    monkeypatch.setattr(
+        "trendr_api.plugins.providers.openai_text.get_http_client",
+        lambda url: fake_client,
+    )
 
     try:
         provider = OpenAITextProvider()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from sqlmodel import Session
 
 from trendr_api.auth import AuthContext
@@ -20,8 +20,8 @@ def test_projects_are_scoped_to_workspace(db_session: Session, actor: AuthContex
         actor=other_actor,
     )
 
-    actor_projects = list_projects(session=db_session, actor=actor)
-    other_projects = list_projects(session=db_session, actor=other_actor)
+    actor_projects = list_projects(response=Response(), session=db_session, actor=actor)
+    other_projects = list_projects(response=Response(), session=db_session, actor=other_actor)
 
     assert len(actor_projects) == 1
     assert len(other_projects) == 1
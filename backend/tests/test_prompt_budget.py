@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from trendr_api.config import settings
+from trendr_api.observability import metrics
+from trendr_api.plugins.registry import registry
+from trendr_api.plugins.types import ProviderCapabilities
+from trendr_api.services.generate import build_prompt
+from trendr_api.services.prompt_budget import (
+    GAP_MARKER,
+    compact_transcript,
+    estimate_tokens,
+    prompt_token_budget,
+    segment_outline,
+)
+
+FILLER = "so we kept going back and forth on that for a while"
+KEY_LINE = "Batching writes cut Postgres commit latency from forty to four milliseconds"
+SEGMENTS = [{"start": float(i), "end": float(i + 1), "text": FILLER} for i in range(400)]
+SEGMENTS[250] = {"start": 250.0, "end": 251.0, "text": KEY_LINE}
+TRANSCRIPT = " ".join(seg["text"] for seg in SEGMENTS)
+
+
+@dataclass
+class _Provider:
+    name: str
+    capabilities: ProviderCapabilities = field(default_factory=ProviderCapabilities)
+
+
+def test_budget_is_smallest_declared_limit_in_fallback_chain(monkeypatch):
+    monkeypatch.setitem(registry.text_providers, "big", _Provider("big", ProviderCapabilities(max_input_tokens=100_000)))
+    monkeypatch.setitem(registry.text_providers, "small", _Provider("small", ProviderCapabilities(max_input_tokens=2_000)))
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "small")
+    monkeypatch.setattr(settings, "prompt_max_tokens", 0)
+
+    assert prompt_token_budget("big") == 1_800
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "")
+    monkeypatch.setattr(settings, "prompt_max_tokens", 5_000)
+    assert prompt_token_budget("big") == 4_500
+
+
+def test_stub_fallbacks_do_not_shrink_the_budget(monkeypatch):
+    monkeypatch.setitem(registry.text_providers, "big", _Provider("big", ProviderCapabilities(max_input_tokens=100_000)))
+    monkeypatch.setitem(
+        registry.text_providers,
+        "stub",
+        _Provider("stub", ProviderCapabilities(max_input_tokens=8_000, is_stub=True)),
+    )
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "stub")
+    monkeypatch.setattr(settings, "prompt_max_tokens", 0)
+
+    assert prompt_token_budget("big") == 90_000
+
+
+def test_compaction_keeps_highest_scoring_segments_in_order():
+    compacted, dropped = compact_transcript(TRANSCRIPT, SEGMENTS, budget_tokens=200)
+
+    assert dropped
+    assert estimate_tokens(compacted) <= 200
+    assert KEY_LINE in compacted
+    assert f"{GAP_MARKER} {KEY_LINE} {GAP_MARKER}" in compacted
+
+    untouched, dropped = compact_transcript("short transcript", None, budget_tokens=200)
+    assert (untouched, dropped) == ("short transcript", False)
+
+
+def test_build_prompt_fits_budget_without_repeating_segments():
+    before = metrics.counter_value("generate_prompt_compactions_total", output_kind="tweet")
+    prompt = build_prompt(
+        transcript=TRANSCRIPT,
+        segments=SEGMENTS,
+        output_kind="tweet",
+        tone="professional",
+        brand_voice=None,
+        audience=None,
+        notes=None,
+        max_prompt_tokens=1_500,
+    )
+
+    assert estimate_tokens(prompt) <= 1_500
+    assert KEY_LINE in prompt
+    assert metrics.counter_value("generate_prompt_compactions_total", output_kind="tweet") == before + 1
+
+    uncapped = build_prompt(
+        transcript=TRANSCRIPT,
+        segments=SEGMENTS,
+        output_kind="tweet",
+        tone="professional",
+        brand_voice=None,
+        audience=None,
+        notes=None,
+    )
+    # Full transcript once, plus a short outline rather than all 400 segment lines.
+    assert uncapped.count(FILLER) < len(SEGMENTS) + 20
+    assert segment_outline(SEGMENTS) in uncapped
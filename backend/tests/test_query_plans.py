@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import Response
+from sqlalchemy import text
+from sqlmodel import Session
+
+from trendr_api.api.artifacts import list_artifacts_query
+from trendr_api.api.jobs import list_jobs, list_jobs_query
+from trendr_api.api.projects import list_projects_query
+from trendr_api.api.templates import list_templates_query
+from trendr_api.api.workflows import list_workflows_query
+from trendr_api.auth import AuthContext
+from trendr_api.models import Job
+
+
+def _plan(session: Session, stmt) -> str:
+    compiled = stmt.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    rows = session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+# SQLite secondary indexes end with the rowid, so the single-column workspace_id
+# indexes already serve `(workspace_id, id)` lookups there; only the wider
+# composites are pinned by name. On Postgres the `*_recent` indexes are needed.
+@pytest.mark.parametrize(
+    ("stmt", "index_name"),
+    [
+        (list_jobs_query(workspace_id=1, project_id=None, limit=50, cursor=500), None),
+        (list_jobs_query(workspace_id=1, project_id=3, limit=50), "ix_job_workspace_project_recent"),
+        (list_projects_query(workspace_id=1, cursor=500), None),
+        (list_templates_query(workspace_id=1, kind=None), None),
+        (list_templates_query(workspace_id=1, kind="tweet"), "ix_template_workspace_kind_recent"),
+        (list_workflows_query(workspace_id=1), None),
+        (list_artifacts_query(workspace_id=1, project_id=3, kind=None), "ix_artifact_workspace_project_recent"),
+        (
+            list_artifacts_query(workspace_id=1, project_id=3, kind="tweet", cursor=500),
+            "ix_artifact_workspace_project_kind_recent",
+        ),
+    ],
+)
+def test_list_queries_walk_an_index_without_sorting(db_session: Session, stmt, index_name: str | None):
+    plan = _plan(db_session, stmt)
+
+    assert plan.startswith("SEARCH") and "USING INDEX" in plan
+    assert index_name is None or index_name in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_job_cursor_pages_cover_every_row_once(db_session: Session, actor: AuthContext):
+    for _ in range(7):
+        db_session.add(Job(kind="ingest", workspace_id=actor.workspace_id, input={}, output={}))
+    db_session.commit()
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        response = Response()
+        page = list_jobs(response=response, limit=3, cursor=cursor, session=db_session, actor=actor)
+        seen += [job.id for job in page]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        cursor = int(response.headers["X-Next-Cursor"])
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(set(seen)) == 7
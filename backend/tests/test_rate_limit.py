@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import importlib
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from trendr_api.config import settings
+from trendr_api.observability import metrics
+from trendr_api.plugins.providers import openai_text
+from trendr_api.plugins.providers.openai_text import OpenAITextProvider
+from trendr_api.plugins.registry import registry
+from trendr_api.plugins.router import generate_text
+from trendr_api.resilience import (
+    RateBucket,
+    RateLimitTimeout,
+    circuit_breaker,
+    estimate_request_tokens,
+    provider_buckets,
+    rate_limiter,
+    retry_after_seconds,
+)
+
+rate_limit_module = importlib.import_module("trendr_api.resilience.rate_limit")
+
+
+class _Clock:
+    """Stands in for `time` in the rate-limit module; sleeping advances it."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+        self.slept: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(rate_limit_module, "time", fake)
+    monkeypatch.setattr(rate_limit_module, "asyncio", SimpleNamespace(sleep=fake.sleep))
+    monkeypatch.setattr(settings, "rate_limit_store", "memory")
+    return fake
+
+
+async def test_callers_wait_for_refill_instead_of_failing(clock):
+    buckets = [RateBucket("test:requests", per_minute=2)]
+
+    assert await rate_limiter.acquire(buckets) == 0
+    assert await rate_limiter.acquire(buckets) == 0
+    waited = await rate_limiter.acquire(buckets)
+
+    assert waited == pytest.approx(30.0)
+    assert clock.slept == [pytest.approx(30.0)]
+
+
+async def test_token_bucket_limits_large_requests(clock):
+    def _buckets(tokens: int) -> list[RateBucket]:
+        return provider_buckets("openai", api_key="k", requests_per_minute=100, tokens_per_minute=1200, tokens=tokens)
+
+    await rate_limiter.acquire(_buckets(1000))
+    assert rate_limiter.try_acquire(_buckets(400)) == pytest.approx(10.0)
+    # Nothing is drawn from any bucket while one of them is short.
+    assert rate_limiter.try_acquire(_buckets(200)) == 0
+
+
+async def test_wait_beyond_max_wait_raises(clock):
+    buckets = [RateBucket("test:requests", per_minute=1)]
+    await rate_limiter.acquire(buckets)
+
+    with pytest.raises(RateLimitTimeout):
+        await rate_limiter.acquire(buckets, max_wait=10)
+    assert clock.slept == []
+
+
+async def test_block_holds_callers_for_retry_after(clock):
+    buckets = provider_buckets("openai", api_key="k", requests_per_minute=100)
+    rate_limiter.block(buckets, 7.0)
+
+    assert await rate_limiter.acquire(buckets) == pytest.approx(7.0)
+
+
+def test_buckets_are_keyed_by_credential_and_optional_workspace(monkeypatch):
+    first = provider_buckets("openai", api_key="key-a", requests_per_minute=10, workspace_id=3)
+    second = provider_buckets("openai", api_key="key-b", requests_per_minute=10, workspace_id=3)
+    assert first[0].key != second[0].key
+    assert "key-a" not in first[0].key
+    assert len(first) == 1
+
+    monkeypatch.setattr(settings, "rate_limit_workspace_requests_per_minute", 5)
+    shared = provider_buckets("openai", api_key="key-a", requests_per_minute=10, workspace_id=3)
+    assert shared[-1] == RateBucket("trendr:ratelimit:openai:workspace:3", 5)
+
+
+def test_retry_after_parsing(monkeypatch):
+    monkeypatch.setattr(rate_limit_module, "time", SimpleNamespace(time=lambda: 1_700_000_000.0))
+
+    assert retry_after_seconds({"retry-after": "2.5"}) == 2.5
+    assert retry_after_seconds({"retry-after": "Tue, 14 Nov 2023 22:13:30 GMT"}) == 10.0
+    assert retry_after_seconds({"retry-after": "soon"}, default=4.0) == 4.0
+    assert retry_after_seconds({}) == 1.0
+
+
+def test_estimate_counts_prompt_and_completion_budget():
+    assert estimate_request_tokens("x" * 40, "y" * 8, {"max_output_tokens": 100}) == 112
+    assert estimate_request_tokens("x" * 5, None, {}) == 2
+
+
+async def test_redis_outage_falls_back_to_local_buckets(clock, monkeypatch):
+    def _down():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(rate_limit_module, "get_redis", _down)
+    monkeypatch.setattr(settings, "rate_limit_store", "redis")
+    buckets = [RateBucket("test:requests", per_minute=1)]
+
+    assert rate_limiter.try_acquire(buckets) == 0
+    assert rate_limiter.try_acquire(buckets) == pytest.approx(60.0)
+
+
+async def test_router_retries_429_after_retry_after(clock, monkeypatch):
+    responses = [
+        httpx.Response(429, text="slow down", headers={"retry-after": "3"}),
+        httpx.Response(200, json={"choices": [{"message": {"content": "real draft"}}]}),
+    ]
+    requests: list[dict] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return responses.pop(0)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    monkeypatch.setattr(openai_text, "get_http_client", lambda url: client)
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(settings, "provider_circuit_store", "memory")
+    monkeypatch.setattr(registry, "text_providers", {"openai": OpenAITextProvider()})
+    monkeypatch.setattr(settings, "text_provider_default", "openai")
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "")
+    retries_before = metrics.counter_value("provider_rate_limit_retries_total", provider="openai")
+
+    text = await generate_text(prompt="p", system=None, meta={})
+    await client.aclose()
+
+    assert text == "real draft"
+    assert len(requests) == 2
+    assert clock.slept == [pytest.approx(3.0)]
+    assert metrics.counter_value("provider_rate_limit_retries_total", provider="openai") == retries_before + 1
+    assert circuit_breaker.snapshot("openai")["failure_rate"] == 0.0
+
+
+async def test_router_falls_back_once_429_retries_are_exhausted(clock, monkeypatch):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(429, text="quota", headers={"retry-after": "1"}))
+    )
+    monkeypatch.setattr(openai_text, "get_http_client", lambda url: client)
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(settings, "provider_circuit_store", "memory")
+    monkeypatch.setattr(settings, "rate_limit_retries", 2)
+    monkeypatch.setattr(registry, "text_providers", {"openai": OpenAITextProvider()})
+    monkeypatch.setattr(settings, "text_provider_default", "openai")
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "")
+
+    with pytest.raises(RuntimeError, match="OpenAI API 429: quota"):
+        await generate_text(prompt="p", system=None, meta={})
+    await client.aclose()
+
+    assert len(clock.slept) == 2
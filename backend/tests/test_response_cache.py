@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from trendr_api.config import settings
+from trendr_api.observability import metrics
+from trendr_api.plugins import response_cache
+from trendr_api.plugins.registry import registry
+from trendr_api.plugins.router import generate_image, generate_text
+from trendr_api.plugins.types import ProviderCapabilities
+from trendr_api.services import media
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def _queue(*args: Any, **kwargs: Any) -> "_FakePipeline":
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self) -> list[Any]:
+        return [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._ops]
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.index: dict[str, float] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: str, ex: int | None = None) -> bool:
+        self.values[key] = value
+        return True
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        self.index.update(mapping)
+        return len(mapping)
+
+    def zremrangebyscore(self, key: str, low: str, high: float) -> int:
+        expired = [member for member, score in self.index.items() if score <= high]
+        for member in expired:
+            del self.index[member]
+        return len(expired)
+
+    def zcard(self, key: str) -> int:
+        return len(self.index)
+
+    def zpopmin(self, key: str, count: int) -> list[tuple[str, float]]:
+        oldest = sorted(self.index.items(), key=lambda item: item[1])[:count]
+        for member, _score in oldest:
+            del self.index[member]
+        return oldest
+
+    def delete(self, *keys: str) -> int:
+        for key in keys:
+            self.values.pop(key, None)
+        return len(keys)
+
+    def pipeline(self) -> _FakePipeline:
+        return _FakePipeline(self)
+
+
+@dataclass
+class _CountingTextProvider:
+    name: str = "openai"
+    model: str = "gpt-test"
+    calls: int = 0
+    capabilities: ProviderCapabilities = ProviderCapabilities()
+
+    def is_available(self, *, meta: dict | None = None) -> bool:
+        return True
+
+    async def generate(self, *, prompt: str, system: str | None = None, meta: dict | None = None) -> str:
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+@dataclass
+class _CountingImageProvider:
+    name: str = "openai_image"
+    model: str = "dall-e-test"
+    calls: list[dict[str, Any]] = field(default_factory=list)
+    capabilities: ProviderCapabilities = ProviderCapabilities()
+
+    def is_available(self, *, meta: dict | None = None) -> bool:
+        return True
+
+    async def generate_image(self, *, prompt: str, size: str = "1024x1024", meta: dict | None = None) -> dict:
+        self.calls.append({"prompt": prompt, "size": size})
+        return {"b64": base64.b64encode(b"png-bytes").decode(), "revised_prompt": "revised"}
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(response_cache, "get_redis", lambda: redis)
+    monkeypatch.setattr(settings, "llm_cache_enabled", True)
+    return redis
+
+
+@pytest.fixture
+def text_provider(monkeypatch):
+    provider = _CountingTextProvider()
+    monkeypatch.setattr(registry, "text_providers", {provider.name: provider})
+    monkeypatch.setattr(settings, "text_provider_default", provider.name)
+    monkeypatch.setattr(settings, "text_provider_fallbacks", "")
+    return provider
+
+
+@pytest.fixture
+def image_provider(monkeypatch):
+    provider = _CountingImageProvider()
+    monkeypatch.setattr(registry, "image_providers", {provider.name: provider})
+    monkeypatch.setattr(settings, "image_provider_default", provider.name)
+    monkeypatch.setattr(settings, "image_provider_fallbacks", "")
+    return provider
+
+
+async def test_identical_text_requests_hit_the_cache(fake_redis, text_provider):
+    meta = {"workspace_id": 1, "temperature": 0.2, "tone": "casual"}
+    hits_before = metrics.counter_value("cache_hits_total", cache="llm_text", provider="openai")
+
+    first = await generate_text(prompt="Write a post", system=None, meta=meta)
+    # Whitespace and meta keys that do not change the output share the entry.
+    second = await generate_text(prompt="Write a post\n", system=None, meta={**meta, "tone": "other"})
+
+    assert first == second == "answer 1"
+    assert text_provider.calls == 1
+    assert metrics.counter_value("cache_hits_total", cache="llm_text", provider="openai") == hits_before + 1
+
+
+async def test_cache_key_covers_workspace_and_sampling(fake_redis, text_provider):
+    await generate_text(prompt="Write a post", system=None, meta={"workspace_id": 1})
+    await generate_text(prompt="Write a post", system=None, meta={"workspace_id": 2})
+    await generate_text(prompt="Write a post", system=None, meta={"workspace_id": 1, "temperature": 0.9})
+    await generate_text(prompt="Write a post", system="Be brief", meta={"workspace_id": 1})
+
+    assert text_provider.calls == 4
+
+
+async def test_bypass_skips_lookup_but_refreshes_entry(fake_redis, text_provider):
+    meta = {"workspace_id": 1}
+    await generate_text(prompt="p", system=None, meta=meta)
+
+    fresh = await generate_text(prompt="p", system=None, meta={**meta, "cache_bypass": True})
+    cached = await generate_text(prompt="p", system=None, meta=meta)
+
+    assert fresh == cached == "answer 2"
+    assert text_provider.calls == 2
+
+
+async def test_cache_is_opt_in(fake_redis, text_provider, monkeypatch):
+    monkeypatch.setattr(settings, "llm_cache_enabled", False)
+
+    await generate_text(prompt="p", system=None, meta={})
+    await generate_text(prompt="p", system=None, meta={})
+
+    assert text_provider.calls == 2
+    assert fake_redis.values == {}
+
+
+async def test_oldest_entries_are_evicted_past_max_entries(fake_redis, text_provider, monkeypatch):
+    monkeypatch.setattr(settings, "llm_cache_max_entries", 2)
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(response_cache, "time", SimpleNamespace(time=lambda: float(next(clock))))
+
+    for prompt in ("a", "b", "c"):
+        await generate_text(prompt=prompt, system=None, meta={})
+
+    assert len(fake_redis.values) == len(fake_redis.index) == 2
+    await generate_text(prompt="a", system=None, meta={})
+    assert text_provider.calls == 4
+
+
+async def test_text_generation_works_when_redis_is_down(text_provider, monkeypatch):
+    def _down():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(settings, "llm_cache_enabled", True)
+    monkeypatch.setattr(response_cache, "get_redis", _down)
+
+    assert await generate_text(prompt="p", system=None, meta={}) == "answer 1"
+    assert await generate_text(prompt="p", system=None, meta={}) == "answer 2"
+
+
+async def test_image_cache_stores_s3_key_not_bytes(fake_redis, image_provider, monkeypatch):
+    uploads: list[str] = []
+
+    def _upload(data: bytes, key: str, content_type: str) -> str:
+        uploads.append(key)
+        return f"http://s3.local/{key}"
+
+    monkeypatch.setattr(media, "upload_bytes", _upload)
+    kwargs = dict(prompt="A cat", size="1024x1024", quality="hd", style="vivid", workspace_id=1, project_id=7)
+
+    first = await media.generate_and_upload_image(**kwargs)
+    second = await media.generate_and_upload_image(**kwargs)
+
+    assert len(image_provider.calls) == 1
+    assert len(uploads) == 1
+    assert first == second
+    assert first["url"] == f"http://s3.local/{uploads[0]}"
+    (stored,) = [json.loads(value) for value in fake_redis.values.values()]
+    assert stored["s3_key"] == uploads[0]
+    assert "b64" not in stored
+
+    await media.generate_and_upload_image(**{**kwargs, "style": "natural"})
+    assert len(image_provider.calls) == 2
+
+
+async def test_url_only_image_results_are_not_cached(fake_redis, image_provider, monkeypatch):
+    async def _url_only(*, prompt: str, size: str = "1024x1024", meta: dict | None = None) -> dict:
+        image_provider.calls.append({"prompt": prompt})
+        return {"url": "https://provider.example/expiring.png"}
+
+    monkeypatch.setattr(image_provider, "generate_image", _url_only)
+
+    await generate_image(prompt="A dog", meta={})
+    await generate_image(prompt="A dog", meta={})
+
+    assert len(image_provider.calls) == 2
+    assert fake_redis.values == {}
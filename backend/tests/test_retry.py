@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import tenacity
+
+from trendr_api.config import settings
+from trendr_api.observability import metrics
+from trendr_api.plugins.providers import openai_text
+from trendr_api.plugins.providers.openai_text import OpenAITextProvider
+from trendr_api.resilience import ProviderHTTPError, ProviderRateLimited, classify, policy_for, retry_async
+from trendr_api.services import ingest
+
+
+class RequestBlocked(Exception):
+    """Same name as youtube-transcript-api's block error."""
+
+
+class _Flaky:
+    def __init__(self, *errors: BaseException, result: str = "ok") -> None:
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+@pytest.fixture
+def sleeps():
+    recorded: list[float] = []
+
+    async def _sleep(seconds: float) -> None:
+        recorded.append(seconds)
+
+    _sleep.recorded = recorded
+    return _sleep
+
+
+def _server_error() -> ProviderHTTPError:
+    return ProviderHTTPError("OpenAI API 503: overloaded", status_code=503)
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (ProviderHTTPError("x", status_code=502), "server_error"),
+        (ProviderHTTPError("x", status_code=400), None),
+        (ProviderRateLimited("x", retry_after=1.0), "rate_limited"),
+        (httpx.ReadTimeout("slow"), "timeout"),
+        (httpx.ConnectError("refused"), "connection"),
+        (RequestBlocked("blocked"), "blocked"),
+        (ValueError("bad input"), None),
+    ],
+)
+def test_classify(exc, expected):
+    assert classify(exc) == expected
+
+
+def test_classify_follows_cause():
+    try:
+        try:
+            raise httpx.ConnectError("refused")
+        except httpx.ConnectError as inner:
+            raise RuntimeError("wrapped") from inner
+    except RuntimeError as exc:
+        assert classify(exc) == "connection"
+
+
+async def test_transient_errors_are_retried_with_jittered_backoff(sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "retry_base_delay_seconds", 1.0)
+    call = _Flaky(_server_error(), httpx.ConnectError("refused"))
+    retries_before = metrics.counter_value("retries_total", target="openai", error_class="server_error")
+
+    assert await retry_async("openai", call, sleep=sleeps) == "ok"
+
+    assert call.calls == 3
+    assert len(sleeps.recorded) == 2
+    assert 0 <= sleeps.recorded[0] <= 1.0
+    assert 0 <= sleeps.recorded[1] <= 2.0
+    assert metrics.counter_value("retries_total", target="openai", error_class="server_error") == retries_before + 1
+
+
+async def test_non_transient_errors_fail_immediately(sleeps):
+    call = _Flaky(ProviderHTTPError("OpenAI API 400: bad request", status_code=400))
+
+    with pytest.raises(ProviderHTTPError, match="400"):
+        await retry_async("openai", call, sleep=sleeps)
+    assert call.calls == 1
+
+
+async def test_attempts_are_limited_per_error_class(sleeps):
+    # The default OpenAI policy allows 3 attempts for 5xx and leaves 429s to the rate limiter.
+    call = _Flaky(*(_server_error() for _ in range(5)))
+    with pytest.raises(ProviderHTTPError):
+        await retry_async("openai", call, sleep=sleeps)
+    assert call.calls == 3
+
+    limited = _Flaky(ProviderRateLimited("OpenAI API 429: slow down", retry_after=1.0))
+    with pytest.raises(ProviderRateLimited):
+        await retry_async("openai", limited, sleep=sleeps)
+    assert limited.calls == 1
+
+
+async def test_policy_overrides_from_settings_honour_retry_after(sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "retry_policies", {"openai": {"rate_limited": 2, "server_error": 1}})
+    assert policy_for("openai").attempts_for("server_error") == 1
+
+    call = _Flaky(ProviderRateLimited("OpenAI API 429: slow down", retry_after=4.0))
+    assert await retry_async("openai", call, sleep=sleeps) == "ok"
+    assert sleeps.recorded == [4.0]
+
+
+async def test_deadline_stops_retries_that_would_overrun(sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "retry_policies", {"openai": {"deadline_seconds": 5, "base_delay_seconds": 10}})
+    # Take the top of the jitter range so the next sleep certainly overruns the deadline.
+    monkeypatch.setattr(tenacity.wait_random_exponential, "__call__", lambda self, state: 10.0)
+    call = _Flaky(_server_error())
+
+    with pytest.raises(ProviderHTTPError):
+        await retry_async("openai", call, sleep=sleeps)
+    assert call.calls == 1
+    assert sleeps.recorded == []
+
+
+def test_openai_deadline_leaves_room_to_retry_a_timeout():
+    policy = policy_for("openai")
+    assert policy.attempts_for("timeout") > 1
+    assert policy.deadline_seconds > openai_text.REQUEST_TIMEOUT_SECONDS + policy.max_delay_seconds
+
+
+async def test_retry_budget_caps_retries_per_target(sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "retry_budget_min_per_minute", 1)
+    monkeypatch.setattr(settings, "retry_budget_ratio", 0.0)
+    denied_before = metrics.counter_value("retry_budget_denied_total", target="openai", error_class="server_error")
+
+    first = _Flaky(_server_error())
+    assert await retry_async("openai", first, sleep=sleeps) == "ok"
+
+    second = _Flaky(_server_error())
+    with pytest.raises(ProviderHTTPError):
+        await retry_async("openai", second, sleep=sleeps)
+    assert second.calls == 1
+    assert metrics.counter_value("retry_budget_denied_total", target="openai", error_class="server_error") == (
+        denied_before + 1
+    )
+
+
+async def test_openai_provider_retries_server_errors(monkeypatch):
+    responses = [
+        httpx.Response(503, text="overloaded"),
+        httpx.Response(200, json={"choices": [{"message": {"content": "draft"}}]}),
+    ]
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: responses.pop(0)))
+    monkeypatch.setattr(openai_text, "get_http_client", lambda url: client)
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(settings, "retry_base_delay_seconds", 0.001)
+
+    assert await OpenAITextProvider().generate(prompt="p") == "draft"
+    await client.aclose()
+    assert responses == []
+
+
+def test_transcript_fetch_retries_when_blocked(monkeypatch):
+    class _Api:
+        calls = 0
+
+        def fetch(self, video_id, languages):
+            _Api.calls += 1
+            if _Api.calls < 3:
+                raise RequestBlocked("too many requests")
+            return [{"text": "hello", "start": 0.0, "duration": 1.0}]
+
+        def list(self, video_id):
+            raise RequestBlocked("too many requests")
+
+    monkeypatch.setattr("youtube_transcript_api.YouTubeTranscriptApi", _Api)
+    monkeypatch.setattr(settings, "retry_policies", {"youtube_transcript": {"base_delay_seconds": 0.001}})
+
+    assert ingest._fetch_transcript_sync("dQw4w9WgXcQ") == ([{"text": "hello", "start": 0.0, "duration": 1.0}], "en")
+    assert _Api.calls == 3
+
+
+def test_transcript_fetch_does_not_retry_missing_captions(monkeypatch):
+    class TranscriptsDisabled(Exception):
+        pass
+
+    class _Api:
+        calls = 0
+
+        def fetch(self, video_id, languages):
+            _Api.calls += 1
+            raise TranscriptsDisabled("disabled")
+
+        def list(self, video_id):
+            raise TranscriptsDisabled("disabled")
+
+    monkeypatch.setattr("youtube_transcript_api.YouTubeTranscriptApi", _Api)
+
+    with pytest.raises(ingest.TranscriptFetchError, match="may not have available captions") as info:
+        ingest._fetch_transcript_sync("dQw4w9WgXcQ")
+    assert info.value.retry_class is None
+    assert _Api.calls == 1
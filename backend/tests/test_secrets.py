@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+
+import pytest
+from sqlmodel import Session, select
+
+from trendr_api.auth import AuthContext
+from trendr_api.config import settings
+from trendr_api.models import ProviderCredential
+from trendr_api.security import decrypt_many, decrypt_secret, encrypt_many, encrypt_secret
+from trendr_api.security.secrets import SecretEncryptionError
+from trendr_api.services.provider_settings import (
+    get_workspace_provider_api_key,
+    reencrypt_workspace_provider_api_keys,
+)
+
+
+def _legacy_encrypt(value: str, material: str) -> str:
+    # Byte-at-a-time reference implementation the stored tokens were written with.
+    key = hashlib.sha256(material.encode("utf-8")).digest()
+    plaintext = value.encode("utf-8")
+    nonce = os.urandom(16)
+    stream = bytearray()
+    counter = 0
+    while len(stream) < len(plaintext):
+        stream.extend(hmac.new(key, nonce + counter.to_bytes(8, "big"), hashlib.sha256).digest())
+        counter += 1
+    ciphertext = bytes(b ^ s for b, s in zip(plaintext, stream))
+    tag = hmac.new(key, nonce + ciphertext, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(nonce + tag + ciphertext).decode("utf-8")
+
+
+@pytest.fixture
+def encryption_key(monkeypatch):
+    monkeypatch.setattr(settings, "secrets_encryption_key", "test-encryption-key")
+    return "test-encryption-key"
+
+
+def test_round_trip_for_multi_block_secret(encryption_key):
+    secret = "sk-" + "x" * 150
+    assert decrypt_secret(encrypt_secret(secret)) == secret
+
+
+def test_decrypts_tokens_written_by_legacy_implementation(encryption_key):
+    secret = "sk-legacy-" + "y" * 70
+    assert decrypt_secret(_legacy_encrypt(secret, encryption_key)) == secret
+
+
+def test_tampered_token_is_rejected(encryption_key):
+    raw = bytearray(base64.urlsafe_b64decode(encrypt_secret("sk-tamper-1234")))
+    raw[-1] ^= 0x01
+    with pytest.raises(SecretEncryptionError):
+        decrypt_secret(base64.urlsafe_b64encode(bytes(raw)).decode("utf-8"))
+
+
+def test_encrypt_and_decrypt_many(encryption_key):
+    secrets = ["sk-one-12345678", "sk-two-12345678", "sk-three-" + "z" * 64]
+    tokens = encrypt_many(secrets)
+    assert len(set(tokens)) == 3
+    assert decrypt_many(tokens) == secrets
+
+
+def test_decrypt_many_with_previous_key_material(encryption_key):
+    token = _legacy_encrypt("sk-old-12345678", "old-key")
+    assert decrypt_many([token], key_material="old-key") == ["sk-old-12345678"]
+    with pytest.raises(SecretEncryptionError):
+        decrypt_many([token])
+
+
+def test_reencrypt_workspace_keys_after_rotation(
+    db_session: Session,
+    actor: AuthContext,
+    encryption_key,
+):
+    for provider, value in (("openai", "sk-openai-12345678"), ("anthropic", "sk-ant-12345678")):
+        db_session.add(
+            ProviderCredential(
+                workspace_id=actor.workspace_id,
+                provider=provider,
+                encrypted_api_key=_legacy_encrypt(value, "old-key"),
+                key_hint="***5678",
+            )
+        )
+    db_session.commit()
+
+    count = reencrypt_workspace_provider_api_keys(
+        session=db_session,
+        workspace_id=actor.workspace_id,
+        previous_key_material="old-key",
+    )
+
+    assert count == 2
+    assert (
+        get_workspace_provider_api_key(
+            session=db_session,
+            workspace_id=actor.workspace_id,
+            provider="openai",
+        )
+        == "sk-openai-12345678"
+    )
+    records = db_session.exec(select(ProviderCredential).order_by(ProviderCredential.id)).all()
+    assert decrypt_many([r.encrypted_api_key for r in records]) == [
+        "sk-openai-12345678",
+        "sk-ant-12345678",
+    ]
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+from sqlmodel import Session
+
+from trendr_api.auth import resolve_auth_context
+from trendr_api.config import settings
+from trendr_api.models import Artifact, Job, Project
+from trendr_api.plugins.providers import openai_text
+from trendr_api.plugins.providers.openai_text import OpenAITextProvider
+from trendr_api.plugins.providers.openai_text_stub import OpenAITextStub
+from trendr_api.plugins.registry import registry
+from trendr_api.plugins.router import generate_text_stream
+from trendr_api.plugins.types import ProviderCapabilities
+from trendr_api.services import generate, job_events
+from trendr_api.services.job_events import DraftPublisher
+from trendr_api.worker import tasks
+
+
+class _RecordingRedis:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.events: list[dict[str, Any]] = []
+
+    def publish(self, channel: str, data: str) -> None:
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.events.append(json.loads(data))
+
+
+@dataclass
+class _ScriptedProvider:
+    name: str
+    deltas: list[str] = field(default_factory=list)
+    fail_after: int | None = None
+    streaming: bool = True
+    calls: int = 0
+
+    @property
+    def capabilities(self) -> ProviderCapabilities:
+        return ProviderCapabilities(supports_streaming=self.streaming)
+
+    def is_available(self, *, meta: dict | None = None) -> bool:
+        return True
+
+    async def generate(self, *, prompt: str, system: str | None = None, meta: dict | None = None) -> str:
+        self.calls += 1
+        if self.fail_after is not None:
+            raise RuntimeError("boom")
+        return "".join(self.deltas)
+
+    async def generate_stream(self, *, prompt: str, system: str | None = None, meta: dict | None = None):
+        self.calls += 1
+        for index, delta in enumerate(self.deltas):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise RuntimeError("stream broke")
+            yield delta
+        if self.fail_after is not None:
+            raise RuntimeError("stream broke")
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    def _install(*providers: _ScriptedProvider) -> None:
+        monkeypatch.setattr(registry, "text_providers", {p.name: p for p in providers})
+        monkeypatch.setattr(settings, "text_provider_default", providers[0].name)
+        monkeypatch.setattr(settings, "text_provider_fallbacks", ",".join(p.name for p in providers[1:]))
+
+    monkeypatch.setattr(settings, "provider_circuit_store", "memory")
+    return _install
+
+
+async def _collect(**meta) -> list[str]:
+    return [delta async for delta in generate_text_stream(prompt="p", system=None, meta=meta)]
+
+
+async def test_openai_generate_stream_parses_sse_deltas(monkeypatch):
+    seen: dict[str, Any] = {}
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen["body"] = json.loads(request.content)
+        chunks = [
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Hello"}}]},
+            {"choices": [{"delta": {"content": " world"}}]},
+        ]
+        body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    monkeypatch.setattr(openai_text, "get_http_client", lambda url: client)
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+
+    provider = OpenAITextProvider()
+    deltas = [delta async for delta in provider.generate_stream(prompt="Say hi", meta={"temperature": 0.1})]
+    await client.aclose()
+
+    assert deltas == ["Hello", " world"]
+    assert seen["body"]["stream"] is True
+    assert seen["body"]["temperature"] == 0.1
+    assert provider.capabilities.supports_streaming
+
+
+async def test_openai_generate_stream_raises_on_http_error(monkeypatch):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(429, text="rate limited"))
+    )
+    monkeypatch.setattr(openai_text, "get_http_client", lambda url: client)
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+
+    with pytest.raises(RuntimeError, match="OpenAI API 429: rate limited"):
+        async for _ in OpenAITextProvider().generate_stream(prompt="p"):
+            pass
+    await client.aclose()
+
+
+async def test_stub_stream_matches_generate():
+    stub = OpenAITextStub()
+    full = await stub.generate(prompt="Write\nsomething  short", meta={"tone": "fun"})
+    deltas = [delta async for delta in stub.generate_stream(prompt="Write\nsomething  short", meta={"tone": "fun"})]
+
+    assert len(deltas) > 3
+    assert "".join(deltas) == full
+
+
+async def test_router_streams_deltas_from_first_provider(chain):
+    primary = _ScriptedProvider(name="openai", deltas=["a", "b", "c"])
+    chain(primary, _ScriptedProvider(name="openai_stub", deltas=["z"]))
+
+    assert await _collect() == ["a", "b", "c"]
+
+
+async def test_router_falls_back_when_stream_fails_before_output(chain):
+    primary = _ScriptedProvider(name="openai", deltas=["a"], fail_after=0)
+    fallback = _ScriptedProvider(name="openai_stub", deltas=["x", "y"])
+    chain(primary, fallback)
+
+    assert await _collect() == ["x", "y"]
+
+
+async def test_router_propagates_failure_after_partial_output(chain):
+    primary = _ScriptedProvider(name="openai", deltas=["a", "b"], fail_after=1)
+    fallback = _ScriptedProvider(name="openai_stub", deltas=["x"])
+    chain(primary, fallback)
+
+    received: list[str] = []
+    with pytest.raises(RuntimeError, match="stream broke"):
+        async for delta in generate_text_stream(prompt="p", system=None, meta={}):
+            received.append(delta)
+
+    assert received == ["a"]
+    assert fallback.calls == 0
+
+
+async def test_router_wraps_non_streaming_provider(chain):
+    chain(_ScriptedProvider(name="openai", deltas=["whole ", "text"], streaming=False))
+
+    assert await _collect() == ["whole text"]
+
+
+async def test_generate_text_output_streams_to_callback(chain):
+    chain(_ScriptedProvider(name="openai", deltas=["  Draft", " one", " \n"]))
+    received: list[str] = []
+
+    text = await generate.generate_text_output(
+        transcript="t",
+        segments=[],
+        output_kind="tweet",
+        tone="professional",
+        brand_voice=None,
+        on_delta=received.append,
+    )
+
+    assert received == ["  Draft", " one", " \n"]
+    assert text == "Draft one"
+
+
+async def test_hedged_requests_are_not_streamed(chain):
+    provider = _ScriptedProvider(name="openai", deltas=["Draft", " one"])
+    provider.generate_stream = None  # a hedged request must go through generate()
+    chain(provider)
+    received: list[str] = []
+
+    text = await generate.generate_text_output(
+        transcript="t",
+        segments=[],
+        output_kind="tweet",
+        tone="professional",
+        brand_voice=None,
+        meta={"hedge": True},
+        on_delta=received.append,
+    )
+
+    assert text == "Draft one"
+    assert received == []
+    assert provider.calls == 1
+
+
+def _draft_job(session: Session, actor) -> Job:
+    job = Job(kind="generate", status="running", workspace_id=actor.workspace_id, project_id=3, input={}, output={})
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def test_draft_publisher_throttles_and_sends_full_text(db_session, actor, monkeypatch):
+    redis = _RecordingRedis()
+    monkeypatch.setattr(job_events, "get_redis", lambda: redis)
+    clock = iter([100.0, 100.1, 100.2, 100.4])
+    monkeypatch.setattr(job_events, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+
+    drafts = DraftPublisher(_draft_job(db_session, actor), "tweet", interval_seconds=0.25)
+    for delta in ("Hel", "lo", " wor", "ld"):
+        drafts(delta)
+    drafts.finish("Hello world")
+    assert drafts.flush()
+
+    assert [(e["text"], e["done"]) for e in redis.events] == [
+        ("Hel", False),
+        ("Hello world", False),
+        ("Hello world", True),
+    ]
+    assert redis.events[0]["type"] == "draft"
+    assert redis.events[0]["output_kind"] == "tweet"
+    assert redis.events[0]["project_id"] == 3
+
+
+def test_draft_publisher_stops_after_publish_failure(db_session, actor, monkeypatch):
+    redis = _RecordingRedis(fail=True)
+    monkeypatch.setattr(job_events, "get_redis", lambda: redis)
+
+    drafts = DraftPublisher(_draft_job(db_session, actor), "blog", interval_seconds=0.0)
+    drafts("a")
+    assert drafts.flush()
+    redis.fail = False
+    drafts("b")
+    drafts.finish("ab")
+    assert drafts.flush()
+
+    assert redis.events == []
+
+
+def test_draft_publisher_does_not_wait_on_redis(db_session, actor, monkeypatch):
+    release = threading.Event()
+
+    class _SlowRedis(_RecordingRedis):
+        def publish(self, channel: str, data: str) -> None:
+            release.wait(5)
+            super().publish(channel, data)
+
+    redis = _SlowRedis()
+    monkeypatch.setattr(job_events, "get_redis", lambda: redis)
+
+    drafts = DraftPublisher(_draft_job(db_session, actor), "blog", interval_seconds=0.0)
+    started = time.monotonic()
+    drafts("Hel")
+    drafts("lo")
+    drafts.finish("Hello")
+    assert time.monotonic() - started < 1.0
+    assert not drafts.flush(timeout=0.05)
+
+    release.set()
+    assert drafts.flush()
+    assert [(e["text"], e["done"]) for e in redis.events] == [
+        ("Hel", False),
+        ("Hello", False),
+        ("Hello", True),
+    ]
+
+
+def test_generate_posts_publishes_drafts_per_output(sqlite_engine, monkeypatch):
+    redis = _RecordingRedis()
+    monkeypatch.setattr(job_events, "get_redis", lambda: redis)
+    monkeypatch.setattr(settings, "generate_draft_interval_seconds", 0.0)
+
+    async def _fake_generate_text_output(*, output_kind: str, on_delta=None, **_: object):
+        assert on_delta is not None
+        for word in ("first ", "second"):
+            on_delta(word)
+        return f"{output_kind} final"
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "generate_text_output", _fake_generate_text_output)
+
+    with Session(sqlite_engine) as session:
+        actor = resolve_auth_context(session=session, user_external_id="stream-user", workspace_slug="stream-space")
+        project = Project(workspace_id=actor.workspace_id, name="P", source_type="youtube", source_ref="x")
+        session.add(project)
+        session.flush()
+        session.add(
+            Artifact(workspace_id=actor.workspace_id, project_id=project.id, kind="transcript", title="T", content="hi")
+        )
+        job = Job(
+            kind="generate",
+            status="queued",
+            workspace_id=actor.workspace_id,
+            project_id=project.id,
+            input={"project_id": project.id, "outputs": ["tweet", "blog"]},
+            output={},
+        )
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+    assert tasks.generate_posts.run(job_id=job.id) == {"ok": True}
+
+    drafts = [e for e in redis.events if e["type"] == "draft"]
+    by_kind = {kind: [e for e in drafts if e["output_kind"] == kind] for kind in ("tweet", "blog")}
+    assert [e["text"] for e in by_kind["tweet"]] == ["first ", "first second", "tweet final"]
+    assert by_kind["blog"][-1] == {**by_kind["blog"][-1], "text": "blog final", "done": True, "job_id": job.id}
+    assert redis.events[-1]["type"] == "job"
+    assert redis.events[-1]["status"] == "succeeded"
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from trendr_api.api.templates import create_template, delete_template, update_template
+from trendr_api.auth import AuthContext
+from trendr_api.cache import invalidation
+from trendr_api.config import settings
+from trendr_api.schemas import TemplateCreate, TemplateUpdate
+from trendr_api.services import templates as templates_module
+from trendr_api.services.template_cache import get_cached_template, template_cache
+from trendr_api.services.templates import compile_template, load_template, render_template, validate_template
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.published: list[tuple[str, dict]] = []
+
+    def publish(self, channel: str, message: str) -> int:
+        self.published.append((channel, json.loads(message)))
+        return 1
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = _FakeRedis()
+    monkeypatch.setattr(invalidation, "get_redis", lambda: client)
+    return client
+
+
+@pytest.fixture
+def _clean_template_cache():
+    template_cache.clear()
+    yield
+    template_cache.clear()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "Tone: {tone}\nFacts:\n{source_facts}",
+        "{{literal}} {tone!r} [{notes:>8}]",
+        "{segments.upper} fallback",
+    ],
+)
+def test_compiled_render_matches_str_format(source: str):
+    ctx = {"tone": "dry", "notes": "n", "source_facts": "- f", "segments": "s"}
+    assert render_template(source, ctx) == source.format(**ctx)
+    assert compile_template(source) is compile_template(source)
+
+
+def test_validate_template_rejects_what_render_would_fail_on():
+    validate_template("Tone {tone} / {transcript}")
+    for bad, message in [
+        ("Hello {name}", "Unknown template placeholders: name"),
+        ("Positional {}", "must be named"),
+        ("Broken {tone", "Invalid template syntax"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_template(bad)
+
+
+def test_filesystem_templates_load_once_and_reload_on_mtime_in_dev(tmp_path, monkeypatch):
+    monkeypatch.setattr(templates_module, "_templates_dir", lambda: tmp_path)
+    monkeypatch.setattr(templates_module, "_file_templates", {})
+    path = tmp_path / "tweet_thread.md"
+    path.write_text("v1 {tone}", encoding="utf-8")
+
+    monkeypatch.setattr(settings, "app_env", "prod")
+    assert load_template("tweet") == "v1 {tone}"
+    path.write_text("v2 {tone}", encoding="utf-8")
+    os.utime(path, (1, 1))
+    assert load_template("tweet") == "v1 {tone}"
+
+    monkeypatch.setattr(settings, "app_env", "dev")
+    assert load_template("tweet") == "v2 {tone}"
+
+
+def test_template_api_validates_content_on_save(db_session: Session, actor: AuthContext):
+    with pytest.raises(HTTPException) as exc_info:
+        create_template(
+            payload=TemplateCreate(name="Bad", kind="tweet", content="Hi {nmae}"),
+            session=db_session,
+            actor=actor,
+        )
+    assert exc_info.value.status_code == 400
+
+    created = create_template(
+        payload=TemplateCreate(name="Good", kind="tweet", content="Hi {tone}"),
+        session=db_session,
+        actor=actor,
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        update_template(
+            template_id=created.id,
+            payload=TemplateUpdate(content="{0}"),
+            session=db_session,
+            actor=actor,
+        )
+    assert exc_info.value.status_code == 400
+
+
+def test_cached_templates_are_invalidated_on_patch_and_delete(
+    db_session: Session, actor: AuthContext, fake_redis: _FakeRedis, _clean_template_cache
+):
+    created = create_template(
+        payload=TemplateCreate(name="Main", kind="tweet", content="v1 {tone}"),
+        session=db_session,
+        actor=actor,
+    )
+    key = {"workspace_id": actor.workspace_id, "template_id": created.id}
+
+    first = get_cached_template(db_session, **key)
+    assert first.content == "v1 {tone}"
+    hits = template_cache.hits
+    assert get_cached_template(db_session, **key) is first
+    assert template_cache.hits == hits + 1
+
+    update_template(
+        template_id=created.id,
+        payload=TemplateUpdate(content="v2 {tone}"),
+        session=db_session,
+        actor=actor,
+    )
+    assert get_cached_template(db_session, **key).content == "v2 {tone}"
+    assert fake_redis.published[-1][1]["namespace"] == "templates"
+
+    delete_template(template_id=created.id, session=db_session, actor=actor)
+    assert get_cached_template(db_session, **key) is None
+
+
+def test_missing_templates_are_not_cached(db_session: Session, actor: AuthContext, _clean_template_cache):
+    assert get_cached_template(db_session, workspace_id=actor.workspace_id, template_id=1) is None
+
+    created = create_template(
+        payload=TemplateCreate(name="Late", kind="tweet", content="hello {tone}"),
+        session=db_session,
+        actor=actor,
+    )
+    assert created.id == 1
+    assert get_cached_template(db_session, workspace_id=actor.workspace_id, template_id=1).content == "hello {tone}"
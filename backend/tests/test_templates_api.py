@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from sqlmodel import Session
 
 from trendr_api.auth import AuthContext
@@ -45,9 +45,9 @@ def test_list_templates_filters_workspace_and_kind(
         actor=other_actor,
     )
 
-    actor_items = list_templates(session=db_session, actor=actor)
-    actor_tweets = list_templates(kind="tweet", session=db_session, actor=actor)
-    other_items = list_templates(session=db_session, actor=other_actor)
+    actor_items = list_templates(response=Response(), session=db_session, actor=actor)
+    actor_tweets = list_templates(response=Response(), kind="tweet", session=db_session, actor=actor)
+    other_items = list_templates(response=Response(), session=db_session, actor=other_actor)
 
     assert len(actor_items) == 2
     assert len(actor_tweets) == 1
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlmodel import Session, select
+
+from trendr_api.auth import AuthContext
+from trendr_api.models import Artifact, Job, Project
+from trendr_api.services.generate import build_prompt
+from trendr_api.services.transcript_analysis import (
+    ANALYSIS_KIND,
+    ANALYSIS_VERSION,
+    analyze_transcript,
+    source_facts_from_analysis,
+)
+from trendr_api.services.transcript_segments import insert_segment_rows, segment_rows
+from trendr_api.worker import tasks
+
+FILLER = "um so yeah we were just kind of talking about stuff"
+SEGMENTS = [
+    {"start": float(i * 10), "end": float(i * 10 + 10), "text": FILLER} for i in range(20)
+] + [
+    {"start": 200.0, "end": 210.0, "text": "Postgres keyset pagination keeps deep pages fast"},
+    {"start": 210.0, "end": 220.0, "text": FILLER},
+    {"start": 260.0, "end": 270.0, "text": "Composite indexes let Postgres skip the sort entirely"},
+]
+
+
+def test_analysis_ranks_informative_segments_and_spaces_key_moments():
+    analysis = analyze_transcript(" ".join(s["text"] for s in SEGMENTS), SEGMENTS)
+
+    assert analysis["version"] == ANALYSIS_VERSION
+    assert analysis["keywords"][0] == "postgres"
+    assert analysis["chunks"][0]["first"] == 0
+    assert analysis["chunks"][-1]["last"] == len(SEGMENTS) - 1
+
+    moments = analysis["key_moments"]
+    assert [m["start"] for m in moments] == sorted(m["start"] for m in moments)
+    assert all(b["start"] - a["start"] >= 30.0 for a, b in zip(moments, moments[1:]))
+    assert {200.0, 260.0} <= {m["start"] for m in moments}
+
+    facts = source_facts_from_analysis(analysis, limit=2)
+    assert facts.splitlines() == [
+        "- [200.0-210.0] Postgres keyset pagination keeps deep pages fast",
+        "- [260.0-270.0] Composite indexes let Postgres skip the sort entirely",
+    ]
+    ranged = source_facts_from_analysis(analysis, start_seconds=255.0, end_seconds=300.0, limit=2)
+    assert ranged.splitlines() == ["- [260.0-270.0] Composite indexes let Postgres skip the sort entirely"]
+
+
+def test_analysis_falls_back_to_sentences_without_segments():
+    text = "Short one. Keyset pagination avoids scanning skipped rows on every page. Fine."
+    analysis = analyze_transcript(text, None)
+
+    assert analysis["key_moments"] == []
+    assert source_facts_from_analysis(analysis) == "- Keyset pagination avoids scanning skipped rows on every page."
+
+
+def test_build_prompt_prefers_precomputed_source_facts():
+    prompt = build_prompt(
+        transcript="This is the transcript.",
+        segments=[{"start": 0.0, "end": 2.0, "text": "Raw segment line"}],
+        output_kind="tweet",
+        tone="professional",
+        brand_voice=None,
+        audience=None,
+        notes=None,
+        template_content="Facts={source_facts}",
+        source_facts="- precomputed fact",
+    )
+    assert prompt == "Facts=- precomputed fact"
+
+
+def test_generate_uses_stored_analysis_and_backfills_legacy_transcripts(
+    sqlite_engine, db_session: Session, actor: AuthContext, monkeypatch
+):
+    prompts_facts: list[Any] = []
+
+    async def _fake_generate_text_output(*, output_kind: str, source_facts: str | None, **_: object):
+        prompts_facts.append(source_facts)
+        return f"{output_kind} draft"
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "generate_text_output", _fake_generate_text_output)
+
+    project = Project(workspace_id=actor.workspace_id, name="P", source_type="youtube", source_ref="u")
+    db_session.add(project)
+    db_session.flush()
+    transcript = Artifact(
+        workspace_id=actor.workspace_id,
+        project_id=project.id,
+        kind="transcript",
+        content=" ".join(s["text"] for s in SEGMENTS),
+        meta={"segment_count": len(SEGMENTS)},
+    )
+    db_session.add(transcript)
+    db_session.flush()
+    insert_segment_rows(db_session, segment_rows(transcript.id, SEGMENTS))
+    db_session.commit()
+
+    def _run_generate() -> None:
+        job = Job(
+            kind="generate",
+            workspace_id=actor.workspace_id,
+            project_id=project.id,
+            input={"project_id": project.id, "outputs": ["tweet", "blog"]},
+            output={},
+        )
+        db_session.add(job)
+        db_session.commit()
+        assert tasks.generate_posts.run(job.id) == {"ok": True}
+
+    _run_generate()
+    analyses = db_session.exec(select(Artifact).where(Artifact.kind == ANALYSIS_KIND)).all()
+    assert len(analyses) == 1
+    assert analyses[0].meta["transcript_artifact_id"] == transcript.id
+
+    _run_generate()
+    assert len(db_session.exec(select(Artifact).where(Artifact.kind == ANALYSIS_KIND)).all()) == 1
+    assert len(set(prompts_facts)) == 1
+    assert "Postgres keyset pagination" in prompts_facts[0]
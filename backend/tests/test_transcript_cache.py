@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from trendr_api.auth import resolve_auth_context
+from trendr_api.config import settings
+from trendr_api.models import Job, Project, TranscriptCache
+from trendr_api.observability import metrics
+from trendr_api.services import transcript_cache
+from trendr_api.services.transcript_cache import lookup_transcripts, store_transcripts
+from trendr_api.worker import tasks
+
+VIDEO_URL = "https://youtu.be/dQw4w9WgXcQ"
+TRANSCRIPT = {
+    "video_id": "dQw4w9WgXcQ",
+    "text": "never gonna give you up",
+    "segments": [{"start": 0.0, "end": 2.0, "text": "never gonna give you up"}],
+}
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key: str, value: str, ex: int | None = None):
+        self.values[key] = value
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def publish(self, channel: str, message: str):
+        return 0
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> _FakeRedis:
+    fake = _FakeRedis()
+    monkeypatch.setattr(transcript_cache, "get_redis", lambda: fake)
+    return fake
+
+
+def test_store_then_lookup_serves_from_redis_then_database(db_session: Session, fake_redis: _FakeRedis):
+    store_transcripts(db_session, [TRANSCRIPT])
+    assert json.loads(fake_redis.values["trendr:transcript:en:dQw4w9WgXcQ"])["text"] == TRANSCRIPT["text"]
+
+    redis_hits = metrics.counter_value("cache_hits_total", cache="transcript_redis")
+    assert lookup_transcripts(db_session, ["dQw4w9WgXcQ"]) == {"dQw4w9WgXcQ": TRANSCRIPT}
+    assert metrics.counter_value("cache_hits_total", cache="transcript_redis") == redis_hits + 1
+
+    fake_redis.values.clear()
+    db_hits = metrics.counter_value("cache_hits_total", cache="transcript_db")
+    assert lookup_transcripts(db_session, ["dQw4w9WgXcQ", "missing0000"]) == {"dQw4w9WgXcQ": TRANSCRIPT}
+    assert metrics.counter_value("cache_hits_total", cache="transcript_db") == db_hits + 1
+    assert "trendr:transcript:en:dQw4w9WgXcQ" in fake_redis.values  # backfilled
+
+
+def test_expired_rows_are_misses_and_store_updates_in_place(db_session: Session, fake_redis: _FakeRedis):
+    store_transcripts(db_session, [TRANSCRIPT])
+    row = db_session.exec(select(TranscriptCache)).one()
+    row.fetched_at = datetime.utcnow() - timedelta(seconds=settings.transcript_cache_ttl_seconds + 60)
+    db_session.add(row)
+    db_session.commit()
+    fake_redis.values.clear()
+
+    assert lookup_transcripts(db_session, ["dQw4w9WgXcQ"]) == {}
+
+    store_transcripts(db_session, [{**TRANSCRIPT, "text": "updated"}])
+    rows = db_session.exec(select(TranscriptCache)).all()
+    assert [r.text for r in rows] == ["updated"]
+
+
+def _ingest_job(session: Session, workspace_slug: str, *, refresh: bool = False) -> int:
+    actor = resolve_auth_context(session=session, user_external_id=workspace_slug, workspace_slug=workspace_slug)
+    project = Project(workspace_id=actor.workspace_id, name="P", source_type="youtube", source_ref=VIDEO_URL)
+    session.add(project)
+    session.commit()
+    session.refresh(project)
+    job = Job(
+        kind="ingest",
+        status="queued",
+        workspace_id=actor.workspace_id,
+        project_id=project.id,
+        input={"url": VIDEO_URL, "refresh_transcript": refresh},
+        output={},
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job.id
+
+
+def test_ingest_reuses_transcripts_across_workspaces_unless_refreshed(
+    sqlite_engine,
+    db_session: Session,
+    fake_redis: _FakeRedis,
+    monkeypatch,
+):
+    fetches: list[str] = []
+
+    async def _fake_metadata(url: str):
+        return {"url": url, "title": "Demo"}
+
+    async def _fake_transcript(url: str):
+        fetches.append(url)
+        return dict(TRANSCRIPT)
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "fetch_youtube_metadata", _fake_metadata)
+    monkeypatch.setattr(tasks, "fetch_youtube_transcript", _fake_transcript)
+
+    first = _ingest_job(db_session, "ws-a")
+    second = _ingest_job(db_session, "ws-b")
+    refreshed = _ingest_job(db_session, "ws-c", refresh=True)
+
+    tasks.ingest_youtube.run(first)
+    tasks.ingest_youtube.run(second)
+    assert len(fetches) == 1
+    tasks.ingest_youtube.run(refreshed)
+    assert len(fetches) == 2
+
+    db_session.expire_all()
+    outputs = {job_id: db_session.get(Job, job_id).output for job_id in (first, second, refreshed)}
+    assert [outputs[j]["transcript_cached"] for j in (first, second, refreshed)] == [False, True, False]
+    assert outputs[second]["transcript_chars"] == len(TRANSCRIPT["text"])
+
+
+def test_fallback_language_transcripts_are_not_served_as_english(db_session: Session, fake_redis: _FakeRedis):
+    german = {**TRANSCRIPT, "language": "de"}
+    store_transcripts(db_session, [german])
+
+    assert "trendr:transcript:de:dQw4w9WgXcQ" in fake_redis.values
+    assert db_session.exec(select(TranscriptCache.language)).all() == ["de"]
+    assert lookup_transcripts(db_session, ["dQw4w9WgXcQ"]) == {}
+    assert lookup_transcripts(db_session, ["dQw4w9WgXcQ"], language="de") == {"dQw4w9WgXcQ": german}
+
+
+def test_ingest_succeeds_when_the_cache_write_fails(sqlite_engine, db_session: Session, monkeypatch):
+    async def _fake_metadata(url: str):
+        return {"url": url, "title": "Demo"}
+
+    async def _fake_transcript(url: str):
+        return dict(TRANSCRIPT)
+
+    def _broken_store(*_, **__):
+        raise RuntimeError("cache unavailable")
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "fetch_youtube_metadata", _fake_metadata)
+    monkeypatch.setattr(tasks, "fetch_youtube_transcript", _fake_transcript)
+    monkeypatch.setattr(tasks, "store_transcripts", _broken_store)
+
+    job_id = _ingest_job(db_session, "ws-broken-cache")
+    assert tasks.ingest_youtube.run(job_id) == {"ok": True}
+
+    db_session.expire_all()
+    assert db_session.get(Job, job_id).status == "succeeded"
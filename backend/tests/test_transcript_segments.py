@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException, Request, Response
+from sqlmodel import Session, select
+
+from trendr_api.api.artifacts import list_artifacts, list_transcript_segments
+from trendr_api.auth import AuthContext
+from trendr_api.models import Artifact, Job, Project, TranscriptSegment
+from trendr_api.services.transcript_segments import insert_segment_rows, load_segments, segment_rows
+from trendr_api.worker import tasks
+
+SEGMENTS = [
+    {"start": 0.0, "end": 5.0, "text": "intro"},
+    {"start": 5.0, "end": 10.0, "text": "first point"},
+    {"start": 10.0, "end": 15.0, "text": "second point"},
+    {"start": 15.0, "end": 20.0, "text": "outro"},
+]
+
+
+def _seed_transcript(session: Session, actor: AuthContext) -> Artifact:
+    project = Project(workspace_id=actor.workspace_id, name="P", source_type="youtube", source_ref="u")
+    session.add(project)
+    session.flush()
+    artifact = Artifact(
+        workspace_id=actor.workspace_id,
+        project_id=project.id,
+        kind="transcript",
+        title="Transcript",
+        content=" ".join(s["text"] for s in SEGMENTS),
+        meta={"segment_count": len(SEGMENTS)},
+    )
+    session.add(artifact)
+    session.flush()
+    insert_segment_rows(session, segment_rows(artifact.id, SEGMENTS))
+    session.commit()
+    session.refresh(artifact)
+    return artifact
+
+
+def test_load_segments_range_queries_by_time(db_session: Session, actor: AuthContext):
+    artifact = _seed_transcript(db_session, actor)
+
+    assert load_segments(db_session, artifact.id) == SEGMENTS
+    # Overlap semantics: a segment ending exactly at `start` is excluded.
+    assert [s["text"] for s in load_segments(db_session, artifact.id, start=5.0, end=12.0)] == [
+        "first point",
+        "second point",
+    ]
+    assert [s["text"] for s in load_segments(db_session, artifact.id, start=12.0, limit=1)] == ["second point"]
+
+
+def test_segments_endpoint_scopes_by_workspace(
+    db_session: Session, actor: AuthContext, other_actor: AuthContext
+):
+    artifact = _seed_transcript(db_session, actor)
+
+    rows = list_transcript_segments(
+        artifact_id=artifact.id, start=15.0, end=None, limit=500, session=db_session, actor=actor
+    )
+    assert [(r.start, r.text) for r in rows] == [(15.0, "outro")]
+
+    with pytest.raises(HTTPException) as exc_info:
+        list_transcript_segments(
+            artifact_id=artifact.id, start=None, end=None, limit=500, session=db_session, actor=other_actor
+        )
+    assert exc_info.value.status_code == 404
+
+    listed = list_artifacts(
+        request=Request({"type": "http", "headers": []}),
+        response=Response(),
+        project_id=artifact.project_id,
+        session=db_session,
+        actor=actor,
+    )
+    assert "segments" not in listed[0]["meta"]
+
+
+def test_ingest_writes_segment_rows_instead_of_meta(sqlite_engine, db_session: Session, actor: AuthContext, monkeypatch):
+    async def _fake_metadata(url: str):
+        return {"url": url}
+
+    async def _fake_transcript(url: str):
+        return {"video_id": "dQw4w9WgXcQ", "text": "intro first point", "segments": SEGMENTS[:2]}
+
+    monkeypatch.setattr(tasks, "engine", sqlite_engine)
+    monkeypatch.setattr(tasks, "fetch_youtube_metadata", _fake_metadata)
+    monkeypatch.setattr(tasks, "fetch_youtube_transcript", _fake_transcript)
+    monkeypatch.setattr(tasks, "lookup_transcripts", lambda session, video_ids: {})
+    monkeypatch.setattr(tasks, "store_transcripts", lambda session, transcripts: None)
+
+    project = Project(workspace_id=actor.workspace_id, name="P", source_type="youtube", source_ref="u")
+    db_session.add(project)
+    db_session.commit()
+    job = Job(
+        kind="ingest",
+        status="queued",
+        workspace_id=actor.workspace_id,
+        project_id=project.id,
+        input={"url": "https://youtu.be/dQw4w9WgXcQ"},
+        output={},
+    )
+    db_session.add(job)
+    db_session.commit()
+
+    tasks.ingest_youtube.run(job.id)
+
+    transcript = db_session.exec(select(Artifact).where(Artifact.kind == "transcript")).one()
+    assert transcript.meta == {"segment_count": 2}
+    stored = db_session.exec(
+        select(TranscriptSegment).where(TranscriptSegment.artifact_id == transcript.id)
+    ).all()
+    assert [(s.position, s.text) for s in stored] == [(0, "intro"), (1, "first point")]
+
+
+def test_generation_source_loads_only_the_requested_clip(db_session: Session, actor: AuthContext):
+    artifact = _seed_transcript(db_session, actor)
+
+    text, segments, _facts = tasks._load_generation_source(
+        db_session,
+        workspace_id=actor.workspace_id,
+        project_id=artifact.project_id,
+        start_seconds=6.0,
+        end_seconds=11.0,
+    )
+    assert text == "first point second point"
+    assert len(segments) == 2
+
+    full_text, all_segments, _facts = tasks._load_generation_source(
+        db_session,
+        workspace_id=actor.workspace_id,
+        project_id=artifact.project_id,
+    )
+    assert full_text == artifact.content
+    assert all_segments == SEGMENTS
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from trendr_api.observability import clear_job_id, get_job_id, set_job_id
+from trendr_api.worker.event_loop import WorkerEventLoop, shared_semaphore
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+def test_worker_event_loop_reuses_one_loop_across_calls():
+    worker_loop = WorkerEventLoop()
+    try:
+        first = worker_loop.run(_current_loop())
+        second = worker_loop.run(_current_loop())
+        assert first is second
+        assert first.is_running()
+    finally:
+        worker_loop.stop()
+
+    assert first.is_closed()
+
+
+def test_worker_event_loop_propagates_results_errors_and_context():
+    async def _job_id():
+        return get_job_id()
+
+    async def _boom():
+        raise ValueError("boom")
+
+    worker_loop = WorkerEventLoop()
+    set_job_id(42)
+    try:
+        assert worker_loop.run(_job_id()) == "42"
+        with pytest.raises(ValueError, match="boom"):
+            worker_loop.run(_boom())
+    finally:
+        clear_job_id()
+        worker_loop.stop()
+
+
+def test_worker_event_loop_restarts_after_stop():
+    worker_loop = WorkerEventLoop()
+    first = worker_loop.run(_current_loop())
+    worker_loop.stop()
+    try:
+        second = worker_loop.run(_current_loop())
+        assert second is not first
+    finally:
+        worker_loop.stop()
+
+
+def test_worker_event_loop_rejects_reentrant_blocking_calls():
+    worker_loop = WorkerEventLoop()
+
+    async def _reenter():
+        worker_loop.run(_current_loop())
+
+    try:
+        with pytest.raises(RuntimeError, match="own thread"):
+            worker_loop.run(_reenter())
+    finally:
+        worker_loop.stop()
+
+
+def test_shared_semaphore_is_shared_per_key_on_a_loop():
+    async def _pair():
+        return (
+            shared_semaphore(("generate", 1), 2),
+            shared_semaphore(("generate", 1), 2),
+            shared_semaphore(("generate", 2), 2),
+        )
+
+    worker_loop = WorkerEventLoop()
+    try:
+        same_a, same_b, other = worker_loop.run(_pair())
+    finally:
+        worker_loop.stop()
+
+    assert same_a is same_b
+    assert same_a is not other
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from sqlmodel import Session
 
 from trendr_api.api.workflows import create_workflow, list_workflows, run_workflow as run_workflow_api
@@ -59,8 +59,8 @@ def test_create_and_list_workflows_scoped_to_workspace(
         actor=other_actor,
     )
 
-    mine = list_workflows(session=db_session, actor=actor)
-    theirs = list_workflows(session=db_session, actor=other_actor)
+    mine = list_workflows(response=Response(), session=db_session, actor=actor)
+    theirs = list_workflows(response=Response(), session=db_session, actor=other_actor)
     assert len(mine) == 1
     assert len(theirs) == 1
     assert mine[0].workspace_id == actor.workspace_id
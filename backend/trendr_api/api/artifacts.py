@@ -1,31 +1,133 @@
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+import json
+from typing import Any, Iterable, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func
 from sqlmodel import Session, select
 from ..auth import AuthContext, require_auth
 from ..db import get_session
 from ..models import Artifact
-from ..schemas import ArtifactUpdate
+from ..schemas import ArtifactContentOut, ArtifactUpdate, TranscriptSegmentOut
+from ..services.transcript_segments import load_segments
+from .pagination import MAX_PAGE_SIZE, keyset, set_next_cursor, split_page
 
 router = APIRouter(prefix="/artifacts", tags=["artifacts"])
 
+ARTIFACT_FIELDS = ("id", "workspace_id", "project_id", "kind", "title", "content", "meta", "created_at")
+SUMMARY_FIELDS = ("id", "kind", "title", "meta", "created_at", "content_length", "preview")
+SUMMARY_PREVIEW_CHARS = 200
+
+
+def parse_artifact_fields(fields: str | None, *, summary: bool = False) -> tuple[str, ...]:
+    """Resolve the `fields=` projection; `id` is always included for cursors."""
+    if summary:
+        return SUMMARY_FIELDS
+    if not fields:
+        return ARTIFACT_FIELDS
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(ARTIFACT_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown artifact fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+def _artifact_columns(names: Sequence[str]) -> list[Any]:
+    computed = {
+        "content_length": func.length(Artifact.content).label("content_length"),
+        "preview": func.substr(Artifact.content, 1, SUMMARY_PREVIEW_CHARS).label("preview"),
+    }
+    return [computed[name] if name in computed else getattr(Artifact, name) for name in names]
+
+
+def list_artifacts_query(
+    *,
+    workspace_id: int,
+    project_id: int,
+    kind: str | None,
+    fields: Sequence[str] = ARTIFACT_FIELDS,
+    cursor: int | None = None,
+    limit: int = MAX_PAGE_SIZE,
+):
+    stmt = select(*_artifact_columns(fields)).where(
+        Artifact.workspace_id == workspace_id,
+        Artifact.project_id == project_id,
+    )
+    if kind is not None:
+        stmt = stmt.where(Artifact.kind == kind)
+    return keyset(stmt, Artifact.id, cursor=cursor, limit=limit)
+
+
+def artifact_page(
+    rows: Iterable[Any], fields: Sequence[str], limit: int
+) -> tuple[list[dict[str, Any]], int | None]:
+    """Turn projected rows into dicts and return them with the next cursor, if any."""
+    items = [dict(zip(fields, row if len(fields) > 1 else (row,))) for row in rows]
+    return split_page(items, limit, lambda item: item["id"])
+
+
+def conditional_response(request: Request, response: Response, payload: Any) -> Any:
+    """Tag `payload` with a weak ETag and answer 304 when the client already has it."""
+    body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    etag = f'W/"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*":
+        return Response(status_code=304, headers={"ETag": etag, **dict(response.headers)})
+    response.headers["ETag"] = etag
+    return payload
+
+
+def artifact_list_response(
+    request: Request, response: Response, items: list[dict[str, Any]], next_cursor: int | None
+) -> Any:
+    set_next_cursor(response, next_cursor)
+    return conditional_response(request, response, items)
+
+
 @router.get("")
 def list_artifacts(
+    request: Request,
+    response: Response,
     project_id: int,
     kind: str | None = None,
+    fields: str | None = None,
+    summary: bool = False,
+    cursor: int | None = None,
+    limit: int = MAX_PAGE_SIZE,
     session: Session = Depends(get_session),
     actor: AuthContext = Depends(require_auth),
 ):
-    stmt = (
-        select(Artifact)
-        .where(
-            Artifact.project_id == project_id,
+    names = parse_artifact_fields(fields, summary=summary)
+    stmt = list_artifacts_query(
+        workspace_id=actor.workspace_id,
+        project_id=project_id,
+        kind=kind,
+        fields=names,
+        cursor=cursor,
+        limit=limit,
+    )
+    items, next_cursor = artifact_page(session.exec(stmt).all(), names, limit)
+    return artifact_list_response(request, response, items, next_cursor)
+
+
+@router.get("/{artifact_id}/content", response_model=ArtifactContentOut)
+def get_artifact_content(
+    request: Request,
+    response: Response,
+    artifact_id: int,
+    session: Session = Depends(get_session),
+    actor: AuthContext = Depends(require_auth),
+):
+    row = session.exec(
+        select(Artifact.id, Artifact.kind, Artifact.content).where(
+            Artifact.id == artifact_id,
             Artifact.workspace_id == actor.workspace_id,
         )
-        .order_by(Artifact.id.desc())
-    )
-    if kind is not None:
-        stmt = stmt.where(Artifact.kind == kind)
-    rows = session.exec(stmt).all()
-    return [a.model_dump() for a in rows]
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return conditional_response(request, response, ArtifactContentOut(id=row[0], kind=row[1], content=row[2]))
 
 
 @router.patch("/{artifact_id}")
@@ -52,3 +154,25 @@ def update_artifact(
     session.commit()
     session.refresh(artifact)
     return artifact.model_dump()
+
+
+@router.get("/{artifact_id}/segments", response_model=list[TranscriptSegmentOut])
+def list_transcript_segments(
+    artifact_id: int,
+    start: float | None = Query(default=None, ge=0),
+    end: float | None = Query(default=None, ge=0),
+    limit: int = Query(default=500, ge=1, le=5000),
+    session: Session = Depends(get_session),
+    actor: AuthContext = Depends(require_auth),
+):
+    artifact_id_found = session.exec(
+        select(Artifact.id).where(
+            Artifact.id == artifact_id,
+            Artifact.workspace_id == actor.workspace_id,
+            Artifact.kind == "transcript",
+        )
+    ).first()
+    if artifact_id_found is None:
+        raise HTTPException(status_code=404, detail="Transcript artifact not found")
+    segments = load_segments(session, artifact_id, start=start, end=end, limit=limit)
+    return [TranscriptSegmentOut(**segment) for segment in segments]
@@ -0,0 +1,155 @@
+"""Async variants of the hot read endpoints, mounted when `DB_ASYNC_ENABLED` is set.
+
+Routes here share paths with the sync routers and are included ahead of them, so
+they take precedence. Queries come from the same builders the sync handlers use.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..auth import AuthContext, require_auth_async
+from ..db import get_async_session
+from ..schemas import (
+    AnalyticsSummaryOut,
+    JobOut,
+    ProjectOut,
+    ScheduledPostOut,
+    TimelinePointOut,
+)
+from ..services.analytics import summary_query, summary_rows, timeline_query, timeline_rows
+from .artifacts import (
+    artifact_list_response,
+    artifact_page,
+    list_artifacts_query,
+    parse_artifact_fields,
+)
+from .jobs import get_job_query, list_jobs_query
+from .pagination import MAX_PAGE_SIZE, set_next_cursor, split_page
+from .projects import get_project_query, list_projects_query, to_project_out
+from .schedule import list_scheduled_posts_query
+
+router = APIRouter()
+
+
+@router.get("/jobs", response_model=list[JobOut], tags=["jobs"])
+async def list_jobs(
+    response: Response,
+    project_id: int | None = None,
+    limit: int = 50,
+    cursor: int | None = None,
+    session: AsyncSession = Depends(get_async_session),
+    actor: AuthContext = Depends(require_auth_async),
+):
+    stmt = list_jobs_query(workspace_id=actor.workspace_id, project_id=project_id, limit=limit, cursor=cursor)
+    rows, next_cursor = split_page((await session.exec(stmt)).all(), limit)
+    set_next_cursor(response, next_cursor)
+    return [JobOut(**row.model_dump()) for row in rows]
+
+
+@router.get("/jobs/{job_id}", response_model=JobOut, tags=["jobs"])
+async def get_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    actor: AuthContext = Depends(require_auth_async),
+):
+    job = (await session.exec(get_job_query(workspace_id=actor.workspace_id, job_id=job_id))).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobOut(**job.model_dump())
+
+
+@router.get("/artifacts", tags=["artifacts"])
+async def list_artifacts(
+    request: Request,
+    response: Response,
+    project_id: int,
+    kind: str | None = None,
+    fields: str | None = None,
+    summary: bool = False,
+    cursor: int | None = None,
+    limit: int = MAX_PAGE_SIZE,
+    session: AsyncSession = Depends(get_async_session),
+    actor: AuthContext = Depends(require_auth_async),
+):
+    names = parse_artifact_fields(fields, summary=summary)
+    stmt = list_artifacts_query(
+        workspace_id=actor.workspace_id,
+        project_id=project_id,
+        kind=kind,
+        fields=names,
+        cursor=cursor,
+        limit=limit,
+    )
+    items, next_cursor = artifact_page((await session.exec(stmt)).all(), names, limit)
+    return artifact_list_response(request, response, items, next_cursor)
+
+
+@router.get("/projects", response_model=list[ProjectOut], tags=["projects"])
+async def list_projects(
+    response: Response,
+    cursor: int | None = None,
+    limit: int = MAX_PAGE_SIZE,
+    session: AsyncSession = Depends(get_async_session),
+    actor: AuthContext = Depends(require_auth_async),
+):
+    stmt = list_projects_query(workspace_id=actor.workspace_id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page((await session.exec(stmt)).all(), limit)
+    set_next_cursor(response, next_cursor)
+    return [to_project_out(p) for p in rows]
+
+
+@router.get("/projects/{project_id}", response_model=ProjectOut, tags=["projects"])
+async def get_project(
+    project_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    actor: AuthContext = Depends(require_auth_async),
+):
+    project = (
+        await session.exec(get_project_query(workspace_id=actor.workspace_id, project_id=project_id))
+    ).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return to_project_out(project)
+
+
+@router.get("/schedule", response_model=list[ScheduledPostOut], tags=["schedule"])
+async def list_scheduled_posts(
+    session: AsyncSession = Depends(get_async_session),
+    actor: AuthContext = Depends(require_auth_async),
+    project_id: Optional[int] = Query(default=None),
+    status: Optional[str] = Query(default=None),
+    platform: Optional[str] = Query(default=None),
+    limit: int = Query(default=50, le=200),
+):
+    stmt = list_scheduled_posts_query(
+        workspace_id=actor.workspace_id,
+        project_id=project_id,
+        status=status,
+        platform=platform,
+        limit=limit,
+    )
+    rows = (await session.exec(stmt)).all()
+    return [ScheduledPostOut(**r.model_dump()) for r in rows]
+
+
+@router.get("/analytics/summary", response_model=list[AnalyticsSummaryOut], tags=["analytics"])
+async def analytics_summary(
+    session: AsyncSession = Depends(get_async_session),
+    actor: AuthContext = Depends(require_auth_async),
+    days: int = Query(default=30, ge=1, le=365),
+):
+    rows = (await session.exec(summary_query(workspace_id=actor.workspace_id, days=days))).all()
+    return [AnalyticsSummaryOut(**r) for r in summary_rows(rows)]
+
+
+@router.get("/analytics/timeline", response_model=list[TimelinePointOut], tags=["analytics"])
+async def analytics_timeline(
+    session: AsyncSession = Depends(get_async_session),
+    actor: AuthContext = Depends(require_auth_async),
+    days: int = Query(default=30, ge=1, le=365),
+):
+    rows = (await session.exec(timeline_query(workspace_id=actor.workspace_id, days=days))).all()
+    return [TimelinePointOut(**r) for r in timeline_rows(rows)]
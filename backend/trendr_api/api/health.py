@@ -6,6 +6,7 @@ from sqlalchemy import text
 
 from ..config import settings
 from ..db import engine
+from ..observability import metrics
 
 router = APIRouter(tags=["health"])
 
@@ -38,3 +39,8 @@ def health(response: Response):
         response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
 
     return {"status": overall, "checks": checks}
+
+
+@router.get("/metrics")
+def metrics_snapshot():
+    return metrics.snapshot()
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 from ..auth import AuthContext, require_auth
+from ..config import settings
 from ..db import get_session
 from ..models import Project, Job
-from ..schemas import IngestYouTubeRequest, JobOut
+from ..schemas import IngestYouTubeBatchRequest, IngestYouTubeRequest, JobOut
 from ..worker import tasks
 
 router = APIRouter(prefix="/ingest", tags=["ingest"])
@@ -30,7 +31,7 @@ def ingest_youtube(
         status="queued",
         workspace_id=actor.workspace_id,
         project_id=project.id,
-        input={"url": str(payload.url)},
+        input={"url": str(payload.url), "refresh_transcript": payload.refresh_transcript},
     )
     session.add(job)
     session.commit()
@@ -43,3 +44,73 @@ def ingest_youtube(
     session.refresh(job)
 
     return JobOut(**job.model_dump())
+
+
+@router.post("/youtube/batch", response_model=JobOut)
+def ingest_youtube_batch(
+    payload: IngestYouTubeBatchRequest,
+    session: Session = Depends(get_session),
+    actor: AuthContext = Depends(require_auth),
+):
+    urls = list(dict.fromkeys(str(url) for url in payload.urls))
+    if len(urls) > settings.ingest_batch_max_urls:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can contain at most {settings.ingest_batch_max_urls} URLs",
+        )
+
+    name = payload.project_name or "YouTube Import"
+    projects = [
+        Project(
+            workspace_id=actor.workspace_id,
+            name=name,
+            source_type="youtube",
+            source_ref=url,
+        )
+        for url in urls
+    ]
+    parent = Job(
+        kind="ingest_batch",
+        status="queued",
+        workspace_id=actor.workspace_id,
+        input={"urls": urls},
+    )
+    session.add_all(projects)
+    session.add(parent)
+    session.flush()
+
+    children = [
+        Job(
+            kind="ingest",
+            status="queued",
+            workspace_id=actor.workspace_id,
+            project_id=project.id,
+            input={
+                "url": url,
+                "parent_job_id": parent.id,
+                "refresh_transcript": payload.refresh_transcript,
+            },
+        )
+        for project, url in zip(projects, urls)
+    ]
+    session.add_all(children)
+    session.flush()
+
+    child_job_ids = [child.id for child in children]
+    parent.output = {
+        "total": len(children),
+        "succeeded": 0,
+        "failed": 0,
+        "progress": 0.0,
+        "child_job_ids": child_job_ids,
+        "project_ids": [project.id for project in projects],
+    }
+    session.add(parent)
+    session.commit()
+
+    parent.task_id = tasks.dispatch_ingest_batch(parent.id, child_job_ids)
+    session.add(parent)
+    session.commit()
+    session.refresh(parent)
+
+    return JobOut(**parent.model_dump())
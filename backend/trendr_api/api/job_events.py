@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from ..auth import AuthContext, require_auth_async
+from ..db import engine
+from ..services.job_events import job_event_payload, sse_stream
+from .jobs import get_job_query
+
+# Included ahead of the jobs routers so `/jobs/events` is not taken for a job id.
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop nginx-style proxies from buffering the stream.
+    "X-Accel-Buffering": "no",
+}
+
+
+def _load_job_payload(*, workspace_id: int, job_id: int) -> dict[str, Any] | None:
+    # Short-lived session: a stream can stay open for minutes and must not pin a
+    # pooled connection.
+    with Session(engine) as session:
+        job = session.exec(get_job_query(workspace_id=workspace_id, job_id=job_id)).first()
+        return job_event_payload(job) if job else None
+
+
+@router.get("/events")
+async def stream_workspace_job_events(actor: AuthContext = Depends(require_auth_async)):
+    return StreamingResponse(
+        sse_stream(workspace_id=actor.workspace_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    actor: AuthContext = Depends(require_auth_async),
+):
+    async def snapshot() -> dict[str, Any] | None:
+        return await run_in_threadpool(
+            _load_job_payload,
+            workspace_id=actor.workspace_id,
+            job_id=job_id,
+        )
+
+    if await snapshot() is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return StreamingResponse(
+        sse_stream(workspace_id=actor.workspace_id, job_id=job_id, snapshot=snapshot),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
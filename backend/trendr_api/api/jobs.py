@@ -1,30 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 from ..auth import AuthContext, require_auth
 from ..db import get_session
 from ..models import Job
 from ..schemas import JobOut
+from .pagination import keyset, set_next_cursor, split_page
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
+def list_jobs_query(*, workspace_id: int, project_id: int | None, limit: int, cursor: int | None = None):
+    stmt = select(Job).where(Job.workspace_id == workspace_id)
+    if project_id is not None:
+        stmt = stmt.where(Job.project_id == project_id)
+    return keyset(stmt, Job.id, cursor=cursor, limit=limit)
+
+
+def get_job_query(*, workspace_id: int, job_id: int):
+    return select(Job).where(
+        Job.id == job_id,
+        Job.workspace_id == workspace_id,
+    )
+
+
 @router.get("", response_model=list[JobOut])
 def list_jobs(
+    response: Response,
     project_id: int | None = None,
     limit: int = 50,
+    cursor: int | None = None,
     session: Session = Depends(get_session),
     actor: AuthContext = Depends(require_auth),
 ):
-    safe_limit = max(1, min(limit, 200))
-    stmt = (
-        select(Job)
-        .where(Job.workspace_id == actor.workspace_id)
-        .order_by(Job.id.desc())
-        .limit(safe_limit)
-    )
-    if project_id is not None:
-        stmt = stmt.where(Job.project_id == project_id)
-    rows = session.exec(stmt).all()
+    stmt = list_jobs_query(workspace_id=actor.workspace_id, project_id=project_id, limit=limit, cursor=cursor)
+    rows, next_cursor = split_page(session.exec(stmt).all(), limit)
+    set_next_cursor(response, next_cursor)
     return [JobOut(**row.model_dump()) for row in rows]
 
 @router.get("/{job_id}", response_model=JobOut)
@@ -33,12 +43,7 @@ def get_job(
     session: Session = Depends(get_session),
     actor: AuthContext = Depends(require_auth),
 ):
-    job = session.exec(
-        select(Job).where(
-            Job.id == job_id,
-            Job.workspace_id == actor.workspace_id,
-        )
-    ).first()
+    job = session.exec(get_job_query(workspace_id=actor.workspace_id, job_id=job_id)).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return JobOut(**job.model_dump())
@@ -0,0 +1,45 @@
+"""Keyset (cursor) pagination shared by the list endpoints.
+
+Lists are ordered newest first by primary key. The cursor is the id of the last
+row on a page; it is returned in the `X-Next-Cursor` header and sent back as
+`?cursor=` to fetch the next page. Queries fetch one extra row to detect the end.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence, TypeVar
+
+from fastapi import Response
+
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset(stmt, id_column, *, cursor: int | None, limit: int):
+    stmt = stmt.order_by(id_column.desc()).limit(clamp_limit(limit) + 1)
+    if cursor is not None:
+        stmt = stmt.where(id_column < cursor)
+    return stmt
+
+
+def split_page(
+    rows: Sequence[T],
+    limit: int,
+    cursor_of: Callable[[T], int] = lambda row: row.id,  # type: ignore[attr-defined]
+) -> tuple[list[T], int | None]:
+    safe_limit = clamp_limit(limit)
+    items = list(rows)
+    if len(items) <= safe_limit:
+        return items, None
+    items = items[:safe_limit]
+    return items, cursor_of(items[-1])
+
+
+def set_next_cursor(response: Response, next_cursor: Any) -> None:
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
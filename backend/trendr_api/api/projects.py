@@ -1,12 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 from ..auth import AuthContext, require_auth
 from ..db import get_session
 from ..models import Project
 from ..schemas import ProjectCreate, ProjectOut
+from .pagination import MAX_PAGE_SIZE, keyset, set_next_cursor, split_page
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+
+def to_project_out(project: Project) -> ProjectOut:
+    return ProjectOut(
+        id=project.id,
+        workspace_id=project.workspace_id,
+        name=project.name,
+        source_type=project.source_type,
+        source_ref=project.source_ref,
+    )
+
+
+def list_projects_query(*, workspace_id: int, cursor: int | None = None, limit: int = MAX_PAGE_SIZE):
+    stmt = select(Project).where(Project.workspace_id == workspace_id)
+    return keyset(stmt, Project.id, cursor=cursor, limit=limit)
+
+
+def get_project_query(*, workspace_id: int, project_id: int):
+    return select(Project).where(
+        Project.id == project_id,
+        Project.workspace_id == workspace_id,
+    )
+
+
 @router.post("", response_model=ProjectOut)
 def create_project(
     payload: ProjectCreate,
@@ -22,34 +46,20 @@ def create_project(
     session.add(project)
     session.commit()
     session.refresh(project)
-    return ProjectOut(
-        id=project.id,
-        workspace_id=project.workspace_id,
-        name=project.name,
-        source_type=project.source_type,
-        source_ref=project.source_ref,
-    )
+    return to_project_out(project)
 
 @router.get("", response_model=list[ProjectOut])
 def list_projects(
+    response: Response,
+    cursor: int | None = None,
+    limit: int = MAX_PAGE_SIZE,
     session: Session = Depends(get_session),
     actor: AuthContext = Depends(require_auth),
 ):
-    rows = session.exec(
-        select(Project)
-        .where(Project.workspace_id == actor.workspace_id)
-        .order_by(Project.id.desc())
-    ).all()
-    return [
-        ProjectOut(
-            id=p.id,
-            workspace_id=p.workspace_id,
-            name=p.name,
-            source_type=p.source_type,
-            source_ref=p.source_ref,
-        )
-        for p in rows
-    ]
+    stmt = list_projects_query(workspace_id=actor.workspace_id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page(session.exec(stmt).all(), limit)
+    set_next_cursor(response, next_cursor)
+    return [to_project_out(p) for p in rows]
 
 
 @router.get("/{project_id}", response_model=ProjectOut)
@@ -59,17 +69,8 @@ def get_project(
     actor: AuthContext = Depends(require_auth),
 ):
     project = session.exec(
-        select(Project).where(
-            Project.id == project_id,
-            Project.workspace_id == actor.workspace_id,
-        )
+        get_project_query(workspace_id=actor.workspace_id, project_id=project_id)
     ).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return ProjectOut(
-        id=project.id,
-        workspace_id=project.workspace_id,
-        name=project.name,
-        source_type=project.source_type,
-        source_ref=project.source_ref,
-    )
+    return to_project_out(project)
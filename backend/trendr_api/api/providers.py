@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends
 
 from ..auth import AuthContext, require_auth
 from ..plugins.registry import registry
-from ..schemas import ProviderCapabilitiesOut, ProviderOut
+from ..resilience import circuit_breaker
+from ..schemas import ProviderCapabilitiesOut, ProviderCircuitOut, ProviderOut
 
 router = APIRouter(prefix="/providers", tags=["providers"])
 
@@ -14,6 +15,7 @@ def _to_provider_out(info: dict) -> ProviderOut:
         name=str(info["name"]),
         available=bool(info["available"]),
         capabilities=ProviderCapabilitiesOut(**dict(info.get("capabilities") or {})),
+        circuit=ProviderCircuitOut(**circuit_breaker.snapshot(str(info["name"]))),
     )
 
 
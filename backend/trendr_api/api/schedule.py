@@ -40,6 +40,26 @@ def create_scheduled_post(
     return ScheduledPostOut(**post.model_dump())
 
 
+def list_scheduled_posts_query(
+    *,
+    workspace_id: int,
+    project_id: Optional[int],
+    status: Optional[str],
+    platform: Optional[str],
+    limit: int,
+):
+    stmt = select(ScheduledPost).where(
+        ScheduledPost.workspace_id == workspace_id
+    )
+    if project_id is not None:
+        stmt = stmt.where(ScheduledPost.project_id == project_id)
+    if status is not None:
+        stmt = stmt.where(ScheduledPost.status == status)
+    if platform is not None:
+        stmt = stmt.where(ScheduledPost.platform == platform)
+    return stmt.order_by(ScheduledPost.scheduled_at.asc()).limit(limit)
+
+
 @router.get("", response_model=list[ScheduledPostOut])
 def list_scheduled_posts(
     session: Session = Depends(get_session),
@@ -49,16 +69,13 @@ def list_scheduled_posts(
     platform: Optional[str] = Query(default=None),
     limit: int = Query(default=50, le=200),
 ):
-    stmt = select(ScheduledPost).where(
-        ScheduledPost.workspace_id == actor.workspace_id
+    stmt = list_scheduled_posts_query(
+        workspace_id=actor.workspace_id,
+        project_id=project_id,
+        status=status,
+        platform=platform,
+        limit=limit,
     )
-    if project_id is not None:
-        stmt = stmt.where(ScheduledPost.project_id == project_id)
-    if status is not None:
-        stmt = stmt.where(ScheduledPost.status == status)
-    if platform is not None:
-        stmt = stmt.where(ScheduledPost.platform == platform)
-    stmt = stmt.order_by(ScheduledPost.scheduled_at.asc()).limit(limit)
     rows = session.exec(stmt).all()
     return [ScheduledPostOut(**r.model_dump()) for r in rows]
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
@@ -8,6 +8,9 @@ from ..auth import AuthContext, require_auth
 from ..db import get_session
 from ..models import Template
 from ..schemas import TemplateCreate, TemplateOut, TemplateUpdate
+from ..services.template_cache import publish_template_change
+from ..services.templates import validate_template
+from .pagination import MAX_PAGE_SIZE, keyset, set_next_cursor, split_page
 
 router = APIRouter(prefix="/templates", tags=["templates"])
 
@@ -25,21 +28,34 @@ def _to_out(template: Template) -> TemplateOut:
     )
 
 
+def _validate_content(content: str) -> None:
+    try:
+        validate_template(content)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def list_templates_query(
+    *, workspace_id: int, kind: str | None, cursor: int | None = None, limit: int = MAX_PAGE_SIZE
+):
+    stmt = select(Template).where(Template.workspace_id == workspace_id)
+    if kind is not None:
+        stmt = stmt.where(Template.kind == kind)
+    return keyset(stmt, Template.id, cursor=cursor, limit=limit)
+
+
 @router.get("", response_model=list[TemplateOut])
 def list_templates(
+    response: Response,
     kind: str | None = None,
+    cursor: int | None = None,
+    limit: int = MAX_PAGE_SIZE,
     session: Session = Depends(get_session),
     actor: AuthContext = Depends(require_auth),
 ):
-    stmt = (
-        select(Template)
-        .where(Template.workspace_id == actor.workspace_id)
-        .order_by(Template.id.desc())
-    )
-    if kind is not None:
-        stmt = stmt.where(Template.kind == kind)
-
-    rows = session.exec(stmt).all()
+    stmt = list_templates_query(workspace_id=actor.workspace_id, kind=kind, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page(session.exec(stmt).all(), limit)
+    set_next_cursor(response, next_cursor)
     return [_to_out(template) for template in rows]
 
 
@@ -49,6 +65,7 @@ def create_template(
     session: Session = Depends(get_session),
     actor: AuthContext = Depends(require_auth),
 ):
+    _validate_content(payload.content)
     version = payload.version
     if version is None:
         latest = session.exec(
@@ -104,6 +121,8 @@ def update_template(
         raise HTTPException(status_code=404, detail="Template not found")
 
     update_data = payload.model_dump(exclude_unset=True)
+    if update_data.get("content") is not None:
+        _validate_content(update_data["content"])
     for field, value in update_data.items():
         setattr(template, field, value)
 
@@ -117,6 +136,7 @@ def update_template(
             detail="Template conflict for workspace/name/kind/version",
         )
     session.refresh(template)
+    publish_template_change(workspace_id=actor.workspace_id, template_id=template.id)
     return _to_out(template)
 
 
@@ -137,4 +157,5 @@ def delete_template(
 
     session.delete(template)
     session.commit()
+    publish_template_change(workspace_id=actor.workspace_id, template_id=template_id)
     return {"ok": True}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 
 from ..auth import AuthContext, require_auth
@@ -9,6 +9,7 @@ from ..models import Job, Project, Workflow
 from ..schemas import JobOut, WorkflowCreate, WorkflowOut, WorkflowRunRequest
 from ..worker import tasks
 from ..workflows.engine import validate_workflow
+from .pagination import MAX_PAGE_SIZE, keyset, set_next_cursor, split_page
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
@@ -23,6 +24,11 @@ def _to_out(workflow: Workflow) -> WorkflowOut:
     )
 
 
+def list_workflows_query(*, workspace_id: int, cursor: int | None = None, limit: int = MAX_PAGE_SIZE):
+    stmt = select(Workflow).where(Workflow.workspace_id == workspace_id)
+    return keyset(stmt, Workflow.id, cursor=cursor, limit=limit)
+
+
 @router.post("", response_model=WorkflowOut)
 def create_workflow(
     payload: WorkflowCreate,
@@ -50,14 +56,15 @@ def create_workflow(
 
 @router.get("", response_model=list[WorkflowOut])
 def list_workflows(
+    response: Response,
+    cursor: int | None = None,
+    limit: int = MAX_PAGE_SIZE,
     session: Session = Depends(get_session),
     actor: AuthContext = Depends(require_auth),
 ):
-    rows = session.exec(
-        select(Workflow)
-        .where(Workflow.workspace_id == actor.workspace_id)
-        .order_by(Workflow.id.desc())
-    ).all()
+    stmt = list_workflows_query(workspace_id=actor.workspace_id, cursor=cursor, limit=limit)
+    rows, next_cursor = split_page(session.exec(stmt).all(), limit)
+    set_next_cursor(response, next_cursor)
     return [_to_out(workflow) for workflow in rows]
 
 
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any
 
 from fastapi import Depends, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as OrmSession, object_session
 from sqlmodel import Session, select
 
-from .db import get_session
+from .cache import TTLCache, get_redis, publish_invalidation, register_invalidation_handler
+from .config import settings
+from .db import engine, get_session
 from .models import UserAccount, Workspace, WorkspaceMember
+from .observability import metrics
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(frozen=True)
 class AuthContext:
     user_id: int
     user_external_id: str
@@ -152,6 +164,124 @@ def resolve_auth_context(
     )
 
 
+AUTH_INVALIDATION_NAMESPACE = "auth_context"
+
+# Resolved principals keyed by (X-User-Id, normalized X-Workspace-Slug). Entries are
+# dropped when the underlying membership row changes (see the ORM hooks below).
+auth_cache: TTLCache[tuple[str, str], AuthContext] = TTLCache(
+    name="auth_context",
+    maxsize=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+)
+
+
+def _redis_auth_key(key: tuple[str, str]) -> str:
+    digest = hashlib.sha256("\0".join(key).encode("utf-8")).hexdigest()
+    return f"trendr:auth:{digest}"
+
+
+def _redis_member_index_key(workspace_id: int, user_id: int) -> str:
+    return f"trendr:auth:member:{workspace_id}:{user_id}"
+
+
+def _load_cached_auth_context(
+    key: tuple[str, str],
+    *,
+    check_local: bool = True,
+) -> AuthContext | None:
+    context = auth_cache.get(key) if check_local else None
+    if context is not None or not settings.auth_cache_redis_enabled:
+        return context
+
+    try:
+        raw = get_redis().get(_redis_auth_key(key))
+    except Exception as exc:
+        logger.warning("auth_cache_redis_read_failed", extra={"error": str(exc)})
+        return None
+    if not raw:
+        metrics.inc("cache_misses_total", cache="auth_context_redis")
+        return None
+
+    metrics.inc("cache_hits_total", cache="auth_context_redis")
+    context = AuthContext(**json.loads(raw))
+    auth_cache.set(key, context)
+    return context
+
+
+def _store_auth_context(key: tuple[str, str], context: AuthContext) -> None:
+    auth_cache.set(key, context)
+    if not settings.auth_cache_redis_enabled:
+        return
+
+    ttl = int(settings.auth_cache_redis_ttl_seconds)
+    redis_key = _redis_auth_key(key)
+    index_key = _redis_member_index_key(context.workspace_id, context.user_id)
+    try:
+        pipe = get_redis().pipeline()
+        pipe.set(redis_key, json.dumps(asdict(context)), ex=ttl)
+        pipe.sadd(index_key, redis_key)
+        pipe.expire(index_key, ttl)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("auth_cache_redis_write_failed", extra={"error": str(exc)})
+
+
+def invalidate_membership_auth(*, workspace_id: int, user_id: int) -> None:
+    """Drop cached principals for a membership in every process and the Redis tier."""
+    if settings.auth_cache_redis_enabled:
+        index_key = _redis_member_index_key(workspace_id, user_id)
+        try:
+            client = get_redis()
+            keys = list(client.smembers(index_key))
+            client.delete(index_key, *keys)
+        except Exception as exc:
+            logger.warning("auth_cache_redis_invalidate_failed", extra={"error": str(exc)})
+    publish_invalidation(
+        AUTH_INVALIDATION_NAMESPACE,
+        {"workspace_id": workspace_id, "user_id": user_id},
+    )
+
+
+def _on_auth_invalidation(payload: dict[str, Any] | None) -> None:
+    if payload is None:
+        auth_cache.clear()
+        return
+    workspace_id = payload.get("workspace_id")
+    user_id = payload.get("user_id")
+    auth_cache.invalidate_where(
+        lambda _, context: context.workspace_id == workspace_id and context.user_id == user_id
+    )
+
+
+register_invalidation_handler(AUTH_INVALIDATION_NAMESPACE, _on_auth_invalidation)
+
+_PENDING_MEMBERSHIP_CHANGES = "trendr_membership_changes"
+
+
+@event.listens_for(WorkspaceMember, "after_insert")
+@event.listens_for(WorkspaceMember, "after_update")
+@event.listens_for(WorkspaceMember, "after_delete")
+def _queue_membership_invalidation(mapper, connection, target: WorkspaceMember) -> None:
+    session = object_session(target)
+    if session is None:
+        return
+    session.info.setdefault(_PENDING_MEMBERSHIP_CHANGES, set()).add(
+        (target.workspace_id, target.user_id)
+    )
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _publish_membership_invalidations(session: OrmSession) -> None:
+    # Publish only once the change is durable, so no request can re-cache the old row.
+    for workspace_id, user_id in session.info.pop(_PENDING_MEMBERSHIP_CHANGES, ()):
+        invalidate_membership_auth(workspace_id=workspace_id, user_id=user_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_membership_invalidations(session: OrmSession) -> None:
+    session.info.pop(_PENDING_MEMBERSHIP_CHANGES, None)
+
+
 def require_workspace_role(actor: AuthContext, minimum_role: str) -> None:
     required = ROLE_RANKS.get(minimum_role)
     if required is None:
@@ -172,8 +302,58 @@ def require_auth(
     if x_user_id is None:
         raise HTTPException(status_code=401, detail="Missing X-User-Id header")
 
-    return resolve_auth_context(
+    workspace_slug = x_workspace_slug or "default"
+    cache_key = (x_user_id.strip(), _normalize_workspace_slug(workspace_slug))
+    if cache_key[0]:
+        cached = _load_cached_auth_context(cache_key)
+        if cached is not None:
+            return cached
+
+    context = resolve_auth_context(
         session=session,
         user_external_id=x_user_id,
-        workspace_slug=x_workspace_slug or "default",
+        workspace_slug=workspace_slug,
     )
+    _store_auth_context(cache_key, context)
+    return context
+
+
+def _require_auth_blocking(
+    x_user_id: str,
+    workspace_slug: str,
+    cache_key: tuple[str, str],
+) -> AuthContext:
+    if cache_key[0]:
+        cached = _load_cached_auth_context(cache_key, check_local=False)
+        if cached is not None:
+            return cached
+
+    with Session(engine) as session:
+        context = resolve_auth_context(
+            session=session,
+            user_external_id=x_user_id,
+            workspace_slug=workspace_slug,
+        )
+    _store_auth_context(cache_key, context)
+    return context
+
+
+async def require_auth_async(
+    x_user_id: str | None = Header(default=None, alias="X-User-Id"),
+    x_workspace_slug: str | None = Header(default="default", alias="X-Workspace-Slug"),
+) -> AuthContext:
+    """`require_auth` for async routes.
+
+    In-process cache hits are answered on the event loop; only misses (Redis tier or
+    database) are pushed to the threadpool.
+    """
+    if x_user_id is None:
+        raise HTTPException(status_code=401, detail="Missing X-User-Id header")
+
+    workspace_slug = x_workspace_slug or "default"
+    cache_key = (x_user_id.strip(), _normalize_workspace_slug(workspace_slug))
+    if cache_key[0]:
+        cached = auth_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    return await run_in_threadpool(_require_auth_blocking, x_user_id, workspace_slug, cache_key)
@@ -0,0 +1,15 @@
+from .invalidation import (
+    invalidation_listener,
+    publish_invalidation,
+    register_invalidation_handler,
+)
+from .redis import get_redis
+from .ttl import TTLCache
+
+__all__ = [
+    "TTLCache",
+    "get_redis",
+    "invalidation_listener",
+    "publish_invalidation",
+    "register_invalidation_handler",
+]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import uuid
+from typing import Any, Callable
+
+from redis import Redis
+
+from ..config import settings
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "trendr:cache-invalidation"
+
+# A handler receives the published payload, or None when the listener may have
+# missed messages (e.g. after a reconnect) and the whole cache must be dropped.
+InvalidationHandler = Callable[[dict[str, Any] | None], None]
+
+_ORIGIN = uuid.uuid4().hex
+_handlers: dict[str, InvalidationHandler] = {}
+
+
+def register_invalidation_handler(namespace: str, handler: InvalidationHandler) -> None:
+    _handlers[namespace] = handler
+
+
+def _dispatch(namespace: str, payload: dict[str, Any] | None) -> None:
+    handler = _handlers.get(namespace)
+    if handler is None:
+        return
+    try:
+        handler(payload)
+    except Exception:
+        logger.warning("cache_invalidation_handler_failed", exc_info=True, extra={"namespace": namespace})
+
+
+def _reset_all() -> None:
+    for namespace in list(_handlers):
+        _dispatch(namespace, None)
+
+
+def publish_invalidation(namespace: str, payload: dict[str, Any]) -> None:
+    """Invalidate locally right away, then fan the change out to other processes."""
+    _dispatch(namespace, payload)
+    message = json.dumps({"origin": _ORIGIN, "namespace": namespace, "payload": payload})
+    try:
+        get_redis().publish(INVALIDATION_CHANNEL, message)
+    except Exception as exc:
+        # Other processes converge once their cache TTL expires.
+        logger.warning(
+            "cache_invalidation_publish_failed",
+            extra={"namespace": namespace, "error": str(exc)},
+        )
+
+
+def _handle_message(raw: Any) -> None:
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        return
+    if not isinstance(message, dict) or message.get("origin") == _ORIGIN:
+        return
+    payload = message.get("payload")
+    _dispatch(str(message.get("namespace")), payload if isinstance(payload, dict) else None)
+
+
+class InvalidationListener:
+    """Background thread applying invalidations published by other processes."""
+
+    def __init__(self) -> None:
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="trendr-cache-invalidation",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        backoff = 1.0
+        subscribed_before = False
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                client = Redis.from_url(
+                    settings.redis_url,
+                    socket_connect_timeout=settings.redis_socket_timeout_seconds,
+                )
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                if subscribed_before:
+                    # Messages published while disconnected are lost.
+                    _reset_all()
+                subscribed_before = True
+                backoff = 1.0
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        _handle_message(message.get("data"))
+            except Exception as exc:
+                logger.warning("cache_invalidation_listener_error", extra={"error": str(exc)})
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+
+invalidation_listener = InvalidationListener()
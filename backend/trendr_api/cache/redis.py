@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from redis import Redis
+
+from ..config import settings
+
+_client: Redis | None = None
+
+
+def get_redis() -> Redis:
+    """Shared Redis client for caches and coordination state.
+
+    Short socket timeouts keep request paths fast when Redis is unavailable; callers
+    treat Redis as an optimisation and fall back to their local path on errors.
+    """
+    global _client
+    if _client is None:
+        _client = Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=settings.redis_socket_timeout_seconds,
+            socket_timeout=settings.redis_socket_timeout_seconds,
+        )
+    return _client
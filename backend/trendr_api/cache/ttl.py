@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from ..observability import MetricsRegistry, metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU cache whose entries also expire after `ttl_seconds`.
+
+    `None` is a valid cached value, which lets callers cache negative lookups.
+    Hits and misses are counted in the process metrics under `cache=<name>`.
+    A `ttl_seconds` of 0 disables caching entirely. A `get_or_load` whose load
+    overlaps an invalidation returns the loaded value without caching it.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        maxsize: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        # Bumped by every invalidation, so loads that started before one can tell.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        metrics.register_collector(self._collect)
+
+    def _collect(self, registry: MetricsRegistry) -> None:
+        stats = self.stats()
+        registry.set_gauge("cache_entries", stats["size"], cache=self.name)
+        if stats["hit_rate"] is not None:
+            registry.set_gauge("cache_hit_rate", stats["hit_rate"], cache=self.name)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.maxsize > 0
+
+    def _lookup(self, key: K) -> Any:
+        if not self.enabled:
+            return _MISSING
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.inc("cache_hits_total" if hit else "cache_misses_total", cache=self.name)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        value = self._lookup(key)
+        self._record(value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def set(self, key: K, value: V) -> None:
+        self._store(key, value)
+
+    def _store(self, key: K, value: V, generation: int | None = None) -> None:
+        if not self.enabled:
+            return
+        expires_at = self._clock() + self.ttl_seconds
+        evicted = 0
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self.evictions += evicted
+        if evicted:
+            metrics.inc("cache_evictions_total", evicted, cache=self.name)
+
+    def get_or_load(self, key: K, loader: Callable[[], V]) -> V:
+        value = self._lookup(key)
+        self._record(value is not _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            generation = self._generation
+        loaded = loader()
+        self._store(key, loaded, generation)
+        return loaded
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[K, V], bool]) -> int:
+        with self._lock:
+            self._generation += 1
+            doomed = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+            for key in doomed:
+                del self._entries[key]
+        return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,10 +7,26 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     app_env: str = "dev"
+    process_role: str = "api"  # api|worker|beat; selects the DB pool profile
     app_name: str = "Trendr"
     api_prefix: str = "/v1"
 
     database_url: str
+    db_async_enabled: bool = False
+    async_database_url: str | None = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    # Transaction-pooling PgBouncer: no client-side pool, no prepared statements.
+    db_pgbouncer_mode: bool = False
+    # Per-role overrides of the pool settings above, e.g.
+    # {"worker": {"pool_size": 2, "max_overflow": 3}}. Keys drop the `db_` prefix.
+    db_pool_roles: dict[str, dict[str, Any]] = {
+        "worker": {"pool_size": 2, "max_overflow": 3},
+        "beat": {"pool_size": 1, "max_overflow": 1},
+    }
 
     redis_url: str = "redis://localhost:6379/0"
     celery_broker_url: str
@@ -29,10 +47,104 @@ class Settings(BaseSettings):
     text_provider_fallbacks: str = "openai_stub"
     image_provider_default: str = "openai_image"
     image_provider_fallbacks: str = "nanobanana"
+    generate_concurrency_per_workspace: int = 3
+    # Stream provider output and publish partial drafts on the job-events stream.
+    # Hedged requests (TEXT_HEDGING_ENABLED or meta.hedge) are not streamed: they publish only the final draft.
+    generate_stream_drafts: bool = True
+    generate_draft_interval_seconds: float = 0.25
+    # Cap on estimated prompt tokens, on top of each provider's declared input limit (0 = provider limit only).
+    prompt_max_tokens: int = 16_000
+    # Long transcripts are summarised in chunks of about this many tokens before generating.
+    map_reduce_chunk_tokens: int = 3_000
+    # Mode "auto" map-reduces only transcripts over this many tokens (and over the prompt budget);
+    # shorter ones that miss the budget are compacted instead.
+    map_reduce_auto_min_tokens: int = 60_000
+    # Concurrent chunk summaries per workspace in a worker process.
+    map_reduce_concurrency: int = 4
+    chunk_summary_cache_ttl_seconds: float = 7 * 24 * 3600.0
+    # Opt-in cache of identical provider requests (see plugins/response_cache.py).
+    llm_cache_enabled: bool = False
+    llm_cache_ttl_seconds: float = 24 * 3600.0
+    llm_cache_max_entries: int = 10_000
+    # Per-provider circuit breaker (see resilience/circuit_breaker.py).
+    provider_circuit_enabled: bool = True
+    provider_circuit_store: str = "redis"  # redis|memory
+    provider_circuit_window_seconds: float = 60.0
+    provider_circuit_min_calls: int = 5
+    provider_circuit_failure_rate: float = 0.5
+    provider_circuit_slow_call_seconds: float = 20.0
+    provider_circuit_slow_rate: float = 0.5
+    provider_circuit_open_seconds: float = 30.0
+    # Hedged text requests (see resilience/hedging.py); per request via meta.hedge.
+    text_hedging_enabled: bool = False
+    text_hedge_percentile: float = 0.95
+    text_hedge_default_delay_seconds: float = 8.0
+    text_hedge_budget_per_hour: int = 100
+    # Provider rate limits (see resilience/rate_limit.py); 0 disables a bucket.
+    rate_limit_enabled: bool = True
+    rate_limit_store: str = "redis"  # redis|memory
+    rate_limit_max_wait_seconds: float = 300.0
+    rate_limit_retries: int = 3
+    rate_limit_workspace_requests_per_minute: int = 0
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 200_000
+    openai_image_requests_per_minute: int = 50
+    # Retries for transient provider/transcript errors (see resilience/retry.py).
+    retry_enabled: bool = True
+    retry_base_delay_seconds: float = 0.5
+    retry_max_delay_seconds: float = 8.0
+    retry_deadline_seconds: float = 30.0
+    retry_budget_ratio: float = 0.2
+    retry_budget_min_per_minute: int = 10
+    # Per-target overrides, e.g. {"openai": {"server_error": 5, "deadline_seconds": 60}}.
+    retry_policies: dict[str, dict[str, float]] = {}
+    # Batch execution of generate jobs (see services/generate_batch.py).
+    generate_batch_provider: str = "openai"
+    generate_batch_poll_seconds: float = 60.0
+    generate_batch_completion_window: str = "24h"
+    ingest_batch_max_urls: int = 500
+    ingest_batch_chunk_size: int = 10
+    # Concurrent metadata+transcript fetches per worker process.
+    ingest_batch_concurrency: int = 4
+
+    http_client_http2: bool = True
+    http_client_default_timeout_seconds: float = 30.0
+    http_client_max_connections_per_host: int = 20
+    http_client_max_keepalive_per_host: int = 10
+    http_client_keepalive_expiry_seconds: float = 30.0
+
+    redis_socket_timeout_seconds: float = 1.0
+    job_events_heartbeat_seconds: float = 15.0
+    job_events_queue_size: int = 256
+    credential_cache_ttl_seconds: float = 300.0
+    credential_cache_max_entries: int = 1024
+    template_cache_ttl_seconds: float = 300.0
+    template_cache_max_entries: int = 1024
+    auth_cache_ttl_seconds: float = 60.0
+    auth_cache_max_entries: int = 10_000
+    auth_cache_redis_enabled: bool = False
+    auth_cache_redis_ttl_seconds: float = 300.0
+    transcript_cache_ttl_seconds: float = 30 * 24 * 3600.0
+    transcript_cache_redis_ttl_seconds: float = 24 * 3600.0
 
     jwt_secret: str = "dev-secret-change-me"
     secrets_encryption_key: str | None = None
 
+    @property
+    def resolved_async_database_url(self) -> str:
+        """Async driver URL; derived from `database_url` unless set explicitly."""
+        if self.async_database_url:
+            return self.async_database_url
+        url = self.database_url
+        for sync_prefix, async_prefix in (
+            ("postgresql://", "postgresql+psycopg://"),
+            ("postgres://", "postgresql+psycopg://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if url.startswith(sync_prefix):
+                return async_prefix + url[len(sync_prefix):]
+        return url
+
     @property
     def text_provider_fallback_list(self) -> list[str]:
         return [item.strip() for item in self.text_provider_fallbacks.split(",") if item.strip()]
@@ -1,15 +1,123 @@
 import logging
 import time
+from typing import Any
 
 from sqlalchemy import text
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from .config import settings
+from .observability import MetricsRegistry, metrics
 
-engine = create_engine(settings.database_url, echo=False, pool_pre_ping=True)
 logger = logging.getLogger(__name__)
 
 
+class _PoolMetricsMixin:
+    """Exports checkout wait time, timeouts and overflow connections per pool."""
+
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.inc("db_pool_checkout_timeouts_total", **self._metric_labels())
+            raise
+        finally:
+            metrics.observe(
+                "db_pool_checkout_wait_seconds",
+                time.perf_counter() - started,
+                **self._metric_labels(),
+            )
+
+    def _inc_overflow(self) -> bool:
+        created = super()._inc_overflow()
+        if created and self._overflow > 0:
+            metrics.inc("db_pool_overflow_total", **self._metric_labels())
+        return created
+
+    def _metric_labels(self) -> dict[str, str]:
+        return {"role": settings.process_role, "engine": self.metrics_label}
+
+
+class InstrumentedQueuePool(_PoolMetricsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_PoolMetricsMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def pool_options(role: str | None = None) -> dict[str, Any]:
+    """Pool settings for a process role: global `db_*` values plus `db_pool_roles[role]`."""
+    options: dict[str, Any] = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout_seconds": settings.db_pool_timeout_seconds,
+        "pool_recycle_seconds": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pgbouncer_mode": settings.db_pgbouncer_mode,
+    }
+    options.update(settings.db_pool_roles.get(role or settings.process_role, {}))
+    return options
+
+
+def engine_options(url: str, *, role: str | None = None, is_async: bool = False) -> dict[str, Any]:
+    """Keyword arguments for `create_engine` / `create_async_engine`."""
+    if url.startswith("sqlite"):
+        # sqlite picks its own pool class; sizing knobs do not apply.
+        return {"pool_pre_ping": True}
+
+    options = pool_options(role)
+    if options["pgbouncer_mode"]:
+        # PgBouncer owns pooling in transaction mode, and server-side prepared
+        # statements do not survive moving between its backend connections.
+        return {"poolclass": NullPool, "connect_args": {"prepare_threshold": None}}
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": int(options["pool_size"]),
+        "max_overflow": int(options["max_overflow"]),
+        "pool_timeout": float(options["pool_timeout_seconds"]),
+        "pool_recycle": int(options["pool_recycle_seconds"]),
+        "pool_pre_ping": bool(options["pool_pre_ping"]),
+    }
+
+
+def _collect_pool_gauges(pool: Pool, label: str) -> None:
+    def collect(registry: MetricsRegistry) -> None:
+        if not isinstance(pool, QueuePool):
+            return
+        labels = {"role": settings.process_role, "engine": label}
+        registry.set_gauge("db_pool_size", pool.size(), **labels)
+        registry.set_gauge("db_pool_checked_out", pool.checkedout(), **labels)
+        registry.set_gauge("db_pool_overflow", max(pool.overflow(), 0), **labels)
+
+    metrics.register_collector(collect)
+
+
+def reset_engine_after_fork(target: Engine | None = None) -> None:
+    """Drop pooled connections inherited from the parent process.
+
+    `close=False` leaves the parent's sockets alone; the child lazily opens its own.
+    """
+    (target or engine).dispose(close=False)
+
+
+engine = create_engine(
+    settings.database_url,
+    echo=False,
+    **engine_options(settings.database_url),
+)
+_collect_pool_gauges(engine.pool, "sync")
+
+_async_engine: AsyncEngine | None = None
+
+
 def wait_for_db() -> None:
     """Wait until a database connection can be established."""
     retries = 30
@@ -39,3 +147,25 @@ def wait_for_db() -> None:
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+def get_async_engine() -> AsyncEngine:
+    """Lazily create the asyncio engine used when `DB_ASYNC_ENABLED` is set.
+
+    `postgresql+psycopg` URLs run on psycopg's async driver; sqlite uses aiosqlite.
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = settings.resolved_async_database_url
+        _async_engine = create_async_engine(
+            url,
+            echo=False,
+            **engine_options(url, is_async=True),
+        )
+        _collect_pool_gauges(_async_engine.sync_engine.pool, "async")
+    return _async_engine
+
+
+async def get_async_session():
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
@@ -2,15 +2,19 @@ from __future__ import annotations
 
 import logging
 import time
+from contextlib import asynccontextmanager
 from uuid import uuid4
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from .cache import invalidation_listener
 from .config import settings
-from .db import wait_for_db
+from .db import get_async_engine, wait_for_db
 from .observability import clear_request_id, configure_logging, set_request_id
 from .plugins.providers import register_all
+from .services.http_clients import aclose_http_clients
+from .services.job_events import job_event_broker
 from .services.s3 import ensure_bucket
 
 from .api.health import router as health_router
@@ -26,11 +30,31 @@ from .api.provider_settings import router as provider_settings_router
 from .api.media import router as media_router
 from .api.schedule import router as schedule_router
 from .api.analytics import router as analytics_router
+from .api.async_reads import router as async_reads_router
+from .api.job_events import router as job_events_router
+from .api.pagination import NEXT_CURSOR_HEADER
 
 configure_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    wait_for_db()
+    register_all()
+    ensure_bucket()
+    invalidation_listener.start()
+    try:
+        yield
+    finally:
+        invalidation_listener.stop()
+        await job_event_broker.aclose()
+        await aclose_http_clients()
+        if settings.db_async_enabled:
+            await get_async_engine().dispose()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,6 +62,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 
@@ -76,13 +101,11 @@ async def request_context_middleware(request: Request, call_next):
     return response
 
 
-@app.on_event("startup")
-def on_startup():
-    wait_for_db()
-    register_all()
-    ensure_bucket()
-
 app.include_router(health_router, prefix=settings.api_prefix)
+app.include_router(job_events_router, prefix=settings.api_prefix)
+if settings.db_async_enabled:
+    # Registered first so these win over the sync handlers on the same paths.
+    app.include_router(async_reads_router, prefix=settings.api_prefix)
 app.include_router(projects_router, prefix=settings.api_prefix)
 app.include_router(ingest_router, prefix=settings.api_prefix)
 app.include_router(generate_router, prefix=settings.api_prefix)
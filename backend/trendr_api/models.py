@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlmodel import SQLModel, Field, Column, JSON
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 
 
 class Workspace(SQLModel, table=True):
@@ -33,6 +33,8 @@ class WorkspaceMember(SQLModel, table=True):
 
 
 class Project(SQLModel, table=True):
+    __table_args__ = (Index("ix_project_workspace_recent", "workspace_id", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     workspace_id: int = Field(foreign_key="workspace.id", index=True)
     name: str
@@ -42,6 +44,11 @@ class Project(SQLModel, table=True):
 
 
 class Artifact(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_artifact_workspace_project_recent", "workspace_id", "project_id", "id"),
+        Index("ix_artifact_workspace_project_kind_recent", "workspace_id", "project_id", "kind", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     workspace_id: int = Field(foreign_key="workspace.id", index=True)
     project_id: int = Field(foreign_key="project.id")
@@ -52,7 +59,29 @@ class Artifact(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class TranscriptSegment(SQLModel, table=True):
+    """One timed line of a transcript artifact, stored outside `Artifact.meta`."""
+
+    __tablename__ = "transcript_segment"
+    __table_args__ = (
+        Index("ix_transcript_segment_artifact_start", "artifact_id", "start_seconds"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    artifact_id: int = Field(foreign_key="artifact.id")
+    position: int
+    start_seconds: float
+    end_seconds: float
+    text: str
+
+
 class Job(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_job_workspace_recent", "workspace_id", "id"),
+        Index("ix_job_workspace_project_recent", "workspace_id", "project_id", "id"),
+        Index("ix_job_workspace_status_updated", "workspace_id", "status", "updated_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     kind: str  # ingest|generate|workflow
     status: str = "queued"  # queued|running|succeeded|failed
@@ -75,6 +104,8 @@ class Template(SQLModel, table=True):
             "version",
             name="uq_template_workspace_name_kind_version",
         ),
+        Index("ix_template_workspace_recent", "workspace_id", "id"),
+        Index("ix_template_workspace_kind_recent", "workspace_id", "kind", "id"),
     )
 
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -88,6 +119,8 @@ class Template(SQLModel, table=True):
 
 
 class Workflow(SQLModel, table=True):
+    __table_args__ = (Index("ix_workflow_workspace_recent", "workspace_id", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     workspace_id: int = Field(foreign_key="workspace.id", index=True)
     name: str
@@ -137,3 +170,19 @@ class ProviderCredential(SQLModel, table=True):
     key_hint: str = ""
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class TranscriptCache(SQLModel, table=True):
+    """Workspace-independent transcript store, keyed by YouTube video id and language."""
+
+    __tablename__ = "transcript_cache"
+    __table_args__ = (
+        UniqueConstraint("video_id", "language", name="uq_transcript_cache_video_language"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    video_id: str = Field(index=True)
+    language: str = "en"
+    text: str = ""
+    segments: list[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON))
+    fetched_at: datetime = Field(default_factory=datetime.utcnow)
@@ -7,13 +7,16 @@ from .context import (
     set_request_id,
 )
 from .logging import configure_logging
+from .metrics import MetricsRegistry, metrics
 
 __all__ = [
+    "MetricsRegistry",
     "clear_job_id",
     "clear_request_id",
     "configure_logging",
     "get_job_id",
     "get_request_id",
+    "metrics",
     "set_job_id",
     "set_request_id",
 ]
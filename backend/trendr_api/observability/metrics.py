@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+LabelSet = tuple[tuple[str, str], ...]
+
+
+def _label_set(labels: dict[str, Any]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and summaries exported as JSON via `/v1/metrics`.
+
+    Values are per process; aggregate across API/worker processes in the log or
+    metrics pipeline rather than here.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, LabelSet], float] = {}
+        self._gauges: dict[tuple[str, LabelSet], float] = {}
+        self._summaries: dict[tuple[str, LabelSet], list[float]] = {}
+        self._collectors: list[Callable[["MetricsRegistry"], None]] = []
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = (name, _label_set(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._gauges[(name, _label_set(labels))] = float(value)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = (name, _label_set(labels))
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                self._summaries[key] = [1.0, float(value), float(value)]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                summary[2] = max(summary[2], value)
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get((name, _label_set(labels)), 0.0)
+
+    def register_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """Register a callback that refreshes gauges right before each snapshot."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            collector(self)
+
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "gauges": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._gauges.items())
+                ],
+                "summaries": [
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "count": int(count),
+                        "sum": total,
+                        "max": peak,
+                    }
+                    for (name, labels), (count, total, peak) in sorted(self._summaries.items())
+                ],
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+metrics = MetricsRegistry()
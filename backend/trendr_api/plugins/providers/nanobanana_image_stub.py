@@ -13,6 +13,7 @@ class NanoBananaImageStub:
         supports_json_mode=False,
         supports_streaming=False,
         supports_system_prompt=False,
+        is_stub=True,
     )
 
     def is_available(self, *, meta: Optional[Dict[str, Any]] = None) -> bool:
@@ -3,11 +3,12 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 
 import httpx
-from sqlmodel import Session
 
 from ...config import settings
-from ...db import engine
-from ...services.provider_settings import get_workspace_provider_api_key
+from ...resilience.rate_limit import ProviderRateLimited, RateBucket, provider_buckets, retry_after_seconds
+from ...resilience.retry import ProviderHTTPError, retry_async
+from ...services.credential_cache import get_cached_workspace_api_key
+from ...services.http_clients import get_http_client
 from ..registry import registry
 from ..types import ProviderCapabilities
 
@@ -27,15 +28,14 @@ class OpenAIImageProvider:
         self._model = settings.dalle_model
         self._base_url = settings.openai_base_url.rstrip("/")
 
+    @property
+    def model(self) -> str:
+        return self._model
+
     def _workspace_api_key(self, workspace_id: int | None) -> str | None:
         if workspace_id is None:
             return None
-        with Session(engine) as session:
-            return get_workspace_provider_api_key(
-                session=session,
-                workspace_id=workspace_id,
-                provider="openai",
-            )
+        return get_cached_workspace_api_key(workspace_id=workspace_id, provider="openai")
 
     def _resolve_api_key(self, meta: Optional[Dict[str, Any]]) -> str | None:
         request_meta = meta or {}
@@ -51,6 +51,17 @@ class OpenAIImageProvider:
     def is_available(self, *, meta: Optional[Dict[str, Any]] = None) -> bool:
         return bool(self._resolve_api_key(meta))
 
+    def rate_limit_buckets(self, *, meta: Optional[Dict[str, Any]], tokens: int) -> list[RateBucket]:
+        api_key = self._resolve_api_key(meta)
+        if not api_key:
+            return []
+        return provider_buckets(
+            self.name,
+            api_key=api_key,
+            requests_per_minute=settings.openai_image_requests_per_minute,
+            workspace_id=(meta or {}).get("workspace_id"),
+        )
+
     async def generate_image(
         self,
         *,
@@ -85,15 +96,21 @@ class OpenAIImageProvider:
             "Content-Type": "application/json",
         }
 
-        async with httpx.AsyncClient(timeout=90) as client:
-            response = await client.post(url, json=payload, headers=headers)
-
-        if response.status_code >= 400:
-            detail = response.text.strip()
-            if len(detail) > 500:
-                detail = f"{detail[:500]}..."
-            raise RuntimeError(f"OpenAI Images API {response.status_code}: {detail}")
-
+        client = get_http_client(url)
+
+        async def _post() -> httpx.Response:
+            response = await client.post(url, json=payload, headers=headers, timeout=90)
+            if response.status_code >= 400:
+                detail = response.text.strip()
+                if len(detail) > 500:
+                    detail = f"{detail[:500]}..."
+                message = f"OpenAI Images API {response.status_code}: {detail}"
+                if response.status_code == 429:
+                    raise ProviderRateLimited(message, retry_after=retry_after_seconds(response.headers))
+                raise ProviderHTTPError(message, status_code=response.status_code)
+            return response
+
+        response = await retry_async(self.name, _post)
         data = response.json()
         items = data.get("data")
         if not isinstance(items, list) or not items:
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import json
+from typing import Any, AsyncIterator, Dict, Optional
 
 import httpx
-from sqlmodel import Session
 
 from ...config import settings
-from ...db import engine
-from ...services.provider_settings import get_workspace_provider_api_key
+from ...resilience.rate_limit import ProviderRateLimited, RateBucket, provider_buckets, retry_after_seconds
+from ...resilience.retry import ProviderHTTPError, retry_async
+from ...services.credential_cache import get_cached_workspace_api_key
+from ...services.http_clients import get_http_client
 from ..registry import registry
-from ..types import ProviderCapabilities
+from ..types import BatchRequest, BatchResult, BatchStatus, ProviderCapabilities
+
+# Per-attempt timeout for chat completions; the "openai" retry deadline must exceed it.
+REQUEST_TIMEOUT_SECONDS = 45.0
 
 
 class OpenAITextProvider:
@@ -18,8 +23,9 @@ class OpenAITextProvider:
         max_input_tokens=128_000,
         max_output_tokens=16_384,
         supports_json_mode=True,
-        supports_streaming=False,
+        supports_streaming=True,
         supports_system_prompt=True,
+        supports_batch=True,
     )
 
     def __init__(self) -> None:
@@ -27,15 +33,14 @@ class OpenAITextProvider:
         self._model = settings.openai_model
         self._base_url = settings.openai_base_url.rstrip("/")
 
+    @property
+    def model(self) -> str:
+        return self._model
+
     def _workspace_api_key(self, workspace_id: int | None) -> str | None:
         if workspace_id is None:
             return None
-        with Session(engine) as session:
-            return get_workspace_provider_api_key(
-                session=session,
-                workspace_id=workspace_id,
-                provider=self.name,
-            )
+        return get_cached_workspace_api_key(workspace_id=workspace_id, provider=self.name)
 
     def _resolve_api_key(self, meta: Optional[Dict[str, Any]]) -> str | None:
         request_meta = meta or {}
@@ -51,13 +56,26 @@ class OpenAITextProvider:
     def is_available(self, *, meta: Optional[Dict[str, Any]] = None) -> bool:
         return bool(self._resolve_api_key(meta))
 
-    async def generate(
+    def rate_limit_buckets(self, *, meta: Optional[Dict[str, Any]], tokens: int) -> list[RateBucket]:
+        api_key = self._resolve_api_key(meta)
+        if not api_key:
+            return []
+        return provider_buckets(
+            self.name,
+            api_key=api_key,
+            requests_per_minute=settings.openai_requests_per_minute,
+            tokens_per_minute=settings.openai_tokens_per_minute,
+            tokens=tokens,
+            workspace_id=(meta or {}).get("workspace_id"),
+        )
+
+    def _request(
         self,
         *,
         prompt: str,
-        system: Optional[str] = None,
-        meta: Optional[Dict[str, Any]] = None,
-    ) -> str:
+        system: Optional[str],
+        meta: Optional[Dict[str, Any]],
+    ) -> tuple[str, dict[str, Any], dict[str, str]]:
         resolved_api_key = self._resolve_api_key(meta)
         if not resolved_api_key:
             raise RuntimeError("OPENAI_API_KEY is not configured")
@@ -86,18 +104,41 @@ class OpenAITextProvider:
             "Authorization": f"Bearer {resolved_api_key}",
             "Content-Type": "application/json",
         }
+        return url, payload, headers
 
-        async with httpx.AsyncClient(timeout=45) as client:
-            response = await client.post(url, json=payload, headers=headers)
+    @staticmethod
+    def _error(response: httpx.Response, body: str) -> RuntimeError:
+        detail = body.strip()
+        if len(detail) > 500:
+            detail = f"{detail[:500]}..."
+        message = f"OpenAI API {response.status_code}: {detail}"
+        if response.status_code == 429:
+            return ProviderRateLimited(message, retry_after=retry_after_seconds(response.headers))
+        return ProviderHTTPError(message, status_code=response.status_code)
 
-        if response.status_code >= 400:
-            detail = response.text.strip()
-            if len(detail) > 500:
-                detail = f"{detail[:500]}..."
-            raise RuntimeError(f"OpenAI API {response.status_code}: {detail}")
+    async def generate(
+        self,
+        *,
+        prompt: str,
+        system: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        url, payload, headers = self._request(prompt=prompt, system=system, meta=meta)
+
+        client = get_http_client(url)
 
-        data = response.json()
-        choices = data.get("choices")
+        async def _post() -> httpx.Response:
+            response = await client.post(url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+            if response.status_code >= 400:
+                raise self._error(response, response.text)
+            return response
+
+        response = await retry_async(self.name, _post)
+        return self._completion_text(response.json())
+
+    @staticmethod
+    def _completion_text(data: Any) -> str:
+        choices = data.get("choices") if isinstance(data, dict) else None
         if not isinstance(choices, list) or not choices:
             raise RuntimeError("OpenAI API returned no choices")
 
@@ -111,6 +152,162 @@ class OpenAITextProvider:
 
         raise RuntimeError("OpenAI API response missing text content")
 
+    async def generate_stream(
+        self,
+        *,
+        prompt: str,
+        system: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        """Yield content deltas from a streamed chat completion (server-sent events)."""
+        url, payload, headers = self._request(prompt=prompt, system=system, meta=meta)
+        payload["stream"] = True
+
+        client = get_http_client(url)
+
+        async def _open() -> httpx.Response:
+            request = client.build_request("POST", url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+            response = await client.send(request, stream=True)
+            if response.status_code >= 400:
+                body = await response.aread()
+                await response.aclose()
+                raise self._error(response, body.decode("utf-8", errors="replace"))
+            return response
+
+        # Only opening the stream is retried; once deltas flow, errors propagate.
+        response = await retry_async(self.name, _open)
+        produced = False
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    continue
+                choices = chunk.get("choices") if isinstance(chunk, dict) else None
+                if not isinstance(choices, list) or not choices:
+                    continue
+                delta = choices[0].get("delta") or {}
+                content = delta.get("content") if isinstance(delta, dict) else None
+                if isinstance(content, str) and content:
+                    produced = True
+                    yield content
+        finally:
+            await response.aclose()
+
+        if not produced:
+            raise RuntimeError("OpenAI API response missing text content")
+
+    async def _batch_call(
+        self,
+        method: str,
+        path: str,
+        *,
+        meta: Optional[Dict[str, Any]],
+        retry: bool = True,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        resolved_api_key = self._resolve_api_key(meta)
+        if not resolved_api_key:
+            raise RuntimeError("OPENAI_API_KEY is not configured")
+        url = f"{self._base_url}{path}"
+        headers = {"Authorization": f"Bearer {resolved_api_key}"}
+        client = get_http_client(url)
+
+        async def _send() -> httpx.Response:
+            response = await client.request(method, url, headers=headers, timeout=60, **kwargs)
+            if response.status_code >= 400:
+                raise self._error(response, response.text)
+            return response
+
+        return await (retry_async(self.name, _send) if retry else _send())
+
+    async def submit_batch(
+        self,
+        requests: list[BatchRequest],
+        *,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Upload the requests as a JSONL file and start a Batch API job over it."""
+        lines = []
+        for request in requests:
+            _, payload, _ = self._request(prompt=request.prompt, system=request.system, meta=request.meta)
+            lines.append(
+                json.dumps(
+                    {"custom_id": request.custom_id, "method": "POST", "url": "/v1/chat/completions", "body": payload}
+                )
+            )
+        jsonl = ("\n".join(lines) + "\n").encode("utf-8")
+        upload = await self._batch_call(
+            "POST",
+            "/files",
+            meta=meta,
+            data={"purpose": "batch"},
+            files={"file": ("requests.jsonl", jsonl, "application/jsonl")},
+        )
+        # Not retried: a create that timed out may still have started a (billed) batch.
+        created = await self._batch_call(
+            "POST",
+            "/batches",
+            meta=meta,
+            retry=False,
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": settings.generate_batch_completion_window,
+            },
+        )
+        return created.json()["id"]
+
+    async def get_batch(self, batch_id: str, *, meta: Optional[Dict[str, Any]] = None) -> BatchStatus:
+        data = (await self._batch_call("GET", f"/batches/{batch_id}", meta=meta)).json()
+        errors = (data.get("errors") or {}).get("data") or []
+        return BatchStatus(
+            id=data["id"],
+            status=data["status"],
+            output_file_id=data.get("output_file_id"),
+            error_file_id=data.get("error_file_id"),
+            errors=tuple(str(error.get("message") or error) for error in errors if error),
+        )
+
+    async def batch_results(
+        self,
+        batch: BatchStatus,
+        *,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, BatchResult]:
+        results: Dict[str, BatchResult] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self._batch_call("GET", f"/files/{file_id}/content", meta=meta)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                results[row["custom_id"]] = self._batch_result(row)
+        return results
+
+    def _batch_result(self, row: dict[str, Any]) -> BatchResult:
+        custom_id = row["custom_id"]
+        error = row.get("error")
+        if error:
+            message = error.get("message") if isinstance(error, dict) else None
+            return BatchResult(custom_id=custom_id, error=str(message or error))
+        response = row.get("response") or {}
+        status_code = response.get("status_code")
+        body = response.get("body")
+        if status_code != 200:
+            return BatchResult(custom_id=custom_id, error=f"OpenAI API {status_code}: {json.dumps(body)[:500]}")
+        try:
+            return BatchResult(custom_id=custom_id, text=self._completion_text(body))
+        except RuntimeError as exc:
+            return BatchResult(custom_id=custom_id, error=str(exc))
+
 
 def register() -> None:
     registry.register_text(OpenAITextProvider())
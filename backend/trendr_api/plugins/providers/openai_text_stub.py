@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+import asyncio
+import re
+from typing import Any, AsyncIterator, Dict, Optional
 
 from ..registry import registry
 from ..types import ProviderCapabilities
@@ -11,8 +13,9 @@ class OpenAITextStub:
         max_input_tokens=8_000,
         max_output_tokens=2_000,
         supports_json_mode=False,
-        supports_streaming=False,
+        supports_streaming=True,
         supports_system_prompt=True,
+        is_stub=True,
     )
 
     def is_available(self, *, meta: Optional[Dict[str, Any]] = None) -> bool:
@@ -28,6 +31,19 @@ class OpenAITextStub:
             f"{prompt[:2000]}"
         )
 
+    async def generate_stream(
+        self,
+        *,
+        prompt: str,
+        system: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        text = await self.generate(prompt=prompt, system=system, meta=meta)
+        # Word-sized deltas, like a remote model would send.
+        for delta in re.findall(r"\S+\s*|\s+", text):
+            yield delta
+            await asyncio.sleep(0)
+
 
 def register():
     registry.register_text(OpenAITextStub())
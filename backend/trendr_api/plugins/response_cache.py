@@ -0,0 +1,105 @@
+"""Opt-in cache of provider responses, used by the provider router.
+
+Entries are keyed by a hash of the normalised request (workspace, provider,
+model, prompt, system prompt and sampling options) and live in Redis with a
+TTL. A sorted-set index ordered by write time bounds the number of entries:
+the oldest are evicted once `LLM_CACHE_MAX_ENTRIES` is exceeded.
+
+Image entries store the uploaded S3 key and URL, never the image bytes.
+Requests can skip the lookup with `meta["cache_bypass"] = True`; the fresh
+response still replaces the cached one.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any
+
+from ..cache import get_redis
+from ..config import settings
+from ..observability import metrics
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "trendr:llm-cache:"
+INDEX_KEY = "trendr:llm-cache:index"
+BYPASS_META_KEY = "cache_bypass"
+
+# Request options that change the output; everything else in meta is ignored.
+TEXT_OPTION_KEYS = ("temperature", "max_output_tokens")
+IMAGE_OPTION_KEYS = ("quality", "style")
+
+
+def enabled() -> bool:
+    return settings.llm_cache_enabled and settings.llm_cache_ttl_seconds > 0
+
+
+def bypassed(meta: dict[str, Any]) -> bool:
+    return bool(meta.get(BYPASS_META_KEY))
+
+
+def _key(kind: str, provider: Any, request: dict[str, Any], meta: dict[str, Any], option_keys: tuple[str, ...]) -> str:
+    normalized = {
+        "kind": kind,
+        "workspace_id": meta.get("workspace_id"),
+        "provider": provider.name,
+        "model": getattr(provider, "model", None),
+        **request,
+        **{option: meta.get(option) for option in option_keys},
+    }
+    encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return KEY_PREFIX + hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def text_key(provider: Any, *, prompt: str, system: str | None, meta: dict[str, Any]) -> str:
+    request = {"prompt": prompt.strip(), "system": (system or "").strip()}
+    return _key("text", provider, request, meta, TEXT_OPTION_KEYS)
+
+
+def image_key(provider: Any, *, prompt: str, size: str, meta: dict[str, Any]) -> str:
+    request = {"prompt": prompt.strip(), "size": size}
+    return _key("image", provider, request, meta, IMAGE_OPTION_KEYS)
+
+
+def lookup(key: str, *, cache: str, provider: str) -> Any | None:
+    try:
+        raw = get_redis().get(key)
+    except Exception as exc:
+        logger.warning("llm_cache_read_failed", extra={"error": str(exc)})
+        return None
+    value = None
+    if raw:
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = None
+    if value is None:
+        metrics.inc("cache_misses_total", cache=cache, provider=provider)
+    else:
+        metrics.inc("cache_hits_total", cache=cache, provider=provider)
+    logger.info("llm_cache_lookup", extra={"cache": cache, "provider": provider, "hit": value is not None})
+    return value
+
+
+def store(key: str, value: Any) -> None:
+    ttl = int(settings.llm_cache_ttl_seconds)
+    max_entries = settings.llm_cache_max_entries
+    try:
+        client = get_redis()
+        pipe = client.pipeline()
+        pipe.set(key, json.dumps(value), ex=ttl)
+        pipe.zadd(INDEX_KEY, {key: time.time()})
+        # Index members whose entry expired by TTL are dropped here too.
+        pipe.zremrangebyscore(INDEX_KEY, "-inf", time.time() - ttl)
+        pipe.zcard(INDEX_KEY)
+        size = pipe.execute()[-1]
+        overflow = int(size) - max_entries
+        if max_entries > 0 and overflow > 0:
+            evicted = [member for member, _score in client.zpopmin(INDEX_KEY, overflow)]
+            if evicted:
+                client.delete(*evicted)
+                metrics.inc("llm_cache_evictions_total", len(evicted))
+    except Exception as exc:
+        logger.warning("llm_cache_write_failed", extra={"error": str(exc)})
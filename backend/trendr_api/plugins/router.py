@@ -1,8 +1,25 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable
 
 from ..config import settings
+from ..observability import metrics
+from ..resilience import (
+    CircuitPermit,
+    ProviderRateLimited,
+    RateBucket,
+    RateLimitTimeout,
+    circuit_breaker,
+    estimate_request_tokens,
+    hedge_budget,
+    hedge_delay,
+    hedging_requested,
+    latency_tracker,
+    rate_limiter,
+)
+from . import response_cache
 from .registry import registry
 
 
@@ -28,13 +45,246 @@ def image_fallback_chain(*, preferred: str | None = None) -> list[str]:
     return _normalize_chain(chain)
 
 
+def _rate_limit_buckets(provider: Any, *, prompt: str, system: str | None, meta: dict[str, Any]) -> list[RateBucket]:
+    """The provider's rate-limit buckets for this call; providers without limits have none."""
+    buckets_for = getattr(provider, "rate_limit_buckets", None)
+    if buckets_for is None:
+        return []
+    return buckets_for(meta=meta, tokens=estimate_request_tokens(prompt, system, meta))
+
+
+# Circuit-breaker, rate-limiter and response-cache calls talk to Redis synchronously.
+# They run in threads so a slow Redis stalls only the call that needs it, not every
+# coroutine sharing the worker's event loop.
+def _release_in_background(permit: CircuitPermit) -> None:
+    """Release a permit from a cancelled call, where awaiting may not be possible."""
+    try:
+        asyncio.get_running_loop().run_in_executor(None, circuit_breaker.release, permit)
+    except RuntimeError:
+        circuit_breaker.release(permit)
+
+
+async def _throttle(permit: CircuitPermit, buckets: list[RateBucket]) -> CircuitPermit:
+    """Wait for room in every bucket. Time spent queueing is not provider latency,
+    so the returned permit is timed from the end of the wait."""
+    await rate_limiter.acquire(buckets)
+    return circuit_breaker.restart(permit)
+
+
+async def _retry_rate_limited(
+    provider_name: str, buckets: list[RateBucket], exc: ProviderRateLimited, attempt: int
+) -> bool:
+    """Hold the provider's buckets for the 429's Retry-After; True if this call should try again."""
+    await asyncio.to_thread(rate_limiter.block, buckets, exc.retry_after)
+    if not buckets or not settings.rate_limit_enabled or attempt >= settings.rate_limit_retries:
+        return False
+    metrics.inc("provider_rate_limit_retries_total", provider=provider_name)
+    return True
+
+
+async def _call_text(
+    provider: Any,
+    permit: CircuitPermit,
+    *,
+    prompt: str,
+    system: str | None,
+    meta: dict[str, Any],
+    cache_key: str | None,
+) -> str:
+    buckets = _rate_limit_buckets(provider, prompt=prompt, system=system, meta=meta)
+    attempt = 0
+    while True:
+        try:
+            permit = await _throttle(permit, buckets)
+            started = time.monotonic()
+            text = await provider.generate(prompt=prompt, system=system, meta=meta)
+        except ProviderRateLimited as exc:
+            if await _retry_rate_limited(provider.name, buckets, exc, attempt):
+                attempt += 1
+                continue
+            await asyncio.to_thread(circuit_breaker.record, permit, ok=False)
+            raise
+        except (RateLimitTimeout, asyncio.CancelledError):
+            _release_in_background(permit)
+            raise
+        except Exception:
+            await asyncio.to_thread(circuit_breaker.record, permit, ok=False)
+            raise
+        break
+    await asyncio.to_thread(circuit_breaker.record, permit, ok=True)
+    latency_tracker.observe(provider.name, time.monotonic() - started)
+    if cache_key is not None:
+        await asyncio.to_thread(response_cache.store, cache_key, text)
+    return text
+
+
 async def generate_text(
     *,
     prompt: str,
     system: str | None,
     meta: dict[str, Any],
     preferred_provider: str | None = None,
+    on_served: Callable[[str], None] | None = None,
 ) -> str:
+    """Generate text with the first provider in the fallback chain that answers.
+
+    `on_served`, if given, is called with the name of the provider whose answer
+    is returned (also for cached answers), so callers can tell a fallback apart.
+
+    With hedging (`TEXT_HEDGING_ENABLED` or `meta["hedge"]`), a provider that has
+    not answered within its observed latency percentile gets raced against the
+    next provider in the chain; the first answer wins and the other call is
+    cancelled. Hedges are capped per workspace by the hedge budget, and never go
+    to a stub provider: racing a real provider against placeholder text would
+    let the placeholder win whenever the real one is slow.
+
+    Calls wait for room in the provider's rate-limit buckets, and a 429 is
+    retried after its `Retry-After` (up to `RATE_LIMIT_RETRIES` times) instead
+    of falling through to the next provider.
+    """
+    errors: list[str] = []
+    chain = text_fallback_chain(preferred=preferred_provider)
+    position = 0
+    hedge = hedging_requested(meta)
+
+    def _served(provider_name: str) -> None:
+        if on_served is not None:
+            on_served(provider_name)
+
+    def _is_stub(provider_name: str) -> bool:
+        try:
+            provider = registry.get_text(provider_name)
+        except KeyError:
+            return False
+        return getattr(provider.capabilities, "is_stub", False)
+
+    def _can_hedge() -> bool:
+        return position < len(chain) and not _is_stub(chain[position])
+
+    async def _start_next(*, hedging: bool = False) -> str | asyncio.Task[str] | None:
+        """Cached text, a running call to the next usable provider, or None.
+
+        A hedge stops before the first stub and leaves it for plain fallback.
+        """
+        nonlocal position
+        while position < len(chain):
+            provider_name = chain[position]
+            if hedging and _is_stub(provider_name):
+                return None
+            position += 1
+            try:
+                provider = registry.get_text(provider_name)
+            except KeyError as exc:
+                errors.append(f"{provider_name}: {exc}")
+                continue
+
+            if not provider.is_available(meta=meta):
+                errors.append(f"{provider_name}: unavailable (missing credentials/config)")
+                continue
+
+            cache_key = None
+            if response_cache.enabled():
+                cache_key = response_cache.text_key(provider, prompt=prompt, system=system, meta=meta)
+                if not response_cache.bypassed(meta):
+                    cached = await asyncio.to_thread(
+                        response_cache.lookup, cache_key, cache="llm_text", provider=provider_name
+                    )
+                    if isinstance(cached, str):
+                        _served(provider_name)
+                        return cached
+
+            permit = await asyncio.to_thread(circuit_breaker.acquire, provider_name)
+            if permit is None:
+                errors.append(f"{provider_name}: circuit open")
+                continue
+            task = asyncio.ensure_future(
+                _call_text(provider, permit, prompt=prompt, system=system, meta=meta, cache_key=cache_key)
+            )
+            task_names[task] = provider_name
+            return task
+        return None
+
+    task_names: dict[asyncio.Task[str], str] = {}
+    pending: set[asyncio.Task[str]] = set()
+    hedged = False
+    try:
+        while True:
+            if not pending:
+                started = await _start_next()
+                if started is None:
+                    break
+                if isinstance(started, str):
+                    return started
+                pending.add(started)
+                hedged = False
+
+            timeout = None
+            if hedge and not hedged and _can_hedge():
+                (primary,) = pending
+                timeout = hedge_delay(task_names[primary])
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                hedged = True
+                if hedge_budget.try_spend(meta.get("workspace_id")):
+                    resume_at, error_count = position, len(errors)
+                    started = await _start_next(hedging=True)
+                    if isinstance(started, str):
+                        return started
+                    if started is None:
+                        # No hedge target: refund the spend and leave the skipped
+                        # providers for plain fallback to try again.
+                        position = resume_at
+                        del errors[error_count:]
+                        hedge_budget.refund(meta.get("workspace_id"))
+                    else:
+                        pending.add(started)
+                        metrics.inc("provider_hedges_total", provider=task_names[started])
+                continue
+
+            for task in done:
+                pending.discard(task)
+                exc = task.exception()
+                if exc is None:
+                    if hedged:
+                        metrics.inc("provider_hedge_wins_total", provider=task_names[task])
+                    _served(task_names[task])
+                    return task.result()
+                errors.append(f"{task_names[task]}: {exc.__class__.__name__}: {exc}")
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    detail = "; ".join(errors) if errors else "no providers configured"
+    raise RuntimeError(f"All text providers failed: {detail}")
+
+
+async def _provider_deltas(provider: Any, *, prompt: str, system: str | None, meta: dict[str, Any]) -> AsyncIterator[str]:
+    capabilities = getattr(provider, "capabilities", None)
+    stream = getattr(provider, "generate_stream", None)
+    if stream is None or not getattr(capabilities, "supports_streaming", False):
+        yield await provider.generate(prompt=prompt, system=system, meta=meta)
+        return
+    async for delta in stream(prompt=prompt, system=system, meta=meta):
+        yield delta
+
+
+async def generate_text_stream(
+    *,
+    prompt: str,
+    system: str | None,
+    meta: dict[str, Any],
+    preferred_provider: str | None = None,
+) -> AsyncIterator[str]:
+    """Yield text deltas from the first provider in the fallback chain that answers.
+
+    Providers without streaming support yield their whole output as one delta.
+    A provider that fails before its first delta falls through to the next one;
+    once output has started, errors propagate, since the caller has already
+    shown partial text. Hedging does not apply to streams.
+    """
     errors: list[str] = []
 
     for provider_name in text_fallback_chain(preferred=preferred_provider):
@@ -48,10 +298,61 @@ async def generate_text(
             errors.append(f"{provider_name}: unavailable (missing credentials/config)")
             continue
 
+        cache_key = None
+        if response_cache.enabled():
+            cache_key = response_cache.text_key(provider, prompt=prompt, system=system, meta=meta)
+            if not response_cache.bypassed(meta):
+                cached = await asyncio.to_thread(
+                    response_cache.lookup, cache_key, cache="llm_text", provider=provider_name
+                )
+                if isinstance(cached, str):
+                    yield cached
+                    return
+
+        permit = await asyncio.to_thread(circuit_breaker.acquire, provider_name)
+        if permit is None:
+            errors.append(f"{provider_name}: circuit open")
+            continue
+        buckets = _rate_limit_buckets(provider, prompt=prompt, system=system, meta=meta)
+        attempt = 0
+        parts: list[str] = []
         try:
-            return await provider.generate(prompt=prompt, system=system, meta=meta)
-        except Exception as exc:  # pragma: no cover - error path exercised in tests
+            while True:
+                permit = await _throttle(permit, buckets)
+                started = time.monotonic()
+                try:
+                    async for delta in _provider_deltas(provider, prompt=prompt, system=system, meta=meta):
+                        if not parts:
+                            metrics.observe(
+                                "provider_first_delta_seconds", time.monotonic() - started, provider=provider_name
+                            )
+                        parts.append(delta)
+                        yield delta
+                except ProviderRateLimited as exc:
+                    if parts or not await _retry_rate_limited(provider_name, buckets, exc, attempt):
+                        raise
+                    attempt += 1
+                    continue
+                break
+        except RateLimitTimeout as exc:
+            await asyncio.to_thread(circuit_breaker.release, permit)
+            errors.append(f"{provider_name}: {exc.__class__.__name__}: {exc}")
+            continue
+        except Exception as exc:
+            await asyncio.to_thread(circuit_breaker.record, permit, ok=False)
+            if parts:
+                raise
             errors.append(f"{provider_name}: {exc.__class__.__name__}: {exc}")
+            continue
+        except BaseException:
+            # Cancelled, or the consumer closed the stream early.
+            _release_in_background(permit)
+            raise
+        await asyncio.to_thread(circuit_breaker.record, permit, ok=True)
+        latency_tracker.observe(provider_name, time.monotonic() - started)
+        if cache_key is not None:
+            await asyncio.to_thread(response_cache.store, cache_key, "".join(parts).strip())
+        return
 
     detail = "; ".join(errors) if errors else "no providers configured"
     raise RuntimeError(f"All text providers failed: {detail}")
@@ -63,7 +364,14 @@ async def generate_image(
     size: str = "1024x1024",
     meta: dict[str, Any],
     preferred_provider: str | None = None,
+    persist: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
+    """Generate an image with the first available provider in the fallback chain.
+
+    `persist` turns a provider result into a stored one (e.g. uploads `b64` data
+    and returns its `s3_key` and `url`). Only persisted results carrying an
+    `s3_key` are cached, so cache hits never hold image bytes or expiring URLs.
+    """
     errors: list[str] = []
 
     for provider_name in image_fallback_chain(preferred=preferred_provider):
@@ -77,10 +385,50 @@ async def generate_image(
             errors.append(f"{provider_name}: unavailable (missing credentials/config)")
             continue
 
+        cache_key = None
+        if response_cache.enabled():
+            cache_key = response_cache.image_key(provider, prompt=prompt, size=size, meta=meta)
+            if not response_cache.bypassed(meta):
+                cached = await asyncio.to_thread(
+                    response_cache.lookup, cache_key, cache="llm_image", provider=provider_name
+                )
+                if isinstance(cached, dict):
+                    return cached
+
+        permit = await asyncio.to_thread(circuit_breaker.acquire, provider_name)
+        if permit is None:
+            errors.append(f"{provider_name}: circuit open")
+            continue
+        buckets = _rate_limit_buckets(provider, prompt=prompt, system=None, meta=meta)
+        attempt = 0
         try:
-            return await provider.generate_image(prompt=prompt, size=size, meta=meta)
+            while True:
+                permit = await _throttle(permit, buckets)
+                try:
+                    result = await provider.generate_image(prompt=prompt, size=size, meta=meta)
+                except ProviderRateLimited as exc:
+                    if not await _retry_rate_limited(provider_name, buckets, exc, attempt):
+                        raise
+                    attempt += 1
+                    continue
+                break
+        except RateLimitTimeout as exc:
+            await asyncio.to_thread(circuit_breaker.release, permit)
+            errors.append(f"{provider_name}: {exc.__class__.__name__}: {exc}")
+            continue
+        except asyncio.CancelledError:
+            _release_in_background(permit)
+            raise
         except Exception as exc:
+            await asyncio.to_thread(circuit_breaker.record, permit, ok=False)
             errors.append(f"{provider_name}: {exc.__class__.__name__}: {exc}")
+            continue
+        await asyncio.to_thread(circuit_breaker.record, permit, ok=True)
+        if persist is not None:
+            result = persist(result)
+        if cache_key is not None and result.get("s3_key"):
+            await asyncio.to_thread(response_cache.store, cache_key, result)
+        return result
 
     detail = "; ".join(errors) if errors else "no image providers configured"
     raise RuntimeError(f"All image providers failed: {detail}")
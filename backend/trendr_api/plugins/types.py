@@ -1,6 +1,6 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, Protocol
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional, Protocol
 
 
 @dataclass(frozen=True)
@@ -10,6 +10,10 @@ class ProviderCapabilities:
     supports_json_mode: bool = False
     supports_streaming: bool = False
     supports_system_prompt: bool = True
+    supports_batch: bool = False
+    # Offline placeholder (e.g. `openai_stub`): a last-resort fallback that is never
+    # hedged against or used to size prompts.
+    is_stub: bool = False
 
 
 class TextProvider(Protocol):
@@ -29,6 +33,77 @@ class TextProvider(Protocol):
         ...
 
 
+class StreamingTextProvider(TextProvider, Protocol):
+    """Text provider that can also yield its output incrementally."""
+
+    def generate_stream(
+        self,
+        *,
+        prompt: str,
+        system: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Yield text deltas; joined in order they equal the full output."""
+        ...
+
+
+# Batch states after which a batch never changes again.
+BATCH_FINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    custom_id: str
+    prompt: str
+    system: Optional[str] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class BatchStatus:
+    id: str
+    status: str  # validating|in_progress|finalizing|completed|failed|expired|cancelling|cancelled
+    output_file_id: Optional[str] = None
+    error_file_id: Optional[str] = None
+    errors: tuple[str, ...] = ()
+
+    @property
+    def done(self) -> bool:
+        return self.status in BATCH_FINAL_STATES
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    custom_id: str
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchTextProvider(TextProvider, Protocol):
+    """Text provider that also runs many prompts as one asynchronous batch."""
+
+    async def submit_batch(
+        self,
+        requests: list[BatchRequest],
+        *,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Submit the requests and return the provider's batch id."""
+        ...
+
+    async def get_batch(self, batch_id: str, *, meta: Optional[Dict[str, Any]] = None) -> BatchStatus:
+        ...
+
+    async def batch_results(
+        self,
+        batch: BatchStatus,
+        *,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, BatchResult]:
+        """Results of a completed batch, by `custom_id`."""
+        ...
+
+
 class ImageProvider(Protocol):
     name: str
     capabilities: ProviderCapabilities
@@ -0,0 +1,48 @@
+from .circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitPermit,
+    circuit_breaker,
+)
+from .hedging import hedge_budget, hedge_delay, hedging_requested, latency_tracker
+from .rate_limit import (
+    ProviderRateLimited,
+    RateBucket,
+    RateLimiter,
+    RateLimitTimeout,
+    estimate_request_tokens,
+    provider_buckets,
+    rate_limiter,
+    retry_after_seconds,
+)
+from .retry import ProviderHTTPError, RetryPolicy, classify, policy_for, retry_async, retry_budget, retry_sync
+
+__all__ = [
+    "CLOSED",
+    "HALF_OPEN",
+    "OPEN",
+    "CircuitBreaker",
+    "CircuitPermit",
+    "ProviderHTTPError",
+    "ProviderRateLimited",
+    "RateBucket",
+    "RateLimitTimeout",
+    "RateLimiter",
+    "RetryPolicy",
+    "circuit_breaker",
+    "classify",
+    "estimate_request_tokens",
+    "hedge_budget",
+    "hedge_delay",
+    "hedging_requested",
+    "latency_tracker",
+    "policy_for",
+    "provider_buckets",
+    "rate_limiter",
+    "retry_after_seconds",
+    "retry_async",
+    "retry_budget",
+    "retry_sync",
+]
@@ -0,0 +1,325 @@
+"""Per-provider circuit breakers shared across worker processes.
+
+Each provider gets a rolling window of call outcomes, split into fixed
+buckets. Once the window holds at least `PROVIDER_CIRCUIT_MIN_CALLS` calls and
+either the error rate or the share of slow calls crosses its threshold, the
+circuit opens and the router skips that provider without waiting for a
+timeout. After `PROVIDER_CIRCUIT_OPEN_SECONDS` one caller at a time is let
+through as a half-open probe: success closes the circuit, failure re-opens it.
+
+State lives in Redis so every API and worker process sees the same circuit.
+When Redis is unreachable the breaker keeps working from process-local state.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Protocol
+
+from ..cache import get_redis
+from ..config import settings
+from ..observability import metrics
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+WINDOW_BUCKETS = 6
+# Back off from Redis for this long after an error instead of paying its timeout on every call.
+REDIS_RETRY_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class WindowCounts:
+    calls: int = 0
+    failures: int = 0
+    slow: int = 0
+
+
+class CircuitStore(Protocol):
+    def record(self, name: str, bucket: int, *, failed: bool, slow: bool, ttl_seconds: int) -> None: ...
+
+    def window(self, name: str, buckets: list[int]) -> WindowCounts: ...
+
+    def get_state(self, name: str) -> tuple[str, float]: ...
+
+    def set_state(self, name: str, state: str, opened_at: float) -> None: ...
+
+    def acquire_probe(self, name: str, ttl_seconds: int) -> bool: ...
+
+    def release_probe(self, name: str) -> None: ...
+
+    def reset(self, name: str | None = None) -> None: ...
+
+
+class MemoryCircuitStore:
+    """Process-local store; also the fallback while Redis is unavailable."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: dict[tuple[str, int], list[int]] = {}
+        self._states: dict[str, tuple[str, float]] = {}
+        self._probes: dict[str, float] = {}
+
+    def record(self, name: str, bucket: int, *, failed: bool, slow: bool, ttl_seconds: int) -> None:
+        with self._lock:
+            counts = self._buckets.setdefault((name, bucket), [0, 0, 0])
+            counts[0] += 1
+            counts[1] += int(failed)
+            counts[2] += int(slow)
+            oldest = bucket - WINDOW_BUCKETS
+            for key in [key for key in self._buckets if key[0] == name and key[1] <= oldest]:
+                del self._buckets[key]
+
+    def window(self, name: str, buckets: list[int]) -> WindowCounts:
+        with self._lock:
+            rows = [self._buckets.get((name, bucket), [0, 0, 0]) for bucket in buckets]
+        return WindowCounts(*(sum(column) for column in zip(*rows)))
+
+    def get_state(self, name: str) -> tuple[str, float]:
+        with self._lock:
+            return self._states.get(name, (CLOSED, 0.0))
+
+    def set_state(self, name: str, state: str, opened_at: float) -> None:
+        with self._lock:
+            if state == CLOSED:
+                self._states.pop(name, None)
+                for key in [key for key in self._buckets if key[0] == name]:
+                    del self._buckets[key]
+            else:
+                self._states[name] = (state, opened_at)
+
+    def acquire_probe(self, name: str, ttl_seconds: int) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._probes.get(name, 0.0) > now:
+                return False
+            self._probes[name] = now + ttl_seconds
+            return True
+
+    def release_probe(self, name: str) -> None:
+        with self._lock:
+            self._probes.pop(name, None)
+
+    def reset(self, name: str | None = None) -> None:
+        with self._lock:
+            if name is None:
+                self._buckets.clear()
+                self._states.clear()
+                self._probes.clear()
+                return
+            for key in [key for key in self._buckets if key[0] == name]:
+                del self._buckets[key]
+            self._states.pop(name, None)
+            self._probes.pop(name, None)
+
+
+class RedisCircuitStore:
+    """Redis-backed store shared by all processes, falling back to memory on errors."""
+
+    prefix = "trendr:circuit:"
+
+    def __init__(self, fallback: MemoryCircuitStore) -> None:
+        self._fallback = fallback
+        self._down_until = 0.0
+
+    def _call(self, op: str, *args: Any, **kwargs: Any) -> Any:
+        if time.monotonic() >= self._down_until:
+            try:
+                return getattr(self, f"_{op}")(get_redis(), *args, **kwargs)
+            except Exception as exc:
+                self._down_until = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning("circuit_store_redis_failed", extra={"op": op, "error": str(exc)})
+        return getattr(self._fallback, op)(*args, **kwargs)
+
+    def _bucket_key(self, name: str, bucket: int) -> str:
+        return f"{self.prefix}{name}:bucket:{bucket}"
+
+    def record(self, name: str, bucket: int, *, failed: bool, slow: bool, ttl_seconds: int) -> None:
+        self._call("record", name, bucket, failed=failed, slow=slow, ttl_seconds=ttl_seconds)
+
+    def _record(self, client: Any, name: str, bucket: int, *, failed: bool, slow: bool, ttl_seconds: int) -> None:
+        key = self._bucket_key(name, bucket)
+        pipe = client.pipeline()
+        pipe.hincrby(key, "calls", 1)
+        if failed:
+            pipe.hincrby(key, "failures", 1)
+        if slow:
+            pipe.hincrby(key, "slow", 1)
+        pipe.expire(key, ttl_seconds)
+        pipe.execute()
+
+    def window(self, name: str, buckets: list[int]) -> WindowCounts:
+        return self._call("window", name, buckets)
+
+    def _window(self, client: Any, name: str, buckets: list[int]) -> WindowCounts:
+        pipe = client.pipeline()
+        for bucket in buckets:
+            pipe.hgetall(self._bucket_key(name, bucket))
+        totals = {"calls": 0, "failures": 0, "slow": 0}
+        for row in pipe.execute():
+            for field, value in (row or {}).items():
+                field = field.decode() if isinstance(field, bytes) else field
+                if field in totals:
+                    totals[field] += int(value)
+        return WindowCounts(**totals)
+
+    def get_state(self, name: str) -> tuple[str, float]:
+        return self._call("get_state", name)
+
+    def _get_state(self, client: Any, name: str) -> tuple[str, float]:
+        row = client.hgetall(f"{self.prefix}{name}:state") or {}
+        decoded = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in row.items()
+        }
+        return decoded.get("state", CLOSED), float(decoded.get("opened_at", 0.0))
+
+    def set_state(self, name: str, state: str, opened_at: float) -> None:
+        self._call("set_state", name, state, opened_at)
+
+    def _set_state(self, client: Any, name: str, state: str, opened_at: float) -> None:
+        key = f"{self.prefix}{name}:state"
+        if state == CLOSED:
+            client.delete(key, *[self._bucket_key(name, b) for b in _buckets(time.time())])
+        else:
+            client.hset(key, mapping={"state": state, "opened_at": opened_at})
+
+    def acquire_probe(self, name: str, ttl_seconds: int) -> bool:
+        return self._call("acquire_probe", name, ttl_seconds)
+
+    def _acquire_probe(self, client: Any, name: str, ttl_seconds: int) -> bool:
+        return bool(client.set(f"{self.prefix}{name}:probe", "1", nx=True, ex=max(1, ttl_seconds)))
+
+    def release_probe(self, name: str) -> None:
+        self._call("release_probe", name)
+
+    def _release_probe(self, client: Any, name: str) -> None:
+        client.delete(f"{self.prefix}{name}:probe")
+
+    def reset(self, name: str | None = None) -> None:
+        self._fallback.reset(name)
+        self._down_until = 0.0
+
+
+def _bucket_seconds() -> float:
+    return max(settings.provider_circuit_window_seconds / WINDOW_BUCKETS, 1.0)
+
+
+def _buckets(now: float) -> list[int]:
+    current = int(now // _bucket_seconds())
+    return list(range(current - WINDOW_BUCKETS + 1, current + 1))
+
+
+@dataclass(frozen=True)
+class CircuitPermit:
+    name: str
+    probe: bool
+    started: float
+
+
+class CircuitBreaker:
+    """Decides whether a provider may be called and records how the call went."""
+
+    def __init__(self) -> None:
+        self._memory = MemoryCircuitStore()
+        self._redis = RedisCircuitStore(fallback=self._memory)
+
+    @property
+    def store(self) -> CircuitStore:
+        return self._redis if settings.provider_circuit_store == "redis" else self._memory
+
+    def acquire(self, name: str) -> CircuitPermit | None:
+        """A permit to call `name`, or None while its circuit is open."""
+        if not settings.provider_circuit_enabled:
+            return CircuitPermit(name=name, probe=False, started=time.monotonic())
+        state, opened_at = self.store.get_state(name)
+        if state == CLOSED:
+            return CircuitPermit(name=name, probe=False, started=time.monotonic())
+        if time.time() < opened_at + settings.provider_circuit_open_seconds:
+            metrics.inc("provider_circuit_rejections_total", provider=name)
+            return None
+        probe_ttl = int(max(settings.provider_circuit_slow_call_seconds * 2, 1))
+        if not self.store.acquire_probe(name, probe_ttl):
+            metrics.inc("provider_circuit_rejections_total", provider=name)
+            return None
+        logger.info("provider_circuit_probe", extra={"provider": name})
+        return CircuitPermit(name=name, probe=True, started=time.monotonic())
+
+    def record(self, permit: CircuitPermit, *, ok: bool) -> None:
+        if not settings.provider_circuit_enabled:
+            return
+        name = permit.name
+        slow = time.monotonic() - permit.started >= settings.provider_circuit_slow_call_seconds
+        store = self.store
+        now = time.time()
+
+        if permit.probe:
+            if ok and not slow:
+                store.set_state(name, CLOSED, 0.0)
+                logger.info("provider_circuit_closed", extra={"provider": name})
+            else:
+                store.set_state(name, OPEN, now)
+                logger.warning("provider_circuit_reopened", extra={"provider": name})
+            store.release_probe(name)
+            return
+
+        buckets = _buckets(now)
+        ttl = int(settings.provider_circuit_window_seconds + _bucket_seconds()) + 1
+        store.record(name, buckets[-1], failed=not ok, slow=slow, ttl_seconds=ttl)
+        if ok and not slow:
+            return
+        counts = store.window(name, buckets)
+        if counts.calls < settings.provider_circuit_min_calls:
+            return
+        if (
+            counts.failures / counts.calls >= settings.provider_circuit_failure_rate
+            or counts.slow / counts.calls >= settings.provider_circuit_slow_rate
+        ):
+            state, _ = store.get_state(name)
+            if state == CLOSED:
+                store.set_state(name, OPEN, now)
+                metrics.inc("provider_circuit_opened_total", provider=name)
+                logger.warning(
+                    "provider_circuit_opened",
+                    extra={"provider": name, "calls": counts.calls, "failures": counts.failures, "slow": counts.slow},
+                )
+
+    def restart(self, permit: CircuitPermit) -> CircuitPermit:
+        """The same permit timed from now, e.g. after queueing for a rate limit."""
+        return replace(permit, started=time.monotonic())
+
+    def release(self, permit: CircuitPermit) -> None:
+        """Give up a permit without an outcome (the call was cancelled)."""
+        if permit.probe:
+            self.store.release_probe(permit.name)
+
+    def snapshot(self, name: str) -> dict[str, Any]:
+        """Current state and window statistics for `name`, for the providers API."""
+        store = self.store
+        state, opened_at = store.get_state(name)
+        open_until = None
+        if state != CLOSED:
+            open_until = opened_at + settings.provider_circuit_open_seconds
+            if time.time() >= open_until:
+                state = HALF_OPEN
+        counts = store.window(name, _buckets(time.time()))
+        return {
+            "state": state,
+            "calls": counts.calls,
+            "failure_rate": round(counts.failures / counts.calls, 4) if counts.calls else 0.0,
+            "slow_rate": round(counts.slow / counts.calls, 4) if counts.calls else 0.0,
+            "open_until": open_until,
+        }
+
+    def reset(self, name: str | None = None) -> None:
+        """Forget local circuit state (tests, or after reconfiguring providers)."""
+        self.store.reset(name)
+        self._memory.reset(name)
+
+
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,127 @@
+"""Hedged text requests: latency percentiles and the per-workspace hedge budget.
+
+When hedging is on, the router waits for the preferred provider only as long as
+its observed `TEXT_HEDGE_PERCENTILE` latency before firing the same request at
+the next provider. Every hedge is an extra paid call, so each workspace may
+hedge at most `TEXT_HEDGE_BUDGET_PER_HOUR` times per hour.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from ..cache import get_redis
+from ..config import settings
+from ..observability import metrics
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SAMPLES = 500
+# Below this many samples the percentile is noise; use the configured default delay.
+MIN_LATENCY_SAMPLES = 20
+MIN_HEDGE_DELAY_SECONDS = 0.05
+BUDGET_WINDOW_SECONDS = 3600
+# After a Redis error, count hedges locally for this long before trying Redis again.
+REDIS_RETRY_SECONDS = 30.0
+
+
+class LatencyTracker:
+    """Recent successful call latencies per provider, for this process."""
+
+    def __init__(self, maxlen: int = LATENCY_SAMPLES) -> None:
+        self._lock = threading.Lock()
+        self._maxlen = maxlen
+        self._samples: dict[str, deque[float]] = {}
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self._maxlen)
+            samples.append(seconds)
+
+    def percentile(self, name: str, q: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        index = min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))
+        return samples[index]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+latency_tracker = LatencyTracker()
+
+
+def hedging_requested(meta: dict[str, Any]) -> bool:
+    """`meta["hedge"]` overrides `TEXT_HEDGING_ENABLED` for a single request."""
+    requested = meta.get("hedge")
+    if isinstance(requested, bool):
+        return requested
+    return settings.text_hedging_enabled
+
+
+def hedge_delay(name: str) -> float:
+    observed = latency_tracker.percentile(name, settings.text_hedge_percentile)
+    delay = observed if observed is not None else settings.text_hedge_default_delay_seconds
+    return max(delay, MIN_HEDGE_DELAY_SECONDS)
+
+
+class HedgeBudget:
+    """Hourly hedge allowance per workspace, counted in Redis with a local fallback."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local: dict[tuple[str, int], int] = {}
+        self._redis_down_until = 0.0
+
+    def _local_add(self, key: tuple[str, int], amount: int) -> int:
+        with self._lock:
+            for stale in [k for k in self._local if k[1] < key[1]]:
+                del self._local[stale]
+            self._local[key] = max(0, self._local.get(key, 0) + amount)
+            return self._local[key]
+
+    def _add(self, workspace_id: Any, amount: int) -> int:
+        """Add `amount` to the current window's count; returns the new count."""
+        scope = str(workspace_id) if workspace_id is not None else "global"
+        window = int(time.time() // BUDGET_WINDOW_SECONDS)
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                redis_key = f"trendr:hedge-budget:{scope}:{window}"
+                pipe = get_redis().pipeline()
+                pipe.incrby(redis_key, amount)
+                pipe.expire(redis_key, BUDGET_WINDOW_SECONDS)
+                return int(pipe.execute()[0])
+            except Exception as exc:
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning("hedge_budget_redis_failed", extra={"error": str(exc)})
+        return self._local_add((scope, window), amount)
+
+    def try_spend(self, workspace_id: Any) -> bool:
+        limit = settings.text_hedge_budget_per_hour
+        if limit <= 0:
+            return False
+        if self._add(workspace_id, 1) > limit:
+            metrics.inc("provider_hedges_denied_total")
+            return False
+        return True
+
+    def refund(self, workspace_id: Any) -> None:
+        """Give back a spend whose hedge found no provider to start."""
+        self._add(workspace_id, -1)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self._redis_down_until = 0.0
+
+
+hedge_budget = HedgeBudget()
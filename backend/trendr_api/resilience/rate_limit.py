@@ -0,0 +1,267 @@
+"""Distributed token-bucket rate limiting for provider calls.
+
+Each bucket allows a burst of `per_minute` units, refilled continuously at
+`per_minute` per minute. A call names every bucket it draws from, typically
+requests/min and tokens/min for the provider credential and optionally a
+per-workspace share. It proceeds only when all of them have room, and then
+draws from all of them atomically (a Lua script in Redis). Otherwise the caller
+sleeps until the slowest bucket refills instead of sending a request the
+provider would reject with 429.
+
+A 429 that gets through anyway blocks the credential's buckets for the
+`Retry-After` period, across all processes. If Redis is unreachable the same
+buckets are kept per process.
+"""
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import hashlib
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from ..cache import get_redis
+from ..config import settings
+from ..observability import metrics
+from .retry import ProviderHTTPError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "trendr:ratelimit:"
+CHARS_PER_TOKEN = 4
+# Back off from Redis for this long after an error instead of paying its timeout on every call.
+REDIS_RETRY_SECONDS = 30.0
+
+# KEYS: bucket keys. ARGV: now, then capacity, refill-per-second and cost per key.
+# Returns "0" after drawing from every bucket, or the seconds to wait (nothing drawn).
+_ACQUIRE_LUA = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local levels = {}
+for i = 1, #KEYS do
+  local capacity = tonumber(ARGV[i * 3 - 1])
+  local rate = tonumber(ARGV[i * 3])
+  local cost = tonumber(ARGV[i * 3 + 1])
+  local row = redis.call('HMGET', KEYS[i], 'level', 'ts', 'blocked')
+  local level = tonumber(row[1]) or capacity
+  local ts = tonumber(row[2]) or now
+  local blocked = tonumber(row[3]) or 0
+  level = math.min(capacity, level + math.max(0, now - ts) * rate)
+  levels[i] = level
+  if blocked > now then wait = math.max(wait, blocked - now) end
+  if level < cost then wait = math.max(wait, (cost - level) / rate) end
+end
+if wait > 0 then return tostring(wait) end
+for i = 1, #KEYS do
+  local capacity = tonumber(ARGV[i * 3 - 1])
+  local rate = tonumber(ARGV[i * 3])
+  local cost = tonumber(ARGV[i * 3 + 1])
+  redis.call('HSET', KEYS[i], 'level', levels[i] - cost, 'ts', now)
+  redis.call('EXPIRE', KEYS[i], math.ceil(capacity / rate) + 60)
+end
+return "0"
+"""
+
+
+class RateLimitTimeout(RuntimeError):
+    """Raised when a call would have to wait longer than its allowed queueing time."""
+
+
+class ProviderRateLimited(ProviderHTTPError):
+    """A provider rejected the call with 429; `retry_after` comes from its `Retry-After` header."""
+
+    def __init__(self, message: str, *, retry_after: float) -> None:
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class RateBucket:
+    key: str
+    per_minute: int
+    cost: float = 1.0
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.per_minute / 60.0
+
+    @property
+    def clamped_cost(self) -> float:
+        # A single request larger than the whole bucket would otherwise wait forever.
+        return min(self.cost, float(self.per_minute))
+
+
+def credential_fingerprint(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def estimate_request_tokens(prompt: str, system: str | None, meta: dict[str, Any]) -> int:
+    """Prompt tokens (chars/4) plus the requested completion budget, as providers count them."""
+    max_output = meta.get("max_output_tokens")
+    completion = max_output if isinstance(max_output, int) and max_output > 0 else 0
+    return math.ceil((len(prompt) + len(system or "")) / CHARS_PER_TOKEN) + completion
+
+
+def provider_buckets(
+    provider: str,
+    *,
+    api_key: str,
+    requests_per_minute: int,
+    tokens_per_minute: int = 0,
+    tokens: int = 0,
+    workspace_id: Any = None,
+) -> list[RateBucket]:
+    """Buckets for one call: the credential's requests and tokens, plus the workspace share.
+
+    A limit of 0 disables that bucket.
+    """
+    scope = f"{KEY_PREFIX}{provider}:{credential_fingerprint(api_key)}"
+    buckets = []
+    if requests_per_minute > 0:
+        buckets.append(RateBucket(f"{scope}:requests", requests_per_minute))
+    if tokens_per_minute > 0 and tokens > 0:
+        buckets.append(RateBucket(f"{scope}:tokens", tokens_per_minute, float(tokens)))
+    workspace_rpm = settings.rate_limit_workspace_requests_per_minute
+    if workspace_rpm > 0 and workspace_id is not None:
+        buckets.append(RateBucket(f"{KEY_PREFIX}{provider}:workspace:{workspace_id}", workspace_rpm))
+    return buckets
+
+
+def retry_after_seconds(headers: Any, default: float = 1.0) -> float:
+    """Parse `Retry-After` (delta-seconds or HTTP date); `default` when absent or invalid."""
+    raw = headers.get("retry-after") if headers is not None else None
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+class _LocalBuckets:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rows: dict[str, list[float]] = {}
+
+    def try_acquire(self, buckets: list[RateBucket], now: float) -> float:
+        with self._lock:
+            wait = 0.0
+            levels = []
+            for bucket in buckets:
+                level, ts, blocked = self._rows.get(bucket.key, [float(bucket.per_minute), now, 0.0])
+                level = min(float(bucket.per_minute), level + max(0.0, now - ts) * bucket.refill_per_second)
+                levels.append(level)
+                if blocked > now:
+                    wait = max(wait, blocked - now)
+                if level < bucket.clamped_cost:
+                    wait = max(wait, (bucket.clamped_cost - level) / bucket.refill_per_second)
+            if wait > 0:
+                return wait
+            for bucket, level in zip(buckets, levels):
+                blocked = self._rows.get(bucket.key, [0.0, 0.0, 0.0])[2]
+                self._rows[bucket.key] = [level - bucket.clamped_cost, now, blocked]
+            return 0.0
+
+    def block(self, buckets: list[RateBucket], until: float, now: float) -> None:
+        with self._lock:
+            for bucket in buckets:
+                row = self._rows.setdefault(bucket.key, [float(bucket.per_minute), now, 0.0])
+                row[2] = max(row[2], until)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._rows.clear()
+
+
+class RateLimiter:
+    def __init__(self) -> None:
+        self._local = _LocalBuckets()
+        self._script = None
+        self._redis_down_until = 0.0
+
+    def _use_redis(self) -> bool:
+        return settings.rate_limit_store == "redis" and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, exc: Exception) -> None:
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.warning("rate_limit_redis_failed", extra={"error": str(exc)})
+
+    def try_acquire(self, buckets: list[RateBucket]) -> float:
+        """Draw from every bucket and return 0, or return the seconds to wait."""
+        now = time.time()
+        if self._use_redis():
+            try:
+                if self._script is None:
+                    self._script = get_redis().register_script(_ACQUIRE_LUA)
+                args: list[float] = [now]
+                for bucket in buckets:
+                    args.extend([bucket.per_minute, bucket.refill_per_second, bucket.clamped_cost])
+                result = self._script(keys=[bucket.key for bucket in buckets], args=args)
+                return float(result.decode() if isinstance(result, bytes) else result)
+            except Exception as exc:
+                self._script = None
+                self._redis_failed(exc)
+        return self._local.try_acquire(buckets, now)
+
+    async def acquire(self, buckets: list[RateBucket], *, max_wait: float | None = None) -> float:
+        """Wait until every bucket has room, then draw from them. Returns the seconds waited.
+
+        Raises RateLimitTimeout if the wait would exceed `max_wait`
+        (default `RATE_LIMIT_MAX_WAIT_SECONDS`).
+        """
+        if not buckets or not settings.rate_limit_enabled:
+            return 0.0
+        limit = settings.rate_limit_max_wait_seconds if max_wait is None else max_wait
+        started = time.monotonic()
+        while True:
+            if self._use_redis():
+                # The Redis script is a blocking call; keep it off the event loop.
+                wait = await asyncio.to_thread(self.try_acquire, buckets)
+            else:
+                wait = self.try_acquire(buckets)
+            waited = time.monotonic() - started
+            if wait <= 0:
+                if waited > 0:
+                    metrics.observe("provider_rate_limit_wait_seconds", waited)
+                return waited
+            if waited + wait > limit:
+                metrics.inc("provider_rate_limit_timeouts_total")
+                raise RateLimitTimeout(f"Rate limited for another {wait:.1f}s (waited {waited:.1f}s)")
+            metrics.inc("provider_rate_limit_waits_total")
+            await asyncio.sleep(wait)
+
+    def block(self, buckets: list[RateBucket], seconds: float) -> None:
+        """Hold every caller of these buckets for `seconds` (e.g. after a 429 with Retry-After)."""
+        if not buckets or seconds <= 0:
+            return
+        now = time.time()
+        until = now + seconds
+        metrics.inc("provider_rate_limit_blocks_total")
+        if self._use_redis():
+            try:
+                pipe = get_redis().pipeline()
+                for bucket in buckets:
+                    pipe.hset(bucket.key, "blocked", until)
+                    pipe.expire(bucket.key, math.ceil(bucket.per_minute / bucket.refill_per_second + seconds) + 60)
+                pipe.execute()
+                return
+            except Exception as exc:
+                self._redis_failed(exc)
+        self._local.block(buckets, until, now)
+
+    def reset(self) -> None:
+        self._local.reset()
+        self._script = None
+        self._redis_down_until = 0.0
+
+
+rate_limiter = RateLimiter()
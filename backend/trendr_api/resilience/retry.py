@@ -0,0 +1,237 @@
+"""Retry policies for transient provider and transcript-fetch errors.
+
+Errors are sorted into classes (`rate_limited`, `server_error`, `timeout`,
+`connection`, `blocked`). Each target (a provider name or `youtube_transcript`)
+has a policy giving the total attempts per class. Classes it does not list are
+never retried. Waits use full-jitter exponential backoff, stretched to a
+`Retry-After` where the error carries one. A retry is skipped when the next
+sleep would overrun the policy's deadline, or when the target has used up its
+retry budget: retries per minute may not exceed `RETRY_BUDGET_RATIO` of calls
+(plus a small floor), so an outage does not multiply the load on a provider.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+import httpx
+from tenacity import AsyncRetrying, RetryCallState, Retrying, wait_random_exponential
+
+from ..config import settings
+from ..observability import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RATE_LIMITED = "rate_limited"
+SERVER_ERROR = "server_error"
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+BLOCKED = "blocked"
+ERROR_CLASSES = (RATE_LIMITED, SERVER_ERROR, TIMEOUT, CONNECTION, BLOCKED)
+
+BUDGET_WINDOW_SECONDS = 60
+
+# Exceptions from libraries we do not import (requests, youtube-transcript-api), by class name.
+_TIMEOUT_NAMES = {"Timeout", "ReadTimeout", "ConnectTimeout"}
+_CONNECTION_NAMES = {"ConnectionError", "ChunkedEncodingError"}
+_BLOCKED_NAMES = {"RequestBlocked", "IpBlocked"}
+
+# Total attempts per error class, plus optional delay/deadline overrides.
+# OpenAI 429s are not retried here: the router retries them against the shared
+# rate-limit buckets (see rate_limit.py) so every process honours Retry-After.
+# OpenAI deadlines leave room for one full request timeout (45s text, 90s image)
+# plus backoff; otherwise a timed-out attempt could never be retried.
+DEFAULT_POLICIES: dict[str, dict[str, float]] = {
+    "openai": {SERVER_ERROR: 3, TIMEOUT: 2, CONNECTION: 3, "deadline_seconds": 120},
+    "openai_image": {SERVER_ERROR: 2, TIMEOUT: 2, CONNECTION: 3, "deadline_seconds": 120},
+    "youtube_transcript": {
+        BLOCKED: 3,
+        TIMEOUT: 3,
+        CONNECTION: 3,
+        "base_delay_seconds": 2,
+        "max_delay_seconds": 20,
+        "deadline_seconds": 60,
+    },
+}
+
+
+class ProviderHTTPError(RuntimeError):
+    """A provider answered with an HTTP error status."""
+
+    def __init__(self, message: str, *, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def classify(exc: BaseException | None) -> str | None:
+    """The retryable error class of `exc` (or of what caused it), or None."""
+    seen: set[int] = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        declared = getattr(exc, "retry_class", None)
+        if declared in ERROR_CLASSES:
+            return declared
+        status = getattr(exc, "status_code", None)
+        if isinstance(status, int):
+            if status == 429:
+                return RATE_LIMITED
+            if status == 408:
+                return TIMEOUT
+            if status >= 500:
+                return SERVER_ERROR
+        name = exc.__class__.__name__
+        if isinstance(exc, (httpx.TimeoutException, TimeoutError)) or name in _TIMEOUT_NAMES:
+            return TIMEOUT
+        if isinstance(exc, (httpx.TransportError, ConnectionError)) or name in _CONNECTION_NAMES:
+            return CONNECTION
+        if name in _BLOCKED_NAMES:
+            return BLOCKED
+        exc = exc.__cause__
+    return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: dict[str, int]
+    base_delay_seconds: float
+    max_delay_seconds: float
+    deadline_seconds: float
+
+    def attempts_for(self, error_class: str | None) -> int:
+        if error_class is None:
+            return 1
+        return max(1, self.attempts.get(error_class, 1))
+
+
+def policy_for(target: str) -> RetryPolicy:
+    """Defaults from settings, then `DEFAULT_POLICIES`, then `RETRY_POLICIES` overrides."""
+    merged: dict[str, float] = {
+        "base_delay_seconds": settings.retry_base_delay_seconds,
+        "max_delay_seconds": settings.retry_max_delay_seconds,
+        "deadline_seconds": settings.retry_deadline_seconds,
+    }
+    merged.update(DEFAULT_POLICIES.get(target, {}))
+    merged.update(settings.retry_policies.get(target, {}))
+    return RetryPolicy(
+        attempts={name: int(merged[name]) for name in ERROR_CLASSES if name in merged},
+        base_delay_seconds=float(merged["base_delay_seconds"]),
+        max_delay_seconds=float(merged["max_delay_seconds"]),
+        deadline_seconds=float(merged["deadline_seconds"]),
+    )
+
+
+class RetryBudget:
+    """Per-target retry allowance for the current minute, in this process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._windows: dict[str, list[int]] = {}
+
+    def _row(self, target: str) -> list[int]:
+        window = int(time.time() // BUDGET_WINDOW_SECONDS)
+        row = self._windows.get(target)
+        if row is None or row[0] != window:
+            row = self._windows[target] = [window, 0, 0]
+        return row
+
+    def record_call(self, target: str) -> None:
+        with self._lock:
+            self._row(target)[1] += 1
+
+    def try_spend(self, target: str) -> bool:
+        with self._lock:
+            row = self._row(target)
+            allowed = settings.retry_budget_min_per_minute + settings.retry_budget_ratio * row[1]
+            if row[2] + 1 > allowed:
+                return False
+            row[2] += 1
+            return True
+
+    def reset(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+
+retry_budget = RetryBudget()
+
+
+def _retrying(target: str, retrying_cls: type, sleep: Callable[[float], Any] | None) -> Any:
+    policy = policy_for(target)
+    jitter = wait_random_exponential(multiplier=policy.base_delay_seconds, max=policy.max_delay_seconds)
+
+    def _error_class(state: RetryCallState) -> str | None:
+        return classify(state.outcome.exception()) if state.outcome is not None else None
+
+    def _retry(state: RetryCallState) -> bool:
+        return state.outcome is not None and state.outcome.failed and policy.attempts_for(_error_class(state)) > 1
+
+    def _wait(state: RetryCallState) -> float:
+        retry_after = getattr(state.outcome.exception(), "retry_after", None) if state.outcome else None
+        delay = jitter(state)
+        if isinstance(retry_after, (int, float)):
+            delay = max(delay, float(retry_after))
+        return delay
+
+    def _stop(state: RetryCallState) -> bool:
+        error_class = _error_class(state)
+        labels = {"target": target, "error_class": error_class}
+        if state.attempt_number >= policy.attempts_for(error_class):
+            metrics.inc("retry_exhausted_total", **labels)
+            return True
+        if state.seconds_since_start + (state.upcoming_sleep or 0.0) > policy.deadline_seconds:
+            metrics.inc("retry_deadline_exceeded_total", **labels)
+            return True
+        if not retry_budget.try_spend(target):
+            metrics.inc("retry_budget_denied_total", **labels)
+            return True
+        return False
+
+    def _before_sleep(state: RetryCallState) -> None:
+        error_class = _error_class(state)
+        metrics.inc("retries_total", target=target, error_class=error_class)
+        logger.info(
+            "retrying_call",
+            extra={
+                "target": target,
+                "error_class": error_class,
+                "attempt": state.attempt_number,
+                "sleep_seconds": round(state.upcoming_sleep, 3),
+            },
+        )
+
+    kwargs: dict[str, Any] = {
+        "retry": _retry,
+        "stop": _stop,
+        "wait": _wait,
+        "before_sleep": _before_sleep,
+        "reraise": True,
+    }
+    if sleep is not None:
+        kwargs["sleep"] = sleep
+    return retrying_cls(**kwargs)
+
+
+async def retry_async(
+    target: str,
+    call: Callable[[], Awaitable[T]],
+    *,
+    sleep: Callable[[float], Awaitable[None]] | None = None,
+) -> T:
+    """Await `call()` under `target`'s retry policy; the last error propagates."""
+    if not settings.retry_enabled:
+        return await call()
+    retry_budget.record_call(target)
+    return await _retrying(target, AsyncRetrying, sleep)(call)
+
+
+def retry_sync(target: str, call: Callable[[], T], *, sleep: Callable[[float], None] | None = None) -> T:
+    """Blocking counterpart of `retry_async`, for code running in worker threads."""
+    if not settings.retry_enabled:
+        return call()
+    retry_budget.record_call(target)
+    return _retrying(target, Retrying, sleep)(call)
@@ -21,6 +21,13 @@ class ProjectOut(BaseModel):
 class IngestYouTubeRequest(BaseModel):
     url: HttpUrl
     project_name: Optional[str] = None
+    refresh_transcript: bool = False
+
+
+class IngestYouTubeBatchRequest(BaseModel):
+    urls: List[HttpUrl] = Field(min_length=1)
+    project_name: Optional[str] = None
+    refresh_transcript: bool = False
 
 
 class GenerateRequest(BaseModel):
@@ -29,6 +36,13 @@ class GenerateRequest(BaseModel):
     tone: str = "professional"
     brand_voice: Optional[str] = None
     template_id: Optional[int] = None
+    # Generate from a clip of the transcript instead of the whole video.
+    start_seconds: Optional[float] = Field(default=None, ge=0)
+    end_seconds: Optional[float] = Field(default=None, ge=0)
+    # "auto" summarises the transcript in chunks first when it exceeds the prompt budget.
+    mode: Literal["auto", "single", "map_reduce"] = "auto"
+    # "batch" submits the prompts through the provider's batch API; results land within hours.
+    execution: Literal["interactive", "batch"] = "interactive"
     meta: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -44,6 +58,18 @@ class JobOut(BaseModel):
     error: Optional[str] = None
 
 
+class TranscriptSegmentOut(BaseModel):
+    start: float
+    end: float
+    text: str
+
+
+class ArtifactContentOut(BaseModel):
+    id: int
+    kind: str
+    content: str
+
+
 class ArtifactUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
@@ -108,12 +134,24 @@ class ProviderCapabilitiesOut(BaseModel):
     supports_json_mode: bool = False
     supports_streaming: bool = False
     supports_system_prompt: bool = True
+    supports_batch: bool = False
+    is_stub: bool = False
+
+
+class ProviderCircuitOut(BaseModel):
+    state: Literal["closed", "open", "half_open"] = "closed"
+    calls: int = 0
+    failure_rate: float = 0.0
+    slow_rate: float = 0.0
+    # Unix timestamp after which a half-open probe is allowed.
+    open_until: Optional[float] = None
 
 
 class ProviderOut(BaseModel):
     name: str
     available: bool
     capabilities: ProviderCapabilitiesOut
+    circuit: ProviderCircuitOut = Field(default_factory=ProviderCircuitOut)
 
 
 class ScheduledPostCreate(BaseModel):
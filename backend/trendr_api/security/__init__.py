@@ -1,3 +1,3 @@
-from .secrets import decrypt_secret, encrypt_secret, secret_hint
+from .secrets import decrypt_many, decrypt_secret, encrypt_many, encrypt_secret, secret_hint
 
-__all__ = ["decrypt_secret", "encrypt_secret", "secret_hint"]
+__all__ = ["decrypt_many", "decrypt_secret", "encrypt_many", "encrypt_secret", "secret_hint"]
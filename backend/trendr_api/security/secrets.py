@@ -4,6 +4,7 @@ import base64
 import hashlib
 import hmac
 import os
+from typing import Iterable
 
 from ..config import settings
 
@@ -17,42 +18,44 @@ def _encryption_material() -> str:
     return (settings.secrets_encryption_key or settings.jwt_secret or "").strip()
 
 
-def _key_bytes() -> bytes:
-    material = _encryption_material()
+def _key_bytes(material: str | None = None) -> bytes:
+    material = (material if material is not None else _encryption_material()).strip()
     if not material:
         raise SecretEncryptionError("SECRETS_ENCRYPTION_KEY is not configured")
     return hashlib.sha256(material.encode("utf-8")).digest()
 
 
 def _keystream(key: bytes, nonce: bytes, length: int) -> bytes:
-    output = bytearray()
-    counter = 0
-    while len(output) < length:
-        block = hmac.new(
-            key,
-            nonce + counter.to_bytes(8, "big"),
-            hashlib.sha256,
-        ).digest()
-        output.extend(block)
-        counter += 1
-    return bytes(output[:length])
+    # HMAC-SHA256(key, nonce || counter) blocks. Keying the HMAC once and copying
+    # its state per block avoids re-deriving the inner/outer pads for every block.
+    base = hmac.new(key, nonce, hashlib.sha256)
+    blocks = -(-length // base.digest_size)
+    parts = []
+    for counter in range(blocks):
+        block = base.copy()
+        block.update(counter.to_bytes(8, "big"))
+        parts.append(block.digest())
+    return b"".join(parts)[:length]
 
 
-def encrypt_secret(value: str) -> str:
+def _xor(data: bytes, stream: bytes) -> bytes:
+    # Whole-buffer XOR through Python ints instead of a per-byte generator.
+    return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(len(data), "big")
+
+
+def _encrypt_with_key(key: bytes, value: str) -> str:
     normalized = value.strip()
     if not normalized:
         raise SecretEncryptionError("Secret value cannot be empty")
-    key = _key_bytes()
     plaintext = normalized.encode("utf-8")
     nonce = os.urandom(16)
-    stream = _keystream(key, nonce, len(plaintext))
-    ciphertext = bytes(b ^ s for b, s in zip(plaintext, stream))
+    ciphertext = _xor(plaintext, _keystream(key, nonce, len(plaintext)))
     tag = hmac.new(key, nonce + ciphertext, hashlib.sha256).digest()
     token = base64.urlsafe_b64encode(nonce + tag + ciphertext)
     return token.decode("utf-8")
 
 
-def decrypt_secret(token: str) -> str:
+def _decrypt_with_key(key: bytes, token: str) -> str:
     try:
         raw = base64.urlsafe_b64decode(token.encode("utf-8"))
         if len(raw) < 48:
@@ -60,17 +63,39 @@ def decrypt_secret(token: str) -> str:
         nonce = raw[:16]
         tag = raw[16:48]
         ciphertext = raw[48:]
-        key = _key_bytes()
         expected_tag = hmac.new(key, nonce + ciphertext, hashlib.sha256).digest()
         if not hmac.compare_digest(tag, expected_tag):
             raise ValueError("invalid ciphertext authentication tag")
-        stream = _keystream(key, nonce, len(ciphertext))
-        plaintext = bytes(b ^ s for b, s in zip(ciphertext, stream))
+        plaintext = _xor(ciphertext, _keystream(key, nonce, len(ciphertext)))
         return plaintext.decode("utf-8")
     except (ValueError, UnicodeDecodeError) as exc:
         raise SecretEncryptionError("Unable to decrypt stored secret") from exc
 
 
+def encrypt_secret(value: str) -> str:
+    return _encrypt_with_key(_key_bytes(), value)
+
+
+def decrypt_secret(token: str) -> str:
+    return _decrypt_with_key(_key_bytes(), token)
+
+
+def encrypt_many(values: Iterable[str]) -> list[str]:
+    """Encrypt several secrets, deriving the key once for the whole batch."""
+    key = _key_bytes()
+    return [_encrypt_with_key(key, value) for value in values]
+
+
+def decrypt_many(tokens: Iterable[str], *, key_material: str | None = None) -> list[str]:
+    """Decrypt several secrets, deriving the key once for the whole batch.
+
+    `key_material` overrides the configured key, e.g. to read tokens written with
+    a previous `SECRETS_ENCRYPTION_KEY` during rotation.
+    """
+    key = _key_bytes(key_material)
+    return [_decrypt_with_key(key, token) for token in tokens]
+
+
 def secret_hint(value: str) -> str:
     normalized = value.strip()
     if len(normalized) < 4:
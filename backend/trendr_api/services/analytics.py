@@ -30,14 +30,9 @@ def record_event(
     return event
 
 
-def get_summary(
-    session: Session,
-    *,
-    workspace_id: int,
-    days: int = 30,
-) -> list[dict[str, Any]]:
+def summary_query(*, workspace_id: int, days: int = 30):
     cutoff = datetime.utcnow() - timedelta(days=days)
-    stmt = (
+    return (
         select(Event.kind, func.count(Event.id).label("count"))
         .where(
             Event.workspace_id == workspace_id,
@@ -46,19 +41,16 @@ def get_summary(
         .group_by(Event.kind)
         .order_by(func.count(Event.id).desc())
     )
-    rows = session.exec(stmt).all()
+
+
+def summary_rows(rows) -> list[dict[str, Any]]:
     return [{"kind": row[0], "count": row[1]} for row in rows]
 
 
-def get_timeline(
-    session: Session,
-    *,
-    workspace_id: int,
-    days: int = 30,
-) -> list[dict[str, Any]]:
+def timeline_query(*, workspace_id: int, days: int = 30):
     cutoff = datetime.utcnow() - timedelta(days=days)
     date_expr = func.substr(cast(Event.created_at, String), 1, 10).label("date")
-    stmt = (
+    return (
         select(date_expr, Event.kind, func.count(Event.id).label("count"))
         .where(
             Event.workspace_id == workspace_id,
@@ -67,5 +59,27 @@ def get_timeline(
         .group_by(date_expr, Event.kind)
         .order_by(date_expr)
     )
-    rows = session.exec(stmt).all()
+
+
+def timeline_rows(rows) -> list[dict[str, Any]]:
     return [{"date": str(row[0]), "kind": row[1], "count": row[2]} for row in rows]
+
+
+def get_summary(
+    session: Session,
+    *,
+    workspace_id: int,
+    days: int = 30,
+) -> list[dict[str, Any]]:
+    rows = session.exec(summary_query(workspace_id=workspace_id, days=days)).all()
+    return summary_rows(rows)
+
+
+def get_timeline(
+    session: Session,
+    *,
+    workspace_id: int,
+    days: int = 30,
+) -> list[dict[str, Any]]:
+    rows = session.exec(timeline_query(workspace_id=workspace_id, days=days)).all()
+    return timeline_rows(rows)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from sqlmodel import Session
+
+from ..cache import TTLCache, register_invalidation_handler
+from ..config import settings
+from ..db import engine
+from .provider_settings import (
+    CREDENTIALS_INVALIDATION_NAMESPACE,
+    get_workspace_provider_api_key,
+)
+
+# Decrypted workspace API keys keyed by (workspace_id, provider). Missing keys are
+# cached as None so providers without a workspace override skip the DB as well.
+credential_cache: TTLCache[tuple[int, str], Optional[str]] = TTLCache(
+    name="provider_credentials",
+    maxsize=settings.credential_cache_max_entries,
+    ttl_seconds=settings.credential_cache_ttl_seconds,
+)
+
+
+def get_cached_workspace_api_key(*, workspace_id: int, provider: str) -> Optional[str]:
+    def _load() -> Optional[str]:
+        with Session(engine) as session:
+            return get_workspace_provider_api_key(
+                session=session,
+                workspace_id=workspace_id,
+                provider=provider,
+            )
+
+    return credential_cache.get_or_load((workspace_id, provider), _load)
+
+
+def _on_credentials_changed(payload: dict[str, Any] | None) -> None:
+    if payload is None:
+        credential_cache.clear()
+        return
+    try:
+        key = (int(payload["workspace_id"]), str(payload["provider"]))
+    except (KeyError, TypeError, ValueError):
+        credential_cache.clear()
+        return
+    credential_cache.invalidate(key)
+
+
+register_invalidation_handler(CREDENTIALS_INVALIDATION_NAMESPACE, _on_credentials_changed)
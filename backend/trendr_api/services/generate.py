@@ -1,8 +1,17 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
+from ..observability import metrics
 from ..plugins import router as provider_router
-from .templates import format_segments, load_template, render_template
+from ..resilience import hedging_requested
+from .prompt_budget import (
+    compact_segments,
+    compact_transcript,
+    estimate_tokens,
+    prompt_token_budget,
+    segment_outline,
+)
+from .templates import format_segments, load_template, render_template, template_fields
 from .writing import build_writing_constraints, extract_source_facts
 
 
@@ -16,33 +25,60 @@ def build_prompt(
     audience: Optional[str],
     notes: Optional[str],
     template_content: Optional[str] = None,
+    source_facts: Optional[str] = None,
+    max_prompt_tokens: Optional[int] = None,
 ) -> str:
+    """Render the generation prompt.
+
+    `source_facts` comes from the precomputed transcript analysis when one exists;
+    otherwise the facts are extracted from the transcript here. When the template
+    also has `{transcript}`, `{segments}` gets a short timestamp outline instead of
+    repeating every line. With `max_prompt_tokens` the transcript is compacted to
+    its highest-scoring parts so the rendered prompt fits.
+    """
     template = template_content or load_template(output_kind)
+    fields = template_fields(template)
     writing_constraints = build_writing_constraints(
         output_kind=output_kind,
         tone=tone,
         audience=audience,
         notes=notes,
     )
-    return render_template(
-        template,
-        {
-            "tone": tone,
-            "brand_voice": brand_voice or "N/A",
-            "audience": audience or "General audience",
-            "notes": notes or "None",
-            "transcript": transcript,
-            "segments": format_segments(segments),
-            "source_facts": extract_source_facts(
-                transcript=transcript,
-                segments=segments,
-            ),
-            "writing_constraints": writing_constraints,
-        },
-    )
+    ctx = {
+        "tone": tone,
+        "brand_voice": brand_voice or "N/A",
+        "audience": audience or "General audience",
+        "notes": notes or "None",
+        "transcript": transcript,
+        "segments": segment_outline(segments) if "transcript" in fields else format_segments(segments),
+        "source_facts": source_facts
+        or extract_source_facts(
+            transcript=transcript,
+            segments=segments,
+        ),
+        "writing_constraints": writing_constraints,
+    }
+    if max_prompt_tokens is None:
+        return render_template(template, ctx)
 
+    compacted = False
+    if "transcript" in fields:
+        overhead = estimate_tokens(render_template(template, {**ctx, "transcript": ""}))
+        ctx["transcript"], compacted = compact_transcript(
+            transcript, segments, budget_tokens=max_prompt_tokens - overhead
+        )
+    elif "segments" in fields and segments:
+        overhead = estimate_tokens(render_template(template, {**ctx, "segments": ""}))
+        kept, compacted = compact_segments(segments, budget_tokens=max_prompt_tokens - overhead)
+        ctx["segments"] = format_segments(kept)
+    prompt = render_template(template, ctx)
+    if compacted:
+        metrics.inc("generate_prompt_compactions_total", output_kind=output_kind)
+    metrics.observe("generate_prompt_tokens", estimate_tokens(prompt), output_kind=output_kind)
+    return prompt
 
-async def generate_text_output(
+
+def prepare_output_request(
     *,
     transcript: str,
     segments: list[dict[str, Any]] | None,
@@ -52,7 +88,9 @@ async def generate_text_output(
     provider_name: str = "openai",
     meta: Optional[Dict[str, Any]] = None,
     template_content: Optional[str] = None,
-) -> str:
+    source_facts: Optional[str] = None,
+) -> tuple[str, Dict[str, Any]]:
+    """The prompt for one output kind, fitted to the provider's budget, and its request meta."""
     prompt_meta = meta or {}
     prompt = build_prompt(
         transcript=transcript,
@@ -63,10 +101,56 @@ async def generate_text_output(
         audience=prompt_meta.get("audience"),
         notes=prompt_meta.get("notes"),
         template_content=template_content,
+        source_facts=source_facts,
+        max_prompt_tokens=prompt_token_budget(provider_name),
+    )
+    return prompt, {**prompt_meta, "tone": tone, "output_kind": output_kind}
+
+
+async def generate_text_output(
+    *,
+    transcript: str,
+    segments: list[dict[str, Any]] | None,
+    output_kind: str,
+    tone: str,
+    brand_voice: Optional[str],
+    provider_name: str = "openai",
+    meta: Optional[Dict[str, Any]] = None,
+    template_content: Optional[str] = None,
+    source_facts: Optional[str] = None,
+    on_delta: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Generate one output kind; with `on_delta` the text is streamed to it as it arrives.
+
+    Streams are not hedged, so a request that asks for hedging is generated in
+    one piece even with `on_delta`: the caller gets only the final text.
+    """
+    prompt, request_meta = prepare_output_request(
+        transcript=transcript,
+        segments=segments,
+        output_kind=output_kind,
+        tone=tone,
+        brand_voice=brand_voice,
+        provider_name=provider_name,
+        meta=meta,
+        template_content=template_content,
+        source_facts=source_facts,
     )
-    return await provider_router.generate_text(
+    if on_delta is None or hedging_requested(request_meta):
+        return await provider_router.generate_text(
+            prompt=prompt,
+            system=None,
+            meta=request_meta,
+            preferred_provider=provider_name,
+        )
+
+    parts: list[str] = []
+    async for delta in provider_router.generate_text_stream(
         prompt=prompt,
         system=None,
-        meta={**prompt_meta, "tone": tone, "output_kind": output_kind},
+        meta=request_meta,
         preferred_provider=provider_name,
-    )
+    ):
+        parts.append(delta)
+        on_delta(delta)
+    return "".join(parts).strip()
@@ -0,0 +1,72 @@
+"""Batch execution for generate jobs.
+
+Bulk regeneration does not need interactive latency. A generate job with
+`execution="batch"` renders one prompt per output kind and submits them together
+through the provider's batch interface (for OpenAI, the Batch API: a JSONL file
+answered within the completion window, at a lower price and under rate limits
+separate from interactive traffic). The job stays `running` with the batch
+recorded under `output["batch"]`, and `trendr.poll_generate_batches` turns
+finished batches into draft artifacts.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from ..observability import metrics
+from ..plugins.registry import registry
+from ..plugins.types import BatchRequest, BatchResult, BatchTextProvider
+
+
+def batch_provider(name: str) -> BatchTextProvider:
+    provider = registry.get_text(name)
+    if not getattr(provider.capabilities, "supports_batch", False):
+        raise ValueError(f"Text provider '{name}' does not support batch execution")
+    return provider  # type: ignore[return-value]
+
+
+def batch_custom_id(job_id: int, output_kind: str) -> str:
+    return f"generate-{job_id}-{output_kind}"
+
+
+async def submit_generate_batch(
+    provider: BatchTextProvider,
+    *,
+    job_id: int,
+    prompts: dict[str, tuple[str, dict[str, Any]]],
+    meta: dict[str, Any],
+) -> dict[str, Any]:
+    """Submit one request per output kind; returns the record kept in the job output."""
+    requests = [
+        BatchRequest(custom_id=batch_custom_id(job_id, output_kind), prompt=prompt, meta=request_meta)
+        for output_kind, (prompt, request_meta) in prompts.items()
+    ]
+    batch_id = await provider.submit_batch(requests, meta=meta)
+    metrics.inc("generate_batches_submitted_total", provider=provider.name)
+    metrics.inc("generate_batch_requests_total", len(requests), provider=provider.name)
+    return {
+        "id": batch_id,
+        "provider": provider.name,
+        "status": "submitted",
+        "requests": {request.custom_id: output_kind for request, output_kind in zip(requests, prompts)},
+    }
+
+
+def batch_texts(requests: dict[str, str], results: dict[str, BatchResult]) -> dict[str, str]:
+    """Generated text per output kind.
+
+    Raises RuntimeError naming every output the batch failed to produce, so a job
+    never ends up with only some of its drafts.
+    """
+    texts: dict[str, str] = {}
+    failures: list[str] = []
+    for custom_id, output_kind in requests.items():
+        result = results.get(custom_id)
+        if result is None:
+            failures.append(f"{output_kind}: missing from batch output")
+        elif result.text is None:
+            failures.append(f"{output_kind}: {result.error or 'no text'}")
+        else:
+            texts[output_kind] = result.text
+    if failures:
+        raise RuntimeError(f"Batch produced no text for {'; '.join(failures)}")
+    return texts
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(f"Expected an absolute URL, got '{url}'")
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+class HttpClientManager:
+    """Process-wide pool of `httpx.AsyncClient` instances, one per upstream host.
+
+    httpx clients are bound to the event loop that first uses them, so clients are
+    tracked per running loop. Reusing a client keeps TCP/TLS connections (and HTTP/2
+    streams) alive between provider calls instead of handshaking on every request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]
+        ] = weakref.WeakKeyDictionary()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=settings.http_client_http2,
+            timeout=settings.http_client_default_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.http_client_max_connections_per_host,
+                max_keepalive_connections=settings.http_client_max_keepalive_per_host,
+                keepalive_expiry=settings.http_client_keepalive_expiry_seconds,
+            ),
+        )
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        host = _host_key(url)
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(host)
+            if client is None or client.is_closed:
+                client = self._build_client()
+                clients[host] = client
+                logger.info("http_client_created", extra={"host": host})
+        return client
+
+    async def aclose(self) -> None:
+        """Close the clients owned by the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.pop(loop, {})
+        for client in clients.values():
+            await client.aclose()
+
+    def close_all(self) -> None:
+        """Close every client from synchronous shutdown hooks (e.g. Celery signals)."""
+        with self._lock:
+            owned = list(self._clients.items())
+            self._clients.clear()
+        for loop, clients in owned:
+            if loop.is_closed():
+                continue
+            for client in clients.values():
+                try:
+                    if loop.is_running():
+                        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+                    else:
+                        loop.run_until_complete(client.aclose())
+                except Exception:
+                    logger.warning("http_client_close_failed", exc_info=True)
+
+
+http_clients = HttpClientManager()
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    return http_clients.get(url)
+
+
+async def aclose_http_clients() -> None:
+    await http_clients.aclose()
+
+
+def close_http_clients() -> None:
+    http_clients.close_all()
@@ -4,14 +4,25 @@ import re
 from typing import Any, Dict
 from urllib.parse import parse_qs, urlparse
 
-import httpx
+from ..resilience.retry import BLOCKED, classify, retry_sync
+from .http_clients import get_http_client
+from .transcript_cache import DEFAULT_TRANSCRIPT_LANGUAGE
 
 
 YOUTUBE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+TRANSCRIPT_LANGUAGES = ["en", "en-US", "en-GB"]
 
 
 class TranscriptFetchError(RuntimeError):
-    """Raised when a transcript cannot be fetched for a YouTube video."""
+    """Raised when a transcript cannot be fetched for a YouTube video.
+
+    `retry_class` names the transient error behind it (see resilience/retry.py),
+    or is None when retrying would not help (no captions, private video).
+    """
+
+    def __init__(self, message: str, *, retry_class: str | None = None) -> None:
+        super().__init__(message)
+        self.retry_class = retry_class
 
 
 def _is_valid_video_id(value: str | None) -> bool:
@@ -54,12 +65,12 @@ async def fetch_youtube_metadata(url: str) -> Dict[str, Any]:
             "url": f"https://www.youtube.com/watch?v={video_id}",
             "format": "json",
         }
-        async with httpx.AsyncClient(timeout=10) as client:
-            res = await client.get(oembed_url, params=params)
-            res.raise_for_status()
-            data = res.json()
-            title = str(data.get("title") or title)
-            channel = str(data.get("author_name") or channel)
+        client = get_http_client(oembed_url)
+        res = await client.get(oembed_url, params=params, timeout=10)
+        res.raise_for_status()
+        data = res.json()
+        title = str(data.get("title") or title)
+        channel = str(data.get("author_name") or channel)
     except Exception:
         # Metadata fallback is acceptable for MVP; transcript fetch is authoritative.
         pass
@@ -78,12 +89,20 @@ def _normalize_line(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
+def _is_blocked(exc: Exception) -> bool:
+    return exc.__class__.__name__ in {"RequestBlocked", "IpBlocked"} or "no element found" in str(exc).lower()
+
+
+def _transcript_retry_class(exc: Exception) -> str | None:
+    # An empty XML body ("no element found") is how YouTube answers blocked clients.
+    return BLOCKED if _is_blocked(exc) else classify(exc)
+
+
 def _format_transcript_error(exc: Exception) -> str:
     name = exc.__class__.__name__
     message = str(exc).strip() or "no details"
-    normalized = message.lower()
 
-    if name in {"RequestBlocked", "IpBlocked"} or "no element found" in normalized:
+    if _is_blocked(exc):
         return (
             f"{name}: {message}. This usually means YouTube blocked transcript requests "
             "from the current IP/environment."
@@ -103,7 +122,15 @@ def _to_raw_entries(fetched: Any) -> list[Dict[str, Any]]:
     return list(fetched)
 
 
-def _fetch_transcript_sync(video_id: str) -> list[Dict[str, Any]]:
+def _transcript_language(fetched: Any) -> str:
+    """Cache language of a fetched transcript; the preferred variants all count as the default."""
+    code = getattr(fetched, "language_code", None)
+    if not isinstance(code, str) or not code or code in TRANSCRIPT_LANGUAGES:
+        return DEFAULT_TRANSCRIPT_LANGUAGE
+    return code
+
+
+def _fetch_transcript_sync(video_id: str) -> tuple[list[Dict[str, Any]], str]:
     try:
         from youtube_transcript_api import YouTubeTranscriptApi
     except ImportError as exc:
@@ -111,15 +138,21 @@ def _fetch_transcript_sync(video_id: str) -> list[Dict[str, Any]]:
             "youtube-transcript-api is not installed. Install backend requirements."
         ) from exc
 
-    language_preferences = ["en", "en-US", "en-GB"]
-    errors: list[str] = []
     api = YouTubeTranscriptApi()
+    return retry_sync("youtube_transcript", lambda: _fetch_transcript_once(api, video_id))
+
+
+def _fetch_transcript_once(api: Any, video_id: str) -> tuple[list[Dict[str, Any]], str]:
+    language_preferences = TRANSCRIPT_LANGUAGES
+    errors: list[str] = []
+    retry_class: str | None = None
 
     try:
         fetched = api.fetch(video_id, languages=language_preferences)
-        return _to_raw_entries(fetched)
+        return _to_raw_entries(fetched), _transcript_language(fetched)
     except Exception as exc:
         errors.append(_format_transcript_error(exc))
+        retry_class = _transcript_retry_class(exc)
 
     try:
         transcript_list = api.list(video_id)
@@ -143,19 +176,21 @@ def _fetch_transcript_sync(video_id: str) -> list[Dict[str, Any]]:
             raise TranscriptFetchError("No transcripts returned for this video.")
 
         fetched = transcript.fetch()
-        return _to_raw_entries(fetched)
+        return _to_raw_entries(fetched), _transcript_language(transcript)
     except Exception as exc:
         errors.append(_format_transcript_error(exc))
+        retry_class = retry_class or _transcript_retry_class(exc)
 
     details = "; ".join(e for e in errors if e) or "unknown transcript retrieval error"
     raise TranscriptFetchError(
-        f"Transcript unavailable for video '{video_id}'. Details: {details}"
+        f"Transcript unavailable for video '{video_id}'. Details: {details}",
+        retry_class=retry_class,
     )
 
 
 async def fetch_youtube_transcript(url: str) -> Dict[str, Any]:
     video_id = extract_video_id(url)
-    raw_entries = await asyncio.to_thread(_fetch_transcript_sync, video_id)
+    raw_entries, language = await asyncio.to_thread(_fetch_transcript_sync, video_id)
 
     segments: list[Dict[str, Any]] = []
     full_text_parts: list[str] = []
@@ -182,4 +217,4 @@ async def fetch_youtube_transcript(url: str) -> Dict[str, Any]:
     if not full_text:
         raise TranscriptFetchError(f"Transcript was empty for video '{video_id}'")
 
-    return {"video_id": video_id, "text": full_text, "segments": segments}
+    return {"video_id": video_id, "text": full_text, "segments": segments, "language": language}
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable
+
+from redis.asyncio import Redis as AsyncRedis
+
+from ..cache import get_redis
+from ..config import settings
+from ..models import Job
+from ..observability import metrics
+
+logger = logging.getLogger(__name__)
+
+JOB_EVENTS_CHANNEL_PREFIX = "trendr:job-events:ws:"
+TERMINAL_JOB_STATUSES = frozenset({"succeeded", "failed"})
+# Draft events are published from these threads: deltas arrive on the worker's
+# shared event loop, which must not wait on Redis.
+DRAFT_PUBLISH_THREADS = 4
+DRAFT_FLUSH_TIMEOUT_SECONDS = 5.0
+
+_draft_sender = ThreadPoolExecutor(max_workers=DRAFT_PUBLISH_THREADS, thread_name_prefix="draft-events")
+
+
+def workspace_channel(workspace_id: int) -> str:
+    return f"{JOB_EVENTS_CHANNEL_PREFIX}{workspace_id}"
+
+
+def job_event_payload(job: Job) -> dict[str, Any]:
+    return {
+        "type": "job",
+        "job_id": job.id,
+        "workspace_id": job.workspace_id,
+        "project_id": job.project_id,
+        "kind": job.kind,
+        "status": job.status,
+        "error": job.error,
+        "output": job.output or {},
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+def _publish(workspace_id: int, event: dict[str, Any]) -> bool:
+    try:
+        get_redis().publish(workspace_channel(workspace_id), json.dumps(event, default=str))
+    except Exception as exc:
+        # Streams are an optimisation over polling; clients can still GET the job.
+        logger.warning("job_event_publish_failed", extra={"error": str(exc)})
+        return False
+    metrics.inc("job_events_published_total", type=event["type"])
+    return True
+
+
+def publish_job_event(job: Job) -> None:
+    _publish(job.workspace_id, job_event_payload(job))
+
+
+def publish_node_event(job: Job, node_status: dict[str, Any]) -> None:
+    _publish(
+        job.workspace_id,
+        {
+            "type": "node",
+            "job_id": job.id,
+            "workspace_id": job.workspace_id,
+            **node_status,
+        },
+    )
+
+
+class DraftPublisher:
+    """Publishes `draft` events with the text generated so far for one output kind.
+
+    Deltas are buffered and published at most every `GENERATE_DRAFT_INTERVAL_SECONDS`.
+    Each event carries the full text so far, so a client that joins late or misses
+    an event is current again on the next one. If Redis rejects a publish, the
+    remaining drafts are skipped; the final artifact is unaffected.
+
+    Events are queued and published in order on a background thread, so calls
+    never block the caller; `flush` waits for the queue to drain.
+    """
+
+    def __init__(self, job: Job, output_kind: str, *, interval_seconds: float | None = None) -> None:
+        self._event = {
+            "type": "draft",
+            "job_id": job.id,
+            "workspace_id": job.workspace_id,
+            "project_id": job.project_id,
+            "output_kind": output_kind,
+        }
+        self._workspace_id = job.workspace_id
+        self._interval = (
+            settings.generate_draft_interval_seconds if interval_seconds is None else interval_seconds
+        )
+        self._parts: list[str] = []
+        self._last_published = 0.0
+        self._enabled = True
+        self._lock = threading.Lock()
+        self._queue: deque[dict[str, Any]] = deque()
+        self._idle = threading.Event()
+        self._idle.set()
+
+    def __call__(self, delta: str) -> None:
+        self._parts.append(delta)
+        now = time.monotonic()
+        if now - self._last_published >= self._interval:
+            self._last_published = now
+            self._send(done=False)
+
+    def finish(self, text: str) -> None:
+        """Publish the final text (as stored in the artifact) and mark the draft done."""
+        self._parts = [text]
+        self._send(done=True)
+
+    def flush(self, timeout: float = DRAFT_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Wait until queued drafts are published or dropped; False on timeout."""
+        return self._idle.wait(timeout)
+
+    def _send(self, *, done: bool) -> None:
+        event = {**self._event, "text": "".join(self._parts), "done": done}
+        with self._lock:
+            if not self._enabled:
+                return
+            self._queue.append(event)
+            if not self._idle.is_set():
+                return
+            self._idle.clear()
+        _draft_sender.submit(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                if not self._queue or not self._enabled:
+                    self._queue.clear()
+                    self._idle.set()
+                    return
+                event = self._queue.popleft()
+            if not _publish(self._workspace_id, event):
+                with self._lock:
+                    self._enabled = False
+
+
+class JobEventBroker:
+    """Fans Redis job events out to the SSE streams of this process.
+
+    One pattern subscription per process (and event loop) serves every stream, so
+    open streams cost a queue each rather than a Redis connection each. After a
+    reconnect every subscriber gets a `resync` event, since messages published
+    while disconnected are lost.
+    """
+
+    def __init__(self, redis_factory: Callable[[], AsyncRedis] | None = None) -> None:
+        self._redis_factory = redis_factory or self._default_redis
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._reader: asyncio.Task | None = None
+        self._ready: asyncio.Event | None = None
+
+    @staticmethod
+    def _default_redis() -> AsyncRedis:
+        return AsyncRedis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        )
+
+    def subscribe(self, workspace_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.job_events_queue_size)
+        self._subscribers.setdefault(workspace_id, set()).add(queue)
+        self._ensure_reader()
+        metrics.inc("job_event_streams_opened_total")
+        return queue
+
+    def unsubscribe(self, workspace_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(workspace_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[workspace_id]
+
+    @property
+    def stream_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def _ensure_reader(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._ready = asyncio.Event()
+            self._reader = asyncio.get_running_loop().create_task(self._run())
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Wait until the Redis subscription is live; False if Redis is unreachable."""
+        if self._ready is None:
+            return False
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _deliver(self, workspace_id: int, event: dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(workspace_id, ())):
+            if queue.full():
+                # A slow client loses its oldest event rather than stalling the fan-out.
+                queue.get_nowait()
+                metrics.inc("job_events_dropped_total")
+            queue.put_nowait(event)
+
+    def _dispatch(self, channel: Any, raw: Any) -> None:
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        try:
+            workspace_id = int(str(channel).removeprefix(JOB_EVENTS_CHANNEL_PREFIX))
+            event = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if isinstance(event, dict):
+            self._deliver(workspace_id, event)
+
+    def _resync_all(self) -> None:
+        for workspace_id in list(self._subscribers):
+            self._deliver(workspace_id, {"type": "resync", "workspace_id": workspace_id})
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        connected_before = False
+        while self._subscribers:
+            pubsub = None
+            try:
+                pubsub = self._redis_factory().pubsub(ignore_subscribe_messages=True)
+                await pubsub.psubscribe(f"{JOB_EVENTS_CHANNEL_PREFIX}*")
+                if connected_before:
+                    self._resync_all()
+                connected_before = True
+                if self._ready is not None:
+                    self._ready.set()
+                backoff = 1.0
+                while self._subscribers:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get("type") == "pmessage":
+                        self._dispatch(message.get("channel"), message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if self._ready is not None:
+                    self._ready.clear()
+                logger.warning("job_event_reader_error", extra={"error": str(exc)})
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    async def aclose(self) -> None:
+        if self._reader is not None and not self._reader.done():
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        self._reader = None
+
+
+job_event_broker = JobEventBroker()
+metrics.register_collector(
+    lambda registry: registry.set_gauge("job_event_streams", job_event_broker.stream_count)
+)
+
+
+def format_sse(event: dict[str, Any]) -> str:
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def sse_stream(
+    *,
+    workspace_id: int,
+    job_id: int | None = None,
+    snapshot: Callable[[], Any] | None = None,
+    broker: JobEventBroker | None = None,
+    heartbeat_seconds: float | None = None,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for a workspace, or for one job when `job_id` is given.
+
+    `snapshot` is an async callable returning the job's current payload. It runs
+    after subscribing, so no transition can fall between the snapshot and the
+    stream; a job stream ends once the job reaches a terminal status.
+    """
+    broker = broker or job_event_broker
+    heartbeat = heartbeat_seconds or settings.job_events_heartbeat_seconds
+    queue = broker.subscribe(workspace_id)
+    try:
+        await broker.wait_ready(settings.redis_socket_timeout_seconds)
+        if snapshot is not None:
+            current = await snapshot()
+            if current is not None:
+                yield format_sse(current)
+                if current.get("status") in TERMINAL_JOB_STATUSES:
+                    return
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if event.get("type") == "resync" and snapshot is not None:
+                current = await snapshot()
+                if current is None:
+                    return
+                event = current
+            elif job_id is not None and event.get("job_id") != job_id:
+                continue
+
+            yield format_sse(event)
+            if (
+                job_id is not None
+                and event.get("type") == "job"
+                and event.get("status") in TERMINAL_JOB_STATUSES
+            ):
+                return
+    finally:
+        broker.unsubscribe(workspace_id, queue)
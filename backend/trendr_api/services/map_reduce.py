@@ -0,0 +1,209 @@
+"""Map-reduce generation for transcripts too long for a single prompt.
+
+The transcript is split along segment boundaries into chunks of roughly
+`MAP_REDUCE_CHUNK_TOKENS`, each chunk is summarised concurrently (map), and the
+ordered summaries stand in for the transcript in every output kind's normal
+prompt (reduce). Chunk summaries are cached in Redis by provider, model and
+content hash, so other output kinds and later re-generations of the same
+transcript reuse them. Only summaries written by the requested provider are
+cached; one served by a fallback (such as the stub) is used once and dropped.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from ..cache import get_redis
+from ..config import settings
+from ..observability import metrics
+from ..plugins import router as provider_router
+from ..plugins.registry import registry
+from .prompt_budget import estimate_tokens
+from .transcript_analysis import transcript_units
+
+logger = logging.getLogger(__name__)
+
+# Bump when MAP_PROMPT changes so cached summaries are not reused across prompts.
+MAP_PROMPT_VERSION = 1
+MAP_PROMPT = """You are condensing one part of a longer video transcript{span}.
+Later steps write social posts and articles from these notes without seeing the transcript.
+
+Write 5-10 short bullet points covering:
+- the main claims and arguments, in the order they appear
+- concrete names, numbers, examples and memorable phrasing (quote briefly when useful)
+
+Only use what is in this part. No introduction, no conclusion.
+
+Transcript part:
+{text}
+"""
+
+
+@dataclass(frozen=True)
+class ChunkSummaries:
+    segments: list[dict[str, Any]]
+    cached: int
+
+    @property
+    def transcript(self) -> str:
+        return "\n\n".join(_with_span(segment) for segment in self.segments)
+
+
+def _span(start: Any, end: Any) -> str:
+    return f"[{start}-{end}]" if start is not None and end is not None else ""
+
+
+def _with_span(segment: dict[str, Any]) -> str:
+    span = _span(segment.get("start"), segment.get("end"))
+    return f"{span}\n{segment['text']}" if span else segment["text"]
+
+
+def split_chunks(
+    transcript: str,
+    segments: Iterable[dict[str, Any]] | None,
+    *,
+    chunk_tokens: int,
+) -> list[dict[str, Any]]:
+    """Group transcript units (segments or sentences) into chunks of about `chunk_tokens`.
+
+    Chunks never split a unit, so each keeps the start of its first segment and
+    the end of its last.
+    """
+    chunks: list[dict[str, Any]] = []
+    current: list[dict[str, Any]] = []
+    used = 0
+    for unit in transcript_units(transcript, segments):
+        cost = estimate_tokens(unit["text"]) + 1
+        if current and used + cost > chunk_tokens:
+            chunks.append(_chunk(current))
+            current, used = [], 0
+        current.append(unit)
+        used += cost
+    if current:
+        chunks.append(_chunk(current))
+    return chunks
+
+
+def _chunk(units: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "start": units[0]["start"],
+        "end": units[-1]["end"],
+        "text": " ".join(unit["text"] for unit in units),
+    }
+
+
+def _provider_model(provider_name: str) -> str:
+    try:
+        provider = registry.get_text(provider_name)
+    except KeyError:
+        return ""
+    return str(getattr(provider, "model", "") or "")
+
+
+def _cache_key(provider_name: str, model: str, text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"trendr:chunk-summary:v{MAP_PROMPT_VERSION}:{provider_name}:{model}:{digest}"
+
+
+def _cached_summaries(keys: list[str]) -> list[str | None]:
+    try:
+        values = get_redis().mget(keys)
+    except Exception as exc:
+        logger.warning("chunk_summary_cache_read_failed", extra={"error": str(exc)})
+        return [None] * len(keys)
+    return [value.decode("utf-8") if isinstance(value, bytes) else value for value in values]
+
+
+def _store_summaries(entries: dict[str, str]) -> None:
+    ttl = int(settings.chunk_summary_cache_ttl_seconds)
+    if not entries or ttl <= 0:
+        return
+    try:
+        pipe = get_redis().pipeline()
+        for key, summary in entries.items():
+            pipe.set(key, summary, ex=ttl)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("chunk_summary_cache_write_failed", extra={"error": str(exc)})
+
+
+async def summarize_chunks(
+    chunks: list[dict[str, Any]],
+    *,
+    provider_name: str,
+    meta: dict[str, Any],
+    semaphore: asyncio.Semaphore,
+) -> ChunkSummaries:
+    """Summarise `chunks` concurrently, reusing cached summaries.
+
+    Returns one pseudo-segment per chunk (same start/end, summary as text), in
+    transcript order. If any chunk fails the others are cancelled and the error
+    is raised; summaries that already finished are still cached.
+    """
+    model = _provider_model(provider_name)
+    keys = [_cache_key(provider_name, model, chunk["text"]) for chunk in chunks]
+    summaries = _cached_summaries(keys)
+    cached = sum(1 for summary in summaries if summary)
+    metrics.inc("cache_hits_total", cached, cache="chunk_summary")
+    metrics.inc("cache_misses_total", len(chunks) - cached, cache="chunk_summary")
+
+    fresh: dict[str, str] = {}
+    produced = 0
+
+    async def _summarize(index: int) -> None:
+        nonlocal produced
+        chunk = chunks[index]
+        span = _span(chunk["start"], chunk["end"])
+        prompt = MAP_PROMPT.format(span=f" {span}" if span else "", text=chunk["text"])
+        served_by: list[str] = []
+        async with semaphore:
+            summary = (
+                await provider_router.generate_text(
+                    prompt=prompt,
+                    system=None,
+                    meta={**meta, "output_kind": "chunk_summary"},
+                    preferred_provider=provider_name,
+                    on_served=served_by.append,
+                )
+            ).strip()
+        summaries[index] = summary
+        produced += 1
+        if served_by == [provider_name]:
+            fresh[keys[index]] = summary
+
+    pending = [asyncio.ensure_future(_summarize(index)) for index, summary in enumerate(summaries) if not summary]
+    try:
+        await asyncio.gather(*pending)
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
+    finally:
+        _store_summaries(fresh)
+        metrics.inc("generate_map_chunks_total", produced)
+
+    return ChunkSummaries(
+        segments=[
+            {"start": chunk["start"], "end": chunk["end"], "text": summary}
+            for chunk, summary in zip(chunks, summaries)
+        ],
+        cached=cached,
+    )
+
+
+def needs_map_reduce(transcript: str, *, mode: str, budget_tokens: int | None) -> bool:
+    """Whether to condense the transcript before generating.
+
+    `auto` switches over once the transcript alone exceeds both the prompt budget
+    and `map_reduce_auto_min_tokens`; anything shorter is compacted to the budget
+    when the prompt is built.
+    """
+    if mode == "map_reduce":
+        return True
+    if mode != "auto" or budget_tokens is None:
+        return False
+    return estimate_tokens(transcript) > max(budget_tokens, settings.map_reduce_auto_min_tokens)
@@ -11,6 +11,21 @@ from .s3 import upload_bytes
 logger = logging.getLogger(__name__)
 
 
+def store_image_result(result: Dict[str, Any], *, project_id: int) -> Dict[str, Any]:
+    """Upload `b64` image data to S3 and return the result with its `s3_key` and `url`.
+
+    Results without inline data (already stored, or URL-only) pass through.
+    """
+    b64_data = result.get("b64")
+    if not isinstance(b64_data, str) or not b64_data:
+        return result
+    image_bytes = base64.b64decode(b64_data)
+    key = f"projects/{project_id}/images/{uuid.uuid4().hex}.png"
+    stored = {k: v for k, v in result.items() if k != "b64"}
+    stored.update(s3_key=key, url=upload_bytes(image_bytes, key, "image/png"))
+    return stored
+
+
 async def generate_and_upload_image(
     *,
     prompt: str,
@@ -30,18 +45,12 @@ async def generate_and_upload_image(
         prompt=prompt,
         size=size,
         meta=meta,
+        persist=lambda raw: store_image_result(raw, project_id=project_id),
     )
-
-    b64_data = result.get("b64")
-    if isinstance(b64_data, str) and b64_data:
-        image_bytes = base64.b64decode(b64_data)
-        key = f"projects/{project_id}/images/{uuid.uuid4().hex}.png"
-        url = upload_bytes(image_bytes, key, "image/png")
-    else:
-        url = result.get("url", "")
+    result = store_image_result(result, project_id=project_id)
 
     return {
-        "url": url,
+        "url": result.get("url", ""),
         "revised_prompt": result.get("revised_prompt", ""),
         "size": size,
     }
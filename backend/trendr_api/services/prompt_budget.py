@@ -0,0 +1,134 @@
+"""Token budgeting for generation prompts.
+
+Budgets come from the declared `max_input_tokens` of every real provider in the
+text fallback chain (a fallback must be able to take the same prompt), capped by
+`PROMPT_MAX_TOKENS`. Stub providers are left out: they answer any prompt locally,
+so their nominal limit would only shrink prompts meant for the real provider.
+Over-budget transcripts are compacted to their highest-scoring segments, kept in
+transcript order.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Iterable
+
+from ..config import settings
+from ..plugins.registry import registry
+from ..plugins.router import text_fallback_chain
+from .transcript_analysis import rank_units, score_units, transcript_units
+
+# Rough chars-per-token for English text; no tokenizer is bundled. The margin
+# keeps estimates on the safe side of provider limits.
+CHARS_PER_TOKEN = 4
+ESTIMATE_MARGIN = 0.9
+GAP_MARKER = "[...]"
+OUTLINE_CHUNK_CHARS = 1500
+OUTLINE_PREVIEW_WORDS = 12
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def prompt_token_budget(preferred_provider: str | None = None) -> int | None:
+    """Smallest declared input limit across the chain's real providers, capped by settings."""
+    limits = []
+    for name in text_fallback_chain(preferred=preferred_provider):
+        try:
+            provider = registry.get_text(name)
+        except KeyError:
+            continue
+        capabilities = getattr(provider, "capabilities", None)
+        if capabilities is None or capabilities.is_stub:
+            continue
+        if capabilities.max_input_tokens:
+            limits.append(capabilities.max_input_tokens)
+    if settings.prompt_max_tokens > 0:
+        limits.append(settings.prompt_max_tokens)
+    if not limits:
+        return None
+    return int(min(limits) * ESTIMATE_MARGIN)
+
+
+def segment_outline(segments: Iterable[dict[str, Any]] | None) -> str:
+    """Timestamp index of the transcript: one short line per ~1500 characters.
+
+    Used in place of the full segment list when the transcript text is already
+    in the prompt, so the same words are not sent twice.
+    """
+    lines: list[str] = []
+    first: dict[str, Any] | None = None
+    last: dict[str, Any] | None = None
+    words: list[str] = []
+    chars = 0
+    for segment in segments or []:
+        text = str(segment.get("text", "")).strip()
+        if first is None:
+            first, words, chars = segment, [], 0
+        last = segment
+        if len(words) < OUTLINE_PREVIEW_WORDS:
+            words.extend(text.split()[: OUTLINE_PREVIEW_WORDS - len(words)])
+        chars += len(text) + 1
+        if chars >= OUTLINE_CHUNK_CHARS:
+            lines.append(f"[{first.get('start')}-{last.get('end')}] {' '.join(words)}")
+            first = None
+    if first is not None and last is not None:
+        lines.append(f"[{first.get('start')}-{last.get('end')}] {' '.join(words)}")
+    return "\n".join(lines) if lines else "No transcript segments available."
+
+
+def _select_within_budget(units: list[dict[str, Any]], budget_tokens: int, extra_tokens: int = 1) -> list[int]:
+    """Highest-scoring unit indexes that fit `budget_tokens`, in transcript order."""
+    chosen: list[int] = []
+    used = 0
+    for index in rank_units(score_units(units)):
+        cost = estimate_tokens(units[index]["text"]) + extra_tokens
+        if used + cost > budget_tokens:
+            continue
+        chosen.append(index)
+        used += cost
+    return sorted(chosen)
+
+
+def compact_transcript(
+    transcript: str,
+    segments: Iterable[dict[str, Any]] | None,
+    *,
+    budget_tokens: int,
+) -> tuple[str, bool]:
+    """Return the transcript, or its highest-scoring units when it exceeds the budget.
+
+    Selected units keep transcript order; skipped stretches become `[...]`.
+    The boolean reports whether anything was dropped.
+    """
+    if estimate_tokens(transcript) <= budget_tokens:
+        return transcript, False
+
+    units = transcript_units(transcript, segments)
+    chosen = _select_within_budget(units, budget_tokens, extra_tokens=2)
+    if not chosen:
+        return transcript[: max(budget_tokens, 0) * CHARS_PER_TOKEN], True
+
+    parts: list[str] = []
+    previous = -1
+    for index in chosen:
+        if index != previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(units[index]["text"])
+        previous = index
+    if previous != len(units) - 1:
+        parts.append(GAP_MARKER)
+    return " ".join(parts), True
+
+
+def compact_segments(
+    segments: list[dict[str, Any]],
+    *,
+    budget_tokens: int,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Segments-only counterpart of `compact_transcript` for templates without `{transcript}`."""
+    # "[start-end] " prefixes cost roughly five tokens per formatted line.
+    if sum(estimate_tokens(str(seg.get("text", ""))) + 5 for seg in segments) <= budget_tokens:
+        return segments, False
+    units = transcript_units("", segments)
+    return [units[index] for index in _select_within_budget(units, budget_tokens, extra_tokens=5)], True
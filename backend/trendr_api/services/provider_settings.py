@@ -5,8 +5,18 @@ from typing import Optional
 
 from sqlmodel import Session, select
 
+from ..cache import publish_invalidation
 from ..models import ProviderCredential
-from ..security import decrypt_secret, encrypt_secret, secret_hint
+from ..security import decrypt_many, decrypt_secret, encrypt_many, encrypt_secret, secret_hint
+
+CREDENTIALS_INVALIDATION_NAMESPACE = "provider_credentials"
+
+
+def _publish_credential_change(*, workspace_id: int, provider: str) -> None:
+    publish_invalidation(
+        CREDENTIALS_INVALIDATION_NAMESPACE,
+        {"workspace_id": workspace_id, "provider": provider},
+    )
 
 
 def get_workspace_provider_credential(
@@ -72,6 +82,7 @@ def upsert_workspace_provider_api_key(
     session.add(record)
     session.commit()
     session.refresh(record)
+    _publish_credential_change(workspace_id=workspace_id, provider=provider)
     return record
 
 
@@ -90,4 +101,36 @@ def delete_workspace_provider_api_key(
         return False
     session.delete(record)
     session.commit()
+    _publish_credential_change(workspace_id=workspace_id, provider=provider)
     return True
+
+
+def reencrypt_workspace_provider_api_keys(
+    *,
+    session: Session,
+    workspace_id: int,
+    previous_key_material: Optional[str] = None,
+) -> int:
+    """Re-encrypt every stored key of a workspace with the current encryption key.
+
+    Pass `previous_key_material` when rotating `SECRETS_ENCRYPTION_KEY`; otherwise
+    the keys are simply re-sealed with fresh nonces. Plaintexts are unchanged, so
+    cached credentials stay valid.
+    """
+    records = session.exec(
+        select(ProviderCredential).where(ProviderCredential.workspace_id == workspace_id)
+    ).all()
+    if not records:
+        return 0
+
+    plaintexts = decrypt_many(
+        [record.encrypted_api_key for record in records],
+        key_material=previous_key_material,
+    )
+    now = datetime.utcnow()
+    for record, token in zip(records, encrypt_many(plaintexts)):
+        record.encrypted_api_key = token
+        record.updated_at = now
+        session.add(record)
+    session.commit()
+    return len(records)
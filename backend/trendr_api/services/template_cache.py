@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlmodel import Session, select
+
+from ..cache import TTLCache, publish_invalidation, register_invalidation_handler
+from ..config import settings
+from ..models import Template
+from .templates import CompiledTemplate, compile_template
+
+TEMPLATES_INVALIDATION_NAMESPACE = "templates"
+
+
+@dataclass(frozen=True)
+class TemplateSnapshot:
+    """The parts of a workspace `Template` row generation needs, safe to share across jobs."""
+
+    id: int
+    workspace_id: int
+    kind: str
+    version: int
+    content: str
+
+    @property
+    def compiled(self) -> CompiledTemplate:
+        return compile_template(self.content)
+
+
+# Workspace templates keyed by (workspace_id, template_id); the snapshot carries
+# the version it was read at. Misses are not cached: a template created after a
+# failed lookup must be visible at once, and creation publishes no invalidation.
+template_cache: TTLCache[tuple[int, int], TemplateSnapshot] = TTLCache(
+    name="templates",
+    maxsize=settings.template_cache_max_entries,
+    ttl_seconds=settings.template_cache_ttl_seconds,
+)
+
+
+def get_cached_template(
+    session: Session,
+    *,
+    workspace_id: int,
+    template_id: int,
+) -> Optional[TemplateSnapshot]:
+    key = (workspace_id, template_id)
+    cached = template_cache.get(key)
+    if cached is not None:
+        return cached
+
+    template = session.exec(
+        select(Template).where(
+            Template.id == template_id,
+            Template.workspace_id == workspace_id,
+        )
+    ).first()
+    if template is None:
+        return None
+    snapshot = TemplateSnapshot(
+        id=template.id,
+        workspace_id=template.workspace_id,
+        kind=template.kind,
+        version=template.version,
+        content=template.content,
+    )
+    template_cache.set(key, snapshot)
+    return snapshot
+
+
+def publish_template_change(*, workspace_id: int, template_id: int) -> None:
+    publish_invalidation(
+        TEMPLATES_INVALIDATION_NAMESPACE,
+        {"workspace_id": workspace_id, "template_id": template_id},
+    )
+
+
+def _on_template_changed(payload: dict[str, Any] | None) -> None:
+    if payload is None:
+        template_cache.clear()
+        return
+    try:
+        key = (int(payload["workspace_id"]), int(payload["template_id"]))
+    except (KeyError, TypeError, ValueError):
+        template_cache.clear()
+        return
+    template_cache.invalidate(key)
+
+
+register_invalidation_handler(TEMPLATES_INVALIDATION_NAMESPACE, _on_template_changed)
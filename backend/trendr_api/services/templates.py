@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import threading
+from functools import lru_cache
 from pathlib import Path
+from string import Formatter
 from typing import Any, Dict, Iterable
 
+from ..config import settings
+
 
 class TemplateNotFoundError(FileNotFoundError):
     """Raised when a filesystem template for an output kind cannot be found."""
@@ -14,6 +19,24 @@ TEMPLATE_FILES: dict[str, str] = {
     "blog": "blog_post.md",
 }
 
+# Placeholders `build_prompt` fills; templates may use any subset of them.
+TEMPLATE_FIELDS = frozenset(
+    {
+        "tone",
+        "brand_voice",
+        "audience",
+        "notes",
+        "transcript",
+        "segments",
+        "source_facts",
+        "writing_constraints",
+    }
+)
+
+_file_lock = threading.Lock()
+# kind -> (mtime, text) of filesystem templates, loaded once per process.
+_file_templates: dict[str, tuple[float, str]] = {}
+
 
 def _templates_dir() -> Path:
     return Path(__file__).resolve().parent.parent / "templates"
@@ -28,13 +51,28 @@ def template_filename(kind: str) -> str:
 
 
 def load_template(kind: str) -> str:
+    """Filesystem template for `kind`, read once and kept in memory.
+
+    In the dev environment the file's mtime is checked on every call so edits
+    show up without a restart.
+    """
     filename = template_filename(kind)
     path = _templates_dir() / filename
-    if not path.exists():
+    cached = _file_templates.get(kind)
+    if cached is not None and settings.app_env != "dev":
+        return cached[1]
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
         raise TemplateNotFoundError(
             f"Template for output kind '{kind}' was not found at '{path}'"
         )
-    return path.read_text(encoding="utf-8")
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    text = path.read_text(encoding="utf-8")
+    with _file_lock:
+        _file_templates[kind] = (mtime, text)
+    return text
 
 
 def format_segments(segments: Iterable[Dict[str, Any]] | None) -> str:
@@ -50,9 +88,85 @@ def format_segments(segments: Iterable[Dict[str, Any]] | None) -> str:
     return "\n".join(lines)
 
 
+class CompiledTemplate:
+    """A `str.format` template parsed once into literal and field parts.
+
+    Simple `{name}`, `{name!r}` and `{name:spec}` fields render without
+    re-parsing; anything fancier (attribute/index access, nested specs) falls
+    back to `str.format`.
+    """
+
+    __slots__ = ("source", "fields", "_parts", "_simple")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        parsed = list(Formatter().parse(source))
+        self._parts = tuple(parsed)
+        self.fields = frozenset(
+            field.split(".")[0].split("[")[0] for _, field, _, _ in parsed if field is not None
+        )
+        self._simple = all(
+            field is None or (field.isidentifier() and "{" not in (spec or ""))
+            for _, field, spec, _ in parsed
+        )
+
+    def render(self, ctx: Dict[str, Any]) -> str:
+        if not self._simple:
+            return self.source.format(**ctx)
+        out: list[str] = []
+        for literal, field, spec, conversion in self._parts:
+            if literal:
+                out.append(literal)
+            if field is None:
+                continue
+            value = ctx[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion == "a":
+                value = ascii(value)
+            out.append(format(value, spec) if spec else str(value))
+        return "".join(out)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compiled form of `source`; identical template text shares one plan."""
+    return CompiledTemplate(source)
+
+
+def template_fields(template: str) -> set[str]:
+    """Placeholder names used by a `str.format` template."""
+    try:
+        return set(compile_template(template).fields)
+    except ValueError:
+        return set()
+
+
+def validate_template(template: str) -> None:
+    """Reject templates `render_template` would fail on, at save time.
+
+    Raises ValueError for malformed braces, positional fields or placeholders
+    `build_prompt` does not provide.
+    """
+    try:
+        compiled = compile_template(template)
+    except ValueError as exc:
+        raise ValueError(f"Invalid template syntax: {exc}") from exc
+    if "" in compiled.fields or any(name.isdigit() for name in compiled.fields):
+        raise ValueError("Template placeholders must be named, e.g. {transcript}")
+    unknown = sorted(compiled.fields - TEMPLATE_FIELDS)
+    if unknown:
+        supported = ", ".join(sorted(TEMPLATE_FIELDS))
+        raise ValueError(
+            f"Unknown template placeholders: {', '.join(unknown)}. Supported: {supported}"
+        )
+
+
 def render_template(template: str, ctx: Dict[str, Any]) -> str:
     try:
-        return template.format(**ctx)
+        return compile_template(template).render(ctx)
     except KeyError as exc:
         missing_key = exc.args[0]
         raise ValueError(
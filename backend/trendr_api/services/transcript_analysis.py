@@ -0,0 +1,184 @@
+"""Ingest-time transcript analysis: chunk boundaries, key sentences, keywords, key moments.
+
+The analysis runs once per transcript and is stored as a `transcript_analysis`
+artifact. Prompt assembly then reads the few precomputed facts it needs instead
+of rescanning the transcript for every output kind.
+"""
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Any, Iterable
+
+ANALYSIS_KIND = "transcript_analysis"
+# Bump when the scoring or the stored shape changes; older analyses are recomputed.
+ANALYSIS_VERSION = 1
+
+CHUNK_TARGET_CHARS = 1500
+KEY_SENTENCE_LIMIT = 12
+KEYWORD_LIMIT = 15
+KEY_MOMENT_LIMIT = 8
+KEY_MOMENT_MIN_GAP_SECONDS = 30.0
+MIN_SENTENCE_CHARS = 25
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9']*")
+STOPWORDS = frozenset(
+    """
+    a about after again all also am an and any are as at be because been before being but by
+    can could did do does doing don't down during each few for from further get got had has
+    have having he her here hers him his how i i'm if in into is it it's its just know like
+    me more most my no nor not now of off on once only or other our out over own really right
+    same she should so some such than that that's the their them then there these they thing
+    things this those through to too um uh under until up very was we we're were what when
+    where which while who why will with would yeah you you're your
+    """.split()
+)
+
+
+def _terms(text: str) -> list[str]:
+    return [word for word in _WORD_RE.findall(text.lower()) if word not in STOPWORDS and len(word) > 2]
+
+
+def transcript_units(transcript: str, segments: Iterable[dict[str, Any]] | None) -> list[dict[str, Any]]:
+    """Timed segments when available, otherwise sentences of the plain transcript."""
+    units: list[dict[str, Any]] = []
+    for seg in segments or []:
+        text = str(seg.get("text", "")).strip()
+        if text:
+            units.append({"start": seg.get("start"), "end": seg.get("end"), "text": text})
+    if units:
+        return units
+    for sentence in transcript.split("."):
+        clean = sentence.strip()
+        if len(clean) >= MIN_SENTENCE_CHARS:
+            units.append({"start": None, "end": None, "text": f"{clean}."})
+    return units
+
+
+def _chunk_bounds(units: list[dict[str, Any]]) -> list[tuple[int, int]]:
+    bounds: list[tuple[int, int]] = []
+    first, chars = 0, 0
+    for index, unit in enumerate(units):
+        chars += len(unit["text"]) + 1
+        if chars >= CHUNK_TARGET_CHARS:
+            bounds.append((first, index))
+            first, chars = index + 1, 0
+    if first < len(units):
+        bounds.append((first, len(units) - 1))
+    return bounds
+
+
+def _idf(unit_terms: list[list[str]]) -> dict[str, float]:
+    unit_count = len(unit_terms)
+    document_frequency = Counter(term for terms in unit_terms for term in set(terms))
+    return {term: math.log((1 + unit_count) / (1 + df)) + 1.0 for term, df in document_frequency.items()}
+
+
+def _scores(unit_terms: list[list[str]], idf: dict[str, float]) -> list[float]:
+    return [
+        sum(idf[term] for term in set(terms)) / math.sqrt(len(terms)) if terms else 0.0
+        for terms in unit_terms
+    ]
+
+
+def score_units(units: list[dict[str, Any]]) -> list[float]:
+    """TF-IDF informativeness of each unit, one unit per document."""
+    unit_terms = [_terms(unit["text"]) for unit in units]
+    return _scores(unit_terms, _idf(unit_terms))
+
+
+def rank_units(scores: list[float]) -> list[int]:
+    """Indexes of units with a positive score, best first, ties in transcript order."""
+    return sorted(
+        (index for index, score in enumerate(scores) if score > 0),
+        key=lambda index: (-scores[index], index),
+    )
+
+
+def analyze_transcript(transcript: str, segments: Iterable[dict[str, Any]] | None) -> dict[str, Any]:
+    """Score transcript units (segments or sentences) with TF-IDF, one unit per document.
+
+    Returns the JSON-serialisable payload stored in the analysis artifact's meta.
+    """
+    units = transcript_units(transcript, segments)
+    unit_terms = [_terms(unit["text"]) for unit in units]
+    bounds = _chunk_bounds(units)
+    idf = _idf(unit_terms)
+    term_frequency = Counter(term for terms in unit_terms for term in terms)
+    weights = {term: (1.0 + math.log(count)) * idf[term] for term, count in term_frequency.items()}
+    scores = _scores(unit_terms, idf)
+    ranked = rank_units(scores)
+
+    key_sentences = [
+        {**units[index], "position": index, "score": round(scores[index], 4)}
+        for index in sorted(ranked[:KEY_SENTENCE_LIMIT])
+    ]
+
+    key_moments: list[dict[str, Any]] = []
+    for index in ranked:
+        start = units[index]["start"]
+        if start is None:
+            break
+        if any(abs(start - moment["start"]) < KEY_MOMENT_MIN_GAP_SECONDS for moment in key_moments):
+            continue
+        key_moments.append({**units[index], "score": round(scores[index], 4)})
+        if len(key_moments) >= KEY_MOMENT_LIMIT:
+            break
+    key_moments.sort(key=lambda moment: moment["start"])
+
+    return {
+        "version": ANALYSIS_VERSION,
+        "chunks": [
+            {
+                "first": first,
+                "last": last,
+                "start": units[first]["start"],
+                "end": units[last]["end"],
+                "chars": sum(len(unit["text"]) for unit in units[first : last + 1]),
+            }
+            for first, last in bounds
+        ],
+        "keywords": [
+            term for term, _weight in sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:KEYWORD_LIMIT]
+        ],
+        "key_sentences": key_sentences,
+        "key_moments": key_moments,
+    }
+
+
+def is_current(analysis: dict[str, Any] | None) -> bool:
+    return isinstance(analysis, dict) and analysis.get("version") == ANALYSIS_VERSION
+
+
+def source_facts_from_analysis(
+    analysis: dict[str, Any],
+    *,
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+    limit: int = 6,
+) -> str | None:
+    """Render the top key sentences as prompt facts, in transcript order.
+
+    With a time range only sentences overlapping it are used. Returns None when
+    nothing qualifies so the caller can fall back to scanning the source.
+    """
+    candidates = []
+    for sentence in analysis.get("key_sentences", []):
+        start, end = sentence.get("start"), sentence.get("end")
+        if start_seconds is not None and (end is None or end <= start_seconds):
+            continue
+        if end_seconds is not None and (start is None or start >= end_seconds):
+            continue
+        candidates.append(sentence)
+    if not candidates:
+        return None
+
+    top = sorted(candidates, key=lambda s: (-s.get("score", 0.0), s.get("position", 0)))[:limit]
+    facts = []
+    for sentence in sorted(top, key=lambda s: s.get("position", 0)):
+        if sentence.get("start") is None:
+            facts.append(f"- {sentence['text']}")
+        else:
+            facts.append(f"- [{sentence['start']}-{sentence['end']}] {sentence['text']}")
+    return "\n".join(facts)
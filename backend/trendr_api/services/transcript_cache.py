@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from ..cache import get_redis
+from ..config import settings
+from ..models import TranscriptCache
+from ..observability import metrics
+
+logger = logging.getLogger(__name__)
+
+# Matches the language preferences `fetch_youtube_transcript` asks for.
+DEFAULT_TRANSCRIPT_LANGUAGE = "en"
+
+
+def _redis_key(video_id: str, language: str) -> str:
+    return f"trendr:transcript:{language}:{video_id}"
+
+
+def _as_transcript(row: TranscriptCache) -> dict[str, Any]:
+    return {"video_id": row.video_id, "text": row.text, "segments": list(row.segments or [])}
+
+
+def _fresh_cutoff() -> datetime | None:
+    ttl = settings.transcript_cache_ttl_seconds
+    return datetime.utcnow() - timedelta(seconds=ttl) if ttl > 0 else None
+
+
+def _redis_get_many(keys: list[str]) -> list[Any]:
+    try:
+        return get_redis().mget(keys)
+    except Exception as exc:
+        logger.warning("transcript_cache_redis_read_failed", extra={"error": str(exc)})
+        return [None] * len(keys)
+
+
+def _redis_set_many(entries: dict[str, dict[str, Any]]) -> None:
+    ttl = int(settings.transcript_cache_redis_ttl_seconds)
+    if not entries or ttl <= 0:
+        return
+    try:
+        pipe = get_redis().pipeline()
+        for key, transcript in entries.items():
+            pipe.set(key, json.dumps(transcript), ex=ttl)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("transcript_cache_redis_write_failed", extra={"error": str(exc)})
+
+
+def lookup_transcripts(
+    session: Session,
+    video_ids: Iterable[str],
+    *,
+    language: str = DEFAULT_TRANSCRIPT_LANGUAGE,
+) -> dict[str, dict[str, Any]]:
+    """Return cached transcripts by video id: Redis first, then the database.
+
+    Database rows older than `TRANSCRIPT_CACHE_TTL_SECONDS` count as misses;
+    database hits are copied back into Redis.
+    """
+    wanted = list(dict.fromkeys(video_ids))
+    if not wanted:
+        return {}
+
+    found: dict[str, dict[str, Any]] = {}
+    raw_values = _redis_get_many([_redis_key(video_id, language) for video_id in wanted])
+    for video_id, raw in zip(wanted, raw_values):
+        if not raw:
+            continue
+        try:
+            found[video_id] = json.loads(raw)
+        except ValueError:
+            continue
+    metrics.inc("cache_hits_total", len(found), cache="transcript_redis")
+    metrics.inc("cache_misses_total", len(wanted) - len(found), cache="transcript_redis")
+
+    remaining = [video_id for video_id in wanted if video_id not in found]
+    if not remaining:
+        return found
+
+    stmt = select(TranscriptCache).where(
+        TranscriptCache.video_id.in_(remaining),
+        TranscriptCache.language == language,
+    )
+    cutoff = _fresh_cutoff()
+    if cutoff is not None:
+        stmt = stmt.where(TranscriptCache.fetched_at >= cutoff)
+    from_db = {row.video_id: _as_transcript(row) for row in session.exec(stmt).all()}
+    metrics.inc("cache_hits_total", len(from_db), cache="transcript_db")
+    metrics.inc("cache_misses_total", len(remaining) - len(from_db), cache="transcript_db")
+
+    _redis_set_many({_redis_key(video_id, language): t for video_id, t in from_db.items()})
+    found.update(from_db)
+    return found
+
+
+def store_transcripts(
+    session: Session,
+    transcripts: Iterable[dict[str, Any]],
+    *,
+    language: str = DEFAULT_TRANSCRIPT_LANGUAGE,
+) -> None:
+    """Upsert freshly fetched transcripts and commit.
+
+    Each transcript is stored under its own `language` key when it has one (a
+    fetch can fall back to a non-English track), else under `language`.
+    Call after the caller's own commit: losing a race with another worker storing
+    the same video only rolls back the cache write.
+    """
+    by_language: dict[str, dict[str, dict[str, Any]]] = {}
+    for transcript in transcripts:
+        by_language.setdefault(transcript.get("language") or language, {})[transcript["video_id"]] = transcript
+    if not by_language:
+        return
+
+    now = datetime.utcnow()
+    for lang, by_video in by_language.items():
+        existing = {
+            row.video_id: row
+            for row in session.exec(
+                select(TranscriptCache).where(
+                    TranscriptCache.video_id.in_(list(by_video)),
+                    TranscriptCache.language == lang,
+                )
+            ).all()
+        }
+        for video_id, transcript in by_video.items():
+            row = existing.get(video_id) or TranscriptCache(video_id=video_id, language=lang)
+            row.text = transcript["text"]
+            row.segments = transcript["segments"]
+            row.fetched_at = now
+            session.add(row)
+    stored = sum(len(by_video) for by_video in by_language.values())
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        logger.info("transcript_cache_store_conflict", extra={"videos": stored})
+    metrics.inc("transcript_cache_stores_total", stored)
+
+    _redis_set_many(
+        {
+            _redis_key(video_id, lang): transcript
+            for lang, by_video in by_language.items()
+            for video_id, transcript in by_video.items()
+        }
+    )
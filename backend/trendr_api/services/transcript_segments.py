@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from ..models import TranscriptSegment
+
+
+def segment_rows(artifact_id: int, segments: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {
+            "artifact_id": artifact_id,
+            "position": position,
+            "start_seconds": float(segment.get("start", 0.0)),
+            "end_seconds": float(segment.get("end", 0.0)),
+            "text": str(segment.get("text", "")),
+        }
+        for position, segment in enumerate(segments)
+    ]
+
+
+def insert_segment_rows(session: Session, rows: list[dict[str, Any]]) -> None:
+    """Bulk insert rows built by `segment_rows` (one executemany, no ORM objects)."""
+    if rows:
+        session.execute(insert(TranscriptSegment), rows)
+
+
+def load_segments(
+    session: Session,
+    artifact_id: int,
+    *,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    limit: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """Segments overlapping [start, end), in transcript order, as start/end/text dicts."""
+    stmt = select(
+        TranscriptSegment.start_seconds,
+        TranscriptSegment.end_seconds,
+        TranscriptSegment.text,
+    ).where(TranscriptSegment.artifact_id == artifact_id)
+    if start is not None:
+        stmt = stmt.where(TranscriptSegment.end_seconds > start)
+    if end is not None:
+        stmt = stmt.where(TranscriptSegment.start_seconds < end)
+    stmt = stmt.order_by(TranscriptSegment.start_seconds, TranscriptSegment.position)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [
+        {"start": row[0], "end": row[1], "text": row[2]}
+        for row in session.exec(stmt).all()
+    ]
+
@@ -1,7 +1,11 @@
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
+from ..cache import invalidation_listener
 from ..config import settings
+from ..db import reset_engine_after_fork
 from ..observability import configure_logging
 from ..plugins.providers import register_all
+from .event_loop import worker_loop
 
 configure_logging()
 
@@ -20,9 +24,32 @@ celery_app.conf.update(
             "task": "trendr.check_scheduled_posts",
             "schedule": 60.0,
         },
+        "poll-generate-batches": {
+            "task": "trendr.poll_generate_batches",
+            "schedule": settings.generate_batch_poll_seconds,
+        },
     },
 )
 
 # Worker runs in a separate process from FastAPI, so providers must be
 # registered here as well.
 register_all()
+
+
+@worker_process_init.connect
+def _reset_db_pool(**_):
+    # Prefork children inherit the parent's pooled connections; sharing those
+    # sockets across processes corrupts the protocol stream.
+    reset_engine_after_fork()
+
+
+@worker_process_init.connect
+def _start_cache_invalidation(**_):
+    invalidation_listener.start()
+
+
+@worker_process_shutdown.connect
+def _stop_worker_loop(**_):
+    invalidation_listener.stop()
+    # Closes pooled HTTP clients on the loop before stopping it.
+    worker_loop.stop()
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Coroutine, Hashable, TypeVar
+
+from ..services.http_clients import aclose_http_clients
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerEventLoop:
+    """Worker-lifetime asyncio loop running on a dedicated daemon thread.
+
+    Celery tasks are synchronous, so they submit coroutines here instead of building
+    a throwaway loop per call. Anything bound to the loop (pooled HTTP clients,
+    semaphores, caches) therefore survives across tasks. The loop is started lazily
+    and restarted in a forked child, since threads do not survive `fork()`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    @staticmethod
+    def _serve(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if (
+                self._loop is not None
+                and self._thread is not None
+                and self._thread.is_alive()
+                and self._pid == os.getpid()
+            ):
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            thread = threading.Thread(
+                target=self._serve,
+                args=(loop, ready),
+                name="trendr-worker-loop",
+                daemon=True,
+            )
+            thread.start()
+            ready.wait()
+
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            logger.info("worker_event_loop_started", extra={"pid": self._pid})
+            return loop
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """Schedule `coro` on the worker loop, preserving the caller's contextvars."""
+        loop = self._ensure_started()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Cannot block on the worker event loop from its own thread")
+
+        context = contextvars.copy_context()
+        result: concurrent.futures.Future[T] = concurrent.futures.Future()
+
+        def _schedule() -> None:
+            if not result.set_running_or_notify_cancel():
+                coro.close()
+                return
+            task = context.run(loop.create_task, coro)
+
+            def _done(finished: asyncio.Task[T]) -> None:
+                if finished.cancelled():
+                    result.set_exception(concurrent.futures.CancelledError())
+                elif finished.exception() is not None:
+                    result.set_exception(finished.exception())
+                else:
+                    result.set_result(finished.result())
+
+            task.add_done_callback(_done)
+
+        loop.call_soon_threadsafe(_schedule)
+        return result
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        return self.submit(coro).result()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            owned = self._pid == os.getpid()
+            self._loop = None
+            self._thread = None
+            self._pid = None
+
+        if loop is None or thread is None or not owned or not thread.is_alive():
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(aclose_http_clients(), loop).result(timeout)
+        except Exception:
+            logger.warning("worker_event_loop_client_close_failed", exc_info=True)
+
+        async def _cancel_pending() -> None:
+            current = asyncio.current_task()
+            pending = [task for task in asyncio.all_tasks() if task is not current]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout)
+        except Exception:
+            logger.warning("worker_event_loop_cancel_failed", exc_info=True)
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+        logger.info("worker_event_loop_stopped")
+
+
+worker_loop = WorkerEventLoop()
+
+_shared_semaphores: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[Hashable, asyncio.Semaphore]
+] = weakref.WeakKeyDictionary()
+
+
+def shared_semaphore(key: Hashable, limit: int) -> asyncio.Semaphore:
+    """Return the semaphore every coroutine on the running loop shares for `key`."""
+    loop = asyncio.get_running_loop()
+    semaphores = _shared_semaphores.setdefault(loop, {})
+    bounded = max(1, limit)
+    semaphore = semaphores.get((key, bounded))
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(bounded)
+        semaphores[(key, bounded)] = semaphore
+    return semaphore
@@ -1,21 +1,37 @@
 from __future__ import annotations
+import asyncio
 from datetime import datetime
 import logging
 from typing import Any, Callable
 
-from celery import shared_task
+from celery import group, shared_task
 from sqlmodel import Session, select
 
+from ..config import settings
 from ..db import engine
-from ..models import Artifact, Event, Job, Project, ScheduledPost, Template, Workflow
-from ..observability import clear_job_id, set_job_id
+from ..models import Artifact, Event, Job, Project, ScheduledPost, Workflow
+from ..observability import clear_job_id, metrics, set_job_id
 from ..plugins.providers import register_all
 from ..plugins.registry import registry
-from ..services.ingest import fetch_youtube_metadata, fetch_youtube_transcript
-from ..services.generate import generate_text_output
+from ..services.ingest import extract_video_id, fetch_youtube_metadata, fetch_youtube_transcript
+from ..services.generate import generate_text_output, prepare_output_request
+from ..services.generate_batch import batch_provider, batch_texts, submit_generate_batch
+from ..services.map_reduce import ChunkSummaries, needs_map_reduce, split_chunks, summarize_chunks
+from ..services.prompt_budget import prompt_token_budget
 from ..services.analytics import record_event
+from ..services.job_events import DraftPublisher, publish_job_event, publish_node_event
+from ..services.transcript_analysis import (
+    ANALYSIS_KIND,
+    analyze_transcript,
+    is_current,
+    source_facts_from_analysis,
+)
+from ..services.transcript_cache import lookup_transcripts, store_transcripts
+from ..services.transcript_segments import insert_segment_rows, load_segments, segment_rows
+from ..services.template_cache import get_cached_template
 from ..services.media import generate_and_upload_image
 from ..workflows.engine import topological_order, validate_workflow
+from .event_loop import shared_semaphore, worker_loop
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +43,7 @@ def _update_job(session: Session, job: Job, **kwargs):
     session.add(job)
     session.commit()
     session.refresh(job)
+    publish_job_event(job)
     return job
 
 
@@ -34,6 +51,89 @@ def _requery_job(session: Session, job_id: int) -> Job | None:
     return session.exec(select(Job).where(Job.id == job_id)).first()
 
 
+def _ingest_artifacts(job: Job, yt_meta: dict[str, Any], transcript: dict[str, Any]) -> list[Artifact]:
+    return [
+        Artifact(
+            workspace_id=job.workspace_id,
+            project_id=job.project_id,
+            kind="source_meta",
+            title="YouTube Metadata",
+            content="",
+            meta=yt_meta,
+        ),
+        Artifact(
+            workspace_id=job.workspace_id,
+            project_id=job.project_id,
+            kind="transcript",
+            title="Transcript",
+            content=transcript["text"],
+            # Segments live in transcript_segment; see `_segment_rows_for`.
+            meta={"segment_count": len(transcript["segments"])},
+        ),
+    ]
+
+
+def _segment_rows_for(artifacts: list[Artifact], transcript: dict[str, Any]) -> list[dict[str, Any]]:
+    """Segment rows for the transcript artifact from `_ingest_artifacts`, once flushed."""
+    transcript_art = artifacts[-1]
+    return segment_rows(transcript_art.id, transcript["segments"])
+
+
+def _analysis_artifact(
+    *,
+    workspace_id: int,
+    project_id: int,
+    transcript_artifact_id: int,
+    transcript_text: str,
+    segments: list[dict[str, Any]],
+) -> Artifact:
+    """Derived analysis for a stored transcript; see `services.transcript_analysis`."""
+    analysis = analyze_transcript(transcript_text, segments)
+    return Artifact(
+        workspace_id=workspace_id,
+        project_id=project_id,
+        kind=ANALYSIS_KIND,
+        title="Transcript Analysis",
+        content=source_facts_from_analysis(analysis) or "",
+        meta={**analysis, "transcript_artifact_id": transcript_artifact_id},
+    )
+
+
+def _ingest_analysis_artifact(artifacts: list[Artifact], transcript: dict[str, Any]) -> Artifact:
+    """Analysis for the transcript artifact from `_ingest_artifacts`, once flushed."""
+    transcript_art = artifacts[-1]
+    return _analysis_artifact(
+        workspace_id=transcript_art.workspace_id,
+        project_id=transcript_art.project_id,
+        transcript_artifact_id=transcript_art.id,
+        transcript_text=transcript["text"],
+        segments=transcript["segments"],
+    )
+
+
+def _ingest_output(
+    yt_meta: dict[str, Any],
+    transcript: dict[str, Any],
+    *,
+    cached: bool = False,
+) -> dict[str, Any]:
+    return {
+        "youtube": yt_meta,
+        "transcript_chars": len(transcript["text"]),
+        "segments": len(transcript["segments"]),
+        "transcript_cached": cached,
+    }
+
+
+def _cache_transcripts(session: Session, transcripts: list[dict[str, Any]]) -> None:
+    """Store fetched transcripts; the jobs already succeeded, so failures only log."""
+    try:
+        store_transcripts(session, transcripts)
+    except Exception:
+        session.rollback()
+        logger.warning("transcript_cache_store_failed", exc_info=True)
+
+
 @shared_task(name="trendr.ingest_youtube")
 def ingest_youtube(job_id: int):
     set_job_id(job_id)
@@ -52,42 +152,31 @@ def ingest_youtube(job_id: int):
                 if not isinstance(url, str) or not url.strip():
                     raise ValueError("Missing 'url' in ingest job payload")
 
+                video_id = extract_video_id(url)
                 yt_meta = _run_async(fetch_youtube_metadata(url))
-                transcript = _run_async(fetch_youtube_transcript(url))
+                transcript = None
+                if not job.input.get("refresh_transcript"):
+                    transcript = lookup_transcripts(session, [video_id]).get(video_id)
+                transcript_cached = transcript is not None
+                if transcript is None:
+                    transcript = _run_async(fetch_youtube_transcript(url))
 
                 # Store artifacts
-                session.add(
-                    Artifact(
-                        workspace_id=job.workspace_id,
-                        project_id=job.project_id,
-                        kind="source_meta",
-                        title="YouTube Metadata",
-                        content="",
-                        meta=yt_meta,
-                    )
-                )
-                session.add(
-                    Artifact(
-                        workspace_id=job.workspace_id,
-                        project_id=job.project_id,
-                        kind="transcript",
-                        title="Transcript",
-                        content=transcript["text"],
-                        meta={"segments": transcript["segments"]},
-                    )
-                )
+                artifacts = _ingest_artifacts(job, yt_meta, transcript)
+                session.add_all(artifacts)
+                session.flush()
+                session.add(_ingest_analysis_artifact(artifacts, transcript))
+                insert_segment_rows(session, _segment_rows_for(artifacts, transcript))
                 session.commit()
 
                 _update_job(
                     session,
                     job,
                     status="succeeded",
-                    output={
-                        "youtube": yt_meta,
-                        "transcript_chars": len(transcript["text"]),
-                        "segments": len(transcript["segments"]),
-                    },
+                    output=_ingest_output(yt_meta, transcript, cached=transcript_cached),
                 )
+                if not transcript_cached:
+                    _cache_transcripts(session, [{**transcript, "video_id": video_id}])
                 try:
                     record_event(session, workspace_id=job.workspace_id, project_id=job.project_id, kind="job_completed", meta={"job_id": job.id, "job_kind": "ingest"})
                 except Exception:
@@ -113,6 +202,201 @@ def ingest_youtube(job_id: int):
         clear_job_id()
 
 
+async def _fetch_ingest_sources(
+    sources: list[tuple[str, dict[str, Any] | None]],
+    *,
+    concurrency: int,
+) -> list[tuple[dict[str, Any], dict[str, Any]] | BaseException]:
+    """Fetch metadata, plus the transcript where no cached copy was passed in."""
+    # Shared by every chunk running in this worker process, so concurrent chunks
+    # do not multiply the request rate against YouTube.
+    semaphore = shared_semaphore(("youtube_ingest",), concurrency)
+
+    async def _fetch_one(url: str, cached: dict[str, Any] | None) -> tuple[dict[str, Any], dict[str, Any]]:
+        async with semaphore:
+            if cached is not None:
+                return await fetch_youtube_metadata(url), cached
+            yt_meta, transcript = await asyncio.gather(
+                fetch_youtube_metadata(url),
+                fetch_youtube_transcript(url),
+            )
+            return yt_meta, transcript
+
+    return await asyncio.gather(
+        *(_fetch_one(url, cached) for url, cached in sources),
+        return_exceptions=True,
+    )
+
+
+def _video_id_or_none(url: str) -> str | None:
+    try:
+        return extract_video_id(url)
+    except ValueError:
+        return None
+
+
+def _lock_job(session: Session, job_id: int) -> Job | None:
+    return session.exec(select(Job).where(Job.id == job_id).with_for_update()).first()
+
+
+def _record_batch_progress(
+    session: Session,
+    parent_job_id: int,
+    *,
+    succeeded: int = 0,
+    failed: int = 0,
+) -> Job | None:
+    """Fold one chunk's results into the parent job under a row lock."""
+    parent = _lock_job(session, parent_job_id)
+    if parent is None:
+        return None
+
+    output = dict(parent.output or {})
+    output["succeeded"] = int(output.get("succeeded", 0)) + succeeded
+    output["failed"] = int(output.get("failed", 0)) + failed
+    processed = output["succeeded"] + output["failed"]
+    total = int(output.get("total", processed))
+    output["progress"] = round(processed / total, 4) if total else 1.0
+
+    status = "running"
+    error = parent.error
+    if processed >= total:
+        status = "succeeded" if output["succeeded"] else "failed"
+        if not output["succeeded"]:
+            error = "All videos in the batch failed to ingest"
+    return _update_job(session, parent, status=status, output=output, error=error)
+
+
+def dispatch_ingest_batch(parent_job_id: int, child_job_ids: list[int]) -> str:
+    size = max(1, settings.ingest_batch_chunk_size)
+    chunks = [child_job_ids[i : i + size] for i in range(0, len(child_job_ids), size)]
+    result = group(ingest_youtube_chunk.s(parent_job_id, chunk) for chunk in chunks).apply_async()
+    return result.id
+
+
+def _fail_unfinished_jobs(session: Session, job_ids: list[int], error: str) -> None:
+    """Mark the chunk's jobs that never reached a terminal state as failed."""
+    jobs = session.exec(
+        select(Job).where(Job.id.in_(job_ids), Job.status.in_(["queued", "running"]))
+    ).all()
+    now = datetime.utcnow()
+    for job in jobs:
+        job.status = "failed"
+        job.error = error
+        job.updated_at = now
+    session.add_all(jobs)
+    session.commit()
+    for job in jobs:
+        publish_job_event(job)
+
+
+@shared_task(name="trendr.ingest_youtube_chunk")
+def ingest_youtube_chunk(parent_job_id: int, job_ids: list[int]):
+    set_job_id(parent_job_id)
+    logger.info("celery_task_started", extra={"task": "ingest_youtube_chunk", "jobs": len(job_ids)})
+    try:
+        # Objects stay loaded across commits so events and results need no re-SELECT.
+        with Session(engine, expire_on_commit=False) as session:
+            # Counts only once committed; whatever did not succeed is failed into the parent.
+            succeeded = 0
+            chunk_error: str | None = None
+            try:
+                jobs = list(session.exec(select(Job).where(Job.id.in_(job_ids))).all())
+                if not jobs:
+                    logger.warning("celery_task_job_not_found", extra={"task": "ingest_youtube_chunk"})
+                    _record_batch_progress(session, parent_job_id, failed=len(job_ids))
+                    return {"error": "jobs not found"}
+
+                parent = _lock_job(session, parent_job_id)
+                if parent is not None and parent.status == "queued":
+                    _update_job(session, parent, status="running")
+                else:
+                    session.commit()
+
+                now = datetime.utcnow()
+                for job in jobs:
+                    job.status = "running"
+                    job.updated_at = now
+                session.add_all(jobs)
+                session.commit()
+                for job in jobs:
+                    publish_job_event(job)
+
+                urls = [str((job.input or {}).get("url") or "") for job in jobs]
+                video_ids = [_video_id_or_none(url) for url in urls]
+                cacheable = [
+                    video_id
+                    for job, video_id in zip(jobs, video_ids)
+                    if video_id and not (job.input or {}).get("refresh_transcript")
+                ]
+                cached = lookup_transcripts(session, cacheable)
+                sources = [(url, cached.get(video_id or "")) for url, video_id in zip(urls, video_ids)]
+                results = _run_async(
+                    _fetch_ingest_sources(sources, concurrency=settings.ingest_batch_concurrency)
+                )
+
+                ok = 0
+                fetched: list[dict[str, Any]] = []
+                ingested: list[tuple[list[Artifact], dict[str, Any]]] = []
+                now = datetime.utcnow()
+                for job, video_id, source, result in zip(jobs, video_ids, sources, results):
+                    job.updated_at = now
+                    if isinstance(result, BaseException):
+                        job.status = "failed"
+                        job.error = f"{result.__class__.__name__}: {result}"
+                        continue
+                    yt_meta, transcript = result
+                    transcript_cached = source[1] is not None
+                    if not transcript_cached and video_id:
+                        fetched.append({**transcript, "video_id": video_id})
+                    artifacts = _ingest_artifacts(job, yt_meta, transcript)
+                    session.add_all(artifacts)
+                    ingested.append((artifacts, transcript))
+                    session.add(
+                        Event(
+                            workspace_id=job.workspace_id,
+                            project_id=job.project_id,
+                            kind="job_completed",
+                            meta={"job_id": job.id, "job_kind": "ingest"},
+                            created_at=now,
+                        )
+                    )
+                    job.status = "succeeded"
+                    job.output = _ingest_output(yt_meta, transcript, cached=transcript_cached)
+                    ok += 1
+                session.add_all(jobs)
+                session.flush()
+                session.add_all(
+                    [_ingest_analysis_artifact(artifacts, transcript) for artifacts, transcript in ingested]
+                )
+                insert_segment_rows(
+                    session,
+                    [row for artifacts, transcript in ingested for row in _segment_rows_for(artifacts, transcript)],
+                )
+                session.commit()
+                succeeded = ok
+                for job in jobs:
+                    publish_job_event(job)
+                _cache_transcripts(session, fetched)
+            except Exception as e:
+                session.rollback()
+                logger.exception("celery_task_failed", extra={"task": "ingest_youtube_chunk"})
+                chunk_error = f"{e.__class__.__name__}: {e}"
+                _fail_unfinished_jobs(session, job_ids, chunk_error)
+
+            failed = len(job_ids) - succeeded
+            _record_batch_progress(session, parent_job_id, succeeded=succeeded, failed=failed)
+            if chunk_error is not None:
+                return {"ok": False, "error": chunk_error, "succeeded": succeeded, "failed": failed}
+            logger.info(
+                "celery_task_succeeded",
+                extra={"task": "ingest_youtube_chunk", "succeeded": succeeded, "failed": failed},
+            )
+            return {"ok": True, "succeeded": succeeded, "failed": failed}
+    finally:
+        clear_job_id()
+
+
 def _workflow_ingest_youtube(
     *,
     session: Session,
@@ -244,6 +528,181 @@ WORKFLOW_TASK_HANDLERS: dict[str, Callable[..., dict[str, Any]]] = {
 }
 
 
+async def _generate_outputs(
+    *,
+    outputs: list[str],
+    workspace_id: int,
+    concurrency: int,
+    drafts_for: Callable[[str], DraftPublisher] | None = None,
+    **kwargs: Any,
+) -> list[str]:
+    """Generate every requested output kind concurrently.
+
+    The semaphore is shared by all generate jobs of a workspace running in this
+    worker process, so at most `concurrency` provider calls are in flight for it.
+    Results are returned in the same order as `outputs`. If any output fails, the
+    remaining in-flight generations are cancelled and the first error is raised.
+    With `drafts_for`, each output is streamed and its partial text published.
+    """
+    semaphore = shared_semaphore(("generate", workspace_id), concurrency)
+
+    async def _generate_one(output_kind: str) -> str:
+        async with semaphore:
+            if drafts_for is None:
+                return await generate_text_output(output_kind=output_kind, **kwargs)
+            drafts = drafts_for(output_kind)
+            text = await generate_text_output(output_kind=output_kind, on_delta=drafts, **kwargs)
+            drafts.finish(text)
+            return text
+
+    pending = [asyncio.ensure_future(_generate_one(kind)) for kind in outputs]
+    try:
+        return list(await asyncio.gather(*pending))
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
+
+
+async def _condense_transcript(
+    *,
+    transcript: str,
+    segments: list[dict[str, Any]],
+    workspace_id: int,
+    provider_name: str,
+    meta: dict[str, Any],
+) -> ChunkSummaries:
+    """Map step for long transcripts: summarise segment-aligned chunks concurrently.
+
+    Runs once per job; every output kind then generates from the summaries.
+    """
+    chunks = split_chunks(transcript, segments, chunk_tokens=settings.map_reduce_chunk_tokens)
+    semaphore = shared_semaphore(("generate_map", workspace_id), settings.map_reduce_concurrency)
+    return await summarize_chunks(chunks, provider_name=provider_name, meta=meta, semaphore=semaphore)
+
+
+def _load_generation_source(
+    session: Session,
+    *,
+    workspace_id: int,
+    project_id: int,
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+) -> tuple[str, list[dict[str, Any]], str | None]:
+    """Transcript text, segments and precomputed source facts for generation.
+
+    With a time range only the overlapping segments are read and the transcript
+    text is built from them; the full `content` column is never loaded.
+    Transcripts ingested before the analysis stage get their analysis computed
+    here on the first full-range generation and added to the session.
+    """
+    transcript_art_id = session.exec(
+        select(Artifact.id).where(
+            Artifact.workspace_id == workspace_id,
+            Artifact.project_id == project_id,
+            Artifact.kind == "transcript",
+        ).order_by(Artifact.id.desc())
+    ).first()
+    if transcript_art_id is None:
+        return "No transcript found. (Run ingest first.)", [], None
+
+    analysis = session.exec(
+        select(Artifact.meta).where(
+            Artifact.workspace_id == workspace_id,
+            Artifact.project_id == project_id,
+            Artifact.kind == ANALYSIS_KIND,
+        ).order_by(Artifact.id.desc())
+    ).first()
+    if not is_current(analysis) or analysis.get("transcript_artifact_id") != transcript_art_id:
+        analysis = None
+
+    ranged = start_seconds is not None or end_seconds is not None
+    segments = load_segments(session, transcript_art_id, start=start_seconds, end=end_seconds)
+    if ranged:
+        text = " ".join(segment["text"] for segment in segments)
+    else:
+        text = session.exec(select(Artifact.content).where(Artifact.id == transcript_art_id)).one()
+        if analysis is None:
+            derived = _analysis_artifact(
+                workspace_id=workspace_id,
+                project_id=project_id,
+                transcript_artifact_id=transcript_art_id,
+                transcript_text=text,
+                segments=segments,
+            )
+            session.add(derived)
+            analysis = derived.meta
+
+    source_facts = None
+    if analysis is not None:
+        source_facts = source_facts_from_analysis(analysis, start_seconds=start_seconds, end_seconds=end_seconds)
+    return text, segments, source_facts
+
+
+def _store_drafts(
+    session: Session,
+    job: Job,
+    *,
+    project_id: int,
+    drafts: list[tuple[str, str]],
+    tone: str,
+    brand_voice: str | None,
+    template_id: int | None,
+    template_version: int | None,
+) -> list[int]:
+    """Insert a draft artifact per (output kind, text) pair and return their ids."""
+    artifacts = [
+        Artifact(
+            workspace_id=job.workspace_id,
+            project_id=project_id,
+            kind=output_kind,
+            title=f"{output_kind.title()} Draft",
+            content=text,
+            meta={
+                "tone": tone,
+                "brand_voice": brand_voice,
+                "template_id": template_id,
+                "template_version": template_version,
+            },
+        )
+        for output_kind, text in drafts
+    ]
+    session.add_all(artifacts)
+    session.flush()
+    created_artifact_ids = [artifact.id for artifact in artifacts if artifact.id is not None]
+    session.commit()
+    return created_artifact_ids
+
+
+def _record_generate_events(session: Session, job: Job, *, project_id: int, artifact_ids: list[int]) -> None:
+    try:
+        record_event(session, workspace_id=job.workspace_id, project_id=project_id, kind="job_completed", meta={"job_id": job.id, "job_kind": "generate"})
+        for aid in artifact_ids:
+            record_event(session, workspace_id=job.workspace_id, project_id=project_id, kind="artifact_created", meta={"artifact_id": aid})
+    except Exception:
+        logger.warning("event_recording_failed", exc_info=True)
+
+
+def _submit_generate_batch(job: Job, *, outputs: list[str], meta: dict[str, Any], **prompt_kwargs: Any) -> dict[str, Any]:
+    """Render every output's prompt and submit them as one provider batch.
+
+    Long transcripts are compacted to the prompt budget rather than condensed
+    with map-reduce, which would need interactive provider calls.
+    """
+    provider_name = settings.generate_batch_provider
+    provider = batch_provider(provider_name)
+    if not provider.is_available(meta=meta):
+        raise RuntimeError(f"Text provider '{provider_name}' is unavailable (missing credentials/config)")
+    prompts = {
+        output_kind: prepare_output_request(
+            output_kind=output_kind, provider_name=provider_name, meta=meta, **prompt_kwargs
+        )
+        for output_kind in outputs
+    }
+    return _run_async(submit_generate_batch(provider, job_id=job.id, prompts=prompts, meta=meta))
+
+
 def _ensure_providers_registered() -> None:
     if registry.list_text():
         return
@@ -280,67 +739,104 @@ def generate_posts(job_id: int):
                         template_id_int = int(template_id)
                     except (TypeError, ValueError):
                         raise ValueError("Invalid template_id")
-                    template = session.exec(
-                        select(Template).where(
-                            Template.id == template_id_int,
-                            Template.workspace_id == job.workspace_id,
-                        )
-                    ).first()
+                    template = get_cached_template(
+                        session,
+                        workspace_id=job.workspace_id,
+                        template_id=template_id_int,
+                    )
                     if not template:
                         raise ValueError(f"Template {template_id_int} not found")
 
-                # Get transcript
-                transcript_art = session.exec(
-                    select(Artifact).where(
-                        Artifact.workspace_id == job.workspace_id,
-                        Artifact.project_id == project_id,
-                        Artifact.kind == "transcript",
-                    ).order_by(Artifact.id.desc())
-                ).first()
-
-                transcript = transcript_art.content if transcript_art else "No transcript found. (Run ingest first.)"
-                segments = (
-                    transcript_art.meta.get("segments", [])
-                    if transcript_art and isinstance(transcript_art.meta, dict)
-                    else []
+                transcript, segments, source_facts = _load_generation_source(
+                    session,
+                    workspace_id=job.workspace_id,
+                    project_id=project_id,
+                    start_seconds=payload.get("start_seconds"),
+                    end_seconds=payload.get("end_seconds"),
                 )
 
-                created_artifact_ids = []
                 for output_kind in outputs:
                     if template is not None and output_kind != template.kind:
                         raise ValueError(
                             f"Template kind '{template.kind}' does not match output '{output_kind}'"
                         )
-                    text = _run_async(
-                        generate_text_output(
+
+                provider_name = "openai"
+                meta = {**(payload.get("meta") or {}), "workspace_id": job.workspace_id}
+                if payload.get("execution") == "batch":
+                    batch = _submit_generate_batch(
+                        job,
+                        outputs=outputs,
+                        meta=meta,
+                        transcript=transcript,
+                        segments=segments,
+                        source_facts=source_facts,
+                        tone=tone,
+                        brand_voice=brand_voice,
+                        template_content=template.content if template else None,
+                    )
+                    batch["template_version"] = template.version if template else None
+                    _update_job(session, job, output={"outputs": outputs, "batch": batch})
+                    logger.info(
+                        "generate_batch_submitted",
+                        extra={"task": "generate_posts", "batch_id": batch["id"], "outputs": len(outputs)},
+                    )
+                    return {"ok": True, "batch_id": batch["id"]}
+
+                map_reduce = None
+                if needs_map_reduce(
+                    transcript,
+                    mode=payload.get("mode") or "auto",
+                    budget_tokens=prompt_token_budget(provider_name),
+                ):
+                    condensed = _run_async(
+                        _condense_transcript(
                             transcript=transcript,
                             segments=segments,
-                            output_kind=output_kind,
-                            tone=tone,
-                            brand_voice=brand_voice,
-                            provider_name="openai",
-                            meta={**(payload.get("meta") or {}), "workspace_id": job.workspace_id},
-                            template_content=template.content if template else None,
+                            workspace_id=job.workspace_id,
+                            provider_name=provider_name,
+                            meta=meta,
                         )
                     )
-                    artifact = Artifact(
+                    transcript, segments = condensed.transcript, condensed.segments
+                    map_reduce = {"chunks": len(condensed.segments), "cached": condensed.cached}
+
+                # Built here: the ORM job must not be touched from the event loop thread.
+                drafts = (
+                    {output_kind: DraftPublisher(job, output_kind) for output_kind in outputs}
+                    if settings.generate_stream_drafts
+                    else {}
+                )
+                texts = _run_async(
+                    _generate_outputs(
+                        outputs=outputs,
                         workspace_id=job.workspace_id,
-                        project_id=project_id,
-                        kind=output_kind,
-                        title=f"{output_kind.title()} Draft",
-                        content=text,
-                        meta={
-                            "tone": tone,
-                            "brand_voice": brand_voice,
-                            "template_id": template.id if template else None,
-                            "template_version": template.version if template else None,
-                        },
+                        concurrency=settings.generate_concurrency_per_workspace,
+                        drafts_for=drafts.__getitem__ if drafts else None,
+                        transcript=transcript,
+                        segments=segments,
+                        source_facts=source_facts,
+                        tone=tone,
+                        brand_voice=brand_voice,
+                        provider_name=provider_name,
+                        meta=meta,
+                        template_content=template.content if template else None,
                     )
-                    session.add(artifact)
-                    session.flush()
-                    if artifact.id is not None:
-                        created_artifact_ids.append(artifact.id)
-                session.commit()
+                )
+                # Final drafts go out before the job's own succeeded event.
+                for publisher in drafts.values():
+                    publisher.flush()
+
+                created_artifact_ids = _store_drafts(
+                    session,
+                    job,
+                    project_id=project_id,
+                    drafts=list(zip(outputs, texts)),
+                    tone=tone,
+                    brand_voice=brand_voice,
+                    template_id=template.id if template else None,
+                    template_version=template.version if template else None,
+                )
 
                 _update_job(
                     session,
@@ -351,14 +847,10 @@ def generate_posts(job_id: int):
                         "outputs": outputs,
                         "artifact_ids": created_artifact_ids,
                         "template_id": template.id if template else None,
+                        "map_reduce": map_reduce,
                     },
                 )
-                try:
-                    record_event(session, workspace_id=job.workspace_id, project_id=project_id, kind="job_completed", meta={"job_id": job.id, "job_kind": "generate"})
-                    for aid in created_artifact_ids:
-                        record_event(session, workspace_id=job.workspace_id, project_id=project_id, kind="artifact_created", meta={"artifact_id": aid})
-                except Exception:
-                    logger.warning("event_recording_failed", exc_info=True)
+                _record_generate_events(session, job, project_id=project_id, artifact_ids=created_artifact_ids)
                 logger.info(
                     "celery_task_succeeded",
                     extra={
@@ -381,6 +873,121 @@ def generate_posts(job_id: int):
         clear_job_id()
 
 
+def _lock_running_batch_job(session: Session, job_id: int, batch_id: str) -> Job | None:
+    """Lock the job again after a provider call; None if it moved on meanwhile."""
+    job = _lock_job(session, job_id)
+    batch = (job.output or {}).get("batch") if job else None
+    if job is None or job.status != "running" or not batch or batch.get("id") != batch_id:
+        session.rollback()
+        return None
+    return job
+
+
+def _finish_generate_batch(job_id: int) -> bool:
+    """Check one batch-mode generate job; True once it has succeeded or failed.
+
+    Provider calls run without the job's row lock (they can take seconds); the
+    row is locked and re-checked only to write the result.
+    """
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+        batch = (job.output or {}).get("batch") if job else None
+        if job is None or job.status != "running" or not batch:
+            return False
+        meta = {"workspace_id": job.workspace_id}
+        session.rollback()
+
+        provider = batch_provider(batch["provider"])
+        status = _run_async(provider.get_batch(batch["id"], meta=meta))
+        if not status.done:
+            if status.status != batch.get("status"):
+                job = _lock_running_batch_job(session, job_id, batch["id"])
+                if job is not None:
+                    _update_job(session, job, output={**job.output, "batch": {**batch, "status": status.status}})
+            return False
+
+        error: Exception | None = None
+        texts: dict[str, str] = {}
+        try:
+            if status.status != "completed":
+                details = "; ".join(status.errors) or "no details"
+                raise RuntimeError(f"Batch {status.id} ended as {status.status}: {details}")
+            texts = batch_texts(batch["requests"], _run_async(provider.batch_results(status, meta=meta)))
+        except Exception as e:
+            error = e
+
+        job = _lock_running_batch_job(session, job_id, batch["id"])
+        if job is None:
+            return False
+        output = {**job.output, "batch": {**batch, "status": status.status}}
+        if error is not None:
+            metrics.inc("generate_batches_failed_total", provider=batch["provider"])
+            _update_job(session, job, status="failed", output=output, error=f"{error.__class__.__name__}: {error}")
+            logger.warning("generate_batch_failed", extra={"batch_id": batch["id"], "error": str(error)})
+            return True
+
+        payload = job.input or {}
+        project_id = job.project_id or payload.get("project_id")
+        outputs = output.get("outputs") or list(texts)
+        created_artifact_ids = _store_drafts(
+            session,
+            job,
+            project_id=project_id,
+            drafts=[(output_kind, texts[output_kind]) for output_kind in outputs],
+            tone=payload.get("tone", "professional"),
+            brand_voice=payload.get("brand_voice"),
+            template_id=payload.get("template_id"),
+            template_version=batch.get("template_version"),
+        )
+        _update_job(
+            session,
+            job,
+            status="succeeded",
+            output={
+                **output,
+                "generated": True,
+                "artifact_ids": created_artifact_ids,
+                "template_id": payload.get("template_id"),
+                "map_reduce": None,
+            },
+        )
+        _record_generate_events(session, job, project_id=project_id, artifact_ids=created_artifact_ids)
+        logger.info(
+            "generate_batch_succeeded",
+            extra={"batch_id": batch["id"], "project_id": project_id, "artifacts_created": len(created_artifact_ids)},
+        )
+        return True
+
+
+@shared_task(name="trendr.poll_generate_batches")
+def poll_generate_batches():
+    """Collect finished provider batches for running batch-mode generate jobs."""
+    logger.info("celery_task_started", extra={"task": "poll_generate_batches"})
+    _ensure_providers_registered()
+    with Session(engine) as session:
+        job_ids = session.exec(
+            select(Job.id)
+            .where(
+                Job.kind == "generate",
+                Job.status == "running",
+                Job.input["execution"].as_string() == "batch",
+            )
+            .order_by(Job.id)
+        ).all()
+
+    finished = 0
+    for job_id in job_ids:
+        set_job_id(job_id)
+        try:
+            finished += _finish_generate_batch(job_id)
+        except Exception:
+            # Provider or network trouble: leave the job running and check again next time.
+            logger.exception("generate_batch_poll_failed", extra={"task": "poll_generate_batches"})
+        finally:
+            clear_job_id()
+    return {"ok": True, "checked": len(job_ids), "finished": finished}
+
+
 @shared_task(name="trendr.generate_media")
 def generate_media(job_id: int):
     set_job_id(job_id)
@@ -526,6 +1133,15 @@ def run_workflow(job_id: int):
                     if handler is None:
                         raise ValueError(f"Unsupported workflow task '{task_name}'")
 
+                    publish_node_event(
+                        job,
+                        {
+                            "node_id": node_id,
+                            "task": task_name,
+                            "status": "running",
+                            "started_at": started_at,
+                        },
+                    )
                     try:
                         result = handler(
                             session=session,
@@ -554,7 +1170,9 @@ def run_workflow(job_id: int):
                                 "error": f"{node_exc.__class__.__name__}: {node_exc}",
                             }
                         )
+                        publish_node_event(job, node_statuses[-1])
                         raise
+                    publish_node_event(job, node_statuses[-1])
 
                 _update_job(
                     session,
@@ -624,10 +1242,5 @@ def check_scheduled_posts():
 
 
 def _run_async(coro):
-    """Run an async coroutine in a sync Celery task (skeleton)."""
-    import asyncio
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+    """Run an async coroutine from a sync Celery task on the worker-lifetime loop."""
+    return worker_loop.run(coro)
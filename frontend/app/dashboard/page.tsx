@@ -27,7 +27,7 @@ export default function Dashboard() {
 
   async function refresh() {
     const [projectData, jobData] = await Promise.all([
-      api.get<Project[]>("/v1/projects"),
+      api.getAll<Project>("/v1/projects"),
       api.get<Job[]>("/v1/jobs?limit=10"),
     ]);
     setProjects(projectData);
@@ -95,7 +95,7 @@ export default function ProjectPage() {
     if (!hasValidProjectId) return;
     const [projectData, artifactData, jobData] = await Promise.all([
       api.get<Project>(`/v1/projects/${projectId}`),
-      api.get<Artifact[]>(`/v1/artifacts?project_id=${projectId}`),
+      api.getAll<Artifact>(`/v1/artifacts?project_id=${projectId}`),
       api.get<Job[]>(`/v1/jobs?project_id=${projectId}&limit=20`),
     ]);
     setProject(projectData);
@@ -175,7 +175,7 @@ export default function ProjectPage() {
     let cancelled = false;
     (async () => {
       try {
-        const rows = await api.get<Template[]>(`/v1/templates?kind=${outputKind}`);
+        const rows = await api.getAll<Template>(`/v1/templates?kind=${outputKind}`);
         if (!cancelled) {
           setTemplates(rows);
           setSelectedTemplateId((prev) => {
@@ -95,7 +95,7 @@ export default function TemplatesPage() {
     setError(null);
     try {
       const query = kindFilter === "all" ? "" : `?kind=${kindFilter}`;
-      const data = await api.get<Template[]>(`/v1/templates${query}`);
+      const data = await api.getAll<Template>(`/v1/templates${query}`);
       setTemplates(data);
       if (data.length === 0) {
         setSelectedTemplateId(null);
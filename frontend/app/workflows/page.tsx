@@ -98,9 +98,9 @@ export default function WorkflowsPage() {
     setError(null);
     try {
       const [workflowRows, projectRows, templateRows] = await Promise.all([
-        api.get<Workflow[]>("/v1/workflows"),
-        api.get<Project[]>("/v1/projects"),
-        api.get<Template[]>("/v1/templates"),
+        api.getAll<Workflow>("/v1/workflows"),
+        api.getAll<Project>("/v1/projects"),
+        api.getAll<Template>("/v1/templates"),
       ]);
       setWorkflows(workflowRows);
       setProjects(projectRows);
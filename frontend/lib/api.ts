@@ -2,7 +2,7 @@ const base = process.env.NEXT_PUBLIC_API_BASE ?? "http://localhost:8000";
 const defaultUserId = process.env.NEXT_PUBLIC_USER_ID ?? "demo-user";
 const defaultWorkspaceSlug = process.env.NEXT_PUBLIC_WORKSPACE_SLUG ?? "default";
 
-async function request(path: string, opts: RequestInit) {
+async function send(path: string, opts: RequestInit) {
   const res = await fetch(base + path, {
     ...opts,
     headers: {
@@ -16,11 +16,31 @@ async function request(path: string, opts: RequestInit) {
     const text = await res.text();
     throw new Error(`API ${res.status}: ${text}`);
   }
+  return res;
+}
+
+async function request(path: string, opts: RequestInit) {
+  const res = await send(path, opts);
   return res.json();
 }
 
+// List endpoints return one page at a time; follow X-Next-Cursor to the end.
+async function getAll<T>(path: string): Promise<T[]> {
+  const items: T[] = [];
+  const separator = path.includes("?") ? "&" : "?";
+  let cursor: string | null = null;
+  do {
+    const pagePath: string = cursor ? `${path}${separator}cursor=${encodeURIComponent(cursor)}` : path;
+    const res = await send(pagePath, { method: "GET" });
+    items.push(...((await res.json()) as T[]));
+    cursor = res.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return items;
+}
+
 export const api = {
   get: <T = any>(path: string) => request(path, { method: "GET" }) as Promise<T>,
+  getAll,
   post: <T = any>(path: string, body: any) => request(path, { method: "POST", body: JSON.stringify(body) }) as Promise<T>,
   put: <T = any>(path: string, body: any) => request(path, { method: "PUT", body: JSON.stringify(body) }) as Promise<T>,
   patch: <T = any>(path: string, body: any) => request(path, { method: "PATCH", body: JSON.stringify(body) }) as Promise<T>,